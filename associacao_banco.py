@@ -0,0 +1,443 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.cluster.hierarchy import leaves_list, linkage, optimal_leaf_ordering
+from scipy.optimize import minimize_scalar
+from scipy.spatial.distance import squareform
+from scipy.special import ndtr, ndtri, owens_t
+
+from cubo_banco import codificar
+from dados_banco import PASTA_SNAPSHOT
+
+# --- Associação entre pares de variáveis: a medida depende da natureza das duas ---
+# numérica (idade, IMC), binária (sim/não, opção de múltipla escolha, duas categorias),
+# ordinal (categorias com ordem no questionário: renda, escolaridade, faixas) e nominal (sem ordem: cor/etnia, residência)
+MEDIDAS = {
+    ('numerica', 'numerica'): 'pearson',
+    ('binaria', 'numerica'): 'ponto_bisserial',
+    ('numerica', 'ordinal'): 'spearman',
+    ('nominal', 'numerica'): 'eta',
+    ('binaria', 'binaria'): 'phi',
+    ('binaria', 'ordinal'): 'spearman',
+    ('binaria', 'nominal'): 'cramer',
+    ('ordinal', 'ordinal'): 'policorica',
+    ('nominal', 'ordinal'): 'cramer',
+    ('nominal', 'nominal'): 'cramer',
+}
+ROTULOS_MEDIDAS = {
+    'pearson': 'Pearson',
+    'spearman': 'Spearman',
+    'ponto_bisserial': 'Ponto-bisserial',
+    'phi': 'Phi',
+    'eta': 'Razão de correlação (η)',
+    'cramer': 'V de Cramér (corrigido)',
+    'policorica': 'Policórica',
+}
+# Pares com menos participantes respondendo às duas perguntas ficam sem valor
+MINIMO_PARES = 3
+# Formato do .npz das associações guardadas em disco (incrementar ao mudar medidas, campos ou codificação)
+VERSAO_ARQUIVO = 1
+
+
+def natureza_da_coluna(coluna, serie):
+    # None: coluna fora da análise (datas, texto livre)
+    if coluna.tipo == 'numerica':
+        return 'numerica'
+    if coluna.tipo in ('sim_nao', 'multipla'):
+        return 'binaria'
+    if coluna.tipo in ('categorica', 'texto') and isinstance(serie.dtype, pd.CategoricalDtype):
+        if coluna.ordenada:
+            return 'ordinal'
+        return 'binaria' if serie.nunique() == 2 else 'nominal'
+    return None
+
+
+def medida_do_par(natureza_a, natureza_b):
+    return MEDIDAS[tuple(sorted((natureza_a, natureza_b)))]
+
+
+# --- Variáveis codificadas: códigos por categoria (-1 = em branco) e valores numéricos (NaN = em branco) ---
+class VariaveisCodificadas:
+    def __init__(self, banco, nomes):
+        self.nomes = []
+        self.naturezas = []
+        self.codigos = []
+        self.categorias = []
+        valores = []
+        for nome in nomes:
+            coluna = banco.esquema.por_nome.get(nome)
+            if coluna is None or nome not in banco:
+                continue
+            serie = banco[nome]
+            natureza = natureza_da_coluna(coluna, serie)
+            if natureza is None:
+                continue
+            if natureza == 'numerica':
+                codigos, categorias = np.full(len(serie), -1, dtype=np.int64), []
+                valor = serie.to_numpy(dtype=float, na_value=np.nan)
+            else:
+                if natureza == 'ordinal':
+                    # Códigos ordinais compartilhados do banco (ordem do questionário, ajustados uma vez por carga)
+                    codigos, categorias = banco.codigos_ordinais(nome).astype(np.int64), banco.ordinais().niveis[nome]
+                else:
+                    codigos, categorias = codificar(serie.astype('category') if coluna.tipo in ('sim_nao', 'multipla') else serie)
+                # Binárias e ordinais também entram como número: posição da categoria (não < sim; ordem do questionário)
+                valor = np.where(codigos < 0, np.nan, codigos).astype(float)
+            self.nomes.append(nome)
+            self.naturezas.append(natureza)
+            self.codigos.append(codigos)
+            self.categorias.append(categorias)
+            valores.append(valor)
+        self.valores = np.column_stack(valores) if valores else np.zeros((len(banco), 0))
+
+        self.postos = postos(self.valores)
+        # Matriz indicadora (linhas × categorias de todas as variáveis categóricas); em branco = linha zerada
+        # naquela variável. O bloco (a, b) de indicadoras.T @ indicadoras é a tabela cruzada de a × b
+        self.tamanhos = np.array([len(categorias) for categorias in self.categorias], dtype=np.int64)
+        self.inicios = np.concatenate([[0], np.cumsum(self.tamanhos)[:-1]]).astype(np.int64)
+        self.indicadoras = np.zeros((len(self.valores), int(self.tamanhos.sum())))
+        for inicio, codigos in zip(self.inicios, self.codigos):
+            linhas = np.flatnonzero(codigos >= 0)
+            self.indicadoras[linhas, inicio + codigos[linhas]] = 1
+
+    def __len__(self):
+        return len(self.nomes)
+
+    def categoricas(self, indices):
+        return [i for i in indices if self.naturezas[i] != 'numerica']
+
+    def blocos(self, indices):
+        # Colunas da matriz indicadora e início de cada variável dentro delas (para somar por variável com reduceat)
+        colunas = np.concatenate([np.arange(self.inicios[i], self.inicios[i] + self.tamanhos[i]) for i in indices]
+                                 or [np.zeros(0, dtype=np.int64)])
+        tamanhos = self.tamanhos[indices]
+        return colunas, np.concatenate([[0], np.cumsum(tamanhos)[:-1]]).astype(np.int64), tamanhos
+
+
+def postos(valores):
+    # Postos médios por coluna, ignorando os em branco (Spearman = Pearson dos postos)
+    resultado = np.full(valores.shape, np.nan)
+    for j in range(valores.shape[1]):
+        presentes = ~np.isnan(valores[:, j])
+        resultado[presentes, j] = pd.Series(valores[presentes, j]).rank().to_numpy()
+    return resultado
+
+
+def pearson_cruzado(a, b, pesos=None):
+    # Pearson de cada coluna de a com cada coluna de b, nas linhas em que as duas estão preenchidas (produtos de matrizes).
+    # pesos (linhas × colunas de b): quantas vezes cada linha conta, como numa reamostragem bootstrap
+    presentes_a, presentes_b = (~np.isnan(a)).astype(float), (~np.isnan(b)).astype(float)
+    xa, xb = np.nan_to_num(a), np.nan_to_num(b)
+    if pesos is not None:
+        presentes_b = presentes_b * pesos
+    xb_ponderado = xb if pesos is None else xb * pesos
+    n = presentes_a.T @ presentes_b
+    soma_a, soma_b = xa.T @ presentes_b, presentes_a.T @ xb_ponderado
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariancia = xa.T @ xb_ponderado - soma_a * soma_b / n
+        variancia_a = (xa * xa).T @ presentes_b - soma_a ** 2 / n
+        variancia_b = presentes_a.T @ (xb * xb_ponderado) - soma_b ** 2 / n
+        r = covariancia / np.sqrt(variancia_a * variancia_b)
+    return np.clip(r, -1, 1), n
+
+
+def qui_quadrado_cruzado(tabelas, inicios_a, inicios_b):
+    # Qui-quadrado de todos os pares a × b a partir dos blocos de tabelas, somado por bloco com reduceat.
+    # Devolve também n, categorias usadas de cada lado (só as que aparecem no par) e a menor frequência esperada
+    variavel_a = np.repeat(np.arange(len(inicios_a)), np.diff(np.append(inicios_a, tabelas.shape[0])))
+    variavel_b = np.repeat(np.arange(len(inicios_b)), np.diff(np.append(inicios_b, tabelas.shape[1])))
+    totais_linha = np.add.reduceat(tabelas, inicios_b, axis=1)          # categoria de a × variável de b
+    totais_coluna = np.add.reduceat(tabelas, inicios_a, axis=0)         # variável de a × categoria de b
+    n = np.add.reduceat(totais_linha, inicios_a, axis=0)                # variável de a × variável de b
+    esperado = totais_linha[:, variavel_b] * totais_coluna[variavel_a, :] / n[np.ix_(variavel_a, variavel_b)]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        parcelas = np.where(esperado > 0, (tabelas - esperado) ** 2 / esperado, 0.0)
+        qui2 = np.add.reduceat(np.add.reduceat(parcelas, inicios_a, axis=0), inicios_b, axis=1)
+    linhas_usadas = np.add.reduceat((totais_linha > 0).astype(float), inicios_a, axis=0)
+    colunas_usadas = np.add.reduceat((totais_coluna > 0).astype(float), inicios_b, axis=1)
+    minimo = np.where(esperado > 0, esperado, np.inf)
+    esperado_minimo = np.minimum.reduceat(np.minimum.reduceat(minimo, inicios_a, axis=0), inicios_b, axis=1)
+    return qui2, n, linhas_usadas, colunas_usadas, esperado_minimo
+
+
+def cramer_cruzado(tabelas, inicios_a, inicios_b):
+    # V de Cramér de todos os pares a × b a partir do qui-quadrado em lote
+    qui2, n, linhas_usadas, colunas_usadas, _ = qui_quadrado_cruzado(tabelas, inicios_a, inicios_b)
+    graus = np.minimum(linhas_usadas, colunas_usadas) - 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Correção de viés de Bergsma: sem ela, categorias raras (uma instituição, uma opção marcada por uma pessoa)
+        # dão V perto de 1 só pelo tamanho da tabela
+        phi2 = np.maximum(qui2 / n - (linhas_usadas - 1) * (colunas_usadas - 1) / (n - 1), 0)
+        linhas_corrigidas = linhas_usadas - (linhas_usadas - 1) ** 2 / (n - 1)
+        colunas_corrigidas = colunas_usadas - (colunas_usadas - 1) ** 2 / (n - 1)
+        v = np.sqrt(phi2 / (np.minimum(linhas_corrigidas, colunas_corrigidas) - 1))
+    return np.where(graus > 0, np.clip(v, 0, 1), np.nan), n
+
+
+def eta_cruzado(indicadoras, inicios, valores, pesos=None):
+    # Razão de correlação das numéricas (colunas de valores) por variável nominal (blocos de indicadoras)
+    presentes = (~np.isnan(valores)).astype(float)
+    x = np.nan_to_num(valores)
+    if pesos is not None:
+        presentes, x = presentes * pesos, x * pesos
+    n = indicadoras.T @ presentes
+    soma = indicadoras.T @ x
+    quadrados = indicadoras.T @ (x * np.nan_to_num(valores))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        entre = np.add.reduceat(np.where(n > 0, soma ** 2 / n, 0.0), inicios, axis=0)
+        n_total = np.add.reduceat(n, inicios, axis=0)
+        soma_total = np.add.reduceat(soma, inicios, axis=0)
+        quadrados_total = np.add.reduceat(quadrados, inicios, axis=0)
+        correcao = soma_total ** 2 / n_total
+        eta = np.sqrt((entre - correcao) / (quadrados_total - correcao))
+    return np.clip(eta, 0, 1), n_total
+
+
+# --- Correlação policórica (ordinal × ordinal): normal bivariada latente, limiares pelas marginais ---
+def normal_bivariada(h, k, rho):
+    # P(X <= h, Y <= k) com correlação rho, pela função T de Owen (vetorizada nos limiares)
+    h, k = np.broadcast_arrays(np.asarray(h, dtype=float), np.asarray(k, dtype=float))
+    h = np.where(h == 0, 1e-12, h)
+    k = np.where(k == 0, 1e-12, k)
+    raiz = np.sqrt(1 - rho * rho)
+    correcao = np.where(h * k < 0, 0.5, 0.0)
+    return (0.5 * (ndtr(h) + ndtr(k)) - owens_t(h, (k - rho * h) / (h * raiz))
+            - owens_t(k, (h - rho * k) / (k * raiz)) - correcao)
+
+
+def policorica(tabela):
+    tabela = np.asarray(tabela, dtype=float)
+    tabela = tabela[tabela.sum(axis=1) > 0][:, tabela.sum(axis=0) > 0]
+    if min(tabela.shape) < 2:
+        return np.nan
+    n = tabela.sum()
+    # Limiares nas proporções acumuladas (±8 faz o papel de ±infinito)
+    limites_h = np.concatenate([[-8.0], ndtri(np.cumsum(tabela.sum(axis=1))[:-1] / n), [8.0]])
+    limites_k = np.concatenate([[-8.0], ndtri(np.cumsum(tabela.sum(axis=0))[:-1] / n), [8.0]])
+    h, k = np.meshgrid(limites_h, limites_k, indexing='ij')
+
+    def menos_verossimilhanca(rho):
+        acumulada = normal_bivariada(h, k, rho)
+        celulas = acumulada[1:, 1:] - acumulada[:-1, 1:] - acumulada[1:, :-1] + acumulada[:-1, :-1]
+        return -(tabela * np.log(np.clip(celulas, 1e-300, None))).sum()
+
+    return minimize_scalar(menos_verossimilhanca, bounds=(-0.999, 0.999), method='bounded').x
+
+
+# --- Associações de um bloco de variáveis (linhas) com outro (colunas) ---
+def associar_blocos(variaveis, a, b):
+    # a, b: índices das variáveis; devolve (valores, medidas, participantes) do bloco a × b
+    medidas = np.array([[medida_do_par(variaveis.naturezas[i], variaveis.naturezas[j]) for j in b] for i in a],
+                       dtype=object).reshape(len(a), len(b))
+    valores = np.full((len(a), len(b)), np.nan)
+    pares = np.zeros((len(a), len(b)), dtype=np.int64)
+
+    # Pearson, phi e ponto-bisserial: Pearson sobre os valores; Spearman: Pearson sobre os postos
+    r, n = pearson_cruzado(variaveis.valores[:, a], variaveis.valores[:, b])
+    rho, _ = pearson_cruzado(variaveis.postos[:, a], variaveis.postos[:, b])
+    for medida, matriz in (('pearson', r), ('phi', r), ('ponto_bisserial', r), ('spearman', rho)):
+        selecao = medidas == medida
+        valores[selecao] = matriz[selecao]
+        pares[selecao] = n[selecao]
+
+    # Categóricas: todas as tabelas cruzadas do bloco num produto; V de Cramér, razão de correlação e policórica saem delas
+    posicao_a, posicao_b = {i: k for k, i in enumerate(a)}, {j: k for k, j in enumerate(b)}
+    categoricas_a, categoricas_b = variaveis.categoricas(a), variaveis.categoricas(b)
+    colunas_a, inicios_a, tamanhos_a = variaveis.blocos(categoricas_a)
+    colunas_b, inicios_b, tamanhos_b = variaveis.blocos(categoricas_b)
+    indicadoras_a, indicadoras_b = variaveis.indicadoras[:, colunas_a], variaveis.indicadoras[:, colunas_b]
+    if categoricas_a and categoricas_b:
+        tabelas = indicadoras_a.T @ indicadoras_b
+        v, n_tabelas = cramer_cruzado(tabelas, inicios_a, inicios_b)
+        for x, i in enumerate(categoricas_a):
+            for y, j in enumerate(categoricas_b):
+                medida = medidas[posicao_a[i], posicao_b[j]]
+                if medida == 'cramer':
+                    valores[posicao_a[i], posicao_b[j]] = v[x, y]
+                elif medida == 'policorica':
+                    tabela = tabelas[inicios_a[x]:inicios_a[x] + tamanhos_a[x], inicios_b[y]:inicios_b[y] + tamanhos_b[y]]
+                    valores[posicao_a[i], posicao_b[j]] = 1.0 if i == j else policorica(tabela)
+                else:
+                    continue
+                pares[posicao_a[i], posicao_b[j]] = n_tabelas[x, y]
+    # Razão de correlação: nominal de um lado, numérica do outro
+    for categoricas, inicios, indicadoras, outras, transpor in (
+            (categoricas_a, inicios_a, indicadoras_a, b, False), (categoricas_b, inicios_b, indicadoras_b, a, True)):
+        if not categoricas:
+            continue
+        eta, n_eta = eta_cruzado(indicadoras, inicios, variaveis.valores[:, outras])
+        for x, i in enumerate(categoricas):
+            for y, j in enumerate(outras):
+                linha, coluna = (posicao_a[j], posicao_b[i]) if transpor else (posicao_a[i], posicao_b[j])
+                if medidas[linha, coluna] == 'eta':
+                    valores[linha, coluna], pares[linha, coluna] = eta[x, y], n_eta[x, y]
+    valores[pares < MINIMO_PARES] = np.nan
+    for i in set(a) & set(b):
+        valores[posicao_a[i], posicao_b[i]] = 1.0 if pares[posicao_a[i], posicao_b[i]] >= MINIMO_PARES else np.nan
+    return valores, medidas, pares
+
+
+# --- Matriz de associações: uma medida por par, escolhida pela natureza das variáveis ---
+# Com tamanho_bloco, a matriz é montada por blocos de variáveis (só os blocos acima da diagonal; a outra metade
+# é espelhada), calculados em paralelo numa pool de threads: os produtos de matrizes do NumPy liberam o GIL
+class MatrizAssociacoes:
+    def __init__(self, banco=None, nomes=(), tamanho_bloco=None, trabalhadores=None):
+        inicio = time.perf_counter()
+        self.blocos = 0
+        if banco is None:
+            return
+        variaveis = VariaveisCodificadas(banco, nomes)
+        m = len(variaveis)
+        if tamanho_bloco is None or m <= tamanho_bloco:
+            valores, medidas, pares = associar_blocos(variaveis, list(range(m)), list(range(m)))
+            self.blocos = 1
+        else:
+            valores = np.full((m, m), np.nan)
+            medidas = np.empty((m, m), dtype=object)
+            pares = np.zeros((m, m), dtype=np.int64)
+            fatias = [list(range(comeco, min(comeco + tamanho_bloco, m))) for comeco in range(0, m, tamanho_bloco)]
+            tarefas = [(a, b) for x, a in enumerate(fatias) for b in fatias[x:]]
+            with ThreadPoolExecutor(max_workers=trabalhadores or os.cpu_count() or 1,
+                                    thread_name_prefix='associacoes') as executor:
+                for (a, b), (bloco, medidas_bloco, pares_bloco) in zip(
+                        tarefas, executor.map(lambda tarefa: associar_blocos(variaveis, *tarefa), tarefas)):
+                    linhas, colunas = np.ix_(a, b)
+                    valores[linhas, colunas], valores[colunas.T, linhas.T] = bloco, bloco.T
+                    medidas[linhas, colunas], medidas[colunas.T, linhas.T] = medidas_bloco, medidas_bloco.T
+                    pares[linhas, colunas], pares[colunas.T, linhas.T] = pares_bloco, pares_bloco.T
+            self.blocos = len(tarefas)
+        self.naturezas = dict(zip(variaveis.nomes, variaveis.naturezas))
+        self.valores = pd.DataFrame(valores, index=variaveis.nomes, columns=variaveis.nomes)
+        self.medidas = pd.DataFrame(medidas, index=variaveis.nomes, columns=variaveis.nomes)
+        self.pares = pd.DataFrame(pares, index=variaveis.nomes, columns=variaveis.nomes)
+        self.tempo = time.perf_counter() - inicio
+        self._ordem = None
+        self._ranking = None
+
+    def legenda(self):
+        # Medida usada em cada par (fora da diagonal)
+        usadas = {}
+        nomes = list(self.medidas.index)
+        for a in range(len(nomes)):
+            for b in range(a + 1, len(nomes)):
+                usadas.setdefault(ROTULOS_MEDIDAS[self.medidas.iat[a, b]], []).append(f'{nomes[a]} × {nomes[b]}')
+        return usadas
+
+    def ordem(self):
+        # Ordem hierárquica (ligação média sobre 1 - |associação|): variáveis associadas ficam vizinhas no mapa de calor
+        if self._ordem is None:
+            m = len(self.valores)
+            if m < 3:
+                self._ordem = np.arange(m)
+            else:
+                distancia = 1 - np.nan_to_num(np.abs(self.valores.to_numpy()), nan=0.0)
+                distancia = (distancia + distancia.T) / 2
+                np.fill_diagonal(distancia, 0)
+                ligacao = linkage(squareform(np.clip(distancia, 0, 1), checks=False), method='average')
+                self._ordem = leaves_list(optimal_leaf_ordering(ligacao, squareform(np.clip(distancia, 0, 1), checks=False)))
+        return self._ordem
+
+    def ranking(self):
+        # Índice dos pares (acima da diagonal) do mais forte para o mais fraco, por |associação|
+        if self._ranking is None:
+            linhas, colunas = np.triu_indices(len(self.valores), k=1)
+            forca = np.abs(self.valores.to_numpy()[linhas, colunas])
+            validos = ~np.isnan(forca)
+            linhas, colunas, forca = linhas[validos], colunas[validos], forca[validos]
+            ordem = np.argsort(-forca, kind='stable')
+            self._ranking = np.column_stack([linhas[ordem], colunas[ordem]])
+        return self._ranking
+
+    def mais_fortes(self, k=20, variavel=None, permitidos=None, minimo_pares=MINIMO_PARES):
+        # k pares mais fortes (todos, ou só os que envolvem a variável), lidos do ranking sem reordenar.
+        # permitidos: matriz booleana dos pares aceitos (ex.: só os significativos)
+        nomes = self.valores.index
+        posicao = None if variavel is None else nomes.get_loc(variavel)
+        linhas = []
+        for a, b in self.ranking():
+            if self.pares.iat[a, b] < minimo_pares or (posicao is not None and posicao not in (a, b)):
+                continue
+            if permitidos is not None and not permitidos[a, b]:
+                continue
+            linhas.append({'Variável A': nomes[a], 'Variável B': nomes[b],
+                           'Medida': ROTULOS_MEDIDAS[self.medidas.iat[a, b]],
+                           'Associação': self.valores.iat[a, b], 'Participantes': int(self.pares.iat[a, b])})
+            if len(linhas) >= k:
+                break
+        return pd.DataFrame(linhas, columns=['Variável A', 'Variável B', 'Medida', 'Associação', 'Participantes'])
+
+    # --- Persistência: matriz, medidas, ordem hierárquica e ranking num .npz por impressão digital do recorte ---
+    # VERSAO_ARQUIVO vai no nome e dentro do arquivo: um .npz de outra versão do formato é recalculado, não lido
+    def salvar(self, caminho):
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        temporario = caminho + '.tmp.npz'
+        codigos_medidas = {medida: posicao for posicao, medida in enumerate(ROTULOS_MEDIDAS)}
+        np.savez_compressed(
+            temporario, nomes=np.array(self.valores.index, dtype=str), valores=self.valores.to_numpy(),
+            medidas=np.vectorize(codigos_medidas.get, otypes=[np.int8])(self.medidas.to_numpy()),
+            pares=self.pares.to_numpy(), naturezas=np.array([self.naturezas[nome] for nome in self.valores.index], dtype=str),
+            ordem=self.ordem(), ranking=self.ranking(), tempo=self.tempo, blocos=self.blocos, versao=VERSAO_ARQUIVO)
+        os.replace(temporario, caminho)
+
+    @classmethod
+    def carregar(cls, caminho):
+        matriz = cls()
+        with np.load(caminho) as dados:
+            if 'versao' not in dados or int(dados['versao']) != VERSAO_ARQUIVO:
+                raise ValueError(f'{caminho}: formato diferente da versão {VERSAO_ARQUIVO}')
+            nomes = list(dados['nomes'])
+            medidas = np.array(list(ROTULOS_MEDIDAS), dtype=object)[dados['medidas']]
+            matriz.valores = pd.DataFrame(dados['valores'], index=nomes, columns=nomes)
+            matriz.medidas = pd.DataFrame(medidas, index=nomes, columns=nomes)
+            matriz.pares = pd.DataFrame(dados['pares'], index=nomes, columns=nomes)
+            matriz.naturezas = dict(zip(nomes, dados['naturezas']))
+            matriz._ordem, matriz._ranking = dados['ordem'], dados['ranking']
+            matriz.tempo, matriz.blocos = float(dados['tempo']), int(dados['blocos'])
+        return matriz
+
+
+def calcular_associacoes(banco, nomes):
+    return MatrizAssociacoes(banco, nomes)
+
+
+# --- Questionário inteiro: todas as variáveis analisáveis, calculadas em blocos e guardadas em disco ---
+TAMANHO_BLOCO = 32
+PASTA_ASSOCIACOES = os.path.join(PASTA_SNAPSHOT, 'associacoes')
+# Recortes guardados em disco (os usados há mais tempo são apagados)
+MAXIMO_ARQUIVOS = 64
+
+
+def variaveis_do_questionario(banco):
+    return [coluna.nome for coluna in banco.esquema.colunas
+            if coluna.nome in banco and natureza_da_coluna(coluna, banco[coluna.nome]) is not None]
+
+
+def associacoes_do_questionario(banco, impressao, pasta=PASTA_ASSOCIACOES):
+    # Lida do disco quando o recorte (impressão digital) já foi calculado; devolve (matriz, lida do disco?)
+    caminho = os.path.join(pasta, f'{impressao}.v{VERSAO_ARQUIVO}.npz')
+    if os.path.exists(caminho):
+        try:
+            matriz = MatrizAssociacoes.carregar(caminho)
+        except (OSError, ValueError, KeyError):
+            pass
+        else:
+            # A data de modificação marca o último uso: os recortes lidos com frequência não são os primeiros apagados
+            try:
+                os.utime(caminho)
+            except OSError:
+                pass
+            return matriz, True
+    matriz = MatrizAssociacoes(banco, variaveis_do_questionario(banco), tamanho_bloco=TAMANHO_BLOCO)
+    try:
+        matriz.salvar(caminho)
+        guardados = sorted((os.path.join(pasta, nome) for nome in os.listdir(pasta) if nome.endswith('.npz')),
+                           key=os.path.getmtime)
+        for antigo in guardados[:-MAXIMO_ARQUIVOS]:
+            os.remove(antigo)
+    except OSError:
+        # Sem permissão de escrita (deploy só leitura): segue com a matriz calculada, sem cache em disco
+        pass
+    return matriz, False
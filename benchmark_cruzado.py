@@ -0,0 +1,79 @@
+import time
+
+import numpy as np
+
+from cruzado_banco import META_LATENCIA_MS, DimensoesCruzadas, FiltroCruzado
+
+# --- Benchmark do filtro cruzado (python benchmark_cruzado.py), fora do módulo carregado pelo dashboard ---
+# Banco sintético com as mesmas perguntas (número de categorias) dos gráficos de barras.
+# Escolha única: número de categorias de cada pergunta; múltipla escolha: número de opções de cada família
+CATEGORIAS_SINTETICAS = [6, 6, 7, 2, 2, 3, 6, 10, 8, 3, 2, 2, 2, 6, 4, 2, 3, 2, 4, 4, 4, 4, 4, 4, 4, 4, 2, 4, 2, 2,
+                         2, 2, 3, 2, 2, 2]
+OPCOES_SINTETICAS = [21, 19, 9]
+
+
+def dimensoes_sinteticas(n_linhas, semente=42):
+    gerador = np.random.default_rng(semente)
+    dimensoes = DimensoesCruzadas(n_linhas)
+    for i, k in enumerate(CATEGORIAS_SINTETICAS):
+        # Frequências desiguais entre as categorias e ~2% em branco, como nas respostas da planilha
+        probabilidades = gerador.dirichlet(np.ones(k + 1))
+        probabilidades[-1] = 0.02
+        codigos = gerador.choice(k + 1, size=n_linhas, p=probabilidades / probabilidades.sum())
+        dimensoes.adicionar_coluna(f'pergunta_{i}', np.where(codigos == k, -1, codigos), [f'c{j}' for j in range(k)])
+    for i, m in enumerate(OPCOES_SINTETICAS):
+        marcadas = gerador.random((n_linhas, m)) < gerador.uniform(0.02, 0.4, m)
+        dimensoes.adicionar_familia(f'familia_{i}', marcadas, [f'o{j}' for j in range(m)])
+    return dimensoes
+
+
+def contagens_de_referencia(dimensoes, selecoes):
+    # Cada pergunta contada nas linhas que passam em todos os outros filtros, pergunta a pergunta
+    passa = {id_pergunta: dimensoes.aceitas(id_pergunta, categorias) for id_pergunta, categorias in selecoes.items()
+             if categorias}
+    contagens = {}
+    for id_pergunta in dimensoes.categorias:
+        linhas = np.ones(dimensoes.n_linhas, dtype=bool)
+        for id_filtro, aceitas in passa.items():
+            if id_filtro != id_pergunta:
+                linhas &= aceitas
+        contagens[id_pergunta] = dimensoes.contar(id_pergunta, np.flatnonzero(linhas))
+    return contagens
+
+
+def medir(n_linhas=1_000_000, cliques=30, semente=42):
+    gerador = np.random.default_rng(semente)
+    inicio = time.perf_counter()
+    dimensoes = dimensoes_sinteticas(n_linhas, semente)
+    montagem = time.perf_counter() - inicio
+    filtro = FiltroCruzado(dimensoes)
+    ids = list(dimensoes.categorias)
+    selecoes, atualizacoes = {}, []
+    for _ in range(cliques):
+        # Clique: liga/desliga uma categoria de uma pergunta; a cada três cliques a seleção cresce em vez de trocar
+        id_pergunta = ids[gerador.integers(len(ids))]
+        categoria = dimensoes.categorias[id_pergunta][gerador.integers(len(dimensoes.categorias[id_pergunta]))]
+        atuais = set(selecoes.get(id_pergunta, ()))
+        atuais ^= {categoria}
+        selecoes[id_pergunta] = tuple(sorted(atuais))
+        if len([1 for valores in selecoes.values() if valores]) > 3:
+            selecoes.pop(next(iter(selecoes)))
+        atualizacoes.append(filtro.atualizar(selecoes))
+        referencia = contagens_de_referencia(dimensoes, selecoes)
+        divergentes = [id_p for id_p in ids if not np.array_equal(referencia[id_p], filtro.contagens[id_p])]
+        if divergentes:
+            raise RuntimeError(f'Contagens do filtro cruzado diferentes da referência: {divergentes}')
+    atualizacoes = np.array(atualizacoes) * 1000
+    return {
+        'linhas': n_linhas,
+        'perguntas': len(ids),
+        'montagem_s': round(montagem, 2),
+        'atualizacao_mediana_ms': round(float(np.median(atualizacoes)), 1),
+        'atualizacao_p95_ms': round(float(np.percentile(atualizacoes, 95)), 1),
+        'meta_ms': META_LATENCIA_MS,
+        'dentro_da_meta': bool(np.percentile(atualizacoes, 95) <= META_LATENCIA_MS),
+    }
+
+
+if __name__ == '__main__':
+    print(medir())
@@ -0,0 +1,252 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from esquema_banco import normalizar_coluna
+from ordinais_banco import CodificacaoOrdinal
+
+# --- Regras de compactação ---
+# Texto livre só vira categoria quando os valores se repetem bastante
+LIMITE_CARDINALIDADE = 0.5
+TIPO_NUMERICO = 'float32'
+# Demais textos ficam em buffers do Arrow em vez de um objeto Python por célula
+TIPO_TEXTO = 'string[pyarrow]'
+
+
+# Quantidade de bits ligados em cada valor de byte (popcount por tabela de consulta)
+POPCOUNT_BYTE = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+
+# --- Pergunta de múltipla escolha guardada como matriz de bits: uma linha de bits por opção, um bit por participante ---
+class FamiliaBits:
+    def __init__(self, nomes, marcadas):
+        self.nomes = list(nomes)
+        matriz = np.asarray(marcadas, dtype=bool)
+        self.n_linhas = matriz.shape[0]
+        self.bits = np.packbits(matriz.T, axis=1, bitorder='little')
+
+    @property
+    def nbytes(self):
+        return self.bits.nbytes
+
+    def matriz(self, linhas=None):
+        matriz = np.unpackbits(self.bits, axis=1, count=self.n_linhas, bitorder='little').T.astype(bool)
+        return matriz if linhas is None else matriz[linhas]
+
+    def _filtrar(self, mascara):
+        # mascara: linhas selecionadas já empacotadas em bits (BancoCompacto.mascara)
+        return self.bits if mascara is None else self.bits & mascara
+
+    def contagens(self, mascara=None):
+        # Participantes que marcaram cada opção
+        return POPCOUNT_BYTE[self._filtrar(mascara)].sum(axis=1).astype(np.int64)
+
+    def coocorrencia(self, mascara=None):
+        # Participantes que marcaram cada par de opções (diagonal = contagens)
+        bits = self._filtrar(mascara)
+        return POPCOUNT_BYTE[bits[:, None, :] & bits[None, :, :]].sum(axis=2).astype(np.int64)
+
+
+# --- Banco compacto sob demanda: cada coluna é tipada e compactada na primeira vez que uma aba a pede ---
+class BancoCompacto:
+    def __init__(self, origem, esquema):
+        # origem: banco cru com acesso por coluna (BancoColunar)
+        self.origem = origem
+        self.esquema = esquema
+        self.index = origem.index
+        self.columns = pd.Index([coluna.nome for coluna in esquema.colunas])
+        self.colunas = {}
+        self.familias = {}
+        # Tipo e bytes de cada coluna já tipada, antes da compactação (para o relatório de memória)
+        self.tipadas = {}
+        self._ordinais = None
+        self._trava = threading.RLock()
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, nome):
+        return nome in self.columns
+
+    def __getitem__(self, chave):
+        if isinstance(chave, str):
+            return self.serie(chave)
+        return pd.DataFrame({nome: self.serie(nome) for nome in chave}, index=self.index)
+
+    @property
+    def empty(self):
+        return len(self) == 0 or len(self.columns) == 0
+
+    @property
+    def nbytes(self):
+        return (sum(int(serie.memory_usage(deep=True, index=False)) for serie in self.colunas.values())
+                + sum(familia.nbytes for familia in self.familias.values()))
+
+    def _tipada(self, id_coluna):
+        # Coluna normalizada sem compactar (colunas calculadas partem do valor exato, ex.: IMC em float64)
+        coluna = self.esquema.coluna(id_coluna)
+        if coluna is None:
+            return None
+        bruta = self.origem[coluna.nome] if coluna.nome in self.origem else None
+        return normalizar_coluna(coluna, bruta, self._tipada)
+
+    def serie(self, nome):
+        coluna = self.esquema.por_nome[nome]
+        if coluna.familia:
+            familia = self._familia(coluna.familia)
+            marcadas = familia.matriz()[:, familia.nomes.index(nome)]
+            return pd.Series(marcadas, index=self.index, name=nome).astype('boolean')
+        serie = self.colunas.get(nome)
+        if serie is None:
+            with self._trava:
+                serie = self.colunas.get(nome)
+                if serie is None:
+                    tipada = self._tipada(coluna.id)
+                    self.tipadas[nome] = (str(tipada.dtype), int(tipada.memory_usage(deep=True, index=False)))
+                    serie = pd.Series(compactar_serie(tipada, coluna), index=self.index, name=nome)
+                    self.colunas[nome] = serie
+        return serie
+
+    def _familia(self, id_familia):
+        familia = self.familias.get(id_familia)
+        if familia is None and self.esquema.familia(id_familia):
+            with self._trava:
+                familia = self.familias.get(id_familia)
+                if familia is None:
+                    nomes = self.esquema.familia(id_familia)
+                    marcadas = []
+                    for nome in nomes:
+                        tipada = self._tipada(self.esquema.por_nome[nome].id)
+                        self.tipadas[nome] = (str(tipada.dtype), int(tipada.memory_usage(deep=True, index=False)))
+                        marcadas.append(tipada.fillna(False).to_numpy(dtype=bool))
+                    familia = FamiliaBits(nomes, np.column_stack(marcadas))
+                    self.familias[id_familia] = familia
+        return familia
+
+    def ordinais(self):
+        # Códigos ordinais das perguntas com ordem, cada uma codificada no primeiro uso e compartilhada pelos recortes
+        if self._ordinais is None:
+            with self._trava:
+                if self._ordinais is None:
+                    self._ordinais = CodificacaoOrdinal(self)
+        return self._ordinais
+
+    def codigos_ordinais(self, nome):
+        return self.ordinais().codigos_de(nome)
+
+    def mascara(self, index=None):
+        # Linhas de um recorte do banco empacotadas no mesmo formato das famílias
+        if index is None:
+            return None
+        return np.packbits(self.index.isin(index), bitorder='little')
+
+    def familia(self, id_familia, index=None):
+        # DataFrame booleano só com as linhas pedidas (index de um recorte do banco)
+        familia = self._familia(id_familia)
+        if familia is None:
+            return pd.DataFrame(index=self.index if index is None else index)
+        linhas = None if index is None else self.index.get_indexer(index)
+        return pd.DataFrame(familia.matriz(linhas), columns=familia.nomes,
+                            index=self.index if index is None else index)
+
+    def prevalencia(self, id_familia, index=None):
+        # Contagem de 'Sim' por opção, sem desempacotar a matriz
+        familia = self._familia(id_familia)
+        if familia is None:
+            return pd.Series(dtype='int64')
+        return pd.Series(familia.contagens(self.mascara(index)), index=familia.nomes)
+
+    def coocorrencia(self, id_familia, index=None):
+        familia = self._familia(id_familia)
+        if familia is None:
+            return pd.DataFrame(dtype='int64')
+        return pd.DataFrame(familia.coocorrencia(self.mascara(index)), index=familia.nomes, columns=familia.nomes)
+
+    def recorte(self, index):
+        return RecorteBanco(self, index)
+
+    def para_dataframe(self, index=None):
+        # Quadro completo na ordem da planilha (usado pelos modelos, que varrem todas as colunas)
+        index = self.index if index is None else index
+        partes = {}
+        for coluna in self.esquema.colunas:
+            if coluna.familia:
+                if coluna.familia not in partes:
+                    partes[coluna.familia] = self.familia(coluna.familia, index).astype('boolean')
+            else:
+                partes[coluna.nome] = self.serie(coluna.nome).loc[index]
+        return pd.concat(partes.values(), axis=1)[self.columns]
+
+
+# --- Recorte do banco (linhas escolhidas nos filtros): mesmo acesso por coluna, sem copiar o banco ---
+class RecorteBanco:
+    def __init__(self, banco, index):
+        self.banco = banco
+        self.esquema = banco.esquema
+        self.index = index
+        self.columns = banco.columns
+        self._linhas = banco.index.get_indexer(index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, nome):
+        return nome in self.columns
+
+    def __getitem__(self, chave):
+        if isinstance(chave, str):
+            return self.banco.serie(chave).iloc[self._linhas]
+        return pd.DataFrame({nome: self[nome] for nome in chave}, index=self.index)
+
+    @property
+    def empty(self):
+        return len(self) == 0 or len(self.columns) == 0
+
+    def ordinais(self):
+        return self.banco.ordinais()
+
+    def codigos_ordinais(self, nome):
+        return self.banco.ordinais().codigos_de(nome, self._linhas)
+
+
+def compactar_serie(serie, coluna):
+    if coluna.tipo == 'numerica':
+        return serie.astype(TIPO_NUMERICO)
+    if coluna.tipo == 'categorica' and serie.dtype != 'category':
+        # Só as categorias observadas, em ordem alfabética: tabelas cruzadas e ordenações saem como no texto original
+        return pd.Categorical(serie, categories=sorted(serie.dropna().unique(), key=str))
+    if coluna.tipo == 'texto' and serie.dtype == object:
+        preenchidos = serie.notna().sum()
+        if preenchidos and serie.nunique() < LIMITE_CARDINALIDADE * preenchidos:
+            return serie.astype('category')
+        return serie.astype(TIPO_TEXTO)
+    return serie
+
+
+# --- Relatório de memória por coluna carregada: coluna tipada x banco compacto ---
+def relatorio_memoria(banco):
+    linhas = []
+    for col in banco.columns:
+        if col not in banco.tipadas:
+            continue
+        coluna = banco.esquema.por_nome[col]
+        if coluna.familia:
+            familia = banco.familias[coluna.familia]
+            # A matriz de bits é dividida igualmente entre as opções da família
+            depois = familia.nbytes / len(familia.nomes)
+            tipo_depois = f'bits ({coluna.familia})'
+        else:
+            depois = banco.colunas[col].memory_usage(deep=True, index=False)
+            tipo_depois = str(banco.colunas[col].dtype)
+        tipo_antes, bytes_antes = banco.tipadas[col]
+        linhas.append({
+            'Coluna': col,
+            'Tipo antes': tipo_antes,
+            'Tipo depois': tipo_depois,
+            'Bytes antes': bytes_antes,
+            'Bytes depois': int(round(depois)),
+        })
+    relatorio = pd.DataFrame(linhas, columns=['Coluna', 'Tipo antes', 'Tipo depois', 'Bytes antes', 'Bytes depois'])
+    relatorio['Redução (x)'] = (relatorio['Bytes antes'] / relatorio['Bytes depois'].clip(lower=1)).round(1)
+    return relatorio
@@ -0,0 +1,182 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from cubo_banco import codificar
+
+# --- Filtro cruzado: clicar numa barra filtra todos os outros gráficos da página ---
+# Cada gráfico mostra as linhas que passam nos filtros dos demais (o próprio filtro não o esvazia).
+# Meta: atualizar as contagens de todos os gráficos em até 100 ms por clique num banco de 1 milhão de linhas
+META_LATENCIA_MS = 100
+# Recorte da barra lateral: entra como mais um filtro, sem gráfico próprio
+RECORTE = '__recorte__'
+# Até quantas perguntas de escolha única são contadas coluna a coluna (acima disso, num bloco só)
+POUCAS_PERGUNTAS = 4
+
+
+# --- Dimensões: códigos por linha de cada pergunta, montados uma vez e compartilhados por todas as sessões ---
+class DimensoesCruzadas:
+    def __init__(self, n_linhas):
+        self.n_linhas = n_linhas
+        self.categorias = {}
+        # Escolha única: código por linha (k = em branco); múltipla escolha: matriz de opções marcadas
+        self.codigos = {}
+        self.marcadas = {}
+        # Códigos de escolha única lado a lado (uma linha por participante): um único gather por atualização
+        self._matriz = None
+
+    def __contains__(self, id_pergunta):
+        return id_pergunta in self.categorias
+
+    def adicionar_coluna(self, id_pergunta, codigos, categorias):
+        k = len(categorias)
+        codigos = np.where(codigos < 0, k, codigos)
+        self.codigos[id_pergunta] = codigos.astype(np.min_scalar_type(k))
+        self.categorias[id_pergunta] = list(categorias)
+        self._matriz = None
+
+    def adicionar_familia(self, id_pergunta, marcadas, opcoes):
+        self.marcadas[id_pergunta] = np.asarray(marcadas, dtype=bool)
+        self.categorias[id_pergunta] = list(opcoes)
+
+    def contar(self, id_pergunta, linhas=None):
+        # Contagem por categoria (escolha única: última posição = em branco) nas linhas pedidas
+        return self.contar_varias([id_pergunta], linhas)[id_pergunta]
+
+    @property
+    def matriz(self):
+        # Códigos de escolha única lado a lado, já deslocados para uma numeração única de categorias
+        if self._matriz is None:
+            ids = list(self.codigos)
+            tamanhos = [len(self.categorias[id_pergunta]) + 1 for id_pergunta in ids]
+            inicios = np.concatenate([[0], np.cumsum(tamanhos)[:-1]]).astype(np.int64)
+            total = int(sum(tamanhos))
+            matriz = (np.column_stack([self.codigos[id_pergunta] for id_pergunta in ids]).astype(np.int64) + inicios
+                      if ids else np.zeros((self.n_linhas, 0), dtype=np.int64))
+            self._matriz = (ids, matriz.astype(np.min_scalar_type(max(total - 1, 0))), inicios, total)
+        return self._matriz
+
+    def contar_varias(self, ids, linhas=None):
+        # Escolha única: um único bincount sobre as linhas pedidas para todas as perguntas de uma vez
+        contagens = {}
+        for id_pergunta in ids:
+            if id_pergunta in self.marcadas:
+                marcadas = self.marcadas[id_pergunta] if linhas is None else self.marcadas[id_pergunta][linhas]
+                contagens[id_pergunta] = marcadas.sum(axis=0, dtype=np.int64)
+        unicas = [id_pergunta for id_pergunta in ids if id_pergunta in self.codigos]
+        if len(unicas) <= POUCAS_PERGUNTAS:
+            # Poucas perguntas: a coluna de cada uma sai mais barata que o bloco inteiro
+            for id_pergunta in unicas:
+                codigos = self.codigos[id_pergunta] if linhas is None else self.codigos[id_pergunta][linhas]
+                contagens[id_pergunta] = np.bincount(codigos, minlength=len(self.categorias[id_pergunta]) + 1).astype(np.int64)
+        else:
+            todas, matriz, inicios, total = self.matriz
+            bloco = matriz if linhas is None else matriz[linhas]
+            contagem = np.bincount(bloco.ravel(), minlength=total).astype(np.int64)
+            for id_pergunta, inicio in zip(todas, inicios):
+                if id_pergunta in ids:
+                    contagens[id_pergunta] = contagem[inicio:inicio + len(self.categorias[id_pergunta]) + 1]
+        return contagens
+
+    def aceitas(self, id_pergunta, categorias):
+        # Linhas que passam no filtro: qualquer uma das categorias (None = em branco) ou opções marcadas
+        valores = self.categorias[id_pergunta]
+        if id_pergunta in self.marcadas:
+            posicoes = [valores.index(categoria) for categoria in categorias if categoria in valores]
+            return self.marcadas[id_pergunta][:, posicoes].any(axis=1)
+        aceitos = np.zeros(len(valores) + 1, dtype=bool)
+        aceitos[[len(valores) if categoria is None else valores.index(categoria)
+                 for categoria in categorias if categoria is None or categoria in valores]] = True
+        return aceitos[self.codigos[id_pergunta]]
+
+
+def dimensoes_do_banco(banco, perguntas):
+    dimensoes = DimensoesCruzadas(len(banco))
+    for id_pergunta in perguntas:
+        if banco.esquema.familia(id_pergunta):
+            dimensoes.adicionar_familia(id_pergunta, banco.familia(id_pergunta).to_numpy(dtype=bool),
+                                        banco.esquema.familia(id_pergunta))
+        elif id_pergunta in banco.esquema:
+            dimensoes.adicionar_coluna(id_pergunta, *codificar(banco[banco.esquema[id_pergunta]]))
+    return dimensoes
+
+
+# --- Estado de uma sessão: filtros ativos e contagens refeitas quando algum filtro muda ---
+# falhas[linha] = em quantos filtros a linha não passa. Uma linha entra no gráfico d quando não falha em nenhum
+# filtro ou falha só no filtro de d. Os gráficos sem filtro próprio são contados juntos, num único bincount.
+# (Uma versão que recontava só as linhas que trocaram de lado ficou dentro do ruído do recálculo em 1 milhão de linhas)
+class FiltroCruzado:
+    def __init__(self, dimensoes):
+        self.dimensoes = dimensoes
+        self.selecoes = {}
+        self.passa = {}
+        self.falhas = np.zeros(dimensoes.n_linhas, dtype=np.uint8)
+        self.contagens = dimensoes.contar_varias(list(dimensoes.categorias))
+        self.totais = {id_pergunta: dimensoes.n_linhas for id_pergunta in dimensoes.categorias}
+        # Duração da última atualização (segundos)
+        self.tempo = 0.0
+
+    def __contains__(self, id_pergunta):
+        return id_pergunta in self.dimensoes
+
+    def _definir(self, id_filtro, passa):
+        # passa: linhas aceitas pelo filtro (None = sem filtro); devolve se o filtro mudou
+        if passa is None:
+            return self.passa.pop(id_filtro, None) is not None
+        antes = self.passa.get(id_filtro)
+        if antes is not None and np.array_equal(antes, passa):
+            return False
+        self.passa[id_filtro] = passa
+        return True
+
+    def atualizar(self, selecoes, recorte=None):
+        # selecoes: {id da pergunta: categorias clicadas}; recorte: máscara booleana da barra lateral (None = banco inteiro).
+        # As contagens só são refeitas quando algum filtro mudou
+        inicio = time.perf_counter()
+        mudou = self._definir(RECORTE, None if recorte is None else np.asarray(recorte, dtype=bool))
+        selecoes = {id_pergunta: tuple(categorias) for id_pergunta, categorias in selecoes.items()
+                    if categorias and id_pergunta in self.dimensoes}
+        for id_pergunta in set(self.selecoes) | set(selecoes):
+            if self.selecoes.get(id_pergunta) != selecoes.get(id_pergunta):
+                categorias = selecoes.get(id_pergunta)
+                mudou |= self._definir(id_pergunta,
+                                       None if categorias is None else self.dimensoes.aceitas(id_pergunta, categorias))
+        self.selecoes = selecoes
+        if mudou:
+            self.recalcular()
+        self.tempo = time.perf_counter() - inicio
+        return self.tempo
+
+    def recalcular(self):
+        falhas = np.zeros(self.dimensoes.n_linhas, dtype=np.uint8)
+        for passa in self.passa.values():
+            falhas += ~passa
+        livres = [id_pergunta for id_pergunta in self.dimensoes.categorias if id_pergunta not in self.passa]
+        linhas = np.flatnonzero(falhas == 0) if self.passa else None
+        contagens = self.dimensoes.contar_varias(livres, linhas)
+        total = self.dimensoes.n_linhas if linhas is None else len(linhas)
+        totais = {id_pergunta: total for id_pergunta in livres}
+        # Gráficos com filtro próprio: a linha também entra quando só falha nesse filtro
+        for id_pergunta, passa_d in self.passa.items():
+            if id_pergunta in self.dimensoes:
+                linhas_d = np.flatnonzero(falhas == ~passa_d)
+                contagens[id_pergunta] = self.dimensoes.contar(id_pergunta, linhas_d)
+                totais[id_pergunta] = len(linhas_d)
+        self.falhas, self.contagens, self.totais = falhas, contagens, totais
+        return contagens
+
+    def linhas(self):
+        # Linhas que passam em todos os filtros (recorte da barra lateral e seleções)
+        return self.falhas == 0
+
+    def total(self, id_pergunta):
+        return self.totais[id_pergunta]
+
+    def distribuicao(self, id_pergunta):
+        # (contagem por categoria, em branco), no mesmo formato do cubo de contagens
+        contagem = self.contagens[id_pergunta]
+        categorias = pd.Index(self.dimensoes.categorias[id_pergunta], dtype=object)
+        if id_pergunta in self.dimensoes.marcadas:
+            return pd.Series(contagem, index=categorias), 0
+        return pd.Series(contagem[:-1], index=categorias), int(contagem[-1])
@@ -0,0 +1,140 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# --- Cubo de contagens: perguntas categóricas cruzadas com os estratificadores comuns ---
+# Os estratos são montados na carga (só as colunas dos estratificadores); a contagem de cada pergunta é feita na
+# primeira vez que um gráfico a pede e fica guardada. Distribuições e tabelas cruzadas saem das contagens, sem
+# reler as linhas do banco, e a carga não converte as colunas que nenhuma aba consulta
+ESTRATIFICADORES = ('sexo', 'faixa_etaria', 'instituicao', 'renda_familiar')
+TIPOS_PERGUNTA = ('categorica', 'sim_nao')
+
+
+def codificar(serie):
+    # Códigos 0..k-1 por categoria (-1 = em branco) e a lista de categorias
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.cat.codes.to_numpy().astype(np.int64), list(serie.cat.categories)
+    codigos, categorias = pd.factorize(serie, sort=True)
+    return codigos.astype(np.int64), list(categorias)
+
+
+class CuboContagens:
+    def __init__(self, banco, estratificadores=ESTRATIFICADORES):
+        inicio = time.perf_counter()
+        esquema = banco.esquema
+        self.estratificadores = [id_estrato for id_estrato in estratificadores if id_estrato in esquema]
+        self.categorias = {}
+        self.nomes = {}
+        # id da pergunta -> matriz estratos × categorias; perguntas de escolha única têm uma coluna a mais (em branco)
+        self.contagens = {}
+        self.familias = set()
+        self.banco = banco
+        self._trava = threading.Lock()
+
+        # Estratos: combinações observadas dos estratificadores (código 0 = em branco), no máximo uma por participante
+        codigos = []
+        for id_estrato in self.estratificadores:
+            codigo, categorias = codificar(banco[esquema[id_estrato]])
+            self.categorias[id_estrato] = categorias
+            self.nomes[id_estrato] = esquema[id_estrato]
+            codigos.append(codigo + 1)
+        combinacoes = np.column_stack(codigos) if codigos else np.zeros((len(banco), 0), dtype=np.int64)
+        estratos, estrato_da_linha = np.unique(combinacoes, axis=0, return_inverse=True)
+        estrato_da_linha = estrato_da_linha.ravel()
+        n_estratos = len(estratos)
+        # Menor inteiro sem sinal que comporta o total de participantes
+        self.tipo = np.min_scalar_type(len(banco))
+        self.estratos = estratos.astype(np.min_scalar_type(max(estratos.max(initial=0), 1)))
+        self.tamanhos = np.bincount(estrato_da_linha, minlength=n_estratos).astype(self.tipo)
+        self._estrato_da_linha = estrato_da_linha
+        # Perguntas já consultadas que ficaram fora do cubo (texto livre, datas, números)
+        self._fora = set()
+        self.tempo = time.perf_counter() - inicio
+
+    def _contagem(self, id_pergunta):
+        # Matriz estratos × categorias da pergunta, contada na primeira consulta (None = pergunta fora do cubo)
+        contagem = self.contagens.get(id_pergunta)
+        if contagem is not None or id_pergunta in self._fora:
+            return contagem
+        with self._trava:
+            if id_pergunta not in self.contagens and id_pergunta not in self._fora:
+                inicio = time.perf_counter()
+                self._contar(id_pergunta)
+                self.tempo += time.perf_counter() - inicio
+        return self.contagens.get(id_pergunta)
+
+    def _contar(self, id_pergunta):
+        esquema, banco = self.banco.esquema, self.banco
+        n_estratos = len(self.estratos)
+        if id_pergunta in esquema.familias:
+            # Múltipla escolha: 'Sim' por opção em cada estrato (uma coluna por opção, sem coluna de em branco)
+            marcadas = banco.familia(id_pergunta).to_numpy(dtype=bool)
+            contagem = [np.bincount(self._estrato_da_linha, weights=marcadas[:, j], minlength=n_estratos)
+                        for j in range(marcadas.shape[1])]
+            self.contagens[id_pergunta] = np.column_stack(contagem).astype(self.tipo)
+            self.categorias[id_pergunta] = esquema.familia(id_pergunta)
+            self.nomes[id_pergunta] = esquema.enunciados.get(id_pergunta, id_pergunta)
+            self.familias.add(id_pergunta)
+            return
+        coluna = esquema.coluna(id_pergunta)
+        if coluna is None or coluna.familia or coluna.tipo not in TIPOS_PERGUNTA + ('texto',):
+            self._fora.add(id_pergunta)
+            return
+        serie = banco[coluna.nome]
+        # Texto só entra quando a compactação o guardou como categoria (ex.: Classificação IMC, Instituição)
+        if coluna.tipo == 'texto' and not isinstance(serie.dtype, pd.CategoricalDtype):
+            self._fora.add(id_pergunta)
+            return
+        codigo, categorias = codificar(serie)
+        k = len(categorias)
+        codigo = np.where(codigo < 0, k, codigo)
+        contagem = np.bincount(self._estrato_da_linha * (k + 1) + codigo, minlength=n_estratos * (k + 1))
+        self.contagens[id_pergunta] = contagem.reshape(n_estratos, k + 1).astype(self.tipo)
+        self.categorias[id_pergunta] = categorias
+        self.nomes[id_pergunta] = coluna.nome
+
+    def __contains__(self, id_pergunta):
+        return self._contagem(id_pergunta) is not None
+
+    @property
+    def nbytes(self):
+        return self.estratos.nbytes + self.tamanhos.nbytes + sum(matriz.nbytes for matriz in self.contagens.values())
+
+    def _selecao(self, filtros=None):
+        # filtros: {id do estratificador: categorias aceitas} -> estratos que entram no recorte
+        selecao = np.ones(len(self.estratos), dtype=bool)
+        for id_estrato, aceitas in (filtros or {}).items():
+            categorias = self.categorias[id_estrato]
+            codigos = [categorias.index(valor) + 1 for valor in aceitas if valor in categorias]
+            selecao &= np.isin(self.estratos[:, self.estratificadores.index(id_estrato)], codigos)
+        return selecao
+
+    def total(self, filtros=None):
+        return int(self.tamanhos[self._selecao(filtros)].sum(dtype=np.int64))
+
+    def distribuicao(self, id_pergunta, filtros=None):
+        # (contagem por categoria, células em branco) dentro do recorte
+        contagem = self._contagem(id_pergunta)[self._selecao(filtros)].sum(axis=0, dtype=np.int64)
+        categorias = pd.Index(self.categorias[id_pergunta], dtype=object)
+        if id_pergunta in self.familias:
+            return pd.Series(contagem, index=categorias), 0
+        return pd.Series(contagem[:-1], index=categorias), int(contagem[-1])
+
+    def cruzamento(self, id_estrato, id_pergunta, filtros=None):
+        # Tabela cruzada estratificador × pergunta, como pd.crosstab (sem em branco nem linhas/colunas zeradas)
+        selecao = self._selecao(filtros)
+        codigos = self.estratos[selecao, self.estratificadores.index(id_estrato)].astype(np.int64)
+        contagem = self._contagem(id_pergunta)[selecao].astype(np.int64)
+        if id_pergunta not in self.familias:
+            contagem = contagem[:, :-1]
+        tabela = np.zeros((len(self.categorias[id_estrato]) + 1, contagem.shape[1]), dtype=np.int64)
+        np.add.at(tabela, codigos, contagem)
+        tabela = pd.DataFrame(tabela[1:], index=pd.Index(self.categorias[id_estrato], dtype=object, name=self.nomes[id_estrato]),
+                              columns=pd.Index(self.categorias[id_pergunta], dtype=object, name=self.nomes[id_pergunta]))
+        return tabela.loc[tabela.sum(axis=1) > 0, tabela.sum(axis=0) > 0]
+
+
+def construir_cubo(banco):
+    return CuboContagens(banco)
@@ -0,0 +1,293 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+# --- Configurações do banco e do snapshot colunar ---
+ARQUIVO_BANCO = 'Banco_SD.xlsx'
+ABA_DADOS = 'Banco original'
+ABA_DICIONARIO = 'Dicionário'
+PASTA_SNAPSHOT = '.cache_banco'
+COLUNA_ID = 'ID'
+COLUNA_INSTITUICAO = 'Instituição'
+
+
+# --- Hash do conteúdo da planilha (chave do snapshot) ---
+def hash_arquivo(caminho, tamanho_bloco=1 << 20):
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(tamanho_bloco), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+# --- Ajuste de tipos para o formato colunar ---
+def preparar_para_arrow(df):
+    # Algumas colunas da planilha misturam números/datas com texto (ex.: 'ID', 'Quantos irmãos o participante possui').
+    # O Arrow exige um único tipo por coluna, então essas colunas são gravadas como texto (mantendo os vazios).
+    df = df.copy()
+    for col in df.columns[df.dtypes == object]:
+        tipos = set(map(type, df[col].dropna()))
+        if len(tipos) > 1:
+            df[col] = df[col].map(lambda valor: valor if pd.isna(valor) else str(valor))
+    return df
+
+
+def caminhos_snapshot(sha, pasta=PASTA_SNAPSHOT, sufixo=''):
+    base = os.path.join(pasta, sha + sufixo)
+    return base + '.feather', base + '.json'
+
+
+def salvar_snapshot(dados, sha, tempo_excel, pasta=PASTA_SNAPSHOT, sufixo='', **meta):
+    # dados: DataFrame ou pyarrow.Table
+    os.makedirs(pasta, exist_ok=True)
+    arquivo_dados, arquivo_meta = caminhos_snapshot(sha, pasta, sufixo)
+
+    # Sem compressão para que a leitura possa mapear o arquivo direto na memória
+    temporario = arquivo_dados + '.tmp'
+    feather.write_feather(dados, temporario, compression='uncompressed')
+    os.replace(temporario, arquivo_dados)
+    with open(arquivo_meta, 'w', encoding='utf-8') as arquivo:
+        json.dump({'sha256': sha, 'tempo_excel': tempo_excel, 'linhas': len(dados), 'colunas': dados.shape[1], **meta},
+                  arquivo, ensure_ascii=False)
+
+
+def ler_meta(sha, pasta=PASTA_SNAPSHOT):
+    try:
+        with open(caminhos_snapshot(sha, pasta)[1], encoding='utf-8') as arquivo:
+            meta = json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+    # Snapshots antigos têm uma única parte, a da própria versão
+    meta.setdefault('partes', [sha])
+    return meta
+
+
+def limpar_snapshots(partes, pasta=PASTA_SNAPSHOT):
+    # Remove arquivos de versões da planilha que não fazem parte do banco atual
+    for nome in os.listdir(pasta):
+        if not nome.startswith(tuple(partes)) and os.path.isfile(os.path.join(pasta, nome)):
+            os.remove(os.path.join(pasta, nome))
+
+
+# --- Banco em partes: a leitura completa da planilha + uma parte por ingestão incremental (só as linhas novas) ---
+def abrir_partes(partes, pasta=PASTA_SNAPSHOT):
+    tabelas = [feather.read_table(caminhos_snapshot(parte, pasta)[0], memory_map=True) for parte in partes]
+    return tabelas[0] if len(tabelas) == 1 else pa.concat_tables(tabelas)
+
+
+def contar_parte(tabela):
+    # Contagens mantidas por parte: somadas entre as partes, não precisam ser refeitas quando chegam linhas novas
+    instituicoes = {}
+    if COLUNA_INSTITUICAO in tabela.column_names:
+        instituicoes = tabela.column(COLUNA_INSTITUICAO).to_pandas().value_counts()
+        instituicoes = {str(nome): int(total) for nome, total in instituicoes.items()}
+    return {
+        'preenchidas': {nome: tabela.num_rows - tabela.column(nome).null_count for nome in tabela.column_names},
+        'por_instituicao': instituicoes,
+    }
+
+
+def lotes_do_banco(partes, pasta=PASTA_SNAPSHOT, tabelas=None):
+    # Um lote por parte, na ordem de ingestão, com as contagens gravadas no meta de cada parte
+    lotes = []
+    for numero, parte in enumerate(partes, start=1):
+        meta = ler_meta(parte, pasta) or {}
+        contagens = meta.get('contagens')
+        if contagens is None:
+            tabela = tabelas[parte] if tabelas else feather.read_table(caminhos_snapshot(parte, pasta)[0], memory_map=True)
+            contagens = contar_parte(tabela)
+        lotes.append({'lote': numero, 'sha256': parte, 'linhas': meta.get('linhas'), **contagens})
+    return lotes
+
+
+def instituicoes_por_lote(lotes):
+    # Tabela cruzada Instituição x lote montada só com as contagens mantidas (sem ler linhas)
+    tabela = pd.DataFrame({f"Lote {lote['lote']}": pd.Series(lote['por_instituicao'], dtype='int64') for lote in lotes})
+    tabela = tabela.fillna(0).astype('int64')
+    tabela['Total'] = tabela.sum(axis=1)
+    return tabela.sort_values('Total', ascending=False, kind='stable')
+
+
+def preenchimento_por_coluna(lotes):
+    return pd.DataFrame([lote['preenchidas'] for lote in lotes]).sum().astype('int64')
+
+
+def ids_como_texto(valores):
+    return [None if pd.isna(valor) else str(valor) for valor in valores]
+
+
+def converter_linhas(linhas, esquema):
+    # Linhas da planilha no esquema já gravado (None quando algum tipo não cabe nele)
+    linhas = preparar_para_arrow(linhas.reset_index(drop=True))
+    for campo in esquema:
+        serie = linhas[campo.name]
+        if serie.isna().all():
+            # Coluna vazia nessas linhas (lida como float): nulos do tipo já gravado
+            linhas[campo.name] = pd.Series([None] * len(serie), index=serie.index, dtype=object)
+        elif pa.types.is_string(campo.type) or pa.types.is_large_string(campo.type):
+            # Colunas que viraram texto no snapshot continuam texto; números inteiros lidos como float
+            # (a coluna só tem números nessas linhas) são escritos como na leitura completa ('3', não '3.0')
+            linhas[campo.name] = serie.map(lambda valor: valor if pd.isna(valor) else
+                                           str(int(valor)) if isinstance(valor, float) and valor.is_integer() else str(valor))
+    try:
+        tabela = pa.Table.from_pandas(linhas, schema=esquema, preserve_index=False)
+    except (pa.ArrowException, TypeError, ValueError):
+        return None
+    return tabela.replace_schema_metadata(esquema.metadata)
+
+
+def ler_linhas_novas(planilha, tabela_antiga):
+    # Linhas novas = as que vêm depois das já gravadas, desde que as linhas antigas continuem iguais no início
+    # da planilha (a coleta só acrescenta respostas). Retorna None quando a planilha mudou de outro jeito
+    # (inclusive uma resposta já gravada corrigida). O xlsx não tem índice de linhas, então a planilha inteira
+    # já foi lida; as linhas antigas só são convertidas para a comparação.
+    ids_antigos = ids_como_texto(tabela_antiga.column(COLUNA_ID).to_pylist())
+    if list(planilha.columns) != tabela_antiga.column_names:
+        return None
+    if ids_como_texto(planilha[COLUNA_ID].iloc[:len(ids_antigos)]) != ids_antigos:
+        return None
+    antigas = converter_linhas(planilha.iloc[:len(ids_antigos)], tabela_antiga.schema)
+    if antigas is None or not antigas.equals(tabela_antiga):
+        return None
+
+    # Tipo incompatível com o já gravado (ex.: coluna até então vazia): None, refaz a leitura completa
+    return converter_linhas(planilha.iloc[len(ids_antigos):], tabela_antiga.schema)
+
+
+# --- Banco sob demanda: cada coluna só é convertida para pandas na primeira vez que é pedida ---
+class BancoColunar:
+    def __init__(self, tabela, lotes=None):
+        # tabela: pyarrow.Table, normalmente mapeada do snapshot (nada é lido do disco até ser usado)
+        self.tabela = tabela
+        self.lotes = lotes or []
+        self.columns = pd.Index(tabela.column_names)
+        self.index = pd.RangeIndex(tabela.num_rows)
+        self._series = {}
+        self._trava = threading.Lock()
+
+    def __len__(self):
+        return self.tabela.num_rows
+
+    def __contains__(self, nome):
+        return nome in self.columns
+
+    def __getitem__(self, chave):
+        if isinstance(chave, str):
+            return self.coluna(chave)
+        return pd.DataFrame({nome: self.coluna(nome) for nome in chave}, index=self.index)
+
+    @property
+    def empty(self):
+        return len(self) == 0 or len(self.columns) == 0
+
+    def coluna(self, nome):
+        serie = self._series.get(nome)
+        if serie is None:
+            with self._trava:
+                serie = self._series.get(nome)
+                if serie is None:
+                    # Mesma conversão da leitura completa (usa os metadados do pandas gravados no snapshot)
+                    serie = self.tabela.select([nome]).to_pandas()[nome]
+                    self._series[nome] = serie
+        return serie
+
+    def colunas_carregadas(self):
+        return list(self._series)
+
+
+# --- Leitura do banco: snapshot colunar se a planilha não mudou; se só ganhou linhas, ingere apenas as novas ---
+def ler_banco(caminho=ARQUIVO_BANCO, pasta=PASTA_SNAPSHOT, incremental=True):
+    # incremental=False força a leitura completa (respostas já gravadas e corrigidas na planilha são detectadas)
+    tempos = {'linhas_novas': 0}
+
+    inicio = time.perf_counter()
+    sha = hash_arquivo(caminho)
+    tempos['hash'] = time.perf_counter() - inicio
+    tempos['sha256'] = sha
+
+    meta = ler_meta(sha, pasta)
+    if meta and all(os.path.exists(caminhos_snapshot(parte, pasta)[0]) for parte in meta['partes']):
+        inicio = time.perf_counter()
+        tabela = abrir_partes(meta['partes'], pasta)
+        tempos['snapshot'] = time.perf_counter() - inicio
+        tempos['origem'] = 'snapshot'
+        tempos['excel'] = meta.get('tempo_excel')
+        return BancoColunar(tabela, lotes_do_banco(meta['partes'], pasta)), tempos
+
+    # Versão anterior mais recente do banco (a planilha mudou desde a última leitura)
+    anterior = None
+    if incremental and os.path.isdir(pasta):
+        versoes = sorted((nome for nome in os.listdir(pasta) if nome.endswith('.json') and nome.count('.') == 1),
+                         key=lambda nome: os.path.getmtime(os.path.join(pasta, nome)))
+        for nome in reversed(versoes):
+            meta = ler_meta(nome[:-len('.json')], pasta)
+            if meta and all(os.path.exists(caminhos_snapshot(parte, pasta)[0]) for parte in meta['partes']):
+                anterior = meta
+                break
+
+    inicio = time.perf_counter()
+    planilha = pd.read_excel(caminho, sheet_name=ABA_DADOS)
+    tempos['excel'] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    partes = [sha]
+    tabela = tabela_antiga = None
+    if anterior:
+        tabela_antiga = abrir_partes(anterior['partes'], pasta)
+        tabela = ler_linhas_novas(planilha, tabela_antiga)
+        if tabela is not None:
+            tempos['origem'] = 'incremental'
+            partes = anterior['partes'] + [sha]
+        else:
+            tabela_antiga = None
+    if tabela is None:
+        tabela = pa.Table.from_pandas(preparar_para_arrow(planilha), preserve_index=False)
+        tempos['origem'] = 'excel'
+    tempos['conversao'] = time.perf_counter() - inicio
+    tempos['linhas_novas'] = tabela.num_rows
+
+    inicio = time.perf_counter()
+    contagens = contar_parte(tabela)
+    tempos['contagens'] = time.perf_counter() - inicio
+
+    try:
+        inicio = time.perf_counter()
+        salvar_snapshot(tabela, sha, tempos['excel'], pasta, partes=partes, contagens=contagens)
+        limpar_snapshots(partes, pasta)
+        tempos['gravacao_snapshot'] = time.perf_counter() - inicio
+        tabela_completa = abrir_partes(partes, pasta)
+        lotes = lotes_do_banco(partes, pasta)
+    except OSError:
+        # Sem permissão de escrita: segue sem cache em disco, com a tabela em memória
+        tabela_completa = tabela if tabela_antiga is None else pa.concat_tables([tabela_antiga, tabela])
+        lotes = lotes_do_banco(partes[:-1], pasta) + [
+            {'lote': len(partes), 'sha256': sha, 'linhas': tabela.num_rows, **contagens}]
+    return BancoColunar(tabela_completa, lotes), tempos
+
+
+# --- Aba 'Dicionário': enunciados e códigos das respostas, com o mesmo snapshot da aba de dados ---
+def ler_dicionario(caminho=ARQUIVO_BANCO, pasta=PASTA_SNAPSHOT, sha=None):
+    sha = sha or hash_arquivo(caminho)
+    arquivo_dados, _ = caminhos_snapshot(sha, pasta, '.dicionario')
+    if os.path.exists(arquivo_dados):
+        return feather.read_table(arquivo_dados, memory_map=True).to_pandas()
+
+    inicio = time.perf_counter()
+    try:
+        dicionario = pd.read_excel(caminho, sheet_name=ABA_DICIONARIO, header=None, usecols='A:B')
+    except ValueError:
+        # Planilha sem dicionário: o registro de colunas é montado só a partir da aba de dados
+        return None
+    dicionario.columns = ['rotulo', 'codigo']
+    dicionario = preparar_para_arrow(dicionario)
+    try:
+        salvar_snapshot(dicionario, sha, time.perf_counter() - inicio, pasta, '.dicionario')
+    except OSError:
+        pass
+    return dicionario
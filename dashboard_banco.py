@@ -1,3 +1,7 @@
+import html
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 import streamlit
 import streamlit as st
 import pandas as pd
@@ -8,12 +12,28 @@ import numpy as np
 import squarify # Importa a biblioteca squarify para criar o mapa de árvore
 import matplotlib.colors as mcolors # Para gerar uma paleta de cores
 
-from sklearn.preprocessing import LabelEncoder, OrdinalEncoder
+from sklearn.preprocessing import LabelEncoder
 from sklearn.preprocessing import StandardScaler
 from sklearn.decomposition import PCA
 from sklearn.cluster import KMeans
 from scipy.stats import chi2_contingency 
 
+from dados_banco import instituicoes_por_lote, ler_dicionario, preenchimento_por_coluna
+from particoes_banco import ler_colecao
+from esquema_banco import ROTULOS_SIM_NAO, construir_esquema
+from compacto_banco import BancoCompacto, relatorio_memoria
+from validacao_banco import validar_banco
+from cubo_banco import construir_cubo
+from associacao_banco import ROTULOS_MEDIDAS, TAMANHO_BLOCO, associacoes_do_questionario, calcular_associacoes
+from permutacoes_banco import PERMUTACOES, permutar_pares
+from testes_banco import ALFA, ROTULOS_TESTES, testar_pares
+from filtros_banco import escolhas_da_url, estado_filtros, filtros_do_cubo, indexar_filtros
+from cruzado_banco import FiltroCruzado, dimensoes_do_banco
+from figuras_banco import CacheFiguras, DesenhoEmProcessos, impressao_digital
+from resultados_banco import CacheResultados
+from graficos_banco import (GRAFICOS, GRAFICOS_BARRAS, GRAFICOS_POR_ABA, agregar_barras, categorias_dos_rotulos,
+                            desenhar_barras, figura_interativa, mapa_calor_interativo)
+
 # --- Configurações da Página ---
 st.set_page_config(
     page_title="Avaliação das Características Sociais, Educacionais e de Saúde das Pessoas com Síndrome de Down no Brasil",
@@ -21,22 +41,244 @@ st.set_page_config(
     layout="wide"
 )
 
-# --- Função de Carregamento de Dados (com cache) ---
-@st.cache_data
-def load_data():
+# --- Função de Carregamento de Dados ---
+def load_data(ondas=None):
+    # Please adjust this path
+    #df = pd.read_excel('C:/Users/Emille/Documents/UNIFESP/MATÉRIAS/Tópicos em Ciência de Dados para Neurociência/Projeto5/Banco_SD.xlsx')
+    # Lê o snapshot colunar (.cache_banco/) quando a planilha não mudou; senão lê o Excel e grava o snapshot.
+    # As colunas só são convertidas quando alguma aba as pede (BancoColunar)
+    # Com a pasta planilhas/<onda>/, cada planilha é ingerida num processo e o banco unificado fica
+    # particionado por onda e instituição: a seleção de ondas só lê as partições escolhidas
+    return ler_colecao(ondas=ondas)
+
+# --- Registro de colunas e banco compacto sob demanda: tipos definidos uma única vez para todas as abas ---
+def load_typed_data(ondas=None):
+    origem, tempos = load_data(ondas)
+    # O registro vem da aba 'Dicionário': id curto, tipo, categorias e família de cada coluna
+    caminho, pasta, sha = tempos['dicionario']
+    esquema = construir_esquema(origem, ler_dicionario(caminho, pasta, sha=sha))
+    banco = BancoCompacto(origem, esquema)
+    # Regras de qualidade só registradas na carga: cada uma é verificada quando um gráfico ou a aba 2 lê a sinalização
+    validacao = validar_banco(banco)
+    # Cubo de contagens (perguntas categóricas × sexo, faixa etária, instituição e renda): só os estratos na carga,
+    # as perguntas são contadas quando algum gráfico as pede
+    cubo = construir_cubo(banco)
+    tempos['cubo'] = cubo.tempo
+    # Bitmaps de linhas por valor de cada filtro da barra lateral
+    indice_filtros = indexar_filtros(banco)
+    tempos['filtros'] = indice_filtros.tempo
+    return banco, esquema, validacao, cubo, indice_filtros, tempos
+
+# --- Carregamento em segundo plano (com cache) ---
+# cache_resource: uma única carga é compartilhada por todas as sessões (sem cópia do banco por usuário),
+# e as colunas já tipadas e compactadas por uma aba continuam prontas para as seguintes.
+# A carga roda numa thread: o cabeçalho, a aba 1 e o sumário são desenhados enquanto o banco é lido.
+# Cada combinação de ondas é um banco inteiro (com cubo e filtros) na memória: só as duas últimas ficam guardadas
+@st.cache_resource(max_entries=2)
+def start_background_load(ondas=None):
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='carga_banco')
+    carga = executor.submit(load_typed_data, ondas)
+    executor.shutdown(wait=False)
+    return carga
+
+def wait_for_data(carga, ondas=None):
     try:
-        # Please adjust this path
-        #df = pd.read_excel('C:/Users/Emille/Documents/UNIFESP/MATÉRIAS/Tópicos em Ciência de Dados para Neurociência/Projeto5/Banco_SD.xlsx')
-        df = pd.read_excel('Banco_SD.xlsx')
-        return df
+        return carga.result()
     except FileNotFoundError:
+        # A carga que falhou sai do cache para ser refeita na próxima execução
+        start_background_load.clear(ondas)
         st.error("Erro: O arquivo 'Banco_SD.xlsx' não foi encontrado.")
         st.info("Por favor, verifique se o nome do arquivo e o caminho estão corretos.")
         st.stop()
     except Exception as e:
+        start_background_load.clear(ondas)
         st.error(f"Ocorreu um erro ao carregar os dados: {e}")
         st.stop()
 
+# --- Cache de figuras (com cache): uma única cópia para todas as sessões, com orçamento de bytes e descarte LRU ---
+@st.cache_resource
+def figure_cache():
+    return CacheFiguras()
+
+def show_cached_figure(id_grafico, desenhar, impressao, *parametros, interativo=None):
+    # A figura só é montada (desenhar) quando o PNG desse gráfico, recorte e parâmetros ainda não está no cache;
+    # no modo interativo, gráficos com versão plotly (interativo) são desenhados pelo navegador
+    if interativo is not None and st.session_state.get('graficos_interativos'):
+        show_interactive_figure(id_grafico, interativo)
+        return
+    png = figure_cache().figura((id_grafico, impressao, parametros), desenhar)
+    st.image(png, width='stretch', output_format='PNG')
+
+# --- Modo interativo: o servidor envia só os dados agregados (JSON do plotly) e o navegador desenha ---
+# Passar o mouse e dar zoom acontecem no navegador, sem rerun do script
+@st.cache_resource
+def interactive_stats():
+    # id do gráfico -> (tempo de montagem no servidor em segundos, bytes do JSON enviado)
+    return {}
+
+def show_interactive_figure(id_grafico, montar, ao_selecionar=None):
+    inicio = time.perf_counter()
+    fig = montar()
+    carga = len(fig.to_json())
+    interactive_stats()[id_grafico] = (time.perf_counter() - inicio, carga)
+    if ao_selecionar is None:
+        st.plotly_chart(fig, key=f'interativo_{id_grafico}', config={'displaylogo': False})
+    else:
+        st.plotly_chart(fig, key=f'interativo_{id_grafico}', config={'displaylogo': False},
+                        on_select=ao_selecionar, selection_mode='points')
+
+# --- Cache de resultados compartilhado (resultados_banco): recortes, contagens e modelos de todas as sessões ---
+# Os filtros da barra lateral ficam na URL; o mesmo estado de filtros, aberto por qualquer usuário, reaproveita
+# o recorte e tudo o que já foi calculado sobre ele (chaveado pela impressão digital do recorte)
+@st.cache_resource
+def result_cache():
+    return CacheResultados()
+
+def filtered_rows(indice_filtros, escolhas, sha, index):
+    # (linhas do recorte ou None = banco inteiro, impressão digital do recorte)
+    linhas = indice_filtros.selecionar(escolhas)
+    return linhas, impressao_digital(sha, index if linhas is None else linhas)
+
+# --- Gráficos de barras do registro (graficos_banco) ---
+# Contagens de todos os gráficos do registro numa única varredura do recorte, feita quando a primeira aba
+# de gráficos de barras é aberta e reaproveitada pelas demais
+def bar_counts(impressao, banco, index, cubo=None, filtros_cubo=None):
+    def calcular():
+        # Recorte descrito só por estratificadores do cubo (ou banco inteiro): contagens do cubo, sem varrer as linhas
+        if cubo is not None and filtros_cubo is not None:
+            barras, _ = agregar_barras(banco, GRAFICOS_BARRAS, cubo=cubo, filtros=filtros_cubo)
+        else:
+            barras, _ = agregar_barras(banco, GRAFICOS_BARRAS, index)
+        return barras
+    return result_cache().obter(('barras', impressao), calcular)
+
+def page_bar_counts(impressao, banco, index, cubo=None, filtros_cubo=None, cruzado=None):
+    # Com seleções cruzadas as contagens já são mantidas pela sessão (cruzado_banco): lidas sem passar pelo cache
+    if cruzado is not None:
+        barras, _ = agregar_barras(banco, GRAFICOS_BARRAS, index, cruzado=cruzado)
+        return barras
+    return bar_counts(impressao, banco, index, cubo, filtros_cubo)
+
+# --- Filtro cruzado (modo interativo): clicar numa barra filtra todos os outros gráficos da página ---
+# Códigos por linha das perguntas do registro: montados uma vez por banco e compartilhados pelas sessões
+@st.cache_resource(max_entries=2)
+def cross_dimensions(impressao, _banco):
+    return dimensoes_do_banco(_banco, [grafico.familia or grafico.coluna for grafico in GRAFICOS_BARRAS])
+
+def cross_filter(impressao, banco):
+    # Seleções e contagens incrementais são da sessão; refeitas quando o banco carregado muda
+    guardado = st.session_state.get('filtro_cruzado')
+    if guardado is None or guardado[0] != impressao:
+        guardado = (impressao, FiltroCruzado(cross_dimensions(impressao, banco)))
+        st.session_state['filtro_cruzado'] = guardado
+    return guardado[1]
+
+def cross_selections(selecao, dimensoes):
+    # {id do gráfico: rótulos das barras clicadas} -> {id da pergunta: categorias}
+    selecoes = {}
+    for id_grafico, rotulos in selecao.items():
+        grafico = GRAFICOS[id_grafico]
+        pergunta = grafico.familia or grafico.coluna
+        if pergunta in dimensoes:
+            mapa = categorias_dos_rotulos(grafico, dimensoes.categorias[pergunta])
+            selecoes[pergunta] = [mapa[rotulo] for rotulo in rotulos if rotulo in mapa]
+    return selecoes
+
+def select_bars(id_grafico):
+    # Clique (ou seleção com shift) nas barras; desmarcar tudo no gráfico tira o filtro dele
+    pontos = st.session_state[f'interativo_{id_grafico}']['selection']['points']
+    eixo = 'y' if GRAFICOS[id_grafico].orientacao == 'horizontal' else 'x'
+    rotulos = [str(ponto[eixo]) for ponto in pontos]
+    selecao = st.session_state.setdefault('selecao_cruzada', {})
+    if rotulos:
+        selecao[id_grafico] = rotulos
+    else:
+        selecao.pop(id_grafico, None)
+
+def clear_selection():
+    for id_grafico in st.session_state.get('selecao_cruzada', {}):
+        st.session_state.pop(f'interativo_{id_grafico}', None)
+    st.session_state['selecao_cruzada'] = {}
+
+# Desenho opcional em processos: os gráficos da aba que ainda não estão no cache são enviados todos de uma vez
+# a um pool de processos (um por núcleo) e exibidos na ordem da página, à medida que cada PNG fica pronto.
+# Os processos são encerrados quando o recurso sai do cache (st.cache_resource.clear) ou quando o servidor termina
+@st.cache_resource(on_release=DesenhoEmProcessos.encerrar)
+def render_pool():
+    return DesenhoEmProcessos()
+
+def start_bar_charts(aba, barras, impressao):
+    if not st.session_state.get('desenho_em_processos') or st.session_state.get('graficos_interativos'):
+        return {}
+    cache, pool = figure_cache(), render_pool()
+    pendentes = {}
+    for grafico in GRAFICOS_POR_ABA[aba]:
+        agregado = barras.get(grafico.id)
+        if agregado is None or agregado[0].empty or (grafico.id, impressao, ()) in cache:
+            continue
+        pendentes[grafico.id] = pool.enviar(desenhar_barras, grafico, *agregado)
+    return pendentes
+
+def show_bar_chart(id_grafico, barras, impressao, nota=None, pendentes=None):
+    grafico = GRAFICOS[id_grafico]
+    st.subheader(grafico.subtitulo)
+    if nota:
+        st.caption(nota)
+    agregado = barras.get(id_grafico)
+    if agregado is None:
+        st.warning(f"Não foi possível gerar o gráfico '{grafico.subtitulo}': coluna não encontrada no banco.")
+    elif agregado[0].empty:
+        st.info(f"Nenhum dado para exibir para '{grafico.subtitulo}' com os filtros selecionados.")
+    else:
+        contagem, total = agregado
+        if st.session_state.get('graficos_interativos'):
+            selecionadas = st.session_state.get('selecao_cruzada', {}).get(id_grafico)
+            show_interactive_figure(id_grafico, lambda: figura_interativa(grafico, contagem, total, selecionadas),
+                                    ao_selecionar=lambda: select_bars(id_grafico))
+        elif pendentes and id_grafico in pendentes:
+            png = figure_cache().png((id_grafico, impressao, ()), pendentes[id_grafico].result)
+            st.image(png, width='stretch', output_format='PNG')
+        else:
+            show_cached_figure(id_grafico, lambda: desenhar_barras(grafico, contagem, total), impressao)
+
+# --- Resultados pesados das abas 8 e 9 (no cache de resultados): calculados quando a aba é aberta pela primeira vez ---
+# Chave: impressão digital do recorte + parâmetros escolhidos; os quadros não entram na chave
+def fit_clusters(impressao, n_clusters, dados):
+    def calcular():
+        dados_normalizados = StandardScaler().fit_transform(dados)
+        pca = PCA(n_components=2)
+        componentes = pca.fit_transform(dados_normalizados)
+        kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
+        return componentes, pca.explained_variance_ratio_ * 100, kmeans.fit_predict(componentes)
+    return result_cache().obter(('clusters', impressao, n_clusters, tuple(dados.columns)), calcular)
+
+def model_frame(impressao, banco, index):
+    # Quadro completo dos modelos, só lido pelas seções (cada modelo trabalha numa cópia)
+    return result_cache().obter(('quadro_modelos', impressao), lambda: banco.para_dataframe(index))
+
+def ordinal_features(impressao, banco, index, nomes):
+    # Renda e escolaridade como número pelos códigos ordinais do banco (ordem do questionário; em branco = NaN)
+    return result_cache().obter(('ordinais', impressao, tuple(nomes)), lambda: banco.ordinais().valores(index, nomes))
+
+def fit_ols(impressao, target, X, y):
+    def calcular():
+        import statsmodels.api as sm
+        return sm.OLS(y, sm.add_constant(X)).fit()
+    return result_cache().obter(('ols', impressao, target, tuple(X.columns)), calcular)
+
+def fit_random_forest(impressao, target, n_estimators, max_depth, balanceado, X_train, y_train):
+    def calcular():
+        from sklearn.ensemble import RandomForestClassifier
+        model = RandomForestClassifier(
+            n_estimators=n_estimators,
+            max_depth=max_depth,
+            random_state=42,
+            class_weight='balanced' if balanceado else None
+        )
+        return model.fit(X_train, y_train)
+    return result_cache().obter(('floresta', impressao, target, n_estimators, max_depth, balanceado, tuple(X_train.columns)),
+                                calcular)
+
 # --- Aplica estilos CSS globais ---
 st.markdown("""
 <style>
@@ -54,8 +296,10 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- Função principal que cria o dashboard ---
-def create_dashboard(df_original):
-    if not df_original.empty:
+def create_dashboard(carga, ondas=None):
+    # carga: banco sendo lido em segundo plano (start_background_load). A página é desenhada de cima para baixo:
+    # o conteúdo estático sai primeiro e cada aba é preenchida quando o banco e os seus gráficos ficam prontos
+    with st.container():
         st.title("Avaliação das Características Sociais, Educacionais e de Saúde das Pessoas com Síndrome de Down no Brasil")
 
         # --- Abas com títulos mais curtos ---
@@ -70,10 +314,9 @@ def create_dashboard(df_original):
             "8. PCA e Cluster",
             "9. Modelos ML",           # Shortened (Machine Learning Models)
             "10. Discussão"            # Shortened
-        ])
-
-        # --- Sidebar para filtros ---
-        df_filtrado = df_original.copy()
+        ], key='aba_aberta', on_change='rerun')
+        # Execução sob demanda: só a aba aberta (aba.open) é calculada; trocar de aba refaz a página com a nova aba.
+        # O que ela calcula fica em cache (figuras, modelos), então voltar a uma aba já aberta sai do cache
 
 
         # --- Sidebar com Sumário das Abas ---
@@ -88,7 +331,9 @@ def create_dashboard(df_original):
         
         with st.sidebar.expander("2️⃣ Apresentação dos Dados"):
             st.header("Dados Gerais")
-            st.subheader(f"- Total de participantes: {len(df_filtrado)}")
+            # Preenchido quando o banco termina de carregar
+            total_participantes = st.empty()
+            total_participantes.subheader("- Total de participantes: …")
             st.subheader("- Período de coleta: [setembro de 2024 - atual]")
             st.subheader("- Regiões abrangidas: [18 Estados] AC, AL, BA, CE, ES, GO, MA, MT, MG, PB, PR, PE, PI, RJ, RN, RS, SC e SP) mais o Distrito Federal. ")
             
@@ -188,2807 +433,1575 @@ def create_dashboard(df_original):
             st.subheader("- Sugestões para Pesquisas Futuras")
             
             st.header("Conclusão")
-            
-            
+
         # --- CONTEÚDO DA ABA 1: Contexto e Objetivo ---
         with tab1:
             st.header("Contexto do Estudo")
             st.image("Image1.jpg", width=1000)
             st.image("Image2.jpg", width=1000)
 
-        # --- CONTEÚDO DA ABA 2: Apresentação dos Dados ---
-        with tab2:
-            st.header("Apresentação dos Dados")
-
+        # --- ABA 10: Discussão e Conclusão ---
+        with tab10:
+            st.header("Discussão")
             st.markdown("""
             <div class="justified-text">
-            O banco possui variáveis quantitativas e qualitativas com dados socioeconômico, demográfico, educacional e de saúde. O tipo de variável poderá ser visto no documento compartilhado em uma planilha no formato xlsx onde consta os dados e o dicionário.
-            </div>
+            Os dados apresentados no gráfico de distribuição por faixa etária contém uma amostra com predomínio de pessoas com Síndrome de Down (SD) mais jovens, as categorias 5 meses a 10 anos possui 44,1% da distribuição e em segundo lugar a categoria 11 a 19 anos com 28,9% dessa demografia. Essa distribuição de uma faixa etária mais jovem é devido à natureza da pesquisa que foi aplicada em Centros de atendimento à Pessoas com Síndrome de Down, Centros Paralímpicos de atletas com SD, instituições filantrópicas e ONGs que trabalham no desenvolvimento dessa população. Em relação as características étnicas raciais, a amostra reflete um predomínio de 77,4% pessoas autodeclaradas brancas e 15,5% pardas. Analisando esses dois gráficos conseguimos notar um ponto limitante da amostra, a falta de diversidade seja pela faixa etária ou pela cor/etnia, uma vez que um dos objetivos  do projeto é avaliar características sociodemográficas de pessoas com SD no Brasil. 
+            
+            O gráfico sobre o número de irmãos que o participante possui aponta que 43,1% possui pelo menos 1 irmão. Trazendo dados da literatura, um estudo realizado na Flórida (Marshall et al., 2019), relata por parte dos pais a falta de ter recebido informações adequadas após o diagnóstico de um filho com Síndrome de Down, seja durante o período pré-natal ou no pós-natal. Em se tratando de países subdesenvolvidos essa problemática pode ser ainda pior e com uma realidade e perspectiva mais dura. Não é difícil encontrar uma sobrecarga dos cuidados recaída sobre a mãe, que na maioria das vezes precisa administrar os cuidados entre os filhos e outras demandas familiares. Ao aplicar a pesquisa foi observado, em sua grande maioria, crianças com SD sendo levadas para as atividades diárias por suas mães que em seus relatos apontavam a dificuldade em conseguir conciliar a rotina de cuidados com o filho e as obrigações do dia a dia.
+            
+            A distribuição da renda familiar parece assimétrica para as faixas de renda mais altas, sendo 40,1% dos participantes terem uma renda de mais de 5 salários mínimos. Isso é reforçado no heatmap de "Correlação Socioeconômica" em que há uma correlação negativa fraca (-0.19) entre renda familiar e receber o Benefício e Pretação Continuada (BPC). Esse dado implica numa menor representação em rendas médias-baixas. Além disso, 4,6% dos participantes disseram receber o Bolsa Família e 16,3% recebem o BPC. Ainda no mesmo heatmap houve uma correlação positiva fraca (0.44) entre receber o Bolsa Família e receber o BPC. A distribuição do tipo de moradia demonstrou que 68,8% dos participantes possuem moradia própria e 19,8% possuem moradia alugada. A realidade brasileira ainda é vista por sua alta concentração de renda, onde apenas 1% da população detém de 28,3% da renda total o que reflete sobre as desigualdades sociais (IPEA, 2023). Em se tratando de pessoas com Síndrome de Down e suas família existe uma subnotificação não apenas dos aspectos sociodemográficos, mas em tantos outros que investigamos nessa pesquisa. A realidade da grande maioria dessas famílias não necessariamente está refletida nos 40,1% computados, mas sim nos relatos de pais em dizer que depender dos auxílios era algo comum, principalmente quando a pesquisa era aplicada em instituições que atendiam pessoas de baixa renda. Algumas mães relataram a necessidade de abdicar do emprego para cuidar de seus filhos de forma integral e que o auxílio era a única renda familiar.
+            
+            Em relação ao nível de escolaridade dos participantes houve um predomínio de baixos níveis de escolaridade. 34,1% disseram ter Ensino Fundamental incompleto e 14,4% não se alfabetizaram e/ou não frequentaram a escola. Ainda que a amostra contenha um predomínio de pessoas na faixa etária de 5 meses a 10 anos (44,1%), 52,8% não são alfabetizados e 26,8% são semi alfabetizados, isso mesmo entre as faixas etárias adultas. Embora no heatamp de "Escolaridade e Alfabetização" apresente fortes correlações positivas entre as variáveis analisadas como "saber escrever", "saber ler" é preciso levantar um questionamento. A realidade escolar e de qualificação profissional entre pessoas com SD e outras deficiências intelectuais é de enfrentamento de barreiras significativas, seja no acesso à informação, emprego, autonomia e participação social. Isso é reflexo tanto da falta de acessibilidade e inclusão nos mais diversos âmbitos da vida, na falta de suporte e políticas públicas que garantem acesso à educação de qualidade, o despreparo de profissionais para atender esse público e também a superproteção e desinformação por parte do cuidador. O direito a educação inclusiva e equitativa deve ser estabelecido nas instituições. Pessoas com Síndrome de Down possuem necessidades educacionais variadas, o apoio adequado, o sentimento de pertencimento à comunidade e o suporte de autonomia garantida são alavancas que podem fazer o indivíduo com SD prosperar não apenas na vida acadêmica, mas em outros aspectos da vida (Boundy et al., 2023). Ainda sobre escolaridade e alfabetização, 64,6% dos participantes não sabe ler e 62,4% não sabe escrever e 93,3% não consegue interpretar texto. O baixo letramento funcional reflete o acesso limitado à educação e isso implicando em uma vulnerabilidade educacional exigindo planejamento e estratégias políticas que atendam as necessidade específicas dessa população. Ao analisar o heatmap de "Escolaridade e Alfabetização" existe uma correlação negativa fraca (-0,15) entre nivel de escolaridade e ser alfabetizado, ou seja, estar em anos mais avançados na escola não é garantia que a pessoa com SD está sendo alfabetizada.
+            Quanto ao nível de escolaridade do responsável do participante 33,8% disseram ter Pós-graduação e 27,5%  tem Ensino Superior completo. Esse dado reafirma o status socioeconômico da amostra e também conversa com outro dado que será apresentado na discussão, "Idade em que a mãe teve a gestação".
+            
+            Analisando o gráfico da idade em que a mãe teve a gestação, majoritariamente a concentração está na faixa etária 36-40 anos (42,3%). Isso pode estar associado na decisão de ter filhos após uma estabilidade socioeconômica e planejamento familiar reforçando o perfil socioeconômico da amostra. Em relação ao acompanhamento pré-natal 66,9% disseram ter realizado na rede privada, dado consistente com o perfil de renda familiar e escolaridade do responsável. De forma geral, em relação as redes de acompanhamento (nutricionista, oftalmologista, psicólogo, clínico geral, dentista) a rede privada é a mais utilizada. As especialidades menos utilizadas são o acompanhamento com nutricionista e psicólogo e aqui é possível apontar uma problemática na saúde, pois pessoas com SD são mais suscetíveis a desenvolverem comorbidades, distúrbios cardiovasculares, colesterol alto, obesidade, distúrbio da tireoide e outras doenças (Asua et al., 2015). Além disso, esse público requer um acompanhamento psicológico por terem um comprometimento cognitivo, em aprendizagem, memória, linguagem e função cognitiva. Em nossa amostra, a prevalência de diagnóstico teve a ansiedade como predominante (12%). A realização de intervenção precoce seja pela rede privada (45,5%) ou pela pública (35,1%) reforça a necessidade de especialistas (fisioterapeutas, fonoaudiólogos, terapeuta ocupacional) capacitados para atender esse público, principalmente na rede pública, onde a demanda é grande e a espera por vaga no atendimento também.
+            
+            Quanto ao diagnóstico do participante, 78,2% tiveram no pós-natal, sugerindo que embora o acompanhamento pré-natal seja realizado o diagnóstico de doenças genéticas acaba sendo tardio. Além disso, 93,7% dos participantes realizaram o exame de cariótipo. Este estudo aponta que métodos de triagem não invasiva são cruciais na estimativa do risco individual de uma gravidez cromossômica afetada tanto em mulheres jovens quanto em mulheres mais velhas. No entanto, apenas o diagnóstico invasivo pré-natal é definitivo da Síndrome de Down e aconselhamento genético apropriado (Vičić et al., 2017). A combinação de fatores como a escolha ou não de realiza o pré-natal, ultrassonografia morfológica não precisa, características físicas do bebê não tão evidentes ao nascimento e a necessidade de exames complementares contribuem para um diagnóstico definitivo no pós-natal.
+            Em relação ao irmão ter ou não alguma deficiência 98,1% disseram não ter deficiência, podendo indicar que a SD não é amplamente recorrente nas famílias da amostra.
+            
+            Sobre a percepção do cuidador em relação à saúde em geral do participante, 50,7% disseram ser boa e 37,6% disseram ser excelente. Ao aplicar a pesquisa, alguns cuidadores relataram ter uma percepção positiva da saúde geral de seu filho mesmo considerando a condição genética e as comorbidades associadas, e muitas vezes comparando com outras crianças que tem Síndrome de Down ou que fazem uso regular de medicações.
+            
+            Em relação ao IMC, a classificação foi realizada de acordo com a Organização Mundial da Saúde e da Sociedade Brasileira de Pediatria quando a faixa etária era de 0 meses a 10 anos devido a curva do Z escore. Ao somar as porcentagens das categorias sobrepeso e obesidades, 47,1% do sexo feminino e 43,8% do sexo masculino estão nessas classificações. Esse dado implica em um problema de saúde pública ainda mais quando o dado conversa com o gráfico de acompanhamento nutricional em que 66,9% disseram não realizar.
+            
+            A distribuição de imunizações/vacinas entre os participantes apresenta uma alta cobertura para aquelas vacinas do calendário infantil anual básico. A cobertura se torna baixa para vacina da varicela, HPV, dengue e principalmente da Covid-19. Aqui vale um comentário, durante a aplicação da pesquisa houve grande resistência em obter informações sobre a vacina da Covid-19, além disso foi relatado uma grande desinformação à respeito da vacina. Infelizmente alguns cuidadores acreditam que a vacina não é benéfica à saúde de seus filhos, outros apontam que ela é causadora de outra enfermidades mesmo tendo evidências científicas de que pessoas com Síndrome de Down possuem uma baixa imunidade quando comparadas a seus pares, podendo ser consideradas imunossuprimidas devido a alterações no sistema imunológico o que as torna mais susceptíveis a infecções e doenças autoimunes (Ram et al., 2011).
+            A baixa taxa de casos de covid grave ou que não tiveram covid-19 pode ser reflexo de maior adesão das 1ª e 2ª doses da vacina, mas também pode ser pela não detecção da doença no período da pandemia ou mesmo na omissão do caso na hora de responder o questionário.
+            
+            Entre as doenças mais contraídas apesar das imunizações, a pneumonia foi a mais frequente com 33% da amostra, sendo que este dado reforça a maior suscetibilidade dessa população em contrair infecções respiratórias, seja pelas diferenças anatômica das vias aéreas ou um sistema imunológico mais comprometido. Vale ressaltar que a vacina pneumocócica conjugada foi relativamente recente introduzida no calendário básico de imunização do Brasil, no ano de 2010, antes disso ela era direcionada apenas aos idosos.
+            As morbidades mais prevalentes foram distúrbio da tireoide (18%), alterações visuais (17,2%) e alterações cardiovasculares/malformações cardíacas (17%). Mapear as morbidades mais prevalentes é demonstrar os desafios de saúde pública e seu acesso.
+            
+            Em relação ao uso de medicações pelos participantes 41,4% fazem suplementação de vitamina D e 30% tomam algum repositor hormonal da tireoide. Pessoas com SD podem desenvolver hipotireoidismo congênito. Um estudo de Gorini et al (2024) mostra que a concentração baixa ou anormal de T4 ao nascer pode impactar na vida fetal e neonatal, uma vez que os hormônios tireoidianos desempenham papel fundamental no desenvolvimento do cérebro e sua deficiência contribui para a deficiência intelectual em pessoas com SD o que influência no crescimento somático e desenvolvimento psicomotor.
+            
+            A percepção dos cuidadores em relação ao hábitos saudáveis dos participantes, 90,7% relatam que seus filhos possuem uma alimentação saudável, no entanto,
+            este dado contrasta com o gráfico de alta prevalência de sobrepeso e obesidade entre os participantes discutido anteriormente. Além disso a obesidade pode ser influenciada por fatores metabólicos intrínsecos à Síndrome de Down o que reforça a necessidade de acompanhamento nutricional.
+            
+            Os gráficos de atividade física e frequência semanal praticada mostram que 37,9% dos participantes não praticam e entre àqueles que praticam a maioria pratica de 2 a 3 vezes na semana. Embora 62,1% declarem praticar alguma atividade física ou esporte, pode ser que a frequência ainda não seja o ideal para todos. Manter-se ativo é importante não apenas para o controle de peso, visto os dados de IMC dessa amostra, mas também por uma questão de saúde geral  de uma população com predisposição à obesidade e outras comorbidades (Xanthopoulos et al., 2023).
+            
+            O gráfico de atendimento de saúde público adequado mostrou que 70% dos cuidadores acham que seus filhos não o recebem. Esse dado é crítico considerando que a maioria dos participantes possui acesso à rede privada. A percepção negativa ao sistema público de saúde aponta fragilidades no atendimento feito pelo SUS. Por se tratar de um público em vulnerabilidade, desigualdade e dificuldade em acessibilidade, o setor público precisa traçar estratégias políticas que atendam não apenas as demandas dessa população, mas que tenha um olhar de integralidade nos aspectos de saúde, educação e sociodemográficos. O direito à saúde pública de qualidade precisa ser garantido, mais ainda o respeito e a liberdade de ter autonomia e participação numa sociedade que precisar rever esse olhar capacitista.
+            
+            Em relação aos aspectos de autonomia, participação e interação social, no gráfico de autonomia, 54,5% disseram que seus filhos tem autonomia para escolher coisas para sua satisfação pessoal. Em relação a se deslocar independentemente pela cidade 91,3% disseram que não. 51,2% é parcialmente independente na realização de suas atividade em geral. 91% se relaciona com diferentes pessoas e tem amigos. 77,1% interagem socialmente frequentando diferentes lugares da cidade e bairro. 77,1% dos cuidadores tem uma percepção positiva e acreditam que seus filhos são tratados com respeito, dignidade e igualdade pelas outras pessoas. É preciso lembrar que maior parte da faixa etária dessa amostra está entre 5 meses e 10 anos, logo não seria possível se descolar sozinho pela cidade, contudo, ainda que na vida adulta, pessoas com Síndrome de Down durante o curso da vida acabam sendo pouco estimuladas a ter sua autonomia, isso gera uma dependência e superproteção do cuidador o que implica na sua socialização e desenvolvimento. Ter uma rede de apoio é importante e ter sua independência e autonomia estimuladas é essencial para o desenvolvimento de habilidades seja na capacidade de tomar decisões, resolver problemas, desenvolver autoconhecimento, capacidade de comunicação e interação social. Embora a percepção do cuidador achar que seu filho é tratado com respeito e dignidade, foi relato que em alguns casos isso ocorre porque ainda são bebês ou crianças, que ao passar para a adolescência muitos sofrem preconceito e discriminação por parte de colegas nas escolas. Essa reflexão importante, pois como mencionados vivemos em uma sociedade capacitista e desigual. Achar que pelo indivíduo ter o diagnóstico de Síndrome de Down sua vida resume a uma  crença de que ele é incapaz devido às sua deficiências é uma atitude discriminatórias. Educar e ensinar as crianças de que todos são capazes de desenvolver habilidades, seja qual for, independente de suas limitações, é um exercício de cidadania. Oportunizar, incentivar e acolher as limitações é diminuir as barreiras físicas, sociais e institucionais enfrentadas diariamente pelas pessoas com Síndrome de Down.
+            
+            Ao analisar o gráfico de dispersão dos resultados da análise de agrupamento usando K-means após uma redução de dimensões por PCA (PC1 + PC2 explicam 79,5% da variância total dos dados), observamos o agrupamento em 3 clusters considerando as variáveis "idade do participante", "idade do cuidador principal", "IMC", "peso do participante", "altura do participante" e "idade em que a mãe do participante teve a gestação":
+            
+            Cluster 0 - Jovens adultos/adultos com IMC alto:
+            A idade média dos participantes é aproximadamente 27 anos. 
+            A idade do cuidador é aproximadamente 62 anos (pais mais velhos no grupo). 
+            IMC de 28,2kg/m² (sobrepeso). 
+            Altura de 1,54m. 
+            Peso de 68kg
+            Idade materna na gestação entre 38-39 anos
+            - Este cluster representa um grupo de adultos jovens com sobrepeso, sob cuidado de pessoas mais velhas. Pode ser que os indivíduos tenham um grau maior de dependência ou vulnerabilidade física divido os pais terem mais idade.
+            
+            Cluster 1 - Crianças
+            Idade média dos participantes de aproximadamente 3,7 anos
+            Idade do cuidador principal de aproximadamente 42 anos
+            IMC de 19,88kg/m² (eutrofia para faixa etária infantil)
+            Altura de 94cm
+            Peso de 15kg
+            Idade materna na gestação entre 30-31 anos
+            - Este cluster representa um grupo de crianças que tem cuidadores adultos na faixa etária dos 40 anos. É esperado um perfil de dependência da infância e uma demanda de cuidados completos no dia a dia.
+            
+            Cluster 2 - Pré-adolescentes/adolescentes
+            Idade média do participante de aproximadamente 13,6 anos
+            Idade do cuidador principal de 49 anos
+            IMC de 22,9kg/m² (eutrofia)
+            Altura de 1,40m
+            Peso de 43kg
+            Idade materna na gestação entre 35-36 anos
+            - Este cluster representa um grupo de adolescentes ou pré-adolescentes com IMC compatível para a idade. Os cuidadores são pais mais jovens (pais e mãe de meia idade) quando comparado com os pais do cluster 0. É possível que este seja um grupo de pessoa com SD com maior independência funcional e autonomia quando comparado ao cluster 1.
+            
+            O gráfico de distribuição da percepção de atendimento de saúde pública por cluster tem os seguintes achados:
+            
+            Cluster 0 – Jovens adultos/adultos
+            45,6% dos cuidadores avaliam que o atendimento pelo sistema público de saúde é adequado, este é o maior percentual entre os grupos. Ainda assim, mais da metade (54,4%) consideram o atendimento inadequado (Não). É possível que apesar do sobrepeso identificado nesse grupo, este seja o que mais reconhece acesso ou qualidade no SUS. Provavelmente são usuários mais experientes do sistema, com certa autonomia e/ou consciência de seus direitos.
+            
+            Cluster 1 – Crianças 
+            Apenas 18,6% disseram ter acesso a atendimento de qualidade pelo sistema público de saúde, ou seja, mais de 80% dos responsáveis não consideram o atendimento adequado. É possível que haja dificuldade dos cuidadores em conseguir atendimento especializado em demandas, por exemplo, fisioterapia, fonoaudiólogo, terapeuta ocupacional, psicólogo. Além disso, o diagnóstico precoce ou terapias contínuas para crianças com deficiência pode ser uma barreira enfrentada no dia a dia.
+            
+            Cluster 2 – Pré-adolescentes/adolescentes
+            Apenas 24,8% avaliaram positivamente o atendimento. A percepção dos cuidadores parece um pouco melhor comparado ao cluster 1, contudo a maioria ainda é negativa. É possível que haja lacunas em acompanhamento longitudinal e de integralidade seja na reabilitação ou transição para a vida adulta.
+            
             """, unsafe_allow_html=True)
 
+            st.header("Referências:")
             st.markdown("""
-            <div class="justified-text">
-            Além disso, o banco possui 159 colunas e 368 linhas (contando com a primeira coluna e linha que são identificação (ID) e perguntas, respectivamente). Detalhes do banco podem ser vistos na planilha em formato xlsx.
-            </div>
-            """, unsafe_allow_html=True)
 
+Marshall, J., Ramakrishnan, R., Slotnick, A. L., Tanner, J. P., Salemi, J. L., & Kirby, R. S. (2019). Family-Centered Perinatal Services for Children With Down Syndrome and Their Families in Florida. Journal of obstetric, gynecologic, and neonatal nursing : JOGNN, 48(1), 78–89. https://doi.org/10.1016/j.jogn.2018.10.006
+
+MONTFERRE, Helio. Estudos revelam impacto da redistribuição de renda no Brasil. Ipea, 4 ago. 2023. Disponível em: https://www.ipea.gov.br/portal/categorias/45-todas-as-noticias/noticias/13909-estudos-revelam-impacto-da-redistribuicao-de-renda-no-brasil. Acesso em: 24 jun. 2025.
+
+Boundy, L., Hargreaves, S., Baxter, R., Holton, S., & Burgoyne, K. (2023). Views of educators working with pupils with Down syndrome on their roles and responsibilities and factors related to successful inclusion. Research in developmental disabilities, 142, 104617. https://doi.org/10.1016/j.ridd.2023.104617
+
+Vičić, A., Hafner, T., Bekavac Vlatković, I., Korać, P., Habek, D., & Stipoljev, F. (2017). Prenatal diagnosis of Down syndrome: A 13-year retrospective study. Taiwanese journal of obstetrics & gynecology, 56(6), 731–735. https://doi.org/10.1016/j.tjog.2017.10.004
+
+Ram, G., & Chinen, J. (2011). Infections and immunodeficiency in Down syndrome. Clinical and experimental immunology, 164(1), 9–16. https://doi.org/10.1111/j.1365-2249.2011.04335.x
+
+Gorini, F., Coi, A., Pierini, A., Assanta, N., Bottoni, A., & Santoro, M. (2024). Hypothyroidism in Patients with Down Syndrome: Prevalence and Association with Congenital Heart Defects. Children (Basel, Switzerland), 11(5), 513. https://doi.org/10.3390/children11050513
+
+Xanthopoulos, M. S., Walega, R., Xiao, R., Pipan, M. E., Cochrane, C. I., Zemel, B. S., Kelly, A., & Magge, S. N. (2023). Physical Activity in Youth with Down Syndrome and Its Relationship with Adiposity. Journal of developmental and behavioral pediatrics : JDBP, 44(6), e436–e443. https://doi.org/10.1097/DBP.0000000000001192
+
+        
+""", unsafe_allow_html=True)  
+
+            
             st.markdown("""
             <div class="justified-text">
-            As variáveis selecioandas para análise descritiva serão apresentadas nas abas (4 blocos) seguintes. Cada aba apresenta um "bloco" de variáveis agrupadas com características semelhantes: "Características Sociodemográficas", "Características Educacionais", "Características de Saúde e Estilo de Vida" e "Características de Participação, Autonomia e Interação Social".s
+            <h3>Principais Achados</h3>
+            <p>Os resultados deste estudo revelaram padrões importantes nas características 
+            sociais, educacionais e de saúde da população com síndrome de Down no Brasil:</p>
+            <ul>
+                <li><strong>Características Sociodemográficas</strong>: A maioria dos participantes se concentra na faixa etária de 5 meses a 10 anos.</li>
+                <li><strong>Saúde</strong>: As morbidades mais prevalentes foram hipotireoidismo, doenças cardiovasculares.</li>
+                <li><strong>Educação</strong>: Grande porcentagem dos participantes não são alfabetizados ou sãos semi alfabetizados.</li>
+                <li><strong>Atividade física</strong>: Necessidade de aumentar a motivação e frequência na prática de ativiade física tendo em vista os altos índices de IMC.</li>
+                </ul
             </div>
-            """, unsafe_allow_html=True)
+""", unsafe_allow_html=True)  
+            
 
-            st.header("Variáveis")
+            st.markdown("""
+            <div class="justified-text">
+            <h3>Implicações</h3>
+            <p>Estes achados têm importantes implicações para políticas públicas e práticas 
+            clínicas:</p>
+            <ul>
+                <li><strong>Políticas de Saúde</strong>: Necessidade de ampliar o acesso a especialidades como fisioteria, fonoaudiologia, psicoligia e dente outros.</li>
+                <li><strong>Educação Inclusiva</strong>: Importância de fortalecer programas de inclusão escolar, apoio pedagógico, incentivo a autonomia e participação.</li>
+                <li><strong>Assistência Social</strong>: Ampliar o acesso a benefícios como o BPC e outros programas sociais.</li>
+            </ul>
+        </div>
+""", unsafe_allow_html=True)
 
             st.markdown("""
-            <div class="variable-list-container">
-                <ul>
-                    <li>ID</li>
-                    <li>Instituição</li>
-                    <li>Data de nascimento</li>
-                    <li>Idade do participante</li>
-                    <li>Cidade</li>
-                    <li>Naturalidade</li>
-                    <li>Cuidador principal</li>
-                    <li>Idade do cuidador principal</li>
-                    <li>Peso do participante</li>
-                    <li>IMC</li>
-                    <li>Classificação do IMC</li>
-                    <li>Peso do cuidador principal</li>
-                    <li>Altura</li>
-                    <li>Altura do cuidador principal</li>
-                    <li>Sexo do participante</li>
-                    <li>Cor/etnia do participante</li>
-                    <li>Possui alguma deficiência</li>
-                    <li>Se na pergunta anterior for selecionado outra DI, escreve qual</li>
-                    <li>CID do participante</li>
-                    <li>O participante foi adotado</li>
-                    <li>Idade que a mãe do participante teve a gestação</li>
-                    <li>A mãe do participante realizou o acompanhamento pré-natal</li>
-                    <li>Realizou o acompanhamento pré-natal na rede</li>
-                    <li>O diagnóstico do participante foi realizado no</li>
-                    <li>Foi feito o cariótipo</li>
-                    <li>O participante possui irmãos</li>
-                    <li>Quantos irmãos o participante possui</li>
-                    <li>Os irmãos do participante possuem alguma deficiência</li>
-                    <li>Você considera que a saúde do participante em geral é</li>
-                    <li>O participante realiza/realizou acompanhamento psicológico</li>
-                    <li>Realiza/realizou na rede</li>
-                    <li>Realizou algum programa de intervenção/estimulação precoce</li>
-                    <li>Realiza/realizou na rede</li>
-                    <li>O participante faz acompanhamento com clínico geral</li>
-                    <li>Se sim, o acompanhamento ocorre na rede</li>
-                    <li>O participante faz acompanhamento com dentista</li>
-                    <li>Se sim, o acompanhamento ocorre na rede</li>
-                    <li>O participante faz acompanhamento com nutricionista</li>
-                    <li>Se sim, o acompanhamento ocorre na rede</li>
-                    <li>O participante faz acompanhamento com oftalmologista</li>
-                    <li>Se sim, o acompanhamento ocorre na rede</li>
-                    <li>Apresenta alguma das morbidades e/ou doenças a seguir</li>
-                    <li>Recebeu alguma das imunizações a seguir</li>
-                    <li>Apesar das imunizações, teve alguma dessas doenças</li>
-                    <li>Teve Covid-19</li>
-                    <li>Gravidade da COVID do participante</li>
-                    <li>O participante ficou hospitalizado (na UTI) por conta da COVID</li>
-                    <li>O participante precisou de suplementação de O2 por conta da COVID</li>
-                    <li>Tomou a 1ª dose da COVID</li>
-                    <li>Nome da vacina da 1ª dose da COVID</li>
-                    <li>Data da 1ª dose da COVID</li>
-                    <li>Tomou a 2ª dose da COVID</li>
-                    <li>Nome da vacina da 2ª dose da COVID</li>
-                    <li>Data da 2ª dose da COVID</li>
-                    <li>Tomou a 3ª dose da COVID</li>
-                    <li>Nome da vacina da 3ª dose da COVID</li>
-                    <li>Data da 3ª dose da COVID</li>
-                    <li>Tomou a 4ª dose da COVID</li>
-                    <li>Nome da vacina da 4ª dose da COVID</li>
-                    <li>Data da 4ª dose da COVID</li>
-                    <li>Tomou a 5ª dose da COVID</li>
-                    <li>Nome da vacina da 5ª dose da COVID</li>
-                    <li>Data da 5ª dose da COVID</li>
-                    <li>Tomou a 6ª dose da COVID</li>
-                    <li>Nome da vacina da 6ª dose da COVID</li>
-                    <li>Data da 6ª dose da COVID</li>
-                    <li>O participante toma alguma dessas medicações</li>
-                    <li>O participante é alfabetizado</li>
-                    <li>Sabe ler</li>
-                    <li>Sabe escrever</li>
-                    <li>O participante consegue interpretar texto</li>
-                    <li>O participante lê jornais, revista ou livros?</li>
-                    <li>Nível de escolaridade do participante</li>
-                    <li>Nível de escolaridade do responsável do participante</li>
-                    <li>Renda familiar</li>
-                    <li>Quantas pessoas vivem com esta renda familiar</li>
-                    <li>Recebe Bolsa Família</li>
-                    <li>Recebe BPC</li>
-                    <li>A residência é</li>
-                    <li>Pratica atividade física ou esporte</li>
-                    <li>Qual atividade física o participante pratica</li>
-                    <li>O participante pratica atividade física ou esporte quantas vezes na semana</li>
-                    <li>Por quanto tempo o participante pratica essa atividade física e/ou esporte</li>
-                    <li>Você considera que o participante possui autonomia para tomar decisões e tem a chance de escolher as coisas que deseja (escolher as coisas para a sua satisfação pessoal)</li>
-                    <li>O participante se desloca independentemente pela cidade</li>
-                    <li>O participante realiza alguma atividade artística</li>
-                    <li>Na maioria das vezes, você considera o participante na realização de suas necessidades pessoais como</li>
-                    <li>Você considera que o participante se relaciona com diferentes pessoas, tem amigos e se dá bem com as pessoas</li>
-                    <li>Você considera que o participante, por vontade própria interage socialmente, frequentando diferentes lugares da cidade ou do bairro</li>
-                    <li>Você considera que o participante é tratado com respeito, dignidade e igualdade pelas outras pessoas</li>
-                    <li>Você considera que o participante possui hábitos alimentares saudáveis</li>
-                    <li>Você considera que o participante possui atendimento de saúde adequado pelo sistema público para atender suas necessidades</li>
-                </ul>
-            </div>
+            <div class="justified-text">
+            <h3>Limitações</h3>
+            <p>Algumas limitações do estudo devem ser consideradas:</p>
+            <ul>
+                <li><strong>Amostra</strong>: Os participantes foram recrutados principalmente na região Sudeste do Brasil o que pode limitar a generalização.</li>
+                <li><strong>Dados Autorrelatados</strong>: Algumas informações dependem da percepção dos cuidadores, podendo haver viés.</li>   </ul>
+ </div>
+""", unsafe_allow_html=True)
+            
+            st.markdown("""
+            <div class="justified-text">
+            <h3>Sugestões para Pesquisas Futuras</h3>
+            <p>Estudos futuros poderiam:</p>
+            <ul>
+                <li>Explorar as diferenças regionais no acesso a serviços e benefícios.</li>
+            </ul>
+        </div>
+""", unsafe_allow_html=True)
+            
+            st.header("Conclusão")
+            st.markdown("""
+            <div class="justified-text">
+            A análise dos dados revela importantes características sociodemográficas, educacionais, saúde e de inclusão de pessoas com Síndrome de Down no Brasil. O predomínio de crianças e adolescentes brancos com maior renda e escolaridade dos responsáveis aponta para um viés amostral, isso pode ser influenciado pelo local de aplicação da pesquisa e pela maior parte da pesquisa ter sido aplicada na região Sudeste do país. Essa limitação reduz a capacidade de generalização dos achados para toda a população com SD no país, especialmente os grupos mais vulneráveis, como aqueles em situação de pobreza extrema, de regiões periféricas ou pertencentes a minorias étnicas. Do ponto de vista socioeconômico, a distribuição de renda e o acesso majoritário à rede privada de saúde e educação reforçam esse perfil mais favorecido da amostra. No entanto, mesmo dentro desse recorte, alguns desafios como a sobrecarga materna no cuidado, o abandono do trabalho por parte dos cuidadores e a dependência de auxílios públicos em camadas economicamente mais frágeis são refletidos na discussão e literatura.
+            
+            A análise de escolaridade e alfabetização expõe um cenário crítico com baixos índices de letramento funcional mesmo entre participantes em idade escolar e com nível educacional regular mais avançado. Isso aponta falhas estruturais nos processos educacionais inclusivos, levantando a urgência por políticas públicas efetivas, formação adequada de profissionais e suporte às famílias.
+            
+            Na área da saúde, a amostra evidencia a baixa cobertura de atendimentos especializados pela rede pública, especialmente entre crianças. A prevalência de sobrepeso e comorbidades como hipotireoidismo, distúrbios cardiovasculares e ansiedade, somada à baixa adesão a acompanhamento nutricional e psicológico, reforça a necessidade de ampliação e qualificação dos serviços de saúde pública voltados para essa população. A resistência ou desinformação quanto à vacinação, sobretudo da Covid-19, também exige estratégias de educação em saúde para os cuidadores.
+            
+            A análise por clusters identificaram três perfis distintos (crianças, adolescentes e adultos jovens) com diferenças significativas quanto à saúde, autonomia e percepção do sistema público. Cuidadores de adultos tendem a relatar maior adequação no atendimento, possivelmente por serem usuários antigos do SUS, enquanto crianças enfrentam mais barreiras ao acesso e à continuidade dos cuidados.
+            
+            Por fim, os dados de autonomia e interação social sugerem avanços em aspectos afetivos e relacionais. Entretanto, apontam para um déficit na independência funcional, especialmente no deslocamento e na tomada de decisões. Isso pode ser reflexo de práticas de superproteção, falta de incentivo à autonomia e barreiras sociais ainda fortemente presentes. Embora os achados ofereçam subsídios importantes sobre a realidade de pessoas com Síndrome de Down em determinados contextos urbanos e institucionais do Brasil, a pesquisa também revela profundas desigualdades sociais e estruturais. As evidências reforçam a necessidade urgente de ações intersetoriais, políticas inclusivas, ampliação do acesso a serviços públicos de qualidade e estratégsias de conscientização que promovam equidade, autonomia e respeito aos direitos das pessoas com Síndrome de Down.
+                        </div>
             """, unsafe_allow_html=True)
 
+        # --- Aviso de carregamento na aba aberta, se ela depende do banco ---
+        avisos = {aba: aba.empty() for aba in (tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9) if aba.open}
+        for aviso in avisos.values():
+            aviso.info("⏳ Carregando os dados do banco…")
+
+        banco, esquema, validacao, cubo, indice_filtros, tempos_carga = wait_for_data(carga, ondas)
+        # Acesso por coluna como num DataFrame; as perguntas de múltipla escolha ficam em bits (banco.familia)
+        df_original = banco
+        if df_original.empty:
+            for aviso in avisos.values():
+                aviso.warning("O banco de dados está vazio.")
+            return
+        # Banco pronto: cada aba mantém o aviso até começar a ser desenhada
+        for aviso in avisos.values():
+            aviso.info("⏳ Gerando os gráficos desta aba…")
+        # Identidade dos dados carregados: a coleção (hash das planilhas) e as ondas escolhidas. O índice é renumerado
+        # a cada seleção de ondas, então sem as ondas duas seleções com o mesmo número de linhas teriam a mesma impressão
+        sha_dados = impressao_digital(tempos_carga['sha256'], tuple(sorted(ondas or ())))
+
+        # --- Sidebar para filtros ---
+        # Sem valores marcados o filtro não restringe; o recorte sai dos bitmaps montados na carga
+        # (OR entre os valores marcados de um filtro, AND entre os filtros)
+        st.sidebar.header("🔎 Filtros")
+        # Sessão nova: os filtros vêm da URL (link compartilhado); depois, a URL acompanha os filtros marcados
+        if 'estado_url' not in st.session_state:
+            for id_filtro, valores in escolhas_da_url(st.query_params, indice_filtros).items():
+                st.session_state[f'filtro_{id_filtro}'] = valores
+        escolhas = {id_filtro: st.sidebar.multiselect(rotulo, indice_filtros.opcoes(id_filtro), key=f'filtro_{id_filtro}')
+                    for id_filtro, rotulo in indice_filtros.rotulos.items()}
+        estado_url = estado_filtros(escolhas)
+        if st.session_state.get('estado_url') != estado_url:
+            st.query_params.from_dict({id_filtro: sorted(valores) for id_filtro, valores in escolhas.items() if valores})
+            st.session_state['estado_url'] = estado_url
+        # Recorte e sua impressão digital, compartilhados entre as sessões com o mesmo estado de filtros
+        linhas_filtradas, impressao_dados = result_cache().obter(
+            ('recorte', sha_dados, estado_url),
+            lambda: filtered_rows(indice_filtros, escolhas, sha_dados, df_original.index))
+        # O banco em cache é só lido pelas abas, então não é copiado por sessão: o recorte só guarda as linhas
+        df_filtrado = df_original if linhas_filtradas is None else banco.recorte(linhas_filtradas)
+        # Filtros só de sexo, faixa etária, instituição e renda: contagens e tabelas cruzadas saem do cubo
+        filtros_cubo = filtros_do_cubo(escolhas, cubo)
+        # Filtro cruzado: as barras clicadas nos gráficos interativos restringem o recorte das demais figuras.
+        # Só os filtros que mudaram desde o último clique são reaplicados (contagens incrementais)
+        filtro_cruzado = None
+        selecao_cruzada = st.session_state.get('selecao_cruzada', {})
+        if st.session_state.get('graficos_interativos') and selecao_cruzada:
+            filtro_cruzado = cross_filter(impressao_digital(sha_dados, df_original.index), banco)
+            recorte = None if linhas_filtradas is None else df_original.index.isin(linhas_filtradas)
+            filtro_cruzado.atualizar(cross_selections(selecao_cruzada, filtro_cruzado.dimensoes), recorte)
+            df_filtrado = banco.recorte(df_original.index[filtro_cruzado.linhas()])
+            filtros_cubo = None
+            impressao_dados = impressao_digital(sha_dados, df_filtrado.index)
+        # A impressão digital do recorte exibido, junto com o id do gráfico, é a chave do cache de figuras
+        total_participantes.subheader(f"- Total de participantes: {len(df_filtrado)}")
+
+        # Ondas de coleta: a troca recarrega o banco lendo só as partições das ondas escolhidas
+        if tempos_carga and len(tempos_carga.get('ondas', [])) > 1:
+            st.sidebar.multiselect("Ondas de coleta", tempos_carga['ondas'], default=tempos_carga['ondas'],
+                                   key='ondas_coleta')
+
+        # Gráficos interativos: barras, treemap e mapas de calor desenhados no navegador a partir das contagens
+        st.sidebar.toggle("Gráficos interativos (desenhados no navegador)", key='graficos_interativos',
+                          help="Clicar nas barras filtra os outros gráficos da página.")
+        if selecao_cruzada:
+            for id_grafico, rotulos in selecao_cruzada.items():
+                st.sidebar.caption(f"**{GRAFICOS[id_grafico].subtitulo}**: {', '.join(rotulos)}")
+            if filtro_cruzado is not None:
+                st.sidebar.caption(f"Filtro cruzado atualizado em {filtro_cruzado.tempo * 1000:.1f} ms "
+                                   f"({int(filtro_cruzado.linhas().sum())} participantes em todos os filtros)")
+            else:
+                st.sidebar.caption("Seleção cruzada inativa: ative os gráficos interativos para aplicá-la.")
+            st.sidebar.button("Limpar seleção cruzada", on_click=clear_selection)
+        # Desenho dos gráficos de barras: em série (padrão) ou num pool de processos, um por núcleo
+        st.sidebar.toggle("Desenhar gráficos em processos paralelos", key='desenho_em_processos',
+                          help=f"Os gráficos de cada aba são desenhados ao mesmo tempo em {os.cpu_count() or 1} processo(s).")
+
+        # --- Tempo de carregamento dos dados (Excel x snapshot colunar) ---
+        if tempos_carga:
+            with st.sidebar.expander("⏱️ Tempo de Carregamento"):
+                origem = {'snapshot': "snapshot colunar", 'incremental': "planilha Excel (só linhas novas)"}.get(
+                    tempos_carga['origem'], "planilha Excel")
+                st.caption(f"Dados lidos do {origem} (hash {tempos_carga['sha256'][:12]}…)")
+                if tempos_carga['origem'] != 'snapshot':
+                    st.metric("Linhas ingeridas", tempos_carga['linhas_novas'])
+                if tempos_carga.get('excel') is not None:
+                    st.metric("Leitura do Excel", f"{tempos_carga['excel']:.3f} s")
+                if tempos_carga.get('snapshot') is not None:
+                    ganho = f"{tempos_carga['excel'] / tempos_carga['snapshot']:.0f}x mais rápido" if tempos_carga.get('excel') else None
+                    st.metric("Leitura do snapshot", f"{tempos_carga['snapshot']:.3f} s", ganho)
+                # Etapas da ingestão (só quando a planilha foi lida nesta carga)
+                etapas = {'conversao': "Conversão para o formato colunar", 'contagens': "Contagens mantidas",
+                          'gravacao_snapshot': "Gravação do snapshot"}
+                for chave, rotulo in etapas.items():
+                    if tempos_carga.get(chave) is not None:
+                        st.caption(f"{rotulo}: {tempos_carga[chave]:.3f} s")
+                st.caption(f"Hash SHA-256 da planilha: {tempos_carga['hash']:.3f} s")
+                if tempos_carga.get('planilhas', 1) > 1:
+                    st.caption(f"{tempos_carga['planilhas']} planilhas ingeridas em paralelo: {tempos_carga['ingestao']:.3f} s")
+                if tempos_carga.get('particionamento') is not None:
+                    st.caption(f"Gravação das partições: {tempos_carga['particionamento']:.3f} s")
+                st.caption(f"Validação do banco ({len(validacao.verificadas)} de {len(validacao.regras)} regras verificadas): "
+                           f"{validacao.tempo:.3f} s")
+                if tempos_carga.get('filtros') is not None:
+                    st.caption(f"Bitmaps dos filtros ({indice_filtros.nbytes / 1024:.0f} KB): {tempos_carga['filtros']:.3f} s")
+                if tempos_carga.get('cubo') is not None:
+                    # Estratos montados na carga; cada pergunta é contada quando um gráfico a pede
+                    st.caption(f"Cubo de contagens ({len(cubo.contagens)} perguntas contadas × {len(cubo.estratos)} estratos, "
+                               f"{cubo.nbytes / 1024:.0f} KB): {tempos_carga['cubo']:.3f} s na carga, {cubo.tempo:.3f} s no total")
+                # Renda, escolaridade e faixas codificadas quando correlações, clusters ou modelos as pedem
+                ordinais = banco.ordinais()
+                st.caption(f"Códigos ordinais ({len(ordinais.codigos)} de {len(ordinais.nomes)} perguntas, "
+                           f"{ordinais.nbytes / 1024:.1f} KB): {ordinais.tempo:.3f} s")
+                lidas, total = tempos_carga.get('particoes_lidas') or (None, None)
+                if total:
+                    st.caption(f"Partições lidas (onda × instituição): {lidas} de {total}")
+            
+            
+        # --- CONTEÚDO DA ABA 2: Apresentação dos Dados ---
+        if tab2.open:
+            with tab2:
+                avisos.pop(tab2).empty()
+                st.header("Apresentação dos Dados")
+
+                st.markdown("""
+                <div class="justified-text">
+                O banco possui variáveis quantitativas e qualitativas com dados socioeconômico, demográfico, educacional e de saúde. O tipo de variável poderá ser visto no documento compartilhado em uma planilha no formato xlsx onde consta os dados e o dicionário.
+                </div>
+                """, unsafe_allow_html=True)
+
+                st.markdown("""
+                <div class="justified-text">
+                Além disso, o banco possui 159 colunas e 368 linhas (contando com a primeira coluna e linha que são identificação (ID) e perguntas, respectivamente). Detalhes do banco podem ser vistos na planilha em formato xlsx.
+                </div>
+                """, unsafe_allow_html=True)
+
+                st.markdown("""
+                <div class="justified-text">
+                As variáveis selecioandas para análise descritiva serão apresentadas nas abas (4 blocos) seguintes. Cada aba apresenta um "bloco" de variáveis agrupadas com características semelhantes: "Características Sociodemográficas", "Características Educacionais", "Características de Saúde e Estilo de Vida" e "Características de Participação, Autonomia e Interação Social".s
+                </div>
+                """, unsafe_allow_html=True)
+
+                st.header("Variáveis")
+
+                # Lista gerada a partir do registro de colunas (mesmos enunciados da planilha)
+                itens_variaveis = "\n".join(f"<li>{html.escape(nome)}</li>" for nome in esquema.variaveis())
+                st.markdown(f"""
+                <div class="variable-list-container">
+                    <ul>
+                    {itens_variaveis}
+                    </ul>
+                </div>
+                """, unsafe_allow_html=True)
+
         # --- ABA 3: Características Sociodemográficas (Gráficos Matplotlib) ---
-        with tab3:
-            st.header("Características Sociodemográficas")
-
-            # Primeira linha de gráficos
-            col1_row1, col2_row1 = st.columns(2)
-
-            with col1_row1:
-                st.subheader("Distribuição por Cor/Etnia")
-                if 'Cor/etnia do participante' in df_filtrado.columns and not df_filtrado.empty:
-                    contagem = df_filtrado['Cor/etnia do participante'].value_counts()
-                    total = contagem.sum()
-
-                    fig, ax = plt.subplots(figsize=(7, 6)) # Ajuste no figsize para proporção
-                    bars = ax.bar(contagem.index, contagem.values, color='#bd928b', edgecolor='#bd928b')
-
-                    for i, (categoria, valor) in enumerate(contagem.items()):
-                        percentual = (valor / total) * 100
-                        ax.text(i, valor + (total * 0.01), f'{percentual:.1f}%', ha='center', va='bottom', fontsize=9)
-
-                    ax.set_title('Distribuição por Cor/Etnia', fontsize=12)
-                    ax.set_xlabel('Cor/Etnia do Participante', fontsize=10)
-                    ax.set_ylabel('Frequência', fontsize=10)
-                    ax.tick_params(axis='x', rotation=45, labelsize=9)
-                    ax.grid(axis='y', linestyle='--', alpha=0.5)
-                    plt.tight_layout()
-                    for spine in ax.spines.values(): # Manter bordas visíveis
-                        spine.set_visible(True)
-                        spine.set_linewidth(1.2)
-                    st.pyplot(fig, use_container_width=True) # Adicionado use_container_width
-                    plt.close(fig)
-                else:
-                    st.warning("Não foi possível gerar o gráfico de Cor/Etnia. Verifique se a coluna existe ou se o DataFrame está vazio após os filtros.")
-
-            with col2_row1:
-                st.subheader("Quantos irmãos o participante possui")
-                if 'Quantos irmãos o participante possui' in df_filtrado.columns and not df_filtrado.empty:
-                    contagem = df_filtrado['Quantos irmãos o participante possui'].value_counts()
-                    total = contagem.sum()
-
-                    fig, ax = plt.subplots(figsize=(7, 6)) # Ajuste no figsize para proporção
-                    bars = ax.barh(contagem.index.astype(str), contagem.values, color='#a1a6aa', edgecolor='#a1a6aa')
-
-                    for i, (categoria, valor) in enumerate(contagem.items()):
-                        percentual = (valor / total) * 100
-                        ax.text(valor + (contagem.max() * 0.05), i, f'{percentual:.1f}%', va='center', fontsize=9)
-
-                    ax.set_xlim(0, contagem.max() * 1.2)
-
-                    ax.set_title('Quantos irmãos o participante possui', fontsize=12)
-                    ax.set_xlabel('Frequência', fontsize=10)
-                    ax.set_ylabel('Nº de irmãos', fontsize=10)
-                    ax.grid(axis='x', linestyle='--', alpha=0.5)
-                    plt.tight_layout()
-
-                    for spine in ax.spines.values(): # Manter bordas visíveis
-                        spine.set_visible(True)
-                        spine.set_linewidth(1.2)
-                    st.pyplot(fig, use_container_width=True) # Adicionado use_container_width
-                    plt.close(fig)
-                else:
-                    st.warning("Não foi possível gerar o gráfico de 'Quantos irmãos o participante possui'. Verifique a coluna.")
+        if tab3.open:
+            with tab3:
+                avisos.pop(tab3).empty()
+                barras = page_bar_counts(impressao_dados, banco, df_filtrado.index, cubo, filtros_cubo, filtro_cruzado)
+                pendentes = start_bar_charts(3, barras, impressao_dados)
+                st.header("Características Sociodemográficas")
 
+                # Primeira linha de gráficos
+                col1_row1, col2_row1 = st.columns(2)
 
-            # Segunda linha de gráficos
-            col1_row2, col2_row2 = st.columns(2)
+                with col1_row1:
+                    show_bar_chart('cor_etnia', barras, impressao_dados, pendentes=pendentes)
 
-            with col1_row2:
-                st.subheader("Distribuição da renda familiar")
-                if 'Renda familiar' in df_filtrado.columns and not df_filtrado.empty:
-                    contagem = df_filtrado['Renda familiar'].value_counts()
-                    total = contagem.sum()
+                with col2_row1:
+                    show_bar_chart('quantos_irmaos_possui', barras, impressao_dados, pendentes=pendentes)
 
-                    fig, ax = plt.subplots(figsize=(7, 6)) # Ajuste no figsize para proporção
-                    bars = ax.barh(contagem.index.astype(str), contagem.values, color='#ffab03', edgecolor='#ffab03')
 
-                    for i, (categoria, valor) in enumerate(contagem.items()):
-                        percentual = (valor / total) * 100
-                        ax.text(valor + (contagem.max() * 0.05), i, f'{percentual:.1f}%', va='center', fontsize=9)
+                # Segunda linha de gráficos
+                col1_row2, col2_row2 = st.columns(2)
 
-                    ax.set_xlim(0, contagem.max() * 1.2)
+                with col1_row2:
+                    show_bar_chart('renda_familiar', barras, impressao_dados, pendentes=pendentes)
 
-                    ax.set_title('Distribuição da renda familiar', fontsize=12)
-                    ax.set_xlabel('Frequência', fontsize=10)
-                    ax.set_ylabel('Renda', fontsize=10)
-                    ax.grid(axis='x', linestyle='--', alpha=0.5)
-                    plt.tight_layout()
+                with col2_row2:
+                    show_bar_chart('recebe_bolsa_familia', barras, impressao_dados, pendentes=pendentes)
 
-                    for spine in ax.spines.values(): # Manter bordas visíveis
-                        spine.set_visible(True)
-                        spine.set_linewidth(1.2)
-                    st.pyplot(fig, use_container_width=True) # Adicionado use_container_width
-                    plt.close(fig)
-                else:
-                    st.warning("Não foi possível gerar o gráfico de 'Renda familiar'. Verifique a coluna.")
-
-            with col2_row2:
-                st.subheader("Recebe Bolsa família")
-                if 'Recebe Bolsa família' in df_filtrado.columns and not df_filtrado.empty:
-                    # Padronizar os valores na coluna
-                    df_filtrado['Recebe Bolsa família'] = (
-                        df_filtrado['Recebe Bolsa família']
-                        .astype(str)
-                        .str.lower()
-                        .str.strip()
-                    )
-                    contagem = df_filtrado['Recebe Bolsa família'].value_counts()
-                    total = contagem.sum()
-
-                    ordem_desejada = ['não', 'sim']
-                    contagem = contagem.reindex(ordem_desejada).dropna()
-                    labels_formatados = [s.capitalize() for s in contagem.index]
-
-                    fig, ax = plt.subplots(figsize=(7, 6)) # Ajuste no figsize para proporção
-                    bars = ax.bar(labels_formatados, contagem.values, color='#e2aa87', edgecolor='#e2aa87')
-
-                    for i, bar in enumerate(bars):
-                        height = bar.get_height()
-                        percentual = (height / total) * 100
-                        ax.text(bar.get_x() + bar.get_width() / 2, height + (total * 0.01), f'{percentual:.1f}%',
-                                ha='center', va='bottom', fontsize=9)
-
-                    ax.set_title('Recebe Bolsa família', fontsize=12)
-                    ax.set_xlabel('Resposta', fontsize=10)
-                    ax.set_ylabel('Frequência', fontsize=10)
-                    ax.set_xticklabels(labels_formatados, rotation=0, ha='center', fontsize=10)
-                    ax.grid(axis='y', linestyle='--', alpha=0.5)
-                    plt.tight_layout()
-
-                    for spine in ax.spines.values(): # Manter bordas visíveis
-                        spine.set_visible(True)
-                        spine.set_linewidth(1.2)
-                    st.pyplot(fig, use_container_width=True) # Adicionado use_container_width
-                    plt.close(fig)
-                else:
-                    st.warning("Não foi possível gerar o gráfico de 'Recebe Bolsa família'. Verifique a coluna.")
-
-            # Terceira linha de gráficos
-            col1_row3, col2_row3 = st.columns(2)
-
-            with col1_row3:
-                st.subheader("Recebe Benefício de Prestação Continuada")
-                if 'Recebe BPC' in df_filtrado.columns and not df_filtrado.empty:
-                    df_filtrado['Recebe BPC'] = (
-                        df_filtrado['Recebe BPC']
-                        .astype(str)
-                        .str.lower()
-                        .str.strip()
-                    )
-                    contagem = df_filtrado['Recebe BPC'].value_counts()
-                    total = contagem.sum()
-
-                    ordem_desejada = ['não', 'sim']
-                    contagem = contagem.reindex(ordem_desejada).dropna()
-                    labels_formatados = [s.capitalize() for s in contagem.index]
-
-                    fig, ax = plt.subplots(figsize=(7, 6)) # Ajuste no figsize para proporção
-                    bars = ax.bar(labels_formatados, contagem.values, color='#b6d4bb', edgecolor='#b6d4bb')
-
-                    for i, bar in enumerate(bars):
-                        height = bar.get_height()
-                        percentual = (height / total) * 100
-                        ax.text(bar.get_x() + bar.get_width() / 2, height + (total * 0.01), f'{percentual:.1f}%',
-                                ha='center', va='bottom', fontsize=9)
-
-                    ax.set_title('Recebe Benefício de Prestação Continuada', fontsize=12)
-                    ax.set_xlabel('Resposta', fontsize=10)
-                    ax.set_ylabel('Frequência', fontsize=10)
-                    ax.set_xticklabels(labels_formatados, rotation=0, ha='center', fontsize=10)
-                    ax.grid(axis='y', linestyle='--', alpha=0.5)
-                    plt.tight_layout()
-
-                    for spine in ax.spines.values(): # Manter bordas visíveis
-                        spine.set_visible(True)
-                        spine.set_linewidth(1.2)
-                    st.pyplot(fig, use_container_width=True) # Adicionado use_container_width
-                    plt.close(fig)
-                else:
-                    st.warning("Não foi possível gerar o gráfico de 'Recebe BPC'. Verifique a coluna.")
-
-            with col2_row3:
-                st.subheader("Distribuição do tipo de moradia")
-                if 'A residência é' in df_filtrado.columns and not df_filtrado.empty:
-                    contagem = df_filtrado['A residência é'].value_counts()
-                    total = contagem.sum()
-
-                    fig, ax = plt.subplots(figsize=(7, 6)) # Ajuste no figsize para proporção
-                    bars = ax.barh(contagem.index.astype(str), contagem.values, color='#a4d9a3', edgecolor='#a4d9a3')
-
-                    for i, (categoria, valor) in enumerate(contagem.items()):
-                        percentual = (valor / total) * 100
-                        ax.text(valor + (contagem.max() * 0.05), i, f'{percentual:.1f}%', va='center', fontsize=9)
-
-                    ax.set_xlim(0, contagem.max() * 1.2)
-
-                    ax.set_title('Distribuição do tipo de moradia', fontsize=12)
-                    ax.set_xlabel('Frequência', fontsize=10)
-                    ax.set_ylabel('Moradia', fontsize=10)
-                    ax.grid(axis='x', linestyle='--', alpha=0.5)
-                    plt.tight_layout()
-
-                    for spine in ax.spines.values(): # Manter bordas visíveis
-                        spine.set_visible(True)
-                        spine.set_linewidth(1.2)
-                    st.pyplot(fig, use_container_width=True) # Adicionado use_container_width
-                    plt.close(fig)
-                else:
-                    st.warning("Não foi possível gerar o gráfico de 'A residência é'. Verifique a coluna.")
-                    
-            # Quarta linha de gráficos
-            col1_row4, col2_row4 = st.columns(2)
-            # --- GRÁFICO DE DISTRIBUIÇÃO POR FAIXA ETÁRIA (IDÊNTICO À ANÁLISE ORIGINAL) ---
-            with col1_row4:  # Segunda coluna da primeira linha
-                st.subheader("Distribuição por Faixa Etária")
-                
-                if 'Idade do participante' in df_filtrado.columns and not df_filtrado.empty:
-                    # CÓPIA FIEL DO PROCESSAMENTO DO SEU GRÁFICO SIMPLES
-                    df_filtrado['Idade_num'] = pd.to_numeric(df_filtrado['Idade do participante'], errors='coerce')
-                    
-                    # USAR EXATAMENTE OS MESMOS PARÂMETROS DO SEU CÓDIGO ORIGINAL
-                    bins = [0, 10, 19, 29, 39, 49, 59]
-                    labels = ['5 meses a 10 anos', '11 anos a 19 anos', '20 anos a 29 anos',
-                             '30 anos a 39 anos', '40 anos a 49 anos', '50 anos a 59 anos']
-                    
-                    # MESMA LÓGICA DE CLASSIFICAÇÃO (com right=True)
-                    df_filtrado['Faixa Etária'] = pd.cut(
-                        df_filtrado['Idade_num'],
-                        bins=bins,
-                        labels=labels,
-                        right=True  # INCLUSÃO DO LIMITE SUPERIOR (igual ao seu código)
-                    )
-                    
-                    # MESMA CONTAGEM E ORDENAÇÃO
-                    contagem = df_filtrado['Faixa Etária'].value_counts().sort_index()
-                    total = contagem.sum()
-            
-                    # GRÁFICO COM MESMO ESTILO VISUAL
-                    fig, ax = plt.subplots(figsize=(7, 5))
-                    bars = ax.bar(
-                        contagem.index,
-                        contagem.values,
-                        color='#bd928b',
-                        edgecolor='#bd928b',
-                        width=0.8
-                    )
-            
-                    # MESMO CÁLCULO DE PORCENTAGENS
-                    for i, (categoria, valor) in enumerate(contagem.items()):
-                        percentual = (valor / total) * 100
-                        ax.text(
-                            i,
-                            valor + (total * 0.01),
-                            f'{percentual:.1f}%',
-                            ha='center',
-                            va='bottom',
-                            fontsize=10
-                        )
-                    # Configurações do eixo X para alinhamento perfeito
-                    ax.set_xticks(range(len(contagem)))  # Define um tick para cada barra
-                    ax.set_xticklabels(contagem.index, rotation=45, ha='right', fontsize=10)  # ha='right' para melhor alinhamento
-                    
-                    # Configurações do gráfico
-                    ax.set_title('Distribuição por Faixa Etária', fontsize=14, pad=20)
-                    ax.set_xlabel('Faixa Etária', fontsize=12)
-                    ax.set_ylabel('Número de Participantes', fontsize=12)
-                    ax.grid(axis='y', linestyle='--', alpha=0.5)
-                    ax.set_ylim(0, contagem.max() * 1.15)  # Espaço para os rótulos
-            
-                    # MESMA FORMATAÇÃO DE EIXOS
-                    #ax.set_title('Distribuição por Faixa Etária', fontsize=12)
-                    #ax.set_xlabel('Faixa Etária', fontsize=10)
-                    #ax.set_ylabel('Número de Participantes', fontsize=10)
-                    #ax.tick_params(axis='x', rotation=45, labelsize=9)
-                    #ax.grid(axis='y', linestyle='--', alpha=0.5)
-                    #ax.set_ylim(0, contagem.max() * 1.15)
-            
-                    plt.tight_layout()
-                    st.pyplot(fig, use_container_width=True)
-                    plt.close(fig)
+                # Terceira linha de gráficos
+                col1_row3, col2_row3 = st.columns(2)
+
+                with col1_row3:
+                    show_bar_chart('recebe_beneficio_prestacao_continuada', barras, impressao_dados, pendentes=pendentes)
+
+                with col2_row3:
+                    show_bar_chart('tipo_moradia', barras, impressao_dados, pendentes=pendentes)
                     
-                else:
-                    st.warning("Dados de idade não disponíveis ou DataFrame vazio após filtros.")
+                # Quarta linha de gráficos
+                col1_row4, col2_row4 = st.columns(2)
+                # --- GRÁFICO DE DISTRIBUIÇÃO POR FAIXA ETÁRIA (IDÊNTICO À ANÁLISE ORIGINAL) ---
+                with col1_row4:  # Segunda coluna da primeira linha
+                    # 'Faixa Etária' já vem calculada na normalização (mesmos bins, com right=True)
+                    fora_das_faixas = validacao.contagem(['idade_numerico', 'idade_intervalo'], df_filtrado.index)
+                    nota = (f"{fora_das_faixas} participante(s) com idade inválida fora do gráfico (ver Qualidade dos dados na aba 2)"
+                            if fora_das_faixas else None)
+                    show_bar_chart('faixa_etaria', barras, impressao_dados, nota, pendentes)
         
         # --- ABA 4: Características Educacionais (Novos Gráficos Matplotlib em Colunas) ---
-        with tab4:
-            st.header("Características Educacionais")
-
-            # Linha 1 de gráficos Educacionais
-            col1_edu_row1, col2_edu_row1 = st.columns(2)
-
-            with col1_edu_row1:
-                st.subheader("Nível de Escolaridade do Participante")
-                if 'Nível de escolaridade do participante' in df_filtrado.columns and not df_filtrado.empty:
-                    contagem = df_filtrado['Nível de escolaridade do participante'].value_counts()
-                    total = contagem.sum()
-
-                    fig, ax = plt.subplots(figsize=(8, 5)) # Mantido o figsize do seu código
-                    bars = ax.barh(contagem.index.astype(str), contagem.values, color='#7bbda1', edgecolor='#7bbda1')
-
-                    for i, (categoria, valor) in enumerate(contagem.items()):
-                        percentual = (valor / total) * 100
-                        ax.text(valor + 5, i, f'{percentual:.1f}%', va='center', fontsize=9)
-
-                    ax.set_xlim(0, contagem.max() * 1.2)
-                    ax.set_title('Distribuição do nível de escolaridade do participante')
-                    ax.set_xlabel('Frequência')
-                    ax.set_ylabel('Escolaridade')
-                    ax.grid(axis='x', linestyle='--', alpha=0.5)
-                    plt.tight_layout()
-                    for spine in ax.spines.values():
-                        spine.set_visible(True)
-                        spine.set_linewidth(1.2)
-                    st.pyplot(fig, use_container_width=True)
-                    plt.close(fig)
-                else:
-                    st.warning("Coluna 'Nível de escolaridade do participante' não encontrada ou DataFrame vazio.")
-
-            with col2_edu_row1:
-                st.subheader("Nível de Escolaridade do Responsável")
-                if 'Nível de escolaridade do responsável do participante' in df_filtrado.columns and not df_filtrado.empty:
-                    contagem = df_filtrado['Nível de escolaridade do responsável do participante'].value_counts()
-                    total = contagem.sum()
-
-                    fig, ax = plt.subplots(figsize=(8, 5)) # Mantido o figsize do seu código
-                    bars = ax.barh(contagem.index.astype(str), contagem.values, color='#fcb653', edgecolor='#fcb653')
-
-                    for i, (categoria, valor) in enumerate(contagem.items()):
-                        percentual = (valor / total) * 100
-                        ax.text(valor + 5, i, f'{percentual:.1f}%', va='center', fontsize=9)
-
-                    ax.set_xlim(0, contagem.max() * 1.2)
-                    ax.set_title('Distribuição do nível de escolaridade do responsável do participante')
-                    ax.set_xlabel('Frequência')
-                    ax.set_ylabel('Escolaridade')
-                    ax.grid(axis='x', linestyle='--', alpha=0.5)
-                    plt.tight_layout()
-                    for spine in ax.spines.values():
-                        spine.set_visible(True)
-                        spine.set_linewidth(1.2)
-                    st.pyplot(fig, use_container_width=True)
-                    plt.close(fig)
-                else:
-                    st.warning("Coluna 'Nível de escolaridade do responsável do participante' não encontrada ou DataFrame vazio.")
-
-            # Linha 2 de gráficos Educacionais
-            col1_edu_row2, col2_edu_row2 = st.columns(2)
-
-            with col1_edu_row2:
-                st.subheader("O Participante é Alfabetizado?")
-                if 'O participante é alfabetizado' in df_filtrado.columns and not df_filtrado.empty:
-                    contagem = df_filtrado['O participante é alfabetizado'].value_counts()
-                    total = contagem.sum()
-
-                    fig, ax = plt.subplots(figsize=(6, 5)) # Mantido o figsize do seu código
-                    bars = ax.barh(contagem.index.astype(str), contagem.values, color='#cee879', edgecolor='#cee879')
-
-                    for i, (categoria, valor) in enumerate(contagem.items()):
-                        percentual = (valor / total) * 100
-                        ax.text(valor + 5, i, f'{percentual:.1f}%', va='center', fontsize=9)
-
-                    ax.set_xlim(0, contagem.max() * 1.2)
-                    ax.set_title('Distribuição do nível de alfabetização do participante')
-                    ax.set_xlabel('Frequência')
-                    ax.set_ylabel('Alfabetização')
-                    ax.grid(axis='x', linestyle='--', alpha=0.5)
-                    plt.tight_layout()
-                    for spine in ax.spines.values():
-                        spine.set_visible(True)
-                        spine.set_linewidth(1.2)
-                    st.pyplot(fig, use_container_width=True)
-                    plt.close(fig)
-                else:
-                    st.warning("Coluna 'O participante é alfabetizado' não encontrada ou DataFrame vazio.")
-
-            with col2_edu_row2:
-                st.subheader("O Participante Sabe Ler?")
-                if 'Sabe ler' in df_filtrado.columns and not df_filtrado.empty:
-                    df_filtrado['Sabe ler'] = (
-                        df_filtrado['Sabe ler']
-                        .astype(str)
-                        .str.lower()
-                        .str.strip()
-                    )
-                    contagem = df_filtrado['Sabe ler'].value_counts()
-                    total = contagem.sum()
-
-                    ordem_desejada = ['não', 'sim']
-                    contagem = contagem.reindex(ordem_desejada).dropna()
-                    labels_formatados = [s.capitalize() for s in contagem.index]
-
-                    fig, ax = plt.subplots(figsize=(6, 5)) # Mantido o figsize do seu código
-                    bars = ax.bar(labels_formatados, contagem.values, color='#daa979', edgecolor='#daa979')
-
-                    for i, bar in enumerate(bars):
-                        height = bar.get_height()
-                        percentual = (height / total) * 100
-                        ax.text(bar.get_x() + bar.get_width() / 2, height + 1, f'{percentual:.1f}%',
-                                ha='center', va='bottom', fontsize=9)
-
-                    ax.set_title('Distribuição dos participantes que sabem ler')
-                    ax.set_xlabel('Resposta')
-                    ax.set_ylabel('Frequência')
-                    ax.set_xticklabels(labels_formatados, rotation=0, ha='center', fontsize=10)
-                    ax.grid(axis='y', linestyle='--', alpha=0.5)
-                    plt.tight_layout()
-                    for spine in ax.spines.values():
-                        spine.set_visible(True)
-                        spine.set_linewidth(1.2)
-                    st.pyplot(fig, use_container_width=True)
-                    plt.close(fig)
-                else:
-                    st.warning("Coluna 'Sabe ler' não encontrada ou DataFrame vazio.")
-
-            # Linha 3 de gráficos Educacionais
-            col1_edu_row3, col2_edu_row3 = st.columns(2)
-
-            with col1_edu_row3:
-                st.subheader("O Participante Sabe Escrever?")
-                if 'Sabe escrever' in df_filtrado.columns and not df_filtrado.empty:
-                    df_filtrado['Sabe escrever'] = (
-                        df_filtrado['Sabe escrever']
-                        .astype(str)
-                        .str.lower()
-                        .str.strip()
-                    )
-                    contagem = df_filtrado['Sabe escrever'].value_counts()
-                    total = contagem.sum()
-
-                    ordem_desejada = ['não', 'sim']
-                    contagem = contagem.reindex(ordem_desejada).dropna()
-                    labels_formatados = [s.capitalize() for s in contagem.index]
-
-                    fig, ax = plt.subplots(figsize=(6, 5)) # Mantido o figsize do seu código
-                    bars = ax.bar(labels_formatados, contagem.values, color='#f9f36a', edgecolor='#f9f36a')
-
-                    for i, bar in enumerate(bars):
-                        height = bar.get_height()
-                        percentual = (height / total) * 100
-                        ax.text(bar.get_x() + bar.get_width() / 2, height + 1, f'{percentual:.1f}%',
-                                ha='center', va='bottom', fontsize=9)
-
-                    ax.set_title('Distribuição dos participantes que sabem escrever')
-                    ax.set_xlabel('Resposta')
-                    ax.set_ylabel('Frequência')
-                    ax.set_xticklabels(labels_formatados, rotation=0, ha='center', fontsize=10)
-                    ax.grid(axis='y', linestyle='--', alpha=0.5)
-                    plt.tight_layout()
-                    for spine in ax.spines.values():
-                        spine.set_visible(True)
-                        spine.set_linewidth(1.2)
-                    st.pyplot(fig, use_container_width=True)
-                    plt.close(fig)
-                else:
-                    st.warning("Coluna 'Sabe escrever' não encontrada ou DataFrame vazio.")
-
-            with col2_edu_row3:
-                st.subheader("O Participante Consegue Interpretar Texto?")
-                if 'O participante consegue interpretar texto?' in df_filtrado.columns and not df_filtrado.empty:
-                    df_filtrado['O participante consegue interpretar texto?'] = (
-                        df_filtrado['O participante consegue interpretar texto?']
-                        .astype(str)
-                        .str.lower()
-                        .str.strip()
-                    )
-                    contagem = df_filtrado['O participante consegue interpretar texto?'].value_counts()
-                    total = contagem.sum()
-
-                    ordem_desejada = ['não', 'sim']
-                    contagem = contagem.reindex(ordem_desejada).dropna()
-                    labels_formatados = [s.capitalize() for s in contagem.index]
-
-                    fig, ax = plt.subplots(figsize=(6, 5)) # Mantido o figsize do seu código
-                    bars = ax.bar(labels_formatados, contagem.values, color='#88b4ec', edgecolor='#88b4ec')
-
-                    for i, bar in enumerate(bars):
-                        height = bar.get_height()
-                        percentual = (height / total) * 100
-                        ax.text(bar.get_x() + bar.get_width() / 2, height + 1, f'{percentual:.1f}%',
-                                ha='center', va='bottom', fontsize=9)
-
-                    ax.set_title('Distribuição dos participantes que conseguem interpretar texto')
-                    ax.set_xlabel('Resposta')
-                    ax.set_ylabel('Frequência')
-                    ax.set_xticklabels(labels_formatados, rotation=0, ha='center', fontsize=10)
-                    ax.grid(axis='y', linestyle='--', alpha=0.5)
-                    plt.tight_layout()
-                    for spine in ax.spines.values():
-                        spine.set_visible(True)
-                        spine.set_linewidth(1.2)
-                    st.pyplot(fig, use_container_width=True)
-                    plt.close(fig)
-                else:
-                    st.warning("Coluna 'O participante consegue interpretar texto?' não encontrada ou DataFrame vazio.")
+        if tab4.open:
+            with tab4:
+                avisos.pop(tab4).empty()
+                barras = page_bar_counts(impressao_dados, banco, df_filtrado.index, cubo, filtros_cubo, filtro_cruzado)
+                pendentes = start_bar_charts(4, barras, impressao_dados)
+                st.header("Características Educacionais")
+
+                # Linha 1 de gráficos Educacionais
+                col1_edu_row1, col2_edu_row1 = st.columns(2)
+
+                with col1_edu_row1:
+                    show_bar_chart('nivel_escolaridade', barras, impressao_dados, pendentes=pendentes)
+
+                with col2_edu_row1:
+                    show_bar_chart('nivel_escolaridade_responsavel', barras, impressao_dados, pendentes=pendentes)
+
+                # Linha 2 de gráficos Educacionais
+                col1_edu_row2, col2_edu_row2 = st.columns(2)
+
+                with col1_edu_row2:
+                    show_bar_chart('nivel_alfabetizacao', barras, impressao_dados, pendentes=pendentes)
+
+                with col2_edu_row2:
+                    show_bar_chart('participantes_sabem_ler', barras, impressao_dados, pendentes=pendentes)
+
+                # Linha 3 de gráficos Educacionais
+                col1_edu_row3, col2_edu_row3 = st.columns(2)
+
+                with col1_edu_row3:
+                    show_bar_chart('participantes_sabem_escrever', barras, impressao_dados, pendentes=pendentes)
+
+                with col2_edu_row3:
+                    show_bar_chart('participantes_conseguem_interpretar_texto', barras, impressao_dados, pendentes=pendentes)
 
 
         # --- ABA 5: Características de Saúde e Estilo de Vida (Gráficos Matplotlib em Colunas) ---
-        with tab5:
-            st.header("Características de Saúde e Estilo de Vida")
+        if tab5.open:
+            with tab5:
+                avisos.pop(tab5).empty()
+                barras = page_bar_counts(impressao_dados, banco, df_filtrado.index, cubo, filtros_cubo, filtro_cruzado)
+                pendentes = start_bar_charts(5, barras, impressao_dados)
+                st.header("Características de Saúde e Estilo de Vida")
         
-            # Tabela de cruzamento entre Sexo e Classificação IMC
-            st.subheader("Distribuição do IMC por Sexo (%)")
-            
-            # Processamento dos dados para a tabela
-            if 'Sexo do participante' in df_filtrado.columns and 'Classificação IMC' in df_filtrado.columns and not df_filtrado.empty:
-                # Garantir que a coluna 'IMC' é numérica
-                df_filtrado['IMC'] = pd.to_numeric(df_filtrado['IMC'], errors='coerce')
-                
-                # Definir condições e classificações
-                condicoes = [
-                    (df_filtrado['IMC'] < 18.5),
-                    (df_filtrado['IMC'] >= 18.5) & (df_filtrado['IMC'] <= 24.9),
-                    (df_filtrado['IMC'] >= 25) & (df_filtrado['IMC'] <= 29.9),
-                    (df_filtrado['IMC'] >= 30) & (df_filtrado['IMC'] <= 34.9),
-                    (df_filtrado['IMC'] >= 35) & (df_filtrado['IMC'] <= 39.9),
-                    (df_filtrado['IMC'] >= 40)
-                ]
-                escolhas = [
-                    'Abaixo do peso',
-                    'Normal',
-                    'Sobrepeso',
-                    'Obesidade Grau I',
-                    'Obesidade Grau II',
-                    'Obesidade Grau III'
-                ]
-                
-                # Calcular classificação
-                classificacao_calculada = np.select(condicoes, escolhas, default=pd.NA)
-                df_filtrado['Classificação IMC'] = df_filtrado['Classificação IMC'].fillna(
-                    pd.Series(classificacao_calculada, index=df_filtrado.index))
-                df_filtrado['Classificação IMC'] = df_filtrado['Classificação IMC'].str.strip()
-                
-                # Criar tabela de cruzamento
-                tabela_cruzada = pd.crosstab(
-                    df_filtrado['Sexo do participante'], 
-                    df_filtrado['Classificação IMC'], 
-                    normalize='index') * 100
-                
-                # Exibir tabela formatada
-                st.dataframe(tabela_cruzada.style.format("{:.1f}%"), use_container_width=True)
-            else:
-                st.warning("Colunas necessárias para a tabela não encontradas ou DataFrame vazio.")
-
-            # Linha 2 de gráficos de Saúde
-            col1_saude_row2, col2_saude_row2 = st.columns(2)
-
-            with col1_saude_row2:
-                # Linha 1 de gráficos de Saúde (agora apenas com o gráfico de idade gestacional)
-                st.subheader("Idade em que a mãe do participante teve a gestação")
-                nome_coluna_idade_mae_original = 'Idade em que a mãe do participante teve a gestação'
-                if nome_coluna_idade_mae_original in df_filtrado.columns and not df_filtrado.empty:
-                    df_filtrado['Idade em que a mãe do participante teve a gestação_Numerica'] = pd.to_numeric(
-                        df_filtrado[nome_coluna_idade_mae_original], errors='coerce'
-                    )
-                    bins = [15, 24, 30, 35, 40, 45, 48]
-                    labels = ['16 - 24', '25 - 30', '31 - 35', '36 - 40', '41 - 45', '46 - 48']
-                    df_filtrado['Faixa Etária da Mãe'] = pd.cut(
-                        df_filtrado['Idade em que a mãe do participante teve a gestação_Numerica'],
-                        bins=bins, labels=labels, right=True, include_lowest=True
-                    )
-                    contagem_idade_mae = df_filtrado['Faixa Etária da Mãe'].value_counts(dropna=False).sort_index()
-                    contagem_idade_mae = contagem_idade_mae.reindex(labels, fill_value=0)
-                    total_idade_mae = contagem_idade_mae.sum()
-            
-                    if not contagem_idade_mae.empty and total_idade_mae > 0:
-                        fig, ax = plt.subplots(figsize=(9, 7))
-                        bars = ax.barh(contagem_idade_mae.index.astype(str), contagem_idade_mae.values, color='#92a9a7', edgecolor='#92a9a7')
-                        for i, (categoria, valor) in enumerate(contagem_idade_mae.items()):
-                            percentual = (valor / total_idade_mae) * 100
-                            ax.text(valor + 5, i, f'{percentual:.1f}%', va='center', fontsize=9)
-            
-                        max_val_for_xlim = contagem_idade_mae.max()
-                        if pd.notna(max_val_for_xlim) and max_val_for_xlim > 0:
-                            ax.set_xlim(0, max_val_for_xlim * 1.2)
-                        else:
-                            ax.set_xlim(0, 10)
-            
-                        ax.set_title('Distribuição da Idade Gestacional da Mãe por Faixa Etária', fontsize=14)
-                        ax.set_xlabel('Contagem de Mães', fontsize=12)
-                        ax.set_ylabel('Faixa Etária da Mãe', fontsize=12)
-                        ax.grid(axis='x', linestyle='--', alpha=0.5)
-                        plt.tight_layout()
-                        for spine in ax.spines.values():
-                            spine.set_visible(True)
-                            spine.set_linewidth(1.2)
-                        st.pyplot(fig, use_container_width=True)
-                        plt.close(fig)
-                    else:
-                        st.warning(f"Não há dados válidos para o gráfico de '{nome_coluna_idade_mae_original}'.")
-                else:
-                    st.warning(f"Coluna '{nome_coluna_idade_mae_original}' não encontrada ou DataFrame vazio.")
-
-            with col2_saude_row2:
-                st.subheader("Rede de Acompanhamento Pré-natal da Mãe")
-                if 'Realizou o acompanhamento pré natal na rede:' in df_filtrado.columns and not df_filtrado.empty:
-                    contagem = df_filtrado['Realizou o acompanhamento pré natal na rede:'].value_counts()
-                    total = contagem.sum()
-
-                    fig, ax = plt.subplots(figsize=(6, 5))
-                    bars = ax.barh(contagem.index.astype(str), contagem.values, color='#5fddaa', edgecolor='#5fddaa')
-
-                    for i, (categoria, valor) in enumerate(contagem.items()):
-                        percentual = (valor / total) * 100
-                        ax.text(valor + 5, i, f'{percentual:.1f}%', va='center', fontsize=9)
-
-                    ax.set_xlim(0, contagem.max() * 1.2)
-                    ax.set_title('Distribuição da rede onde a mãe realizou pré natal')
-                    ax.set_xlabel('Frequência')
-                    ax.set_ylabel('Rede')
-                    ax.grid(axis='x', linestyle='--', alpha=0.5)
-                    plt.tight_layout()
-                    for spine in ax.spines.values():
-                        spine.set_visible(True)
-                        spine.set_linewidth(1.2)
-                    st.pyplot(fig, use_container_width=True)
-                    plt.close(fig)
-                else:
-                    st.warning("Coluna 'Realizou o acompanhamento pré natal na rede:' não encontrada ou DataFrame vazio.")
-            
-            # Linha 3 de gráficos de Saúde
-            col1_saude_row3, col2_saude_row3 = st.columns(2)
-            
-            with col1_saude_row3:
-                st.subheader("Quando o Diagnóstico do Participante foi Realizado")
-                if 'O diagnóstico do participante foi realizado no' in df_filtrado.columns and not df_filtrado.empty:
-                    contagem = df_filtrado['O diagnóstico do participante foi realizado no'].value_counts()
-                    total = contagem.sum()
-
-                    fig, ax = plt.subplots(figsize=(6, 5))
-                    bars = ax.barh(contagem.index.astype(str), contagem.values, color='#7696dc', edgecolor='#7696dc')
-
-                    for i, (categoria, valor) in enumerate(contagem.items()):
-                        percentual = (valor / total) * 100
-                        ax.text(valor + 5, i, f'{percentual:.1f}%', va='center', fontsize=9)
-
-                    ax.set_xlim(0, contagem.max() * 1.2)
-                    ax.set_title('Distribuição de quando o diagnóstico do participante foi realizado')
-                    ax.set_xlabel('Frequência')
-                    ax.set_ylabel('Diagnóstico')
-                    ax.grid(axis='x', linestyle='--', alpha=0.5)
-                    plt.tight_layout()
-                    for spine in ax.spines.values():
-                        spine.set_visible(True)
-                        spine.set_linewidth(1.2)
-                    st.pyplot(fig, use_container_width=True)
-                    plt.close(fig)
-                else:
-                    st.warning("Coluna 'O diagnóstico do participante foi realizado no' não encontrada ou DataFrame vazio.")
-
-            with col2_saude_row3:
-                st.subheader("Foi feito o cariótipo?")
-                if 'Foi feito o cariótipo' in df_filtrado.columns and not df_filtrado.empty:
-                    df_filtrado['Foi feito o cariótipo'] = (
-                        df_filtrado['Foi feito o cariótipo']
-                        .astype(str)
-                        .str.lower()
-                        .str.strip()
-                    )
-                    contagem = df_filtrado['Foi feito o cariótipo'].value_counts()
-                    total = contagem.sum()
-
-                    ordem_desejada = ['não', 'sim']
-                    contagem = contagem.reindex(ordem_desejada).dropna()
-                    labels_formatados = [s.capitalize() for s in contagem.index]
-
-                    fig, ax = plt.subplots(figsize=(6, 5))
-                    bars = ax.bar(labels_formatados, contagem.values, color='#c5eea6', edgecolor='#c5eea6')
-
-                    for i, bar in enumerate(bars):
-                        height = bar.get_height()
-                        percentual = (height / total) * 100
-                        ax.text(bar.get_x() + bar.get_width() / 2, height + 1, f'{percentual:.1f}%',
-                                ha='center', va='bottom', fontsize=9)
-
-                    ax.set_title('Distribuição dos participantes que fizeram o cariótipo')
-                    ax.set_xlabel('Resposta')
-                    ax.set_ylabel('Frequência')
-                    ax.set_xticklabels(labels_formatados, rotation=0, ha='center', fontsize=10)
-                    ax.grid(axis='y', linestyle='--', alpha=0.5)
-                    plt.tight_layout()
-                    for spine in ax.spines.values():
-                        spine.set_visible(True)
-                        spine.set_linewidth(1.2)
-                    st.pyplot(fig, use_container_width=True)
-                    plt.close(fig)
-                else:
-                    st.warning("Coluna 'Foi feito o cariótipo' não encontrada ou DataFrame vazio.")
-
-            # Linha 4 de gráficos de Saúde
-            col1_saude_row4, col2_saude_row4 = st.columns(2)
-            
-            with col1_saude_row4:
-                st.subheader("Irmãos do participante possuem alguma deficiência?")
-                if 'Os irmãos do participante possui alguma deficiência' in df_filtrado.columns and not df_filtrado.empty:
-                    df_filtrado['Os irmãos do participante possui alguma deficiência'] = (
-                        df_filtrado['Os irmãos do participante possui alguma deficiência']
-                        .astype(str)
-                        .str.lower()
-                        .str.strip()
-                    )
-                    contagem = df_filtrado['Os irmãos do participante possui alguma deficiência'].value_counts()
-                    total = contagem.sum()
-
-                    ordem_desejada = ['não', 'sim']
-                    contagem = contagem.reindex(ordem_desejada).dropna()
-                    labels_formatados = [s.capitalize() for s in contagem.index]
-
-                    fig, ax = plt.subplots(figsize=(6, 5))
-                    bars = ax.bar(labels_formatados, contagem.values, color='#ea664d', edgecolor='#ea664d')
-
-                    for i, bar in enumerate(bars):
-                        height = bar.get_height()
-                        percentual = (height / total) * 100
-                        ax.text(bar.get_x() + bar.get_width() / 2, height + 1, f'{percentual:.1f}%',
-                                ha='center', va='bottom', fontsize=9)
-
-                    ax.set_title('Distribuição de irmãos com alguma deficiência')
-                    ax.set_xlabel('Resposta')
-                    ax.set_ylabel('Frequência')
-                    ax.set_xticklabels(labels_formatados, rotation=0, ha='center', fontsize=10)
-                    ax.grid(axis='y', linestyle='--', alpha=0.5)
-                    plt.tight_layout()
-                    for spine in ax.spines.values():
-                        spine.set_visible(True)
-                        spine.set_linewidth(1.2)
-                    st.pyplot(fig, use_container_width=True)
-                    plt.close(fig)
-                else:
-                    st.warning("Coluna 'Os irmãos do participante possui alguma deficiência' não encontrada ou DataFrame vazio.")
-
-            with col2_saude_row4:
-                st.subheader("Saúde Geral do Participante (Percepção do Cuidador)")
-                nome_coluna_saude_geral = 'Você considera que a saúde do participante em geral é'
-                if nome_coluna_saude_geral in df_filtrado.columns and not df_filtrado.empty:
-                    df_filtrado[nome_coluna_saude_geral] = df_filtrado[nome_coluna_saude_geral].astype(str).str.lower().str.strip()
-                    contagem_saude = df_filtrado[nome_coluna_saude_geral].value_counts(dropna=False)
-                    ordem_saude_desejada = ['muito boa', 'boa', 'excelente', 'regular', 'ruim', 'muito ruim', 'nan']
-                    contagem_saude = contagem_saude.reindex(ordem_saude_desejada, fill_value=0).dropna()
-                    contagem_saude = contagem_saude[contagem_saude > 0]
-                    total_saude = contagem_saude.sum()
-
-                    if not contagem_saude.empty and total_saude > 0:
-                        fig, ax = plt.subplots(figsize=(9, 7))
-                        bars = ax.barh(contagem_saude.index.astype(str), contagem_saude.values, color='#ff9486', edgecolor='#ff9486')
-                        for i, (categoria, valor) in enumerate(contagem_saude.items()):
-                            if total_saude > 0:
-                                percentual = (valor / total_saude) * 100
-                                ax.text(valor + 5, i, f'{percentual:.1f}%', va='center', fontsize=9)
-                            else:
-                                ax.text(valor + 5, i, '0.0%', va='center', fontsize=9)
-
-                        max_val_for_xlim = contagem_saude.max()
-                        if pd.notna(max_val_for_xlim) and max_val_for_xlim > 0:
-                            ax.set_xlim(0, max_val_for_xlim * 1.2)
-                        else:
-                            ax.set_xlim(0, 10)
-
-                        ax.set_title('Distribuição de como o cuidador considera a saúde do participante em geral', fontsize=14)
-                        ax.set_xlabel('Frequência', fontsize=12)
-                        ax.set_ylabel('Saúde em geral', fontsize=12)
-                        ax.grid(axis='x', linestyle='--', alpha=0.5)
-                        plt.tight_layout()
-                        for spine in ax.spines.values():
-                            spine.set_visible(True)
-                            spine.set_linewidth(1.2)
-                        st.pyplot(fig, use_container_width=True)
-                        plt.close(fig)
+                # Tabela de cruzamento entre Sexo e Classificação IMC
+                st.subheader("Distribuição do IMC por Sexo (%)")
+            
+                # Processamento dos dados para a tabela
+                if 'sexo' in esquema and 'classificacao_imc' in esquema and not df_filtrado.empty:
+                    # 'Classificação IMC' ausente já foi completada a partir do IMC na normalização
+                    # Criar tabela de cruzamento
+                    if filtros_cubo is not None:
+                        # Recorte coberto pelo cubo: a tabela sai das contagens, sem ler as linhas
+                        tabela_cruzada = cubo.cruzamento('sexo', 'classificacao_imc', filtros_cubo)
+                        tabela_cruzada = tabela_cruzada.div(tabela_cruzada.sum(axis=1), axis=0) * 100
                     else:
-                        st.warning(f"Não há dados válidos para o gráfico de '{nome_coluna_saude_geral}'.")
+                        tabela_cruzada = pd.crosstab(
+                            df_filtrado[esquema['sexo']],
+                            df_filtrado[esquema['classificacao_imc']],
+                            normalize='index') * 100
+                        # Rótulos categóricos viram texto simples para a serialização da tabela
+                        tabela_cruzada.index = tabela_cruzada.index.astype(object)
+                        tabela_cruzada.columns = tabela_cruzada.columns.astype(object)
+                
+                    # Exibir tabela formatada
+                    st.dataframe(tabela_cruzada.style.format("{:.1f}%"), use_container_width=True)
+                    imc_sinalizado = validacao.contagem(['imc_numerico', 'imc_intervalo', 'imc_peso_altura',
+                                                         'classificacao_imc_adulto'], df_filtrado.index)
+                    if imc_sinalizado:
+                        st.caption(f"{imc_sinalizado} participante(s) com IMC ou classificação sinalizados na validação (ver Qualidade dos dados na aba 2)")
                 else:
-                    st.warning(f"Coluna '{nome_coluna_saude_geral}' não encontrada ou DataFrame vazio.")
+                    st.warning("Colunas necessárias para a tabela não encontradas ou DataFrame vazio.")
 
- 
-            # Linha 5 de gráficos de Saúde
-            col1_saude_row5, col2_saude_row5 = st.columns(2)           
-
-            with col1_saude_row5:
-                st.subheader("Rede de Acompanhamento Psicológico")
-                if 'Realiza/realizou acompanhamento psicológico na rede' in df_filtrado.columns and not df_filtrado.empty:
-                    contagem = df_filtrado['Realiza/realizou acompanhamento psicológico na rede'].value_counts()
-                    total = contagem.sum()
-
-                    fig, ax = plt.subplots(figsize=(6, 5))
-                    bars = ax.barh(contagem.index.astype(str), contagem.values, color='#f5da7a', edgecolor='#f5da7a')
-
-                    for i, (categoria, valor) in enumerate(contagem.items()):
-                        percentual = (valor / total) * 100
-                        ax.text(valor + 5, i, f'{percentual:.1f}%', va='center', fontsize=9)
-
-                    ax.set_xlim(0, contagem.max() * 1.2)
-                    ax.set_title('Distribuição onde o participante realiza/realizou acompanhamento psicológico')
-                    ax.set_xlabel('Frequência')
-                    ax.set_ylabel('Rede')
-                    ax.grid(axis='x', linestyle='--', alpha=0.5)
-                    plt.tight_layout()
-                    for spine in ax.spines.values():
-                        spine.set_visible(True)
-                        spine.set_linewidth(1.2)
-                    st.pyplot(fig, use_container_width=True)
-                    plt.close(fig)
-                else:
-                    st.warning("Coluna 'Realiza/realizou acompanhamento psicológico na rede' não encontrada ou DataFrame vazio.")
+                # Linha 2 de gráficos de Saúde
+                col1_saude_row2, col2_saude_row2 = st.columns(2)
 
-            with col2_saude_row5:
-                st.subheader("Rede de Estimulação Precoce")
-            
-                if 'Realizou o programa de intervenção/estimulação precoce na rede' in df_filtrado.columns and not df_filtrado.empty:
-                    rede_estimulacao = df_filtrado['Realizou o programa de intervenção/estimulação precoce na rede'].copy()
-                    rede_estimulacao.replace('Particular', 'Privada', inplace=True)
+                with col1_saude_row2:
+                    # Linha 1 de gráficos de Saúde (agora apenas com o gráfico de idade gestacional)
+                    fora_das_faixas = validacao.contagem(['idade_mae_gestacao_numerico', 'idade_mae_gestacao_intervalo'],
+                                                         df_filtrado.index)
+                    nota = (f"{fora_das_faixas} mãe(s) com idade inválida fora do gráfico (ver Qualidade dos dados na aba 2)"
+                            if fora_das_faixas else None)
+                    show_bar_chart('idade_gestacional_mae_faixa_etaria', barras, impressao_dados, nota, pendentes)
 
-                    contagem = rede_estimulacao.value_counts()
-                    total = contagem.sum()
-                    porcentagem = (contagem / total) * 100
+                with col2_saude_row2:
+                    show_bar_chart('rede_mae_realizou_pre_natal', barras, impressao_dados, pendentes=pendentes)
             
-                    fig, ax = plt.subplots(figsize=(6, 5))
+                # Linha 3 de gráficos de Saúde
+                col1_saude_row3, col2_saude_row3 = st.columns(2)
             
-                    cor_unica = sns.color_palette("viridis", 1)[0]
-                    bars = ax.barh(contagem.index.astype(str), contagem.values, color=cor_unica, edgecolor=cor_unica)
-            
-                    for i, (categoria, valor) in enumerate(contagem.items()):
-                        percentual = porcentagem.loc[categoria]
-                        ax.text(valor + (contagem.max() * 0.05),
-                                i,
-                                f'{percentual:.1f}%',
-                                va='center',
-                                fontsize=9,
-                                color='black')
-            
-                    ax.set_xlim(0, contagem.max() * 1.2)
-                    ax.set_xlabel('Frequência')
-                    ax.set_ylabel('Rede')
-                    ax.invert_yaxis()
-                    ax.set_title('Distribuição onde o participante realizou estimulação precoce')
-                    ax.grid(axis='x', linestyle='--', alpha=0.5)
+                with col1_saude_row3:
+                    show_bar_chart('quando_diagnostico_realizado', barras, impressao_dados, pendentes=pendentes)
+
+                with col2_saude_row3:
+                    show_bar_chart('participantes_fizeram_cariotipo', barras, impressao_dados, pendentes=pendentes)
+
+                # Linha 4 de gráficos de Saúde
+                col1_saude_row4, col2_saude_row4 = st.columns(2)
             
-                    plt.tight_layout()
-                    for spine in ax.spines.values():
-                        spine.set_visible(True)
-                        spine.set_linewidth(1.2)
+                with col1_saude_row4:
+                    show_bar_chart('irmaos_deficiencia', barras, impressao_dados, pendentes=pendentes)
+
+                with col2_saude_row4:
+                    show_bar_chart('como_cuidador_saude_geral', barras, impressao_dados, pendentes=pendentes)
+
+ 
+                # Linha 5 de gráficos de Saúde
+                col1_saude_row5, col2_saude_row5 = st.columns(2)           
+
+                with col1_saude_row5:
+                    show_bar_chart('realiza_realizou_acompanhamento_psicologico', barras, impressao_dados, pendentes=pendentes)
+
+                with col2_saude_row5:
+                    show_bar_chart('realizou_estimulacao_precoce', barras, impressao_dados, pendentes=pendentes)
+
+                # Linha 6 de gráficos de Saúde
+                col1_saude_row6, col2_saude_row6 = st.columns(2)
             
-                    st.pyplot(fig, use_container_width=True)
-                    plt.close(fig)
+                with col1_saude_row6:
+                    show_bar_chart('faz_acompanhamento_clinico_geral', barras, impressao_dados, pendentes=pendentes)
 
-                else:
-                    st.warning("Coluna 'Realizou o programa de intervenção/estimulação precoce na rede' não encontrada ou DataFrame vazio.")
-
-            # Linha 6 de gráficos de Saúde
-            col1_saude_row6, col2_saude_row6 = st.columns(2)
-            
-            with col1_saude_row6:
-                st.subheader("Rede de Acompanhamento com Clínico Geral")
-                # Atenção: 'Se sim, o acompanhamento ocorre na rede1:' é o nome real da coluna
-                if 'Se sim, o acompanhamento ocorre na rede1:' in df_filtrado.columns and not df_filtrado.empty:
-                    contagem = df_filtrado['Se sim, o acompanhamento ocorre na rede1:'].value_counts()
-                    total = contagem.sum()
-
-                    fig, ax = plt.subplots(figsize=(6, 5))
-                    bars = ax.barh(contagem.index.astype(str), contagem.values, color='#a35572', edgecolor='#a35572')
-
-                    for i, (categoria, valor) in enumerate(contagem.items()):
-                        percentual = (valor / total) * 100
-                        ax.text(valor + 5, i, f'{percentual:.1f}%', va='center', fontsize=9)
-
-                    ax.set_xlim(0, contagem.max() * 1.2)
-                    ax.set_title('Distribuição onde o participante faz acompanhamento com clínico geral')
-                    ax.set_xlabel('Frequência')
-                    ax.set_ylabel('Rede')
-                    ax.grid(axis='x', linestyle='--', alpha=0.5)
-                    plt.tight_layout()
-                    for spine in ax.spines.values():
-                        spine.set_visible(True)
-                        spine.set_linewidth(1.2)
-                    st.pyplot(fig, use_container_width=True)
-                    plt.close(fig)
-                else:
-                    st.warning("Coluna 'Se sim, o acompanhamento ocorre na rede1:' não encontrada ou DataFrame vazio.")
-
-            with col2_saude_row6:
-                st.subheader("Rede de Acompanhamento com Dentista")
-                # Atenção: 'Se sim, o acompanhamento ocorre na rede2:' é o nome real da coluna
-                if 'Se sim, o acompanhamento ocorre na rede2:' in df_filtrado.columns and not df_filtrado.empty:
-                    contagem = df_filtrado['Se sim, o acompanhamento ocorre na rede2:'].value_counts()
-                    total = contagem.sum()
-
-                    fig, ax = plt.subplots(figsize=(6, 5))
-                    bars = ax.barh(contagem.index.astype(str), contagem.values, color='#8ccc81', edgecolor='#8ccc81')
-
-                    for i, (categoria, valor) in enumerate(contagem.items()):
-                        percentual = (valor / total) * 100
-                        ax.text(valor + 5, i, f'{percentual:.1f}%', va='center', fontsize=9)
-
-                    ax.set_xlim(0, contagem.max() * 1.2)
-                    ax.set_title('Distribuição onde o participante faz acompanhamento com dentista')
-                    ax.set_xlabel('Frequência')
-                    ax.set_ylabel('Rede')
-                    ax.grid(axis='x', linestyle='--', alpha=0.5)
-                    plt.tight_layout()
-                    for spine in ax.spines.values():
-                        spine.set_visible(True)
-                        spine.set_linewidth(1.2)
-                    st.pyplot(fig, use_container_width=True)
-                    plt.close(fig)
-                else:
-                    st.warning("Coluna 'Se sim, o acompanhamento ocorre na rede2:' não encontrada ou DataFrame vazio.")
-
-            # Linha 7 de gráficos de Saúde
-            col1_saude_row7, col2_saude_row7 = st.columns(2)            
-
-            with col1_saude_row7:
-                st.subheader("Rede de Acompanhamento com Nutricionista")
-                # Atenção: 'Se sim, o acompanhamento ocorre na rede3:' é o nome real da coluna
-                if 'Se sim, o acompanhamento ocorre na rede3:' in df_filtrado.columns and not df_filtrado.empty:
-                    contagem = df_filtrado['Se sim, o acompanhamento ocorre na rede3:'].value_counts()
-                    total = contagem.sum()
-
-                    fig, ax = plt.subplots(figsize=(6, 5))
-                    bars = ax.barh(contagem.index.astype(str), contagem.values, color='#d698b1', edgecolor='#d698b1')
-
-                    for i, (categoria, valor) in enumerate(contagem.items()):
-                        percentual = (valor / total) * 100
-                        ax.text(valor + 5, i, f'{percentual:.1f}%', va='center', fontsize=9)
-
-                    ax.set_xlim(0, contagem.max() * 1.2)
-                    ax.set_title('Distribuição onde o participante faz acompanhamento com nutricionista')
-                    ax.set_xlabel('Frequência')
-                    ax.set_ylabel('Rede')
-                    ax.grid(axis='x', linestyle='--', alpha=0.5)
-                    plt.tight_layout()
-                    for spine in ax.spines.values():
-                        spine.set_visible(True)
-                        spine.set_linewidth(1.2)
-                    st.pyplot(fig, use_container_width=True)
-                    plt.close(fig)
-                else:
-                    st.warning("Coluna 'Se sim, o acompanhamento ocorre na rede3:' não encontrada ou DataFrame vazio.")
-
-
-            with col2_saude_row7:
-                st.subheader("Rede de Acompanhamento com Oftalmologista")
-                # Atenção: 'Se sim, o acompanhamento ocorre na rede4:' é o nome real da coluna
-                if 'Se sim, o acompanhamento ocorre na rede4:' in df_filtrado.columns and not df_filtrado.empty:
-                    contagem = df_filtrado['Se sim, o acompanhamento ocorre na rede4:'].value_counts()
-                    total = contagem.sum()
-
-                    fig, ax = plt.subplots(figsize=(6, 5))
-                    bars = ax.barh(contagem.index.astype(str), contagem.values, color='#5b7c8d', edgecolor='#5b7c8d')
-
-                    for i, (categoria, valor) in enumerate(contagem.items()):
-                        percentual = (valor / total) * 100
-                        ax.text(valor + 5, i, f'{percentual:.1f}%', va='center', fontsize=9)
-
-                    ax.set_xlim(0, contagem.max() * 1.2)
-                    ax.set_title('Distribuição onde o participante faz acompanhamento com oftalmologista')
-                    ax.set_xlabel('Frequência')
-                    ax.set_ylabel('Rede')
-                    ax.grid(axis='x', linestyle='--', alpha=0.5)
-                    plt.tight_layout()
-                    for spine in ax.spines.values():
-                        spine.set_visible(True)
-                        spine.set_linewidth(1.2)
-                    st.pyplot(fig, use_container_width=True)
-                    plt.close(fig)
-                else:
-                    st.warning("Coluna 'Se sim, o acompanhamento ocorre na rede4:' não encontrada ou DataFrame vazio.")
+                with col2_saude_row6:
+                    show_bar_chart('faz_acompanhamento_dentista', barras, impressao_dados, pendentes=pendentes)
+
+                # Linha 7 de gráficos de Saúde
+                col1_saude_row7, col2_saude_row7 = st.columns(2)            
 
-            # Linha 8 de gráficos de Saúde
-            col1_saude_row8, col2_saude_row8 = st.columns(2) 
+                with col1_saude_row7:
+                    show_bar_chart('faz_acompanhamento_nutricionista', barras, impressao_dados, pendentes=pendentes)
+
+
+                with col2_saude_row7:
+                    show_bar_chart('faz_acompanhamento_oftalmologista', barras, impressao_dados, pendentes=pendentes)
+
+                # Linha 8 de gráficos de Saúde
+                col1_saude_row8, col2_saude_row8 = st.columns(2) 
             
-            with col1_saude_row8:
+                with col1_saude_row8:
 
-                # --- Gráfico de Diagnósticos Psicológicos (sem "Sem Diagnóstico") ---
-                st.subheader("Distribuição de Diagnósticos Psicológicos")
-                
-                # 1. Definir colunas de diagnóstico (removendo 'Não possui')
-                diagnosticos_cols = [
-                    'O participante possui diagnóstico médico de (Ansiedade)',
-                    'O participante possui diagnóstico médico de (Depressão)',
-                    'O participante possui diagnóstico médico de (Outros distúrbios de humor)'
-                ]
+                    # --- Gráfico de Diagnósticos Psicológicos (sem "Sem Diagnóstico") ---
+                    st.subheader("Distribuição de Diagnósticos Psicológicos")
                 
-                # Filtrar colunas existentes
-                cols_existentes = [col for col in diagnosticos_cols if col in df_filtrado.columns]
+                    # 1. Colunas de diagnóstico da família no registro (sem a opção 'Não possui')
+                    cols_existentes = esquema.familia('diagnosticos', incluir_nenhuma=False)
                 
-                if cols_existentes and not df_filtrado.empty:
-                    # 2. Processar os dados
-                    df_diag = df_filtrado[cols_existentes].copy()
+                    if cols_existentes and not df_filtrado.empty:
+                        # 2. Contar os diagnósticos (popcount na matriz de bits da família)
+                        contagem = banco.prevalencia('diagnosticos', df_filtrado.index)[cols_existentes]
+                        total = len(df_filtrado)
+                        porcentagem = (contagem / total) * 100
                     
-                    # Converter para valores booleanos
-                    for col in cols_existentes:
-                        df_diag[col] = df_diag[col].astype(str).str.strip().str.lower()
-                        df_diag[col] = df_diag[col].map({'sim': True, 'não': False, 'true': True, 'false': False}).fillna(False)
+                        # Renomear para nomes mais amigáveis
+                        nomes_amigaveis = {
+                            esquema['diagnosticos_ansiedade']: 'Ansiedade',
+                            esquema['diagnosticos_depressao']: 'Depressão',
+                            esquema['diagnosticos_outros_disturbios_humor']: 'Outros Distúrbios'
+                        }
+                        contagem.index = contagem.index.map(nomes_amigaveis)
+                        porcentagem.index = porcentagem.index.map(nomes_amigaveis)
                     
-                    # Contar os diagnósticos
-                    contagem = df_diag.sum()
-                    total = len(df_diag)
-                    porcentagem = (contagem / total) * 100
+                        # 3. Criar o gráfico
+                        def desenhar():
+                            fig, ax = plt.subplots(figsize=(10, 6))
                     
-                    # Renomear para nomes mais amigáveis
-                    nomes_amigaveis = {
-                        'O participante possui diagnóstico médico de (Ansiedade)': 'Ansiedade',
-                        'O participante possui diagnóstico médico de (Depressão)': 'Depressão',
-                        'O participante possui diagnóstico médico de (Outros distúrbios de humor)': 'Outros Distúrbios'
-                    }
-                    contagem.index = contagem.index.map(nomes_amigaveis)
-                    porcentagem.index = porcentagem.index.map(nomes_amigaveis)
+                            # Usar palette do Seaborn para cores consistentes
+                            cores = sns.color_palette("viridis", 1)
+                            barras = ax.bar(contagem.index, contagem.values, color=cores)
                     
-                    # 3. Criar o gráfico
-                    fig, ax = plt.subplots(figsize=(10, 6))
+                            # Adicionar valores e porcentagens
+                            for barra, valor, pct in zip(barras, contagem.values, porcentagem.values):
+                                altura = barra.get_height()
+                                ax.text(barra.get_x() + barra.get_width()/2, altura + 0.5,
+                                       f'{valor} ({pct:.1f}%)', ha='center', va='bottom', fontsize=10)
                     
-                    # Usar palette do Seaborn para cores consistentes
-                    cores = sns.color_palette("viridis", 1)
-                    barras = ax.bar(contagem.index, contagem.values, color=cores)
+                            # Configurações do gráfico
+                            ax.set_title('Prevalência de Diagnósticos Psicológicos', fontsize=14, pad=20)
+                            ax.set_xlabel('Tipo de Diagnóstico', fontsize=12)
+                            ax.set_ylabel('Frquência', fontsize=12)
+                            ax.grid(axis='y', linestyle='--', alpha=0.7)
+                            ax.set_ylim(0, contagem.max() * 1.2)
+                            plt.xticks(rotation=45, ha='right')
                     
-                    # Adicionar valores e porcentagens
-                    for barra, valor, pct in zip(barras, contagem.values, porcentagem.values):
-                        altura = barra.get_height()
-                        ax.text(barra.get_x() + barra.get_width()/2, altura + 0.5,
-                               f'{valor} ({pct:.1f}%)', ha='center', va='bottom', fontsize=10)
-                    
-                    # Configurações do gráfico
-                    ax.set_title('Prevalência de Diagnósticos Psicológicos', fontsize=14, pad=20)
-                    ax.set_xlabel('Tipo de Diagnóstico', fontsize=12)
-                    ax.set_ylabel('Frquência', fontsize=12)
-                    ax.grid(axis='y', linestyle='--', alpha=0.7)
-                    ax.set_ylim(0, contagem.max() * 1.2)
-                    plt.xticks(rotation=45, ha='right')
-                    
-                    plt.tight_layout()
-                    st.pyplot(fig, use_container_width=True)
-                    plt.close(fig)
+                            plt.tight_layout()
+                            return fig
+                        show_cached_figure('prevalencia_diagnosticos_psicologicos', desenhar, impressao_dados)
                         
-                else:
-                    st.warning("Nenhum dado de diagnóstico psicológico disponível após os filtros aplicados.")
-
-            # --- Seção: Distribuição de Imunizações (Vacinas) ---
-            with col2_saude_row8:
-                st.subheader("Distribuição de Imunizações (Vacinas)")
-                colunas_imunizacao = [
-                    'Recebeu alguma das imunizações a seguir (Palivizumabe)',
-                    'Recebeu alguma das imunizações a seguir (BCG)',
-                    'Recebeu alguma das imunizações a seguir (Hepatite B)',
-                    'Recebeu alguma das imunizações a seguir (Rotavirus)',
-                    'Recebeu alguma das imunizações a seguir (Tríplice bacteriana)',
-                    'Recebeu alguma das imunizações a seguir (Haemophilus influenzae b)',
-                    'Recebeu alguma das imunizações a seguir (Poliomielite vírus inativado)',
-                    'Recebeu alguma das imunizações a seguir (Poliomielite oral)',
-                    'Recebeu alguma das imunizações a seguir (Pneumocócicas conjugadas)',
-                    'Recebeu alguma das imunizações a seguir (Meningocócicas conjugadas)',
-                    'Recebeu alguma das imunizações a seguir (Meningocócica B)',
-                    'Recebeu alguma das imunizações a seguir (Influenza)',
-                    'Recebeu alguma das imunizações a seguir (Febre amarela)',
-                    'Recebeu alguma das imunizações a seguir (Tríplice viral)',
-                    'Recebeu alguma das imunizações a seguir (Varicela)',
-                    'Recebeu alguma das imunizações a seguir (Hepatite A)',
-                    'Recebeu alguma das imunizações a seguir (HPV)',
-                    'Recebeu alguma das imunizações a seguir (Difteria e tétano adulto)',
-                    'Recebeu alguma das imunizações a seguir (Herpes zoster)',
-                    'Recebeu alguma das imunizações a seguir (Dengue)',
-                    'Recebeu alguma das imunizações a seguir (Recebeu todas)'
-                ]
-            
-                colunas_existentes_imunizacao = [col for col in colunas_imunizacao if col in df_filtrado.columns]
-            
-                if not colunas_existentes_imunizacao:
-                    st.warning("Nenhuma coluna de imunização (vacinas) foi encontrada no DataFrame. Verifique os nomes.")
-                else:
-                    contagens_vacinas = {}
-                    total_participantes_para_porcentagem = len(df_filtrado)
-            
-                    if total_participantes_para_porcentagem == 0:
-                        st.info("Nenhum participante encontrado com os filtros selecionados para exibir imunizações.")
                     else:
-                        df_temp_imunizacao = df_filtrado.copy()
-            
-                        for col_imunizacao_single in colunas_existentes_imunizacao:
-                            df_temp_imunizacao[col_imunizacao_single] = df_temp_imunizacao[col_imunizacao_single].astype(str).str.strip().str.lower()
-                            df_temp_imunizacao[col_imunizacao_single] = df_temp_imunizacao[col_imunizacao_single].apply(lambda x: 'Sim' if x == 'sim' else 'Não')
-                        
-                            count_sim = df_temp_imunizacao[df_temp_imunizacao[col_imunizacao_single] == 'Sim'].shape[0]
-                        
-                            if '(' in col_imunizacao_single and ')' in col_imunizacao_single:
-                                nome_vacina_limpo = col_imunizacao_single.split('(')[-1].replace(')', '')
-                            else:
-                                nome_vacina_limpo = col_imunizacao_single
-            
-                            if count_sim > 0:
-                                contagens_vacinas[nome_vacina_limpo] = count_sim
-            
-                        if not contagens_vacinas:
-                            st.info("Nenhuma vacina possui contagens positivas para plotar com os filtros selecionados.")
-                        else:
-                            contagem_series = pd.Series(contagens_vacinas).sort_values(ascending=True)
-            
-                            fig, ax = plt.subplots(figsize=(8, max(6, len(contagem_series) * 0.4)))
-            
-                            cor_unica = '#f5da7a'
-                            bars = ax.barh(contagem_series.index, contagem_series.values, color=cor_unica, edgecolor=cor_unica)
-            
-                            for i, (vacina, valor) in enumerate(contagem_series.items()):
-                                percentual = (valor / total_participantes_para_porcentagem) * 100
-                                ax.text(valor + (contagem_series.max() * 0.02),
-                                        i,
-                                        f'{percentual:.1f}%',
-                                        va='center',
-                                        fontsize=9,
-                                        color='black')
-            
-                            ax.set_xlim(0, contagem_series.max() * 1.25)
-                            ax.set_title('Distribuição de imunizações/vacinas entre os participantes', fontsize=16)
-                            ax.set_xlabel('Frequência')
-                            ax.set_ylabel('Imunizante/vacina')
-                            ax.grid(axis='x', linestyle='--', alpha=0.5)
-                            plt.tight_layout()
-            
-                            for spine in ax.spines.values():
-                                spine.set_visible(True)
-                                spine.set_linewidth(1.2)
-            
-                            st.pyplot(fig, use_container_width=True)
-                            plt.close(fig)
+                        st.warning("Nenhum dado de diagnóstico psicológico disponível após os filtros aplicados.")
 
-            # ------------------------------------------------------------------------
+                # --- Seção: Distribuição de Imunizações (Vacinas) ---
+                with col2_saude_row8:
+                    show_bar_chart('imunizacoes_vacinas_entre_participantes', barras, impressao_dados, pendentes=pendentes)
+
+                # ------------------------------------------------------------------------
                    
-            # --- Prevalência de Morbidades e/ou Doenças ---
-            st.subheader("Prevalência de Morbidades e/ou Doenças")
-            col_morbidades = [col for col in df_filtrado.columns if 'Apresenta algumas das morbidades' in col]
-            
-            if col_morbidades and not df_filtrado.empty:
-                df_morbidades_temp = df_filtrado[col_morbidades].copy()
-                for col in col_morbidades:
-                    df_morbidades_temp[col] = df_morbidades_temp[col].astype(str).str.strip().str.lower()
-                    df_morbidades_temp[col] = df_morbidades_temp[col].map({'sim': 'Sim', 'não': 'Não', 'nan': 'Não'}).fillna('Não')
-            
-                df_morbidades_long = df_morbidades_temp.melt(var_name='Morbidade', value_name='Status')
-                df_morbidades_sim = df_morbidades_long[df_morbidades_long['Status'] == 'Sim']
-                contagem_morbidades = df_morbidades_sim['Morbidade'].value_counts().reset_index()
-                contagem_morbidades.columns = ['Morbidade', 'Contagem']
-                contagem_morbidades['Morbidade Limpa'] = contagem_morbidades['Morbidade'].str.replace('Apresenta algumas das morbidades (', '').str.replace(')', '')
-            
-                if not contagem_morbidades.empty:
-                    total_morbidades_sim = contagem_morbidades['Contagem'].sum()
-                    contagem_morbidades['Porcentagem'] = (contagem_morbidades['Contagem'] / total_morbidades_sim) * 100
-                    contagem_morbidades['Morbidade_ID'] = range(1, len(contagem_morbidades) + 1)
-            
-                    # Criar figura com dois subplots - um para a legenda e outro para o treemap
-                    fig = plt.figure(figsize=(14, 12))
+                # --- Prevalência de Morbidades e/ou Doenças ---
+                st.subheader("Prevalência de Morbidades e/ou Doenças")
+                col_morbidades = esquema.familia('morbidades')
+            
+                if col_morbidades and not df_filtrado.empty:
+                    contagem_morbidades = banco.prevalencia('morbidades', df_filtrado.index)
+                    contagem_morbidades = contagem_morbidades[contagem_morbidades > 0].sort_values(ascending=False, kind='stable')
+                    contagem_morbidades = contagem_morbidades.rename_axis('Morbidade').reset_index(name='Contagem')
+                    contagem_morbidades['Morbidade Limpa'] = contagem_morbidades['Morbidade'].str.replace('Apresenta algumas das morbidades (', '').str.replace(')', '')
+            
+                    if not contagem_morbidades.empty:
+                        total_morbidades_sim = contagem_morbidades['Contagem'].sum()
+                        contagem_morbidades['Porcentagem'] = (contagem_morbidades['Contagem'] / total_morbidades_sim) * 100
+                        contagem_morbidades['Morbidade_ID'] = range(1, len(contagem_morbidades) + 1)
+            
+                        # Criar figura com dois subplots - um para a legenda e outro para o treemap
+                        def desenhar():
+                            fig = plt.figure(figsize=(14, 12))
                     
-                    # Subplot 1 - apenas para a legenda (topo)
-                    ax1 = plt.subplot2grid((10, 1), (0, 0), rowspan=2)
-                    ax1.axis('off')
+                            # Subplot 1 - apenas para a legenda (topo)
+                            ax1 = plt.subplot2grid((10, 1), (0, 0), rowspan=2)
+                            ax1.axis('off')
                     
-                    # Subplot 2 - para o treemap (parte inferior)
-                    ax2 = plt.subplot2grid((10, 1), (2, 0), rowspan=8)
+                            # Subplot 2 - para o treemap (parte inferior)
+                            ax2 = plt.subplot2grid((10, 1), (2, 0), rowspan=8)
                     
-                    colors = [plt.cm.viridis(i / float(len(contagem_morbidades['Contagem']))) for i in range(len(contagem_morbidades['Contagem']))]
+                            colors = [plt.cm.viridis(i / float(len(contagem_morbidades['Contagem']))) for i in range(len(contagem_morbidades['Contagem']))]
             
-                    # Gerar a legenda no subplot superior
-                    legend_labels = []
-                    for index, row in contagem_morbidades.iterrows():
-                        legend_labels.append(
-                            f"{row['Morbidade_ID']}: {row['Morbidade Limpa']} "
-                            f"({row['Contagem']} - {row['Porcentagem']:.1f}%)"
-                        )
+                            # Gerar a legenda no subplot superior
+                            legend_labels = []
+                            for index, row in contagem_morbidades.iterrows():
+                                legend_labels.append(
+                                    f"{row['Morbidade_ID']}: {row['Morbidade Limpa']} "
+                                    f"({row['Contagem']} - {row['Porcentagem']:.1f}%)"
+                                )
             
-                    legend_patches = [plt.Rectangle((0, 0), 1, 1, fc=colors[i], ec="none") for i in range(len(colors))]
+                            legend_patches = [plt.Rectangle((0, 0), 1, 1, fc=colors[i], ec="none") for i in range(len(colors))]
                     
-                    # Criar legenda no subplot superior
-                    ax1.legend(legend_patches, legend_labels, title="Detalhes das Morbidades",
-                              loc='center', ncol=2, fontsize=9)
+                            # Criar legenda no subplot superior
+                            ax1.legend(legend_patches, legend_labels, title="Detalhes das Morbidades",
+                                      loc='center', ncol=2, fontsize=9)
                     
-                    # Gerar o treemap no subplot inferior
-                    squarify.plot(
-                        sizes=contagem_morbidades['Contagem'],
-                        label=contagem_morbidades['Morbidade_ID'].astype(str),
-                        color=colors,
-                        alpha=.8,
-                        pad=True,
-                        text_kwargs={'fontsize': 10, 'weight': 'bold', 'color': 'white'},
-                        ax=ax2
-                    )
-            
-                    ax2.set_title('Distribuição das Morbidades', fontsize=12)
-                    ax2.axis('off')
+                            # Gerar o treemap no subplot inferior
+                            squarify.plot(
+                                sizes=contagem_morbidades['Contagem'],
+                                label=contagem_morbidades['Morbidade_ID'].astype(str),
+                                color=colors,
+                                alpha=.8,
+                                pad=True,
+                                text_kwargs={'fontsize': 10, 'weight': 'bold', 'color': 'white'},
+                                ax=ax2
+                            )
+            
+                            ax2.set_title('Distribuição das Morbidades', fontsize=12)
+                            ax2.axis('off')
                     
-                    plt.tight_layout()
-                    st.pyplot(fig, use_container_width=True)
-                    plt.close(fig)
+                            plt.tight_layout()
+                            return fig
+                        show_cached_figure('morbidades', desenhar, impressao_dados, interativo=lambda: px.treemap(
+                            contagem_morbidades, path=['Morbidade Limpa'], values='Contagem', color='Contagem',
+                            color_continuous_scale='viridis', hover_data={'Porcentagem': ':.1f'},
+                            title='Distribuição das Morbidades'))
+
+                        # Coocorrência: participantes com cada par de morbidades (AND + popcount entre as opções)
+                        with st.expander("Morbidades que ocorrem juntas"):
+                            coocorrencia = banco.coocorrencia('morbidades', df_filtrado.index)
+                            coocorrencia = coocorrencia.loc[contagem_morbidades['Morbidade'], contagem_morbidades['Morbidade']]
+                            rotulos_ids = contagem_morbidades['Morbidade_ID'].astype(str).tolist()
+                            coocorrencia.index = rotulos_ids
+                            coocorrencia.columns = rotulos_ids
+
+                            def desenhar():
+                                fig, ax = plt.subplots(figsize=(10, 8))
+                                sns.heatmap(coocorrencia, annot=True, fmt='d', cmap='viridis', cbar_kws={'label': 'Participantes'}, ax=ax)
+                                ax.set_title('Coocorrência de Morbidades (números conforme a legenda acima)', fontsize=12)
+                                ax.set_xlabel('Morbidade')
+                                ax.set_ylabel('Morbidade')
+                                plt.tight_layout()
+                                return fig
+                            show_cached_figure('coocorrencia_morbidades_numeros_conforme_legenda', desenhar, impressao_dados,
+                                               interativo=lambda: mapa_calor_interativo(
+                                                   coocorrencia, 'Coocorrência de Morbidades (números conforme a legenda acima)',
+                                                   escala='viridis', formato='d', limites=None))
+                    else:
+                        st.warning("Não há dados de morbidades 'Sim' para gerar a treemap após os filtros.")
                 else:
-                    st.warning("Não há dados de morbidades 'Sim' para gerar a treemap após os filtros.")
-            else:
-                st.warning("Não foram encontradas colunas de morbidades ou DataFrame vazio.")
+                    st.warning("Não foram encontradas colunas de morbidades ou DataFrame vazio.")
 
-            # -----------------------------------------
-            col1_saude_row8, col2_saude_row8 = st.columns(2) 
+                # -----------------------------------------
+                col1_saude_row8, col2_saude_row8 = st.columns(2) 
     
-            with col1_saude_row8:
-                # --- Gráfico de Doenças Apesar das Imunizações ---
-                st.subheader("Doenças Apesar das Imunizações")
-                
-                # 1. Definir as colunas de imunização (Vacinas)
-                colunas_imunizacao = [
-                    'Apesar das imunizações, teve alguma dessas doenças (Tuberculose)',
-                    'Apesar das imunizações, teve alguma dessas doenças (Hepatite B)',
-                    'Apesar das imunizações, teve alguma dessas doenças (Poliomielite)',
-                    'Apesar das imunizações, teve alguma dessas doenças (Diarreia por rotavírus)',
-                    'Apesar das imunizações, teve alguma dessas doenças (Dfiteria)',
-                    'Apesar das imunizações, teve alguma dessas doenças (Tétano)',
-                    'Apesar das imunizações, teve alguma dessas doenças (Coqueluche)',
-                    'Apesar das imunizações, teve alguma dessas doenças (Haemophilus influenzae B)',
-                    'Apesar das imunizações, teve alguma dessas doenças (Pneumonia)',
-                    'Apesar das imunizações, teve alguma dessas doenças (Meningite)',
-                    'Apesar das imunizações, teve alguma dessas doenças (Febre amarela)',
-                    'Apesar das imunizações, teve alguma dessas doenças (Sarampo)',
-                    'Apesar das imunizações, teve alguma dessas doenças (Caxumba)',
-                    'Apesar das imunizações, teve alguma dessas doenças (Rubéola)',
-                    'Apesar das imunizações, teve alguma dessas doenças (Varicela/catapora)',
-                    'Apesar das imunizações, teve alguma dessas doenças (Hepatite A)',
-                    'Apesar das imunizações, teve alguma dessas doenças (Papiloma vírus)',
-                    'Apesar das imunizações, teve alguma dessas doenças (Dengue)',
-                    'Apesar das imunizações, teve alguma dessas doenças (Não teve)',
-                ]
-                
-                # Filtrar apenas as colunas que existem no DataFrame filtrado
-                colunas_existentes_imunizacao = [col for col in colunas_imunizacao if col in df_filtrado.columns]
-                
-                if not colunas_existentes_imunizacao:
-                    st.warning("Nenhuma coluna de doenças pós-imunização encontrada após os filtros aplicados.")
-                else:
-                    contagens_vacinas = {}
-                    total_participantes = len(df_filtrado)
-                    
-                    if total_participantes == 0:
-                        st.info("Nenhum participante encontrado com os filtros selecionados.")
-                    else:
-                        df_temp = df_filtrado.copy()
-                        
-                        for col_imunizacao in colunas_existentes_imunizacao:
-                            # Padronizar valores
-                            df_temp[col_imunizacao] = df_temp[col_imunizacao].astype(str).str.strip().str.lower()
-                            df_temp[col_imunizacao] = df_temp[col_imunizacao].apply(lambda x: 'Sim' if x == 'sim' else 'Não')
-                            
-                            # Contar ocorrências
-                            count_sim = df_temp[df_temp[col_imunizacao] == 'Sim'].shape[0]
-                            
-                            # Extrair nome limpo
-                            if '(' in col_imunizacao and ')' in col_imunizacao:
-                                nome_doenca = col_imunizacao.split('(')[-1].replace(')', '')
-                            else:
-                                nome_doenca = col_imunizacao
-                            
-                            if count_sim > 0:
-                                contagens_vacinas[nome_doenca] = count_sim
-                        
-                        if not contagens_vacinas:
-                            st.info("Nenhuma doença reportada após imunização com os filtros selecionados.")
-                        else:
-                            contagem_series = pd.Series(contagens_vacinas).sort_values(ascending=True)
-                            
-                            fig, ax = plt.subplots(figsize=(8, max(6, len(contagem_series) * 0.4)))
-                            bars = ax.barh(contagem_series.index, contagem_series.values, color='#79aba2', edgecolor='#79aba2')
-                            
-                            # Adicionar porcentagens
-                            for i, (doenca, valor) in enumerate(contagem_series.items()):
-                                percentual = (valor / total_participantes) * 100
-                                ax.text(valor + (contagem_series.max() * 0.02), i, 
-                                        f'{percentual:.1f}%', va='center', fontsize=9)
-                            
-                            ax.set_xlim(0, contagem_series.max() * 1.25)
-                            ax.set_title('Doenças contraídas apesar das imunizações', fontsize=14)
-                            ax.set_xlabel('Frequência')
-                            ax.set_ylabel('Doenças')
-                            ax.grid(axis='x', linestyle='--', alpha=0.5)
-                            
-                            for spine in ax.spines.values():
-                                spine.set_visible(True)
-                                spine.set_linewidth(1.2)
-                            
-                            plt.tight_layout()
-                            st.pyplot(fig, use_container_width=True)
-                            plt.close(fig)
+                with col1_saude_row8:
+                    # --- Gráfico de Doenças Apesar das Imunizações ---
+                    show_bar_chart('doencas_contraidas_apesar_imunizacoes', barras, impressao_dados, pendentes=pendentes)
             
-            with col2_saude_row8:
-                # --- Gráfico de Gravidade da COVID ---
-                st.subheader("Gravidade da COVID")
-                
-                if 'Gravidade da COVID do participante' not in df_filtrado.columns:
-                    st.warning("Coluna 'Gravidade da COVID do participante' não encontrada.")
-                else:
-                    contagem = df_filtrado['Gravidade da COVID do participante'].value_counts()
-                    total = contagem.sum()
-                    
-                    if total == 0:
-                        st.info("Nenhum dado disponível sobre gravidade da COVID com os filtros aplicados.")
-                    else:
-                        fig, ax = plt.subplots(figsize=(6, 5))
-                        bars = ax.barh(contagem.index.astype(str), contagem.values, color='#c3c2ff', edgecolor='#c3c2ff')
-                        
-                        # Adicionar porcentagens
-                        for i, (categoria, valor) in enumerate(contagem.items()):
-                            percentual = (valor / total) * 100
-                            ax.text(valor + 5, i, f'{percentual:.1f}%', va='center', fontsize=9)
-                        
-                        ax.set_xlim(0, contagem.max() * 1.2)
-                        ax.set_title('Gravidade da COVID entre participantes', fontsize=14)
-                        ax.set_xlabel('Frequência')
-                        ax.set_ylabel('Gravidade')
-                        ax.grid(axis='x', linestyle='--', alpha=0.5)
-                        
-                        for spine in ax.spines.values():
-                            spine.set_visible(True)
-                            spine.set_linewidth(1.2)
-                        
-                        plt.tight_layout()
-                        st.pyplot(fig, use_container_width=True)
-                        plt.close(fig)
+                with col2_saude_row8:
+                    # --- Gráfico de Gravidade da COVID ---
+                    show_bar_chart('gravidade_covid_entre_participantes', barras, impressao_dados, pendentes=pendentes)
     
-            # ---------------------
-            # Tabela de distribuição de doses de vacina COVID-19
-            st.subheader("Distribuição de Doses de Vacina COVID-19")
-            
-            # Definir as colunas de interesse
-            doses = [
-                'Tomou a 1ª dose da COVID',
-                'Tomou a 2ª dose da COVID',
-                'Tomou a 3ª dose da COVID',
-                'Tomou a 4ª dose da COVID',
-                'Tomou a 5ª dose da COVID',
-                'Tomou a 6ª dose da COVID'
-            ]
-            
-            # Verificar quais colunas existem no DataFrame
-            doses_existentes = [col for col in doses if col in df_filtrado.columns]
-            
-            if not doses_existentes:
-                st.warning("Nenhuma informação sobre doses de vacina disponível.")
-            else:
-                # Criar DataFrame vazio com o formato desejado
-                tabela_resultado = pd.DataFrame(index=['Não', 'Sim'], columns=doses_existentes)
+                # ---------------------
+                # Tabela de distribuição de doses de vacina COVID-19
+                st.subheader("Distribuição de Doses de Vacina COVID-19")
+            
+                # Colunas das seis doses no registro
+                ids_doses = [f'tomou_{dose}a_dose_covid' for dose in range(1, 7)]
+                doses_existentes = [esquema[id_dose] for id_dose in ids_doses if id_dose in esquema]
+            
+                if not doses_existentes:
+                    st.warning("Nenhuma informação sobre doses de vacina disponível.")
+                else:
+                    # Criar DataFrame vazio com o formato desejado
+                    tabela_resultado = pd.DataFrame(index=['Não', 'Sim'], columns=doses_existentes)
                 
-                # Preencher o DataFrame com as contagens
-                for dose in doses_existentes:
-                    # Contar valores 'Sim' e 'Não', considerando NaN como 'Não'
-                    contagens = df_filtrado[dose].fillna('Não').value_counts()
+                    # Preencher o DataFrame com as contagens
+                    for dose in doses_existentes:
+                        # Contar valores 'Sim' e 'Não', considerando NaN como 'Não'
+                        contagens = df_filtrado[dose].fillna(False).value_counts()
                     
-                    # Preencher os valores na tabela
-                    tabela_resultado.loc['Não', dose] = contagens.get('Não', 0)
-                    tabela_resultado.loc['Sim', dose] = contagens.get('Sim', 0)
-                
-                # Converter todos valores para inteiros
-                tabela_resultado = tabela_resultado.fillna(0).astype(int)
+                        # Preencher os valores na tabela
+                        tabela_resultado.loc['Não', dose] = contagens.get(False, 0)
+                        tabela_resultado.loc['Sim', dose] = contagens.get(True, 0)
                 
-                # Exibir a tabela formatada
-                st.dataframe(
-                    tabela_resultado.style
-                        .format("{:d}")  # Formato inteiro sem decimais
-                        .set_properties(**{'text-align': 'center'})
-                        .set_table_styles([{
-                            'selector': 'th',
-                            'props': [('background-color', '#f0f2f6'), 
-                                     ('font-weight', 'bold'),
-                                     ('text-align', 'center')]
-                        }]),
-                    use_container_width=True
-                )
-                
-                # Adicionar informação do total de respondentes
-                st.caption(f"Total de participantes analisados: {len(df_filtrado)}")
-            # ---------------------
-            # --- GRÁFICO DE MEDICAÇÕES (FULL WIDTH) ---
-            st.subheader("Medicações Utilizadas pelos Participantes")
-            
-            colunas_medicacoes = [
-                'O participante toma alguma dessas medicações (Antidepressivo/ansiolitico)',
-                'O participante toma alguma dessas medicações (Anti-hipertensivo/ICC)',
-                'O participante toma alguma dessas medicações (Antidiabético em geral)',
-                'O participante toma alguma dessas medicações (Estatina/antidislipidemico)',
-                'O participante toma alguma dessas medicações (Repositor hormonal da tireoide)',
-                'O participante toma alguma dessas medicações (Vitamina D)',
-                'O participante toma alguma dessas medicações (Glicocorticoide)',
-                'O participante toma alguma dessas medicações (Outros)',
-                'O participante toma alguma dessas medicações (Não toma medicação)',
-            ]
-            
-            colunas_existentes = [col for col in colunas_medicacoes if col in df_filtrado.columns]
-            
-            if not colunas_existentes:
-                st.warning("Nenhuma informação sobre medicações disponível.")
-            else:
-                contagens = {}
-                total = len(df_filtrado)
+                    # Converter todos valores para inteiros
+                    tabela_resultado = tabela_resultado.fillna(0).astype(int)
                 
-                for col in colunas_existentes:
-                    # Padronizar valores
-                    df_filtrado[col] = df_filtrado[col].astype(str).str.strip().str.lower()
-                    count_sim = (df_filtrado[col] == 'sim').sum()
-                    
-                    # Extrair nome da medicação
-                    nome = col.split('(')[-1].replace(')', '') if '(' in col else col
-                    contagens[nome] = count_sim
-                
-                if not contagens:
-                    st.info("Nenhuma medicação com contagens positivas.")
-                else:
-                    serie_contagens = pd.Series(contagens).sort_values()
-                    
-                    fig, ax = plt.subplots(figsize=(10, max(4, len(serie_contagens)*0.5)))  # Ajustado para full width
-                    bars = ax.barh(serie_contagens.index, serie_contagens.values, color='#fbc599')
-                    
-                    # Adicionar porcentagens
-                    for i, (med, valor) in enumerate(serie_contagens.items()):
-                        percent = (valor/total)*100
-                        ax.text(valor + serie_contagens.max()*0.02, i, 
-                                f'({percent:.1f}%)', va='center', fontsize=10)
-                    
-                    ax.set_xlim(0, serie_contagens.max()*1.3)  # Aumentado espaço para texto
-                    ax.set_title('Uso de Medicações pelos Participantes', fontsize=16, pad=20)
-                    ax.set_xlabel('Frequência', fontsize=12)
-                    ax.set_ylabel('Tipo de Medicação', fontsize=12)
-                    ax.grid(axis='x', linestyle='--', alpha=0.7)
-                    
-                    # Melhorar a estética
-                    for spine in ax.spines.values():
-                        spine.set_visible(True)
-                        spine.set_linewidth(1.5)
-                    
-                    plt.tight_layout()
-                    st.pyplot(fig, use_container_width=True)
-                    plt.close(fig)
-
-            col1_saude_row9, col2_saude_row9 = st.columns(2) 
-            
-            with col1_saude_row9:
-                # --- GRÁFICO DE ATIVIDADE FÍSICA ---
-                st.subheader("Prática de Atividade Física")
-                
-                if 'Pratica alguma atividade física ou esporte' not in df_filtrado.columns:
-                    st.warning("Dados sobre atividade física não disponíveis.")
-                else:
-                    # Processar dados
-                    df_filtrado['Atividade_Fisica'] = (
-                        df_filtrado['Pratica alguma atividade física ou esporte']
-                        .astype(str)
-                        .str.lower()
-                        .str.strip()
+                    # Exibir a tabela formatada
+                    st.dataframe(
+                        tabela_resultado.style
+                            .format("{:d}")  # Formato inteiro sem decimais
+                            .set_properties(**{'text-align': 'center'})
+                            .set_table_styles([{
+                                'selector': 'th',
+                                'props': [('background-color', '#f0f2f6'), 
+                                         ('font-weight', 'bold'),
+                                         ('text-align', 'center')]
+                            }]),
+                        use_container_width=True
                     )
-                    
-                    contagem = df_filtrado['Atividade_Fisica'].value_counts()
-                    total = contagem.sum()
-                    
-                    # Ordenar e formatar
-                    ordem = ['não', 'sim']
-                    contagem = contagem.reindex(ordem).dropna()
-                    labels = [s.capitalize() for s in contagem.index]
-                    
-                    if contagem.empty:
-                        st.info("Nenhum dado disponível sobre atividade física.")
-                    else:
-                        fig, ax = plt.subplots(figsize=(6, 5))
-                        bars = ax.bar(labels, contagem.values, color='#aef055')
-                        
-                        # Adicionar porcentagens
-                        for bar in bars:
-                            height = bar.get_height()
-                            percent = (height/total)*100
-                            ax.text(bar.get_x() + bar.get_width()/2, height + 1,
-                                    f'{percent:.1f}%', ha='center', va='bottom')
-                        
-                        ax.set_title('Prática de Atividade Física', fontsize=14)
-                        ax.set_xlabel('Resposta')
-                        ax.set_ylabel('Número de Participantes')
-                        ax.grid(axis='y', linestyle='--', alpha=0.5)
-                        
-                        st.pyplot(fig, use_container_width=True)
-                        plt.close(fig)
-                        
-            # ---------------------            
-            with col2_saude_row9:
-                # --- GRÁFICO DE FREQUÊNCIA DE ATIVIDADE FÍSICA ---
-                st.subheader("Frequência Semanal de Atividade Física")
                 
-                if 'O participante pratica atividade física ou esporte quantas vezes na semana' not in df_filtrado.columns:
-                    st.warning("Dados sobre frequência de atividade física não disponíveis.")
-                else:
-                    # Processar os dados
-                    contagem = df_filtrado['O participante pratica atividade física ou esporte quantas vezes na semana'].value_counts()
-                    total = contagem.sum()
-                    
-                    if total == 0:
-                        st.info("Nenhum dado disponível sobre frequência de atividade física.")
-                    else:
-                        # Criar gráfico
-                        fig, ax = plt.subplots(figsize=(6, 5))
-                        bars = ax.barh(contagem.index.astype(str), contagem.values, color='#9b5f7b', edgecolor='#9b5f7b')
-                        
-                        # Adicionar porcentagens
-                        for i, (categoria, valor) in enumerate(contagem.items()):
-                            percentual = (valor / total) * 100
-                            ax.text(valor + 5, i, f'{percentual:.1f}%', va='center', fontsize=9)
-                        
-                        # Configurações do gráfico
-                        ax.set_xlim(0, contagem.max() * 1.2)
-                        ax.set_title('Frequência Semanal de Atividade Física', fontsize=14)
-                        ax.set_xlabel('Número de Participantes')
-                        ax.set_ylabel('Vezes por Semana')
-                        ax.grid(axis='x', linestyle='--', alpha=0.5)
-                        
-                        # Exibir no Streamlit
-                        st.pyplot(fig, use_container_width=True)
-                        plt.close(fig)
+                    # Adicionar informação do total de respondentes
+                    st.caption(f"Total de participantes analisados: {len(df_filtrado)}")
+                # ---------------------
+                # --- GRÁFICO DE MEDICAÇÕES (FULL WIDTH) ---
+                show_bar_chart('uso_medicacoes_pelos_participantes', barras, impressao_dados, pendentes=pendentes)
 
-            # Criar layout de duas colunas
-            col1_saude_row10, col2_saude_row10 = st.columns(2) 
+                col1_saude_row9, col2_saude_row9 = st.columns(2) 
             
-            with col1_saude_row10:
-                # --- GRÁFICO DE HÁBITOS ALIMENTARES ---
-                st.subheader("Hábitos Alimentares Saudáveis")
-                
-                if 'Você considera que o participante possui hábitos alimentares saudáveis' not in df_filtrado.columns:
-                    st.warning("Dados sobre hábitos alimentares não disponíveis.")
-                else:
-                    # Processar os dados
-                    df_filtrado['Habitos_Alimentares'] = (
-                        df_filtrado['Você considera que o participante possui hábitos alimentares saudáveis']
-                        .astype(str)
-                        .str.lower()
-                        .str.strip()
-                    )
-                    
-                    contagem = df_filtrado['Habitos_Alimentares'].value_counts()
-                    total = contagem.sum()
-                    
-                    if total == 0:
-                        st.info("Nenhum dado disponível sobre hábitos alimentares.")
-                    else:
-                        # Ordenar e formatar
-                        ordem_desejada = ['não', 'sim']
-                        contagem = contagem.reindex(ordem_desejada).dropna()
-                        labels = [s.capitalize() for s in contagem.index]
-                        
-                        # Criar gráfico
-                        fig, ax = plt.subplots(figsize=(6, 5))
-                        bars = ax.bar(labels, contagem.values, color='#b7833a', edgecolor='#b7833a')
-                        
-                        # Adicionar porcentagens
-                        for bar in bars:
-                            height = bar.get_height()
-                            percentual = (height / total) * 100
-                            ax.text(bar.get_x() + bar.get_width() / 2, height + 1, 
-                                    f'{percentual:.1f}%', ha='center', va='bottom', fontsize=9)
-                        
-                        # Configurações do gráfico
-                        ax.set_title('Hábitos Alimentares Saudáveis', fontsize=14)
-                        ax.set_xlabel('Resposta')
-                        ax.set_ylabel('Número de Participantes')
-                        ax.grid(axis='y', linestyle='--', alpha=0.5)
-                        
-                        # Exibir no Streamlit
-                        st.pyplot(fig, use_container_width=True)
-                        plt.close(fig)
-            # ---------------------
-            with col2_saude_row10:
-                # --- GRÁFICO DE ATENDIMENTO DE SAÚDE PÚBLICO ---
-                st.subheader("Atendimento de Saúde Público Adequado")
-                
-                coluna_saude = 'Você considera que o participante possui atendimento de saúde adequado pelo sistema público para atender suas necessidades'
-                
-                if coluna_saude not in df_filtrado.columns:
-                    st.warning("Dados sobre atendimento de saúde público não disponíveis.")
-                else:
-                    # Processar os dados
-                    df_filtrado['Atendimento_Saude'] = (
-                        df_filtrado[coluna_saude]
-                        .astype(str)
-                        .str.lower()
-                        .str.strip()
-                    )
-                    
-                    contagem = df_filtrado['Atendimento_Saude'].value_counts()
-                    total = contagem.sum()
-                    
-                    if total == 0:
-                        st.info("Nenhum dado disponível sobre atendimento de saúde público.")
-                    else:
-                        # Ordenar e formatar
-                        ordem_desejada = ['não', 'sim']
-                        contagem = contagem.reindex(ordem_desejada).dropna()
-                        labels = [s.capitalize() for s in contagem.index]
-                        
-                        # Criar gráfico
-                        fig, ax = plt.subplots(figsize=(6, 5))
-                        bars = ax.bar(labels, contagem.values, color='#838689', edgecolor='#838689')
-                        
-                        # Adicionar porcentagens
-                        for bar in bars:
-                            height = bar.get_height()
-                            percentual = (height / total) * 100
-                            ax.text(bar.get_x() + bar.get_width() / 2, height + 1, 
-                                   f'{percentual:.1f}%', ha='center', va='bottom', fontsize=9)
+                with col1_saude_row9:
+                    # --- GRÁFICO DE ATIVIDADE FÍSICA ---
+                    show_bar_chart('pratica_atividade_fisica', barras, impressao_dados, pendentes=pendentes)
                         
-                        # Configurações do gráfico
-                        ax.set_title('Atendimento de Saúde Público Adequado', fontsize=14)
-                        ax.set_xlabel('Resposta')
-                        ax.set_ylabel('Número de Participantes')
-                        ax.grid(axis='y', linestyle='--', alpha=0.5)
-                        
-                        # Exibir no Streamlit
-                        st.pyplot(fig, use_container_width=True)
-                        plt.close(fig)
-
-    
-            # -----
-
-        with tab6:
-            st.header("Características de Participação, Autonomia e Interação Social")
-            # --- ABA 6: Características de Pariticipação, Autonomia e Interação Social (Novos Gráficos Matplotlib em Colunas) ---
-            col_autonomia, col_deslocamento = st.columns(2)
-            col_necessidades, col_relacionamento = st.columns(2)
-            col_interacao_social, col_respeito = st.columns(2)
-            
-            # --- Gráfico 1: Autonomia para Tomar Decisões ---
-            with col_autonomia:
-                st.subheader("Autonomia para Tomar Decisões")
-                coluna_autonomia = 'Você considera que o participante possui autonomia para tomar decisões e tem a chance de escolher as coisas que deseja (escolher as coisas para sua satisfação pessoal)?'
-
-                if coluna_autonomia in df_filtrado.columns and not df_filtrado.empty:
-                    temp_series = df_filtrado[coluna_autonomia].astype(str).str.lower().str.strip()
-                    contagem = temp_series.value_counts()
-                    total_participantes = len(df_filtrado)
-        
-                    # Ordenar para garantir "Não" antes de "Sim" se ambos existirem
-                    ordem_desejada = ['não', 'sim']
-                    contagem_ordenada = contagem.reindex(ordem_desejada).dropna()
-                    labels_formatados = [s.capitalize() for s in contagem_ordenada.index]
-        
-                    if total_participantes == 0 or contagem_ordenada.empty:
-                        st.info("Nenhum dado para exibir para Autonomia para Tomar Decisões com os filtros selecionados.")
-                    else:
-                        fig, ax = plt.subplots(figsize=(6, 5))
-                        bars = ax.bar(labels_formatados, contagem_ordenada.values, color='#8ccc81', edgecolor='#8ccc81')
-        
-                        for i, bar in enumerate(bars):
-                            height = bar.get_height()
-                            percentual = (height / total_participantes) * 100
-                            ax.text(bar.get_x() + bar.get_width() / 2, height + 1,
-                                    f'{percentual:.1f}%', # Apenas porcentagem
-                                    ha='center', va='bottom', fontsize=9, color='black')
-        
-                        ax.set_ylim(0, contagem_ordenada.max() * 1.15)
-                        ax.set_title('Possui autonomia para tomar decisões') # Título mais conciso
-                        ax.set_xlabel('Resposta')
-                        ax.set_ylabel('Frequência')
-                        ax.tick_params(axis='x', rotation=0, labelsize=10) # Ajuste para Streamlit
-                        ax.grid(axis='y', linestyle='--', alpha=0.5)
-                        plt.tight_layout()
-                        for spine in ax.spines.values():
-                            spine.set_visible(True)
-                            spine.set_linewidth(1.2)
-                        st.pyplot(fig, use_container_width=True)
-                        plt.close(fig)
-                else:
-                    st.warning(f"Coluna '{coluna_autonomia}' não encontrada ou DataFrame vazio para esta seleção.")
-
-    # --- Gráfico 2: Deslocamento Independentemente pela Cidade ---
-            with col_deslocamento:
-                st.subheader("Deslocamento Independente")
-                coluna_deslocamento = 'O participante se desloca independentemente pela cidade'
-
-                if coluna_deslocamento in df_filtrado.columns and not df_filtrado.empty:
-                    temp_series = df_filtrado[coluna_deslocamento].astype(str).str.lower().str.strip()
-                    contagem = temp_series.value_counts()
-                    total_participantes = len(df_filtrado)
-        
-                    ordem_desejada = ['não', 'sim']
-                    contagem_ordenada = contagem.reindex(ordem_desejada).dropna()
-                    labels_formatados = [s.capitalize() for s in contagem_ordenada.index]
-        
-                    if total_participantes == 0 or contagem_ordenada.empty:
-                        st.info("Nenhum dado para exibir para Deslocamento Independente com os filtros selecionados.")
-                    else:
-                        fig, ax = plt.subplots(figsize=(6, 5))
-                        bars = ax.bar(labels_formatados, contagem_ordenada.values, color='#bcc499', edgecolor='#bcc499')
-        
-                        for i, bar in enumerate(bars):
-                            height = bar.get_height()
-                            percentual = (height / total_participantes) * 100
-                            ax.text(bar.get_x() + bar.get_width() / 2, height + 1,
-                                    f'{percentual:.1f}%', # Apenas porcentagem
-                                    ha='center', va='bottom', fontsize=9, color='black')
-        
-                        ax.set_ylim(0, contagem_ordenada.max() * 1.15)
-                        ax.set_title('Se desloca independentemente pela cidade') # Título mais conciso
-                        ax.set_xlabel('Resposta')
-                        ax.set_ylabel('Frequência')
-                        ax.tick_params(axis='x', rotation=0, labelsize=10)
-                        ax.grid(axis='y', linestyle='--', alpha=0.5)
-                        plt.tight_layout()
-                        for spine in ax.spines.values():
-                            spine.set_visible(True)
-                            spine.set_linewidth(1.2)
-                        st.pyplot(fig, use_container_width=True)
-                        plt.close(fig)
-                else:
-                    st.warning(f"Coluna '{coluna_deslocamento}' não encontrada ou DataFrame vazio para esta seleção.")
-
-    # --- GRÁFICO 3: Necessidades Pessoais ---
-            with col_necessidades: # Usando a primeira coluna da segunda linha
-                st.subheader("Realização de Necessidades Pessoais")
-                coluna_necessidades = 'Na maioria das vezes, você considera o participante na realização de suas necessidades pessoais como'
-    
-                if coluna_necessidades in df_filtrado.columns and not df_filtrado.empty:
-                    temp_series = df_filtrado[coluna_necessidades].astype(str).str.lower().str.strip()
-                    contagem = temp_series.value_counts(dropna=False)
-    
-                    if 'nan' in contagem.index:
-                        contagem = contagem.rename(index={'nan': 'Não Preenchido'})
-                        # Se você NÃO QUISER que 'Não Preenchido' apareça no gráfico, descomente a linha abaixo:
-                        # contagem = contagem.drop('Não Preenchido', errors='ignore')
-    
-                    total_participantes = len(df_filtrado) # Usar df_filtrado para o total de participantes
-    
-                    contagem = contagem.sort_values(ascending=True)
-    
-                    if total_participantes == 0 or contagem.empty:
-                        st.info("Nenhum dado para exibir para Necessidades Pessoais com os filtros selecionados.")
-                    else:
-                        fig, ax = plt.subplots(figsize=(10, max(6, len(contagem) * 0.7))) # Ajuste o figsize para barras horizontais
-                        labels_formatados = [s.capitalize() for s in contagem.index]
-                        bars = ax.barh(labels_formatados, contagem.values, color='#f8afb8', edgecolor='#f8afb8')
-    
-                        for i, (categoria_original, valor) in enumerate(contagem.items()):
-                            percentual = (valor / total_participantes) * 100
-                            ax.text(valor + (contagem.max() * 0.02), i, f'{percentual:.1f}%', va='center', fontsize=9)
-    
-                        ax.set_xlim(0, contagem.max() * 1.15)
-                        ax.set_title('Como o cuidador considera o participante na realização de necessidades pessoais')
-                        ax.set_xlabel('Frequência')
-                        ax.set_ylabel('Forma de Independência')
-                        ax.grid(axis='x', linestyle='--', alpha=0.5)
-                        plt.tight_layout()
-                        for spine in ax.spines.values():
-                            spine.set_visible(True)
-                            spine.set_linewidth(1.2)
-                        st.pyplot(fig, use_container_width=True)
-                        plt.close(fig)
-                else:
-                    st.warning(f"Coluna '{coluna_necessidades}' não encontrada ou DataFrame vazio para esta seleção.")                
+                # ---------------------            
+                with col2_saude_row9:
+                    # --- GRÁFICO DE FREQUÊNCIA DE ATIVIDADE FÍSICA ---
+                    show_bar_chart('frequencia_semanal_atividade_fisica', barras, impressao_dados, pendentes=pendentes)
+
+                # Criar layout de duas colunas
+                col1_saude_row10, col2_saude_row10 = st.columns(2) 
+            
+                with col1_saude_row10:
+                    # --- GRÁFICO DE HÁBITOS ALIMENTARES ---
+                    show_bar_chart('habitos_alimentares_saudaveis', barras, impressao_dados, pendentes=pendentes)
+                # ---------------------
+                with col2_saude_row10:
+                    # --- GRÁFICO DE ATENDIMENTO DE SAÚDE PÚBLICO ---
+                    show_bar_chart('atendimento_saude_publico_adequado', barras, impressao_dados, pendentes=pendentes)
 
-    # --- Gráfico 4: Participante se Relaciona com Diferentes Pessoas ---
-            with col_relacionamento:
-                st.subheader("Relacionamento Interpessoal")
-                coluna_relacionamento = 'Você considera que o participante se relaciona com diferentes pessoas, tem amigos e se dá bem com as pessoas'
     
-                if coluna_relacionamento in df_filtrado.columns and not df_filtrado.empty:
-                    temp_series = df_filtrado[coluna_relacionamento].astype(str).str.lower().str.strip()
-                    contagem = temp_series.value_counts()
-                    total_participantes = len(df_filtrado)
-        
-                    ordem_desejada = ['não', 'sim']
-                    contagem_ordenada = contagem.reindex(ordem_desejada).dropna()
-                    labels_formatados = [s.capitalize() for s in contagem_ordenada.index]
-        
-                    if total_participantes == 0 or contagem_ordenada.empty:
-                        st.info("Nenhum dado para exibir para Relacionamento Interpessoal com os filtros selecionados.")
-                    else:
-                        fig, ax = plt.subplots(figsize=(6, 5))
-                        bars = ax.bar(labels_formatados, contagem_ordenada.values, color='#525574', edgecolor='#525574')
-        
-                        for i, bar in enumerate(bars):
-                            height = bar.get_height()
-                            percentual = (height / total_participantes) * 100
-                            ax.text(bar.get_x() + bar.get_width() / 2, height + 1,
-                                    f'{percentual:.1f}%', # Apenas porcentagem
-                                    ha='center', va='bottom', fontsize=9, color='black')
-        
-                        ax.set_ylim(0, contagem_ordenada.max() * 1.15)
-                        ax.set_title('Se relaciona com diferentes pessoas e tem amigos') # Título mais conciso
-                        ax.set_xlabel('Resposta')
-                        ax.set_ylabel('Frequência')
-                        ax.tick_params(axis='x', rotation=0, labelsize=10)
-                        ax.grid(axis='y', linestyle='--', alpha=0.5)
-                        plt.tight_layout()
-                        for spine in ax.spines.values():
-                            spine.set_visible(True)
-                            spine.set_linewidth(1.2)
-                        st.pyplot(fig, use_container_width=True)
-                        plt.close(fig)
-                else:
-                    st.warning(f"Coluna '{coluna_relacionamento}' não encontrada ou DataFrame vazio para esta seleção.")
-
-    # --- Gráfico 5: Interação Social (frequenta lugares) ---
-            with col_interacao_social:
-                st.subheader("Interação Social Voluntária")
-                coluna_interacao_social = 'Você considera que o participante, por vontade própria interage socialmente, frequentando diferentes lugares da cidade ou do bairro'
-
-                if coluna_interacao_social in df_filtrado.columns and not df_filtrado.empty:
-                    temp_series = df_filtrado[coluna_interacao_social].astype(str).str.lower().str.strip()
-                    contagem = temp_series.value_counts()
-                    total_participantes = len(df_filtrado)
-        
-                    ordem_desejada = ['não', 'sim']
-                    contagem_ordenada = contagem.reindex(ordem_desejada).dropna()
-                    labels_formatados = [s.capitalize() for s in contagem_ordenada.index]
-        
-                    if total_participantes == 0 or contagem_ordenada.empty:
-                        st.info("Nenhum dado para exibir para Interação Social Voluntária com os filtros selecionados.")
-                    else:
-                        fig, ax = plt.subplots(figsize=(6, 5))
-                        bars = ax.bar(labels_formatados, contagem_ordenada.values, color='#ff9934', edgecolor='#ff9934')
-        
-                        for i, bar in enumerate(bars):
-                            height = bar.get_height()
-                            percentual = (height / total_participantes) * 100
-                            ax.text(bar.get_x() + bar.get_width() / 2, height + 1,
-                                    f'{percentual:.1f}%', # Apenas porcentagem
-                                    ha='center', va='bottom', fontsize=9, color='black')
-        
-                        ax.set_ylim(0, contagem_ordenada.max() * 1.15)
-                        ax.set_title('Interage socialmente em diferentes lugares') # Título mais conciso
-                        ax.set_xlabel('Resposta')
-                        ax.set_ylabel('Frequência')
-                        ax.tick_params(axis='x', rotation=0, labelsize=10)
-                        ax.grid(axis='y', linestyle='--', alpha=0.5)
-                        plt.tight_layout()
-                        for spine in ax.spines.values():
-                            spine.set_visible(True)
-                            spine.set_linewidth(1.2)
-                        st.pyplot(fig, use_container_width=True)
-                        plt.close(fig)
-                else:
-                    st.warning(f"Coluna '{coluna_interacao_social}' não encontrada ou DataFrame vazio para esta seleção.")
-
-    # --- Gráfico 6: Tratado com Respeito, Dignidade e Igualdade ---
-            with col_respeito: # Esta coluna foi definida para ocupar uma linha inteira
-                st.subheader(" Olhar do Cuidador Quanto a Tratamento com Respeito, Dignidade e Igualdade")
-                coluna_respeito = 'Você considera que o participante é tratado com respeito, dignidade e igualdade pelas outras pessoas'
-
-                if coluna_respeito in df_filtrado.columns and not df_filtrado.empty:
-                    temp_series = df_filtrado[coluna_respeito].astype(str).str.lower().str.strip()
-                    contagem = temp_series.value_counts()
-                    total_participantes = len(df_filtrado)
-        
-                    ordem_desejada = ['não', 'sim']
-                    contagem_ordenada = contagem.reindex(ordem_desejada).dropna()
-                    labels_formatados = [s.capitalize() for s in contagem_ordenada.index]
-        
-                    if total_participantes == 0 or contagem_ordenada.empty:
-                        st.info("Nenhum dado para exibir para Tratamento com Respeito com os filtros selecionados.")
-                    else:
-                        fig, ax = plt.subplots(figsize=(6, 5))
-                        bars = ax.bar(labels_formatados, contagem_ordenada.values, color='#680a1d', edgecolor='#680a1d')
-        
-                        for i, bar in enumerate(bars):
-                            height = bar.get_height()
-                            percentual = (height / total_participantes) * 100
-                            ax.text(bar.get_x() + bar.get_width() / 2, height + 1,
-                                    f'{percentual:.1f}%', # Apenas porcentagem
-                                    ha='center', va='bottom', fontsize=9, color='black')
-        
-                        ax.set_ylim(0, contagem_ordenada.max() * 1.15)
-                        ax.set_title('Participante é tratado com respeito, dignidade e igualdade') # Título mais conciso
-                        ax.set_xlabel('Resposta')
-                        ax.set_ylabel('Frequência')
-                        ax.tick_params(axis='x', rotation=0, labelsize=10)
-                        ax.grid(axis='y', linestyle='--', alpha=0.5)
-                        plt.tight_layout()
-                        for spine in ax.spines.values():
-                            spine.set_visible(True)
-                            spine.set_linewidth(1.2)
-                        st.pyplot(fig, use_container_width=True)
-                        plt.close(fig)
-                else:
-                    st.warning(f"Coluna '{coluna_respeito}' não encontrada ou DataFrame vazio para esta seleção.")
+                # -----
+
+        if tab6.open:
+            with tab6:
+                avisos.pop(tab6).empty()
+                barras = page_bar_counts(impressao_dados, banco, df_filtrado.index, cubo, filtros_cubo, filtro_cruzado)
+                pendentes = start_bar_charts(6, barras, impressao_dados)
+                st.header("Características de Participação, Autonomia e Interação Social")
+                # --- ABA 6: Características de Pariticipação, Autonomia e Interação Social (Novos Gráficos Matplotlib em Colunas) ---
+                col_autonomia, col_deslocamento = st.columns(2)
+                col_necessidades, col_relacionamento = st.columns(2)
+                col_interacao_social, col_respeito = st.columns(2)
+            
+                # --- Gráfico 1: Autonomia para Tomar Decisões ---
+                with col_autonomia:
+                    show_bar_chart('possui_autonomia_tomar_decisoes', barras, impressao_dados, pendentes=pendentes)
+
+                # --- Gráfico 2: Deslocamento Independentemente pela Cidade ---
+                with col_deslocamento:
+                    show_bar_chart('desloca_independentemente_pela_cidade', barras, impressao_dados, pendentes=pendentes)
+
+                # --- GRÁFICO 3: Necessidades Pessoais ---
+                with col_necessidades: # Usando a primeira coluna da segunda linha
+                    show_bar_chart('como_cuidador_realizacao_necessidades_pessoais', barras, impressao_dados, pendentes=pendentes)
+
+                # --- Gráfico 4: Participante se Relaciona com Diferentes Pessoas ---
+                with col_relacionamento:
+                    show_bar_chart('relaciona_diferentes_pessoas_tem_amigos', barras, impressao_dados, pendentes=pendentes)
+
+                # --- Gráfico 5: Interação Social (frequenta lugares) ---
+                with col_interacao_social:
+                    show_bar_chart('interage_socialmente_diferentes_lugares', barras, impressao_dados, pendentes=pendentes)
+
+                # --- Gráfico 6: Tratado com Respeito, Dignidade e Igualdade ---
+                with col_respeito: # Esta coluna foi definida para ocupar uma linha inteira
+                    show_bar_chart('tratado_respeito_dignidade_igualdade', barras, impressao_dados, pendentes=pendentes)
 
         # ---------------------
         # --- ABA 7: Correlações (Heatmap com estilo visual harmonizado) ---
-        with tab7:
-            st.header("Análise de Correlações")
-            from sklearn.preprocessing import LabelEncoder
-            # Função para preprocessar dados para correlação
-            def preprocess_for_correlation(df, columns):
-                df_processed = df.copy()
-                for col in columns:
-                    if col in df_processed.columns:
-                        # Tratar valores não numéricos e nulos
-                        df_processed[col] = df_processed[col].astype(str).str.lower().str.strip()
-                        
-                        # Mapeamento para binárias 'sim'/'não'
-                        if df_processed[col].nunique() <= 2 and (
-                            'sim' in df_processed[col].unique() or 'não' in df_processed[col].unique() or
-                            'masculino' in df_processed[col].unique() or 'feminino' in df_processed[col].unique()
-                        ):
-                            unique_vals = df_processed[col].unique()
-                            if 'sim' in unique_vals and 'não' in unique_vals:
-                                df_processed[col] = df_processed[col].map({'sim': 1, 'não': 0})
-                            elif 'masculino' in unique_vals and 'feminino' in unique_vals:
-                                df_processed[col] = df_processed[col].map({'masculino': 1, 'feminino': 0})
-                            else: # General LabelEncoder for other binary or few categories
-                                le = LabelEncoder()
-                                df_processed[col] = le.fit_transform(df_processed[col].astype(str))
-                        else: # Apply LabelEncoder for other categorical columns
-                            le = LabelEncoder()
-                            # Handle NaN values before encoding by filling with a placeholder or dropping
-                            # For correlation, it's often better to drop or fill strategically.
-                            # Here, fill with a string placeholder, then encode.
-                            df_processed[col] = le.fit_transform(df_processed[col].fillna('N/A').astype(str))
-                    else:
-                        st.warning(f"Coluna '{col}' não encontrada para correlação.")
-                        df_processed = df_processed.drop(columns=[col], errors='ignore') # Remove missing column
-                return df_processed
-        
-            # --- Correlação de Variáveis Socioeconômicas ---
-            st.subheader("Correlação de Variáveis Socioeconômicas")
-            socioeconomic_cols = [
-                'Renda familiar',
-                'Recebe Bolsa família',
-                'Recebe BPC',
-                'A residência é',
-                'Quantas pessoas vivem com esta renda familiar'
-            ]
-            
-            # Ensure numerical conversion for 'Quantas pessoas vivem com esta renda familiar'
-            if 'Quantas pessoas vivem com esta renda familiar' in df_filtrado.columns:
-                df_filtrado['Quantas pessoas vivem com esta renda familiar'] = pd.to_numeric(df_filtrado['Quantas pessoas vivem com esta renda familiar'], errors='coerce')
-                # Fill NaN for numerical columns before correlation calculation, e.g., with median or mean
-                df_filtrado['Quantas pessoas vivem com esta renda familiar'] = df_filtrado['Quantas pessoas vivem com esta renda familiar'].fillna(df_filtrado['Quantas pessoas vivem com esta renda familiar'].median())
-        
-            df_socio = preprocess_for_correlation(df_filtrado, socioeconomic_cols)
-            
-            # Drop columns that might have been removed by preprocess_for_correlation if not found
-            socioeconomic_cols_present = [col for col in socioeconomic_cols if col in df_socio.columns]
-            
-            if len(socioeconomic_cols_present) > 1: # Need at least 2 columns for correlation
+        if tab7.open:
+            with tab7:
+                avisos.pop(tab7).empty()
+                st.header("Análise de Correlações")
+                st.markdown("""
+                <div class="justified-text">
+                Cada par de variáveis usa a medida adequada aos seus tipos: Pearson entre numéricas, ponto-bisserial
+                entre numérica e binária, Spearman quando há uma variável ordinal, policórica entre ordinais, phi entre
+                binárias, V de Cramér quando há uma variável nominal e razão de correlação (η) entre nominal e numérica.
+                V de Cramér e η vão de 0 a 1; as demais, de -1 a 1.
+                </div>
+                """, unsafe_allow_html=True)
+
+                # Matriz de todas as variáveis analisáveis, calculada em blocos uma única vez por recorte e guardada em
+                # disco: reaberturas e outras sessões leem o arquivo (ou o cache de resultados) sem recalcular.
+                # Os testes de todos os pares (corrigidos juntos por Benjamini–Hochberg) marcam os mapas de calor
+                try:
+                    questionario, do_disco = result_cache().obter(
+                        ('associacoes_questionario', impressao_dados),
+                        lambda: associacoes_do_questionario(df_filtrado, impressao_dados))
+                    testes = result_cache().obter(('testes_pares', impressao_dados),
+                                                  lambda: testar_pares(df_filtrado, questionario))
+                except Exception as e:
+                    st.error(f"Erro ao calcular as associações do questionário: {e}")
+                    questionario = testes = None
+                alfa = f'{ALFA:.2f}'.replace('.', ',')
+
+                def show_associations(id_grafico, titulo, nomes, figsize):
+                    # Matriz calculada uma vez por recorte (cache de resultados compartilhado)
+                    associacoes = result_cache().obter(('associacoes', impressao_dados, tuple(nomes)),
+                                                       lambda: calcular_associacoes(df_filtrado, nomes))
+                    if len(associacoes.valores) < 2:
+                        return False
+                    matriz = associacoes.valores
+                    # Significância de cada célula por permutação (lotes de permutações em produtos de matrizes, com
+                    # parada antecipada), corrigida entre os pares do mapa; também no cache de resultados
+                    permutacoes = result_cache().obter(('permutacoes', impressao_dados, tuple(nomes)),
+                                                       lambda: permutar_pares(df_filtrado, associacoes))
+                    # Valor de cada par, com * quando significativo após a correção
+                    marcas = permutacoes.marcas(list(matriz.index))
+                    textos = matriz.map(lambda valor: '' if pd.isna(valor) else f'{valor:.2f}') + marcas
+                    def desenhar():
+                        fig, ax = plt.subplots(figsize=figsize)
+                        sns.heatmap(matriz, annot=textos, cmap='coolwarm', fmt='', linewidths=.5, vmin=-1, vmax=1, ax=ax)
+                        ax.set_title(titulo)
+                        return fig
+                    show_cached_figure(id_grafico, desenhar, impressao_dados,
+                                       interativo=lambda: mapa_calor_interativo(matriz, titulo, textos=textos))
+                    st.caption(f"* significativo por permutação com q < {alfa} (Benjamini–Hochberg entre os "
+                               f"{permutacoes.n_testes} pares do mapa; até {PERMUTACOES} permutações por par, "
+                               f"{permutacoes.lotes} lotes em {permutacoes.tempo:.2f} s)")
+                    with st.expander("Medida, teste e participantes de cada par"):
+                        st.dataframe(associacoes.medidas.replace(ROTULOS_MEDIDAS), use_container_width=True)
+                        st.markdown(f"**Valor p por permutação e intervalo bootstrap de 95% ({permutacoes.reamostras} reamostras)**")
+                        st.dataframe(permutacoes.p.round(4), use_container_width=True)
+                        inferior, superior = permutacoes.inferior, permutacoes.superior
+                        intervalos = ('[' + inferior.map('{:.2f}'.format) + '; ' + superior.map('{:.2f}'.format) + ']').where(
+                            inferior.notna(), '')
+                        st.dataframe(intervalos, use_container_width=True)
+                        st.caption("Pares ordinais (policórica) são permutados pelo Spearman dos mesmos códigos e ficam sem intervalo.")
+                        if testes is not None:
+                            nomes_matriz = list(matriz.index)
+                            st.markdown("**Teste assintótico e valor q no questionário (Benjamini–Hochberg)**")
+                            st.dataframe(testes.testes.reindex(index=nomes_matriz, columns=nomes_matriz).replace(ROTULOS_TESTES),
+                                         use_container_width=True)
+                            st.dataframe(testes.q.reindex(index=nomes_matriz, columns=nomes_matriz).round(4),
+                                         use_container_width=True)
+                        st.dataframe(associacoes.pares, use_container_width=True)
+                        st.caption(f"Calculada em {associacoes.tempo * 1000:.1f} ms")
+                    return True
+
+                # --- Correlação de Variáveis Socioeconômicas ---
+                st.subheader("Correlação de Variáveis Socioeconômicas")
+                socioeconomic_cols = esquema.nomes(
+                    'renda_familiar',
+                    'recebe_bolsa_familia',
+                    'recebe_bpc',
+                    'residencia',
+                    'pessoas_renda',
+                )
                 try:
-                    corr_socio = df_socio[socioeconomic_cols_present].corr()
-                    fig, ax = plt.subplots(figsize=(10, 8))
-                    sns.heatmap(corr_socio, annot=True, cmap='coolwarm', fmt=".2f", linewidths=.5, ax=ax)
-                    ax.set_title('Matriz de Correlação Socioeconômica')
-                    st.pyplot(fig, use_container_width=True)
-                    plt.close(fig)
+                    if not show_associations('matriz_correlacao_socioeconomica', 'Matriz de Correlação Socioeconômica',
+                                             socioeconomic_cols, (10, 8)):
+                        st.warning("Não há colunas suficientes para calcular a correlação socioeconômica.")
                 except Exception as e:
                     st.error(f"Erro ao gerar a matriz de correlação socioeconômica: {e}")
-            else:
-                st.warning("Não há colunas suficientes para calcular a correlação socioeconômica após o pré-processamento.")
-        
-            # --- Correlação de Escolaridade e Alfabetização ---
-            st.subheader("Correlação de Escolaridade e Alfabetização")
-            education_cols = [
-                'Nível de escolaridade do participante',
-                'Nível de escolaridade do responsável do participante',
-                'O participante é alfabetizado',
-                'Sabe ler',
-                'Sabe escrever',
-                'O participante consegue interpretar texto?',
-                'O participante lê jornais, revistas ou livros?'
-            ]
-            df_edu = preprocess_for_correlation(df_filtrado, education_cols)
-        
-            education_cols_present = [col for col in education_cols if col in df_edu.columns]
-            if len(education_cols_present) > 1:
+
+                # --- Correlação de Escolaridade e Alfabetização ---
+                st.subheader("Correlação de Escolaridade e Alfabetização")
+                education_cols = esquema.nomes(
+                    'escolaridade_participante',
+                    'escolaridade_responsavel',
+                    'alfabetizado',
+                    'sabe_ler',
+                    'sabe_escrever',
+                    'consegue_interpretar_texto',
+                    'le_jornais_revistas_livros',
+                )
                 try:
-                    corr_edu = df_edu[education_cols_present].corr()
-                    fig, ax = plt.subplots(figsize=(10, 8))
-                    sns.heatmap(corr_edu, annot=True, cmap='coolwarm', fmt=".2f", linewidths=.5, ax=ax)
-                    ax.set_title('Matriz de Correlação de Escolaridade e Alfabetização')
-                    st.pyplot(fig, use_container_width=True)
-                    plt.close(fig)
+                    if not show_associations('matriz_correlacao_escolaridade_alfabetizacao',
+                                             'Matriz de Correlação de Escolaridade e Alfabetização', education_cols, (10, 8)):
+                        st.warning("Não há colunas suficientes para calcular a correlação de escolaridade e alfabetização.")
                 except Exception as e:
                     st.error(f"Erro ao gerar a matriz de correlação de escolaridade: {e}")
-            else:
-                st.warning("Não há colunas suficientes para calcular a correlação de escolaridade e alfabetização após o pré-processamento.")
-        
-            # --- Correlação de Variáveis Demográficas e de Saúde ---
-            st.subheader("Correlação de Variáveis Demográficas e de Saúde")
-            health_dem_cols = [
-                'Idade do participante',
-                'Sexo do participante',
-                'Cor/etnia do participante',
-                'IMC',
-                'Classificação IMC', # This is categorical, will be encoded
-                'Pratica alguma atividade física ou esporte',
-                'Você considera que o participante possui hábitos alimentares saudáveis',
-                'Você considera que o participante possui atendimento de saúde adequado pelo sistema público para atender suas necessidades',
-                'Idade em que a mãe do participante teve a gestação' # Should be numeric
-            ]
-        
-            # Ensure numerical conversion for 'Idade do participante', 'IMC', 'Idade em que a mãe do participante teve a gestação'
-            for col in ['Idade do participante', 'IMC', 'Idade em que a mãe do participante teve a gestação']:
-                if col in df_filtrado.columns:
-                    df_filtrado[col] = pd.to_numeric(df_filtrado[col], errors='coerce')
-                    df_filtrado[col] = df_filtrado[col].fillna(df_filtrado[col].median() if df_filtrado[col].dtype != 'object' else 0) # Fill NaN for numerical columns
-        
-            df_health_dem = preprocess_for_correlation(df_filtrado, health_dem_cols)
-            
-            health_dem_cols_present = [col for col in health_dem_cols if col in df_health_dem.columns]
-        
-            if len(health_dem_cols_present) > 1:
+
+                # --- Correlação de Variáveis Demográficas e de Saúde ---
+                st.subheader("Correlação de Variáveis Demográficas e de Saúde")
+                health_dem_cols = esquema.nomes(
+                    'idade',
+                    'sexo',
+                    'cor_etnia',
+                    'imc',
+                    'classificacao_imc',
+                    'pratica_atividade_fisica',
+                    'habitos_alimentares',
+                    'atendimento_saude_sus',
+                    'idade_mae_gestacao',
+                )
                 try:
-                    corr_health_dem = df_health_dem[health_dem_cols_present].corr()
-                    fig, ax = plt.subplots(figsize=(12, 10))
-                    sns.heatmap(corr_health_dem, annot=True, cmap='coolwarm', fmt=".2f", linewidths=.5, ax=ax)
-                    ax.set_title('Matriz de Correlação de Variáveis Demográficas e de Saúde')
-                    st.pyplot(fig, use_container_width=True)
-                    plt.close(fig)
+                    if not show_associations('matriz_correlacao_variaveis_demograficas_saude',
+                                             'Matriz de Correlação de Variáveis Demográficas e de Saúde', health_dem_cols, (12, 10)):
+                        st.warning("Não há colunas suficientes para calcular a correlação de variáveis demográficas e de saúde.")
                 except Exception as e:
                     st.error(f"Erro ao gerar a matriz de correlação de saúde e demográficas: {e}")
-            else:
-                st.warning("Não há colunas suficientes para calcular a correlação de variáveis demográficas e de saúde após o pré-processamento.")
+
+                # --- Associações em todo o questionário ---
+                st.subheader("Associações em todo o questionário")
+                if questionario is not None and len(questionario.valores) > 1:
+                    m = len(questionario.valores)
+                    origem = ("lida do disco" if do_disco
+                              else f"calculada em {questionario.tempo:.2f} s ({questionario.blocos} blocos de até {TAMANHO_BLOCO} variáveis)")
+                    st.caption(f"{m} variáveis, {m * (m - 1) // 2} pares; matriz {origem}. "
+                               "Ordem hierárquica: variáveis associadas entre si ficam vizinhas.")
+                    ordem = questionario.ordem()
+                    inicio, fim = st.slider("Variáveis exibidas (na ordem hierárquica)", 1, m, (1, min(40, m)),
+                                            key='janela_associacoes')
+                    janela = questionario.valores.iloc[ordem, ordem].iloc[inicio - 1:fim, inicio - 1:fim]
+                    # Rótulos encurtados pelo meio: as opções de múltipla escolha ficam no fim do nome
+                    encurtar = lambda nome: nome if len(nome) <= 45 else f'{nome[:20]}…{nome[-24:]}'
+                    janela = janela.rename(index=encurtar, columns=encurtar)
+                    titulo = f'Associações no questionário (variáveis {inicio} a {fim})'
+                    def desenhar():
+                        tamanho = max(8, 0.28 * len(janela))
+                        fig, ax = plt.subplots(figsize=(tamanho * 1.15, tamanho))
+                        sns.heatmap(janela, cmap='coolwarm', vmin=-1, vmax=1, linewidths=.2,
+                                    xticklabels=True, yticklabels=True, ax=ax)
+                        ax.tick_params(labelsize=7)
+                        ax.set_title(titulo)
+                        return fig
+                    show_cached_figure('mapa_associacoes_questionario', desenhar, impressao_dados, inicio, fim,
+                                       interativo=lambda: mapa_calor_interativo(janela, titulo, formato='.2f' if len(janela) <= 25 else False))
+
+                    st.markdown("**Pares mais fortes**")
+                    if testes is not None:
+                        st.caption(f"{testes.significativos()} de {testes.n_testes} pares significativos com q < {alfa} "
+                                   f"(qui-quadrado ou exato de Fisher entre categóricas, t ou F com numéricas; "
+                                   f"testados em {testes.tempo:.2f} s)")
+                    col_k, col_variavel, col_significativos = st.columns([1, 3, 1])
+                    k = col_k.number_input("Quantidade de pares", 5, 200, 20, step=5, key='k_associacoes')
+                    variavel = col_variavel.selectbox("Envolvendo a variável", ['Todas'] + list(questionario.valores.index),
+                                                      key='variavel_associacoes')
+                    so_significativos = col_significativos.checkbox("Só significativos", key='so_significativos',
+                                                                    disabled=testes is None)
+                    permitidos = (testes.q.to_numpy() < ALFA) if testes is not None and so_significativos else None
+                    fortes = questionario.mais_fortes(int(k), None if variavel == 'Todas' else variavel, permitidos)
+                    if testes is not None and not fortes.empty:
+                        pares_fortes = list(zip(fortes['Variável A'], fortes['Variável B']))
+                        fortes['Teste'] = [ROTULOS_TESTES.get(testes.testes.at[a, b], '') for a, b in pares_fortes]
+                        fortes['p'] = [testes.p.at[a, b] for a, b in pares_fortes]
+                        fortes['q (BH)'] = [testes.q.at[a, b] for a, b in pares_fortes]
+                    st.dataframe(fortes.round({'Associação': 3}), hide_index=True, use_container_width=True,
+                                 column_config={'p': st.column_config.NumberColumn(format='%.2e'),
+                                                'q (BH)': st.column_config.NumberColumn(format='%.2e')})
 
         # --- ABA 8: PCA e Cluster ---
-        with tab8:
-            st.header("PCA e Cluster")
-            
-            st.markdown("""
-            <div class="justified-text">
-            Esta seção apresenta a análise de redução de dimensionalidade (PCA) e os 
-            resultados da clusterização dos dados. Essas técnicas ajudam a identificar 
-            padrões e agrupamentos naturais nos dados.
-            </div>
-            """, unsafe_allow_html=True)
+        if tab8.open:
+            with tab8:
+                avisos.pop(tab8).empty()
+                st.header("PCA e Cluster")
+            
+                st.markdown("""
+                <div class="justified-text">
+                Esta seção apresenta a análise de redução de dimensionalidade (PCA) e os 
+                resultados da clusterização dos dados. Essas técnicas ajudam a identificar 
+                padrões e agrupamentos naturais nos dados.
+                </div>
+                """, unsafe_allow_html=True)
+            
+                # Análise PCA
+                st.subheader("Análise de Componentes Principais (PCA)")
+                # ======================
+                # SELEÇÃO DE VARIÁVEIS
+                # ======================
+                variaveis = esquema.nomes(
+                    'idade',
+                    'idade_cuidador_principal',
+                    'imc',
+                    'peso',
+                    'altura',
+                    'idade_mae_gestacao',
+                )
             
-            # Análise PCA
-            st.subheader("Análise de Componentes Principais (PCA)")
-            # ======================
-            # SELEÇÃO DE VARIÁVEIS
-            # ======================
-            variaveis = [
-                'Idade do participante',
-                'Idade do cuidador principal',
-                'IMC',
-                'Peso do participante', 
-                'Altura do participante',
-                'Idade em que a mãe do participante teve a gestação'
-            ]
-            
-            # ======================
-            # PRÉ-PROCESSAMENTO
-            # ======================
-            with st.expander("Pré-processamento dos Dados", expanded=True):
-                # Carregar dados (substitua por seu DataFrame)
-                
-                # Preencher NA com medianas
-                df_para_analise = df_original[variaveis].copy()
-                for col in variaveis:
-                    df_para_analise[col] = df_para_analise[col].fillna(df_para_analise[col].median())
-                
-                st.success(f"Dados pré-processados com sucesso! Total de participantes: {len(df_para_analise)}")
-                
-                # Mostrar estatísticas básicas
-                if st.checkbox("Mostrar estatísticas descritivas"):
-                    st.dataframe(df_para_analise.describe())
-            
-            # ======================
-            # ANÁLISE PCA E CLUSTERS
-            # ======================
-            with st.expander("Análise de Clusters", expanded=True):
-                # Widget para selecionar número de clusters
-                n_clusters = st.slider("Número de Clusters", 2, 5, 3)
-                
-                # Normalização e PCA
-                scaler = StandardScaler()
-                dados_normalizados = scaler.fit_transform(df_para_analise)
+                # ======================
+                # PRÉ-PROCESSAMENTO
+                # ======================
+                with st.expander("Pré-processamento dos Dados", expanded=True):
+                    # Carregar dados (substitua por seu DataFrame)
+                    com_ordinais = st.checkbox("Incluir renda e escolaridade (códigos ordinais, na ordem do questionário)",
+                                               key='clusters_ordinais')
                 
-                pca = PCA(n_components=2)
-                componentes = pca.fit_transform(dados_normalizados)
-                var_exp = pca.explained_variance_ratio_ * 100
+                    # Preencher NA com medianas
+                    df_para_analise = df_filtrado[variaveis].copy()
+                    if com_ordinais:
+                        ordinais = ordinal_features(impressao_dados, banco, df_filtrado.index, esquema.nomes(
+                            'renda_familiar', 'escolaridade_participante', 'escolaridade_responsavel'))
+                        df_para_analise = df_para_analise.join(ordinais)
+                        variaveis = variaveis + list(ordinais.columns)
+                    for col in variaveis:
+                        df_para_analise[col] = df_para_analise[col].fillna(df_para_analise[col].median())
                 
-                # K-Means
-                kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-                clusters = kmeans.fit_predict(componentes)
-                df_para_analise['Cluster'] = clusters
+                    st.success(f"Dados pré-processados com sucesso! Total de participantes: {len(df_para_analise)}")
                 
+                    # Mostrar estatísticas básicas
+                    if st.checkbox("Mostrar estatísticas descritivas"):
+                        st.dataframe(df_para_analise.describe())
+            
                 # ======================
-                # VISUALIZAÇÕES
+                # ANÁLISE PCA E CLUSTERS
                 # ======================
-                st.subheader("Visualização dos Clusters (PCA)")
-                fig1, ax1 = plt.subplots(figsize=(8,6))
-                sns.scatterplot(
-                    x=componentes[:, 0], y=componentes[:, 1],
-                    hue=clusters, palette='Set2', s=100, ax=ax1
-                )
-                ax1.set_title(f'Clusters via PCA + K-Means (k={n_clusters})')
-                ax1.set_xlabel(f'PC1 ({var_exp[0]:.1f}% variância)')
-                ax1.set_ylabel(f'PC2 ({var_exp[1]:.1f}% variância)')
-                ax1.grid(True)
-                st.pyplot(fig1)
-
-                st.subheader("Médias por Cluster")
-                fig2, ax2 = plt.subplots(figsize=(10,6))
-                df_melted = df_para_analise.melt(
-                    id_vars='Cluster', 
-                    value_vars=variaveis,
-                    var_name='Variável', 
-                    value_name='Valor'
-                )
-                sns.barplot(
-                    data=df_melted, 
-                    x='Variável', 
-                    y='Valor', 
-                    hue='Cluster', 
-                    palette='Set2', 
-                    errorbar=None,
-                    ax=ax2
-                )
-                ax2.set_title('Médias das Variáveis por Cluster')
-                ax2.set_ylabel('Valor Médio')
-                ax2.tick_params(axis='x', rotation=45)
-                plt.tight_layout()
-                st.pyplot(fig2)
+                # Seção interativa isolada (st.fragment): mexer no número de clusters refaz só os
+                # clusters e as análises que dependem deles, sem redesenhar as outras abas
+                @st.fragment
+                def secao_clusters(df_para_analise):
+                    # Cópia local: a coluna Cluster não pode ficar no quadro reaproveitado pelas próximas execuções
+                    df_para_analise = df_para_analise.copy()
+                    with st.expander("Análise de Clusters", expanded=True):
+                        # Widget para selecionar número de clusters
+                        n_clusters = st.slider("Número de Clusters", 2, 5, 3)
+                
+                        # Normalização, PCA e K-Means (em cache por recorte e número de clusters)
+                        componentes, var_exp, clusters = fit_clusters(impressao_dados, n_clusters, df_para_analise)
+                        df_para_analise['Cluster'] = clusters
+
+                        # ======================
+                        # VISUALIZAÇÕES
+                        # ======================
+                        st.subheader("Visualização dos Clusters (PCA)")
+                        def desenhar():
+                            fig1, ax1 = plt.subplots(figsize=(8,6))
+                            sns.scatterplot(
+                                x=componentes[:, 0], y=componentes[:, 1],
+                                hue=clusters, palette='Set2', s=100, ax=ax1
+                            )
+                            ax1.set_title(f'Clusters via PCA + K-Means (k={n_clusters})')
+                            ax1.set_xlabel(f'PC1 ({var_exp[0]:.1f}% variância)')
+                            ax1.set_ylabel(f'PC2 ({var_exp[1]:.1f}% variância)')
+                            ax1.grid(True)
+                            return fig1
+                        show_cached_figure('clusters_pca', desenhar, impressao_dados, n_clusters, com_ordinais)
+
+                        st.subheader("Médias por Cluster")
+                        def desenhar():
+                            fig2, ax2 = plt.subplots(figsize=(10,6))
+                            df_melted = df_para_analise.melt(
+                                id_vars='Cluster', 
+                                value_vars=variaveis,
+                                var_name='Variável', 
+                                value_name='Valor'
+                            )
+                            sns.barplot(
+                                data=df_melted, 
+                                x='Variável', 
+                                y='Valor', 
+                                hue='Cluster', 
+                                palette='Set2', 
+                                errorbar=None,
+                                ax=ax2
+                            )
+                            ax2.set_title('Médias das Variáveis por Cluster')
+                            ax2.set_ylabel('Valor Médio')
+                            ax2.tick_params(axis='x', rotation=45)
+                            plt.tight_layout()
+                            return fig2
+                        show_cached_figure('medias_variaveis_cluster', desenhar, impressao_dados, n_clusters, com_ordinais)
 
-            # ======================
+                    # ======================
             
 
-            # ANÁLISE DE PERCEPÇÃO DE ATENDIMENTO
-            # ======================
-            with st.expander("Análise de Percepção de Atendimento de Saúde", expanded=True):
-                col_atividade = 'Você considera que o participante possui atendimento de saúde adequado pelo sistema público para atender suas necessidades'
+                    # ANÁLISE DE PERCEPÇÃO DE ATENDIMENTO
+                    # ======================
+                    with st.expander("Análise de Percepção de Atendimento de Saúde", expanded=True):
+                        col_atividade = esquema.get('atendimento_saude_sus')
                 
-                if col_atividade in df_original.columns:
-                    # 1. Preparar dados
-                    df_clusterizado_cat = df_para_analise.copy()
-                    df_clusterizado_cat[col_atividade] = df_original[col_atividade]
+                        if col_atividade:
+                            # 1. Preparar dados
+                            df_clusterizado_cat = df_para_analise.copy()
+                            df_clusterizado_cat[col_atividade] = df_filtrado[col_atividade]
                     
-                    # 2. Padronizar respostas
-                    df_clusterizado_cat[col_atividade] = (
-                        df_clusterizado_cat[col_atividade]
-                        .fillna('Não')
-                        .astype(str)
-                        .str.strip()
-                        .str.lower()
-                        .apply(lambda x: 'Sim' if x in ['sim', 'sim.'] else 'Não')
-                    )
+                            # 2. Rótulos das respostas (coluna já booleana; vazio conta como 'Não')
+                            df_clusterizado_cat[col_atividade] = (
+                                df_clusterizado_cat[col_atividade]
+                                .fillna(False)
+                                .map(ROTULOS_SIM_NAO)
+                            )
                     
-                    # 3. Tabelas cruzadas
-                    st.subheader("Distribuição por Cluster")
+                            # 3. Tabelas cruzadas
+                            st.subheader("Distribuição por Cluster")
                     
-                    col1, col2 = st.columns(2)
+                            col1, col2 = st.columns(2)
                     
-                    with col1:
-                        tabela_cruzada = pd.crosstab(df_clusterizado_cat['Cluster'], df_clusterizado_cat[col_atividade])
-                        st.markdown("**Contagem absoluta**")
-                        st.dataframe(tabela_cruzada.style.background_gradient(cmap='Blues'))
+                            with col1:
+                                tabela_cruzada = pd.crosstab(df_clusterizado_cat['Cluster'], df_clusterizado_cat[col_atividade])
+                                st.markdown("**Contagem absoluta**")
+                                st.dataframe(tabela_cruzada.style.background_gradient(cmap='Blues'))
                     
-                    with col2:
-                        tabela_percentual = tabela_cruzada.div(tabela_cruzada.sum(axis=1), axis=0) * 100
-                        st.markdown("**Percentual por cluster (%)**")
-                        st.dataframe(tabela_percentual.round(1).style.background_gradient(cmap='Greens'))
+                            with col2:
+                                tabela_percentual = tabela_cruzada.div(tabela_cruzada.sum(axis=1), axis=0) * 100
+                                st.markdown("**Percentual por cluster (%)**")
+                                st.dataframe(tabela_percentual.round(1).style.background_gradient(cmap='Greens'))
                     
-                    # 4. Gráficos
-                    st.subheader("Visualizações")
+                            # 4. Gráficos
+                            st.subheader("Visualizações")
                     
-                    tab1, tab2 = st.tabs(["Gráfico Empilhado", "Gráfico Lado a Lado"])
+                            tab_empilhado, tab_lado = st.tabs(["Gráfico Empilhado", "Gráfico Lado a Lado"])
                     
-                    with tab1:
-                        fig3, ax3 = plt.subplots(figsize=(10,6))
-                        tabela_percentual[['Sim', 'Não']].plot(kind='bar', stacked=True, colormap='Set2', ax=ax3)
-                        ax3.set_title('Percepção de Atendimento de Saúde por Cluster')
-                        ax3.set_ylabel('% de participantes')
-                        ax3.set_xlabel('Cluster')
-                        ax3.legend(title='Resposta', bbox_to_anchor=(1.05, 1), loc='upper left')
-                        plt.tight_layout()
-                        st.pyplot(fig3)
+                            with tab_empilhado:
+                                def desenhar():
+                                    fig3, ax3 = plt.subplots(figsize=(10,6))
+                                    tabela_percentual[['Sim', 'Não']].plot(kind='bar', stacked=True, colormap='Set2', ax=ax3)
+                                    ax3.set_title('Percepção de Atendimento de Saúde por Cluster')
+                                    ax3.set_ylabel('% de participantes')
+                                    ax3.set_xlabel('Cluster')
+                                    ax3.legend(title='Resposta', bbox_to_anchor=(1.05, 1), loc='upper left')
+                                    plt.tight_layout()
+                                    return fig3
+                                show_cached_figure('percepcao_atendimento_cluster_empilhado', desenhar, impressao_dados, n_clusters, com_ordinais)
                     
-                    with tab2:
-                        fig4, ax4 = plt.subplots(figsize=(10,6))
-                        tabela_percentual[['Sim', 'Não']].plot(kind='bar', stacked=False, color=['#66c2a5', '#fc8d62'], ax=ax4)
-                        ax4.set_title('Percepção de Atendimento de Saúde por Cluster')
-                        ax4.set_ylabel('% de participantes')
-                        ax4.set_xlabel('Cluster')
-                        ax4.legend(title='Resposta')
-                        ax4.grid(axis='y', linestyle='--', alpha=0.6)
-                        plt.tight_layout()
-                        st.pyplot(fig4)
+                            with tab_lado:
+                                def desenhar():
+                                    fig4, ax4 = plt.subplots(figsize=(10,6))
+                                    tabela_percentual[['Sim', 'Não']].plot(kind='bar', stacked=False, color=['#66c2a5', '#fc8d62'], ax=ax4)
+                                    ax4.set_title('Percepção de Atendimento de Saúde por Cluster')
+                                    ax4.set_ylabel('% de participantes')
+                                    ax4.set_xlabel('Cluster')
+                                    ax4.legend(title='Resposta')
+                                    ax4.grid(axis='y', linestyle='--', alpha=0.6)
+                                    plt.tight_layout()
+                                    return fig4
+                                show_cached_figure('percepcao_atendimento_cluster_lado', desenhar, impressao_dados, n_clusters, com_ordinais)
                     
-                    # 5. Teste Qui-Quadrado
-                    st.subheader("Teste de Associação Estatística")
-                    chi2, p_valor, dof, expected = chi2_contingency(tabela_cruzada)
+                            # 5. Teste Qui-Quadrado
+                            st.subheader("Teste de Associação Estatística")
+                            chi2, p_valor, dof, expected = chi2_contingency(tabela_cruzada)
                     
-                    st.markdown(f"""
-                    **Resultados do Teste Qui-Quadrado:**
-                    - Estatística qui-quadrado: `{chi2:.4f}`
-                    - p-valor: `{p_valor:.4f}`
-                    - Graus de liberdade: `{dof}`
-                    """)
+                            st.markdown(f"""
+                            **Resultados do Teste Qui-Quadrado:**
+                            - Estatística qui-quadrado: `{chi2:.4f}`
+                            - p-valor: `{p_valor:.4f}`
+                            - Graus de liberdade: `{dof}`
+                            """)
                     
-                    if p_valor < 0.05:
-                        st.success("🔍 **Resultado:** Existe diferença estatisticamente significativa entre os clusters na percepção de atendimento (p < 0.05)")
-                    else:
-                        st.warning("🔍 **Resultado:** NÃO há diferença estatisticamente significativa entre os clusters na percepção de atendimento (p ≥ 0.05)")
+                            if p_valor < 0.05:
+                                st.success("🔍 **Resultado:** Existe diferença estatisticamente significativa entre os clusters na percepção de atendimento (p < 0.05)")
+                            else:
+                                st.warning("🔍 **Resultado:** NÃO há diferença estatisticamente significativa entre os clusters na percepção de atendimento (p ≥ 0.05)")
                     
-                    st.markdown("**Frequências esperadas (se não houvesse associação):**")
-                    st.dataframe(pd.DataFrame(expected, index=tabela_cruzada.index, columns=tabela_cruzada.columns))
+                            st.markdown("**Frequências esperadas (se não houvesse associação):**")
+                            st.dataframe(pd.DataFrame(expected, index=tabela_cruzada.index, columns=tabela_cruzada.columns))
                     
-                else:
-                    st.error(f"Coluna '{col_atividade}' não encontrada no DataFrame. Verifique o nome da variável.")
+                        else:
+                            st.error(f"Coluna '{col_atividade}' não encontrada no DataFrame. Verifique o nome da variável.")
             
-            # ======================
-            # ESTATÍSTICAS POR CLUSTER
-            # ======================
-            with st.expander("Estatísticas Detalhadas por Cluster", expanded=False):
-                tabs = st.tabs(["Médias", "Medianas", "Tamanhos"])
+                    # ======================
+                    # ESTATÍSTICAS POR CLUSTER
+                    # ======================
+                    with st.expander("Estatísticas Detalhadas por Cluster", expanded=False):
+                        tabs = st.tabs(["Médias", "Medianas", "Tamanhos"])
                 
-                with tabs[0]:
-                    st.dataframe(
-                        df_para_analise.groupby('Cluster')[variaveis].mean().style.background_gradient(cmap='Blues')
-                    )
+                        with tabs[0]:
+                            st.dataframe(
+                                df_para_analise.groupby('Cluster')[variaveis].mean().style.background_gradient(cmap='Blues')
+                            )
                 
-                with tabs[1]:
-                    st.dataframe(
-                        df_para_analise.groupby('Cluster')[variaveis].median().style.background_gradient(cmap='Greens')
-                    )
+                        with tabs[1]:
+                            st.dataframe(
+                                df_para_analise.groupby('Cluster')[variaveis].median().style.background_gradient(cmap='Greens')
+                            )
                 
-                with tabs[2]:
-                    cluster_counts = df_para_analise['Cluster'].value_counts().sort_index()
-                    st.dataframe(cluster_counts)
-                    fig5, ax5 = plt.subplots(figsize=(6,4))
-                    sns.barplot(x=cluster_counts.index, y=cluster_counts.values, palette='Set2')
-                    ax5.set_title('Distribuição dos Clusters')
-                    ax5.set_xlabel('Cluster')
-                    ax5.set_ylabel('Número de Participantes')
-                    st.pyplot(fig5)
+                        with tabs[2]:
+                            cluster_counts = df_para_analise['Cluster'].value_counts().sort_index()
+                            st.dataframe(cluster_counts)
+                            def desenhar():
+                                fig5, ax5 = plt.subplots(figsize=(6,4))
+                                sns.barplot(x=cluster_counts.index, y=cluster_counts.values, palette='Set2')
+                                ax5.set_title('Distribuição dos Clusters')
+                                ax5.set_xlabel('Cluster')
+                                ax5.set_ylabel('Número de Participantes')
+                                return fig5
+                            show_cached_figure('distribuicao_clusters', desenhar, impressao_dados, n_clusters, com_ordinais)
+
+                # K-Means precisa de pelo menos tantos participantes quanto o maior número de clusters do controle
+                if len(df_para_analise) >= 5 and not df_para_analise.isna().any().any():
+                    secao_clusters(df_para_analise)
+                else:
+                    st.warning("Participantes insuficientes no recorte filtrado para a análise de clusters.")
 
         
         # --- ABA 9: Regressão e Random Forest ---
-        with tab9:
-            st.header("Modelos Preditivos: Regressão e Random Forest")
-            
-            st.markdown("""
-            <div style="text-align: justify">
-            Esta seção apresenta modelos preditivos para análise dos dados, incluindo regressão linear 
-            para problemas de predição numérica e Random Forest para classificação.
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Função para verificar variáveis válidas para regressão
-            def get_valid_regression_targets(df):
-                valid_targets = []
-                numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+        if tab9.open:
+            with tab9:
+                avisos.pop(tab9).empty()
+                st.header("Modelos Preditivos: Regressão e Random Forest")
+            
+                st.markdown("""
+                <div style="text-align: justify">
+                Esta seção apresenta modelos preditivos para análise dos dados, incluindo regressão linear 
+                para problemas de predição numérica e Random Forest para classificação.
+                </div>
+                """, unsafe_allow_html=True)
+            
+                # Função para verificar variáveis válidas para regressão
+                def get_valid_regression_targets(df):
+                    valid_targets = []
+                    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
                 
-                for col in numeric_cols:
-                    # Verificar se tem valores suficientes e variância
-                    if df[col].nunique() > 5 and df[col].notna().sum() > 20:
-                        valid_targets.append(col)
+                    for col in numeric_cols:
+                        # Verificar se tem valores suficientes e variância
+                        if df[col].nunique() > 5 and df[col].notna().sum() > 20:
+                            valid_targets.append(col)
                 
-                return valid_targets
+                    return valid_targets
             
-            # Função para verificar variáveis válidas para classificação
-            def get_valid_classification_targets(df):
-                valid_targets = []
+                # Função para verificar variáveis válidas para classificação
+                def get_valid_classification_targets(df):
+                    valid_targets = []
                 
-                # Considerar colunas categóricas e binárias numéricas
-                cat_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
-                binary_num_cols = [col for col in df.select_dtypes(include=['number']) 
-                                  if df[col].nunique() == 2 and df[col].notna().sum() > 20]
+                    # Considerar colunas categóricas e binárias numéricas
+                    cat_cols = df.select_dtypes(include=['object', 'string', 'category', 'boolean']).columns.tolist()
+                    binary_num_cols = [col for col in df.select_dtypes(include=['number']) 
+                                      if df[col].nunique() == 2 and df[col].notna().sum() > 20]
                 
-                for col in cat_cols + binary_num_cols:
-                    # Verificar se tem pelo menos 2 classes com amostras suficientes
-                    value_counts = df[col].value_counts()
-                    if len(value_counts) >= 2 and all(value_counts > 5):
-                        valid_targets.append(col)
+                    for col in cat_cols + binary_num_cols:
+                        # Verificar se tem pelo menos 2 classes com amostras suficientes
+                        value_counts = df[col].value_counts()
+                        if len(value_counts) >= 2 and all(value_counts > 5):
+                            valid_targets.append(col)
                 
-                return valid_targets
+                    return valid_targets
             
-            # Obter variáveis válidas
-            valid_reg_targets = get_valid_regression_targets(df_filtrado)
-            valid_clf_targets = get_valid_classification_targets(df_filtrado)
+                # Os modelos varrem todas as colunas, inclusive as opções de múltipla escolha guardadas em bits
+                df_modelos = model_frame(impressao_dados, banco, df_filtrado.index)
+
+                # Obter variáveis válidas
+                valid_reg_targets = get_valid_regression_targets(df_modelos)
+                valid_clf_targets = get_valid_classification_targets(df_modelos)
             
-            # Mostrar apenas se houver variáveis válidas
-            if not valid_reg_targets and not valid_clf_targets:
-                st.warning("Nenhuma variável alvo adequada encontrada para modelagem.")
-            else:
-                # Divisão em duas colunas para seleção de parâmetros
-                col1, col2 = st.columns(2)
+                # Mostrar apenas se houver variáveis válidas
+                if not valid_reg_targets and not valid_clf_targets:
+                    st.warning("Nenhuma variável alvo adequada encontrada para modelagem.")
+                else:
+                    # Seção interativa isolada (st.fragment): trocar a variável alvo refaz só os modelos
+                    @st.fragment
+                    def secao_modelos():
+                        # Divisão em duas colunas para seleção de parâmetros
+                        col1, col2 = st.columns(2)
                 
-                with col1:
-                    if valid_reg_targets:
-                        # Selecionar variável alvo para regressão
-                        target_reg = st.selectbox(
-                            "Selecione a variável alvo para regressão:",
-                            options=valid_reg_targets,
-                            index=0
-                        )
-                    else:
-                        st.warning("Nenhuma variável numérica adequada para regressão encontrada.")
+                        with col1:
+                            if valid_reg_targets:
+                                # Selecionar variável alvo para regressão
+                                target_reg = st.selectbox(
+                                    "Selecione a variável alvo para regressão:",
+                                    options=valid_reg_targets,
+                                    index=0
+                                )
+                            else:
+                                st.warning("Nenhuma variável numérica adequada para regressão encontrada.")
                 
-                with col2:
-                    if valid_clf_targets:
-                        # Selecionar variável alvo para classificação
-                        target_clf = st.selectbox(
-                            "Selecione a variável alvo para classificação:",
-                            options=valid_clf_targets,
-                            index=0
-                        )
-                    else:
-                        st.warning("Nenhuma variável categórica adequada para classificação encontrada.")
+                        with col2:
+                            if valid_clf_targets:
+                                # Selecionar variável alvo para classificação
+                                target_clf = st.selectbox(
+                                    "Selecione a variável alvo para classificação:",
+                                    options=valid_clf_targets,
+                                    index=0
+                                )
+                            else:
+                                st.warning("Nenhuma variável categórica adequada para classificação encontrada.")
                 
-                # Divisão em abas para cada modelo
-                tab_reg, tab_clf = st.tabs(["Análise de Regressão", "Random Forest"])
+                        # Renda e escolaridade só entram pelos códigos ordinais compartilhados (as categorias não são numéricas)
+                        com_ordinais = st.checkbox("Incluir renda e escolaridade como preditoras (códigos ordinais)",
+                                                   key='modelos_ordinais')
+                        ordinais = ordinal_features(impressao_dados, banco, df_modelos.index, esquema.nomes(
+                            'renda_familiar', 'escolaridade_participante', 'escolaridade_responsavel')) if com_ordinais else None
+
+                        # Divisão em abas para cada modelo
+                        tab_reg, tab_clf = st.tabs(["Análise de Regressão", "Random Forest"])
                 
-                # ABA DE REGRESSÃO
-                with tab_reg:
-                    if valid_reg_targets:
-                        st.subheader(f"Análise de Regressão para: {target_reg}")
+                        # ABA DE REGRESSÃO
+                        with tab_reg:
+                            if valid_reg_targets:
+                                st.subheader(f"Análise de Regressão para: {target_reg}")
                         
-                        try:
-                            import statsmodels.api as sm
-                            from sklearn.preprocessing import LabelEncoder
+                                try:
+                                    import statsmodels.api as sm
                             
-                            # Preparar dados para regressão
-                            df_reg = df_filtrado.copy()
+                                    # Preparar dados para regressão
+                                    df_reg = df_modelos.copy()
                             
-                            # Selecionar features automaticamente (todas as numéricas exceto a target)
-                            numeric_features = [col for col in df_filtrado.select_dtypes(include=['number']).columns 
-                                              if col != target_reg and df_filtrado[col].notna().sum() > 20]
+                                    # Selecionar features automaticamente (todas as numéricas exceto a target)
+                                    numeric_features = [col for col in df_modelos.select_dtypes(include=['number']).columns 
+                                                      if col != target_reg and df_modelos[col].notna().sum() > 20]
+                                    if ordinais is not None:
+                                        preditoras_ordinais = [col for col in ordinais.columns if col != target_reg]
+                                        df_reg[preditoras_ordinais] = ordinais[preditoras_ordinais]
+                                        numeric_features += preditoras_ordinais
                             
-                            if len(numeric_features) > 0:
-                                # Processar dados
-                                df_reg = df_reg[[target_reg] + numeric_features].dropna()
+                                    if len(numeric_features) > 0:
+                                        # Processar dados
+                                        df_reg = df_reg[[target_reg] + numeric_features].dropna()
                                 
-                                if len(df_reg) > 30:  # Mínimo de 30 observações
-                                    X = df_reg[numeric_features]
-                                    y = df_reg[target_reg]
-                                    
-                                    # Adicionar constante para o intercepto
-                                    X = sm.add_constant(X)
-                                    
-                                    # Ajustar modelo
-                                    model = sm.OLS(y, X).fit()
-                                    
-                                    # Exibir resultados
-                                    st.write("### Resumo do Modelo")
+                                        if len(df_reg) > 30:  # Mínimo de 30 observações
+                                            X = df_reg[numeric_features]
+                                            y = df_reg[target_reg]
+
+                                            # Ajustar modelo (constante para o intercepto; em cache por recorte e alvo)
+                                            model = fit_ols(impressao_dados, target_reg, X, y)
+
+                                            # Exibir resultados
+                                            st.write("### Resumo do Modelo")
                                     
-                                    # Criar duas colunas para métricas
-                                    m1, m2 = st.columns(2)
-                                    with m1:
-                                        st.metric("R² Ajustado", f"{model.rsquared_adj:.3f}")
-                                    with m2:
-                                        st.metric("Valor F", f"{model.fvalue:.1f}", f"p-valor: {model.f_pvalue:.4f}")
+                                            # Criar duas colunas para métricas
+                                            m1, m2 = st.columns(2)
+                                            with m1:
+                                                st.metric("R² Ajustado", f"{model.rsquared_adj:.3f}")
+                                            with m2:
+                                                st.metric("Valor F", f"{model.fvalue:.1f}", f"p-valor: {model.f_pvalue:.4f}")
                                     
-                                    # Mostrar coeficientes em tabela
-                                    st.write("### Coeficientes do Modelo")
-                                    coef_df = pd.DataFrame({
-                                        'Variável': model.params.index,
-                                        'Coeficiente': model.params.values,
-                                        'p-valor': model.pvalues.values
-                                    })
-                                    st.dataframe(
-                                        coef_df.style.format({'Coeficiente': '{:.4f}', 'p-valor': '{:.4f}'})
-                                        .apply(lambda x: ['background-color: #ffcccc' if x['p-valor'] > 0.05 else '' for i in x], axis=1)
-                                    )
+                                            # Mostrar coeficientes em tabela
+                                            st.write("### Coeficientes do Modelo")
+                                            coef_df = pd.DataFrame({
+                                                'Variável': model.params.index,
+                                                'Coeficiente': model.params.values,
+                                                'p-valor': model.pvalues.values
+                                            })
+                                            st.dataframe(
+                                                coef_df.style.format({'Coeficiente': '{:.4f}', 'p-valor': '{:.4f}'})
+                                                .apply(lambda x: ['background-color: #ffcccc' if x['p-valor'] > 0.05 else '' for i in x], axis=1)
+                                            )
                                     
-                                    # Gráficos de diagnóstico
-                                    st.write("### Diagnóstico do Modelo")
+                                            # Gráficos de diagnóstico
+                                            st.write("### Diagnóstico do Modelo")
                                     
-                                    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+                                            def desenhar():
+                                                fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
                                     
-                                    # Gráfico de resíduos
-                                    ax1.scatter(model.predict(), model.resid, alpha=0.6, color='#4e79a7')
-                                    ax1.axhline(y=0, color='r', linestyle='--')
-                                    ax1.set_title('Resíduos vs Valores Preditos')
-                                    ax1.set_xlabel('Valores Preditos')
-                                    ax1.set_ylabel('Resíduos')
+                                                # Gráfico de resíduos
+                                                ax1.scatter(model.predict(), model.resid, alpha=0.6, color='#4e79a7')
+                                                ax1.axhline(y=0, color='r', linestyle='--')
+                                                ax1.set_title('Resíduos vs Valores Preditos')
+                                                ax1.set_xlabel('Valores Preditos')
+                                                ax1.set_ylabel('Resíduos')
                                     
-                                    # QQ-plot
-                                    sm.qqplot(model.resid, line='s', ax=ax2)
-                                    ax2.set_title('QQ-Plot dos Resíduos')
+                                                # QQ-plot
+                                                sm.qqplot(model.resid, line='s', ax=ax2)
+                                                ax2.set_title('QQ-Plot dos Resíduos')
                                     
-                                    st.pyplot(fig)
-                                    plt.close(fig)
+                                                return fig
+                                            show_cached_figure('diagnostico_regressao', desenhar, impressao_dados, target_reg, com_ordinais)
                                     
-                                else:
-                                    st.warning(f"Dados insuficientes após limpeza (apenas {len(df_reg)} observações válidas).")
-                            else:
-                                st.warning("Nenhuma feature numérica adequada encontrada para a regressão.")
+                                        else:
+                                            st.warning(f"Dados insuficientes após limpeza (apenas {len(df_reg)} observações válidas).")
+                                    else:
+                                        st.warning("Nenhuma feature numérica adequada encontrada para a regressão.")
                                 
-                        except Exception as e:
-                            st.error(f"Erro na regressão: {str(e)}")
-                    else:
-                        st.warning("Nenhuma variável alvo válida selecionada para regressão.")
+                                except Exception as e:
+                                    st.error(f"Erro na regressão: {str(e)}")
+                            else:
+                                st.warning("Nenhuma variável alvo válida selecionada para regressão.")
                 
-                # ABA DE CLASSIFICAÇÃO
-                with tab_clf:
-                    if valid_clf_targets:
-                        st.subheader(f"Modelo Random Forest para: {target_clf}")
+                        # ABA DE CLASSIFICAÇÃO
+                        with tab_clf:
+                            if valid_clf_targets:
+                                st.subheader(f"Modelo Random Forest para: {target_clf}")
                         
-                        try:
-                            from sklearn.ensemble import RandomForestClassifier
-                            from sklearn.model_selection import train_test_split
-                            from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
-                            from sklearn.preprocessing import LabelEncoder
+                                try:
+                                    from sklearn.model_selection import train_test_split
+                                    from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
                             
-                            # Preparar dados
-                            df_clf = df_filtrado.copy()
+                                    # Preparar dados
+                                    df_clf = df_modelos.copy()
                             
-                            # Codificar target
-                            le = LabelEncoder()
-                            df_clf[target_clf] = le.fit_transform(df_clf[target_clf].astype(str))
+                                    # Codificar target (booleanas exibidas como 'Não'/'Sim')
+                                    if pd.api.types.is_bool_dtype(df_clf[target_clf]):
+                                        df_clf[target_clf] = df_clf[target_clf].map(ROTULOS_SIM_NAO)
+                                    le = LabelEncoder()
+                                    df_clf[target_clf] = le.fit_transform(df_clf[target_clf].astype(str))
                             
-                            # Selecionar features (todas as numéricas com dados suficientes)
-                            numeric_features = [col for col in df_filtrado.select_dtypes(include=['number']).columns 
-                                              if col != target_clf and df_filtrado[col].notna().sum() > 20]
+                                    # Selecionar features (todas as numéricas com dados suficientes)
+                                    numeric_features = [col for col in df_modelos.select_dtypes(include=['number']).columns 
+                                                      if col != target_clf and df_modelos[col].notna().sum() > 20]
+                                    if ordinais is not None:
+                                        preditoras_ordinais = [col for col in ordinais.columns if col != target_clf]
+                                        df_clf[preditoras_ordinais] = ordinais[preditoras_ordinais]
+                                        numeric_features += preditoras_ordinais
                             
-                            if len(numeric_features) > 0:
-                                df_clf = df_clf[[target_clf] + numeric_features].dropna()
+                                    if len(numeric_features) > 0:
+                                        df_clf = df_clf[[target_clf] + numeric_features].dropna()
                                 
-                                if len(df_clf) > 30:  # Mínimo de 30 observações
-                                    X = df_clf[numeric_features]
-                                    y = df_clf[target_clf]
-                                    
-                                    # Verificar balanceamento
-                                    class_balance = pd.Series(y).value_counts(normalize=True)
-                                    st.write(f"**Distribuição das classes:** {', '.join([f'{le.classes_[i]}: {p:.1%}' for i, p in class_balance.items()])}")
+                                        if len(df_clf) > 30:  # Mínimo de 30 observações
+                                            X = df_clf[numeric_features]
+                                            y = df_clf[target_clf]
                                     
-                                    # Dividir dados com stratificação
-                                    X_train, X_test, y_train, y_test = train_test_split(
-                                        X, y, test_size=0.3, random_state=42, stratify=y
-                                    )
+                                            # Verificar balanceamento
+                                            class_balance = pd.Series(y).value_counts(normalize=True)
+                                            st.write(f"**Distribuição das classes:** {', '.join([f'{le.classes_[i]}: {p:.1%}' for i, p in class_balance.items()])}")
                                     
-                                    # Configuração do modelo
-                                    st.write("### Configuração do Modelo")
-                                    n_estimators = st.slider("Número de árvores", 10, 200, 100, key='n_estimators')
-                                    max_depth = st.slider("Profundidade máxima", 2, 20, 5, key='max_depth')
+                                            # Dividir dados com stratificação
+                                            X_train, X_test, y_train, y_test = train_test_split(
+                                                X, y, test_size=0.3, random_state=42, stratify=y
+                                            )
                                     
-                                    # Treinar modelo
-                                    model = RandomForestClassifier(
-                                        n_estimators=n_estimators,
-                                        max_depth=max_depth,
-                                        random_state=42,
-                                        class_weight='balanced' if any(p < 0.3 for p in class_balance) else None
-                                    )
-                                    model.fit(X_train, y_train)
+                                            # Treino isolado (st.fragment): os sliders de hiperparâmetros só refazem o Random Forest
+                                            @st.fragment
+                                            def secao_random_forest():
+                                                # Configuração do modelo
+                                                st.write("### Configuração do Modelo")
+                                                n_estimators = st.slider("Número de árvores", 10, 200, 100, key='n_estimators')
+                                                max_depth = st.slider("Profundidade máxima", 2, 20, 5, key='max_depth')
                                     
-                                    # Avaliação
-                                    y_pred = model.predict(X_test)
-                                    accuracy = accuracy_score(y_test, y_pred)
+                                                # Treinar modelo (em cache por recorte, alvo e hiperparâmetros)
+                                                model = fit_random_forest(impressao_dados, target_clf, n_estimators, max_depth,
+                                                                          any(p < 0.3 for p in class_balance), X_train, y_train)
+
+                                                # Avaliação
+                                                y_pred = model.predict(X_test)
+                                                accuracy = accuracy_score(y_test, y_pred)
                                     
-                                    # Mostrar métricas
-                                    st.write("### Desempenho do Modelo")
+                                                # Mostrar métricas
+                                                st.write("### Desempenho do Modelo")
                                     
-                                    col1, col2 = st.columns(2)
-                                    with col1:
-                                        st.metric("Acurácia", f"{accuracy:.2%}")
+                                                col1, col2 = st.columns(2)
+                                                with col1:
+                                                    st.metric("Acurácia", f"{accuracy:.2%}")
                                     
-                                    with col2:
-                                        st.metric("Classes", len(le.classes_))
+                                                with col2:
+                                                    st.metric("Classes", len(le.classes_))
                                     
-                                    # Relatório de classificação
-                                    st.write("### Relatório Detalhado")
-                                    report = classification_report(
-                                        y_test, y_pred, 
-                                        target_names=le.classes_, 
-                                        output_dict=True
-                                    )
-                                    st.dataframe(pd.DataFrame(report).transpose().style.background_gradient(cmap='Blues'))
+                                                # Relatório de classificação
+                                                st.write("### Relatório Detalhado")
+                                                report = classification_report(
+                                                    y_test, y_pred, 
+                                                    target_names=le.classes_, 
+                                                    output_dict=True
+                                                )
+                                                st.dataframe(pd.DataFrame(report).transpose().style.background_gradient(cmap='Blues'))
                                     
-                                    # Matriz de confusão
-                                    st.write("### Matriz de Confusão")
-                                    cm = confusion_matrix(y_test, y_pred)
+                                                # Matriz de confusão
+                                                st.write("### Matriz de Confusão")
+                                                cm = confusion_matrix(y_test, y_pred)
                                     
-                                    fig, ax = plt.subplots(figsize=(8, 6))
-                                    sns.heatmap(
-                                        cm, annot=True, fmt='d', 
-                                        cmap='Blues',
-                                        xticklabels=le.classes_,
-                                        yticklabels=le.classes_,
-                                        ax=ax
-                                    )
-                                    ax.set_xlabel('Predito')
-                                    ax.set_ylabel('Real')
-                                    ax.set_title('Matriz de Confusão')
-                                    st.pyplot(fig)
-                                    plt.close(fig)
+                                                def desenhar():
+                                                    fig, ax = plt.subplots(figsize=(8, 6))
+                                                    sns.heatmap(
+                                                        cm, annot=True, fmt='d', 
+                                                        cmap='Blues',
+                                                        xticklabels=le.classes_,
+                                                        yticklabels=le.classes_,
+                                                        ax=ax
+                                                    )
+                                                    ax.set_xlabel('Predito')
+                                                    ax.set_ylabel('Real')
+                                                    ax.set_title('Matriz de Confusão')
+                                                    return fig
+                                                show_cached_figure('matriz_confusao', desenhar, impressao_dados, target_clf, n_estimators, max_depth, com_ordinais)
                                     
-                                    # Importância das features
-                                    st.write("### Importância das Variáveis")
-                                    importance = pd.DataFrame({
-                                        'Variável': numeric_features,
-                                        'Importância': model.feature_importances_
-                                    }).sort_values('Importância', ascending=False)
+                                                # Importância das features
+                                                st.write("### Importância das Variáveis")
+                                                importance = pd.DataFrame({
+                                                    'Variável': numeric_features,
+                                                    'Importância': model.feature_importances_
+                                                }).sort_values('Importância', ascending=False)
                                     
-                                    fig2, ax2 = plt.subplots(figsize=(10, 6))
-                                    sns.barplot(
-                                        x='Importância', 
-                                        y='Variável', 
-                                        data=importance.head(10),  # Mostrar apenas as top 10
-                                        palette='viridis',
-                                        ax=ax2
-                                    )
-                                    ax2.set_title('Top 10 Variáveis Mais Importantes')
-                                    st.pyplot(fig2)
-                                    plt.close(fig2)
+                                                def desenhar():
+                                                    fig2, ax2 = plt.subplots(figsize=(10, 6))
+                                                    sns.barplot(
+                                                        x='Importância', 
+                                                        y='Variável', 
+                                                        data=importance.head(10),  # Mostrar apenas as top 10
+                                                        palette='viridis',
+                                                        ax=ax2
+                                                    )
+                                                    ax2.set_title('Top 10 Variáveis Mais Importantes')
+                                                    return fig2
+                                                show_cached_figure('importancia_variaveis', desenhar, impressao_dados, target_clf, n_estimators, max_depth, com_ordinais)
+
+                                            secao_random_forest()
                                     
-                                else:
-                                    st.warning(f"Dados insuficientes após limpeza (apenas {len(df_clf)} observações válidas).")
-                            else:
-                                st.warning("Nenhuma feature numérica adequada encontrada para o modelo.")
+                                        else:
+                                            st.warning(f"Dados insuficientes após limpeza (apenas {len(df_clf)} observações válidas).")
+                                    else:
+                                        st.warning("Nenhuma feature numérica adequada encontrada para o modelo.")
                                 
-                        except Exception as e:
-                            st.error(f"Erro no Random Forest: {str(e)}")
-                    else:
-                        st.warning("Nenhuma variável alvo válida selecionada para classificação.")
-        
-        # --- ABA 10: Discussão e Conclusão ---
-        with tab10:
-            st.header("Discussão")
-            st.markdown("""
-            <div class="justified-text">
-            Os dados apresentados no gráfico de distribuição por faixa etária contém uma amostra com predomínio de pessoas com Síndrome de Down (SD) mais jovens, as categorias 5 meses a 10 anos possui 44,1% da distribuição e em segundo lugar a categoria 11 a 19 anos com 28,9% dessa demografia. Essa distribuição de uma faixa etária mais jovem é devido à natureza da pesquisa que foi aplicada em Centros de atendimento à Pessoas com Síndrome de Down, Centros Paralímpicos de atletas com SD, instituições filantrópicas e ONGs que trabalham no desenvolvimento dessa população. Em relação as características étnicas raciais, a amostra reflete um predomínio de 77,4% pessoas autodeclaradas brancas e 15,5% pardas. Analisando esses dois gráficos conseguimos notar um ponto limitante da amostra, a falta de diversidade seja pela faixa etária ou pela cor/etnia, uma vez que um dos objetivos  do projeto é avaliar características sociodemográficas de pessoas com SD no Brasil. 
-            
-            O gráfico sobre o número de irmãos que o participante possui aponta que 43,1% possui pelo menos 1 irmão. Trazendo dados da literatura, um estudo realizado na Flórida (Marshall et al., 2019), relata por parte dos pais a falta de ter recebido informações adequadas após o diagnóstico de um filho com Síndrome de Down, seja durante o período pré-natal ou no pós-natal. Em se tratando de países subdesenvolvidos essa problemática pode ser ainda pior e com uma realidade e perspectiva mais dura. Não é difícil encontrar uma sobrecarga dos cuidados recaída sobre a mãe, que na maioria das vezes precisa administrar os cuidados entre os filhos e outras demandas familiares. Ao aplicar a pesquisa foi observado, em sua grande maioria, crianças com SD sendo levadas para as atividades diárias por suas mães que em seus relatos apontavam a dificuldade em conseguir conciliar a rotina de cuidados com o filho e as obrigações do dia a dia.
-            
-            A distribuição da renda familiar parece assimétrica para as faixas de renda mais altas, sendo 40,1% dos participantes terem uma renda de mais de 5 salários mínimos. Isso é reforçado no heatmap de "Correlação Socioeconômica" em que há uma correlação negativa fraca (-0.19) entre renda familiar e receber o Benefício e Pretação Continuada (BPC). Esse dado implica numa menor representação em rendas médias-baixas. Além disso, 4,6% dos participantes disseram receber o Bolsa Família e 16,3% recebem o BPC. Ainda no mesmo heatmap houve uma correlação positiva fraca (0.44) entre receber o Bolsa Família e receber o BPC. A distribuição do tipo de moradia demonstrou que 68,8% dos participantes possuem moradia própria e 19,8% possuem moradia alugada. A realidade brasileira ainda é vista por sua alta concentração de renda, onde apenas 1% da população detém de 28,3% da renda total o que reflete sobre as desigualdades sociais (IPEA, 2023). Em se tratando de pessoas com Síndrome de Down e suas família existe uma subnotificação não apenas dos aspectos sociodemográficos, mas em tantos outros que investigamos nessa pesquisa. A realidade da grande maioria dessas famílias não necessariamente está refletida nos 40,1% computados, mas sim nos relatos de pais em dizer que depender dos auxílios era algo comum, principalmente quando a pesquisa era aplicada em instituições que atendiam pessoas de baixa renda. Algumas mães relataram a necessidade de abdicar do emprego para cuidar de seus filhos de forma integral e que o auxílio era a única renda familiar.
-            
-            Em relação ao nível de escolaridade dos participantes houve um predomínio de baixos níveis de escolaridade. 34,1% disseram ter Ensino Fundamental incompleto e 14,4% não se alfabetizaram e/ou não frequentaram a escola. Ainda que a amostra contenha um predomínio de pessoas na faixa etária de 5 meses a 10 anos (44,1%), 52,8% não são alfabetizados e 26,8% são semi alfabetizados, isso mesmo entre as faixas etárias adultas. Embora no heatamp de "Escolaridade e Alfabetização" apresente fortes correlações positivas entre as variáveis analisadas como "saber escrever", "saber ler" é preciso levantar um questionamento. A realidade escolar e de qualificação profissional entre pessoas com SD e outras deficiências intelectuais é de enfrentamento de barreiras significativas, seja no acesso à informação, emprego, autonomia e participação social. Isso é reflexo tanto da falta de acessibilidade e inclusão nos mais diversos âmbitos da vida, na falta de suporte e políticas públicas que garantem acesso à educação de qualidade, o despreparo de profissionais para atender esse público e também a superproteção e desinformação por parte do cuidador. O direito a educação inclusiva e equitativa deve ser estabelecido nas instituições. Pessoas com Síndrome de Down possuem necessidades educacionais variadas, o apoio adequado, o sentimento de pertencimento à comunidade e o suporte de autonomia garantida são alavancas que podem fazer o indivíduo com SD prosperar não apenas na vida acadêmica, mas em outros aspectos da vida (Boundy et al., 2023). Ainda sobre escolaridade e alfabetização, 64,6% dos participantes não sabe ler e 62,4% não sabe escrever e 93,3% não consegue interpretar texto. O baixo letramento funcional reflete o acesso limitado à educação e isso implicando em uma vulnerabilidade educacional exigindo planejamento e estratégias políticas que atendam as necessidade específicas dessa população. Ao analisar o heatmap de "Escolaridade e Alfabetização" existe uma correlação negativa fraca (-0,15) entre nivel de escolaridade e ser alfabetizado, ou seja, estar em anos mais avançados na escola não é garantia que a pessoa com SD está sendo alfabetizada.
-            Quanto ao nível de escolaridade do responsável do participante 33,8% disseram ter Pós-graduação e 27,5%  tem Ensino Superior completo. Esse dado reafirma o status socioeconômico da amostra e também conversa com outro dado que será apresentado na discussão, "Idade em que a mãe teve a gestação".
-            
-            Analisando o gráfico da idade em que a mãe teve a gestação, majoritariamente a concentração está na faixa etária 36-40 anos (42,3%). Isso pode estar associado na decisão de ter filhos após uma estabilidade socioeconômica e planejamento familiar reforçando o perfil socioeconômico da amostra. Em relação ao acompanhamento pré-natal 66,9% disseram ter realizado na rede privada, dado consistente com o perfil de renda familiar e escolaridade do responsável. De forma geral, em relação as redes de acompanhamento (nutricionista, oftalmologista, psicólogo, clínico geral, dentista) a rede privada é a mais utilizada. As especialidades menos utilizadas são o acompanhamento com nutricionista e psicólogo e aqui é possível apontar uma problemática na saúde, pois pessoas com SD são mais suscetíveis a desenvolverem comorbidades, distúrbios cardiovasculares, colesterol alto, obesidade, distúrbio da tireoide e outras doenças (Asua et al., 2015). Além disso, esse público requer um acompanhamento psicológico por terem um comprometimento cognitivo, em aprendizagem, memória, linguagem e função cognitiva. Em nossa amostra, a prevalência de diagnóstico teve a ansiedade como predominante (12%). A realização de intervenção precoce seja pela rede privada (45,5%) ou pela pública (35,1%) reforça a necessidade de especialistas (fisioterapeutas, fonoaudiólogos, terapeuta ocupacional) capacitados para atender esse público, principalmente na rede pública, onde a demanda é grande e a espera por vaga no atendimento também.
-            
-            Quanto ao diagnóstico do participante, 78,2% tiveram no pós-natal, sugerindo que embora o acompanhamento pré-natal seja realizado o diagnóstico de doenças genéticas acaba sendo tardio. Além disso, 93,7% dos participantes realizaram o exame de cariótipo. Este estudo aponta que métodos de triagem não invasiva são cruciais na estimativa do risco individual de uma gravidez cromossômica afetada tanto em mulheres jovens quanto em mulheres mais velhas. No entanto, apenas o diagnóstico invasivo pré-natal é definitivo da Síndrome de Down e aconselhamento genético apropriado (Vičić et al., 2017). A combinação de fatores como a escolha ou não de realiza o pré-natal, ultrassonografia morfológica não precisa, características físicas do bebê não tão evidentes ao nascimento e a necessidade de exames complementares contribuem para um diagnóstico definitivo no pós-natal.
-            Em relação ao irmão ter ou não alguma deficiência 98,1% disseram não ter deficiência, podendo indicar que a SD não é amplamente recorrente nas famílias da amostra.
-            
-            Sobre a percepção do cuidador em relação à saúde em geral do participante, 50,7% disseram ser boa e 37,6% disseram ser excelente. Ao aplicar a pesquisa, alguns cuidadores relataram ter uma percepção positiva da saúde geral de seu filho mesmo considerando a condição genética e as comorbidades associadas, e muitas vezes comparando com outras crianças que tem Síndrome de Down ou que fazem uso regular de medicações.
-            
-            Em relação ao IMC, a classificação foi realizada de acordo com a Organização Mundial da Saúde e da Sociedade Brasileira de Pediatria quando a faixa etária era de 0 meses a 10 anos devido a curva do Z escore. Ao somar as porcentagens das categorias sobrepeso e obesidades, 47,1% do sexo feminino e 43,8% do sexo masculino estão nessas classificações. Esse dado implica em um problema de saúde pública ainda mais quando o dado conversa com o gráfico de acompanhamento nutricional em que 66,9% disseram não realizar.
-            
-            A distribuição de imunizações/vacinas entre os participantes apresenta uma alta cobertura para aquelas vacinas do calendário infantil anual básico. A cobertura se torna baixa para vacina da varicela, HPV, dengue e principalmente da Covid-19. Aqui vale um comentário, durante a aplicação da pesquisa houve grande resistência em obter informações sobre a vacina da Covid-19, além disso foi relatado uma grande desinformação à respeito da vacina. Infelizmente alguns cuidadores acreditam que a vacina não é benéfica à saúde de seus filhos, outros apontam que ela é causadora de outra enfermidades mesmo tendo evidências científicas de que pessoas com Síndrome de Down possuem uma baixa imunidade quando comparadas a seus pares, podendo ser consideradas imunossuprimidas devido a alterações no sistema imunológico o que as torna mais susceptíveis a infecções e doenças autoimunes (Ram et al., 2011).
-            A baixa taxa de casos de covid grave ou que não tiveram covid-19 pode ser reflexo de maior adesão das 1ª e 2ª doses da vacina, mas também pode ser pela não detecção da doença no período da pandemia ou mesmo na omissão do caso na hora de responder o questionário.
-            
-            Entre as doenças mais contraídas apesar das imunizações, a pneumonia foi a mais frequente com 33% da amostra, sendo que este dado reforça a maior suscetibilidade dessa população em contrair infecções respiratórias, seja pelas diferenças anatômica das vias aéreas ou um sistema imunológico mais comprometido. Vale ressaltar que a vacina pneumocócica conjugada foi relativamente recente introduzida no calendário básico de imunização do Brasil, no ano de 2010, antes disso ela era direcionada apenas aos idosos.
-            As morbidades mais prevalentes foram distúrbio da tireoide (18%), alterações visuais (17,2%) e alterações cardiovasculares/malformações cardíacas (17%). Mapear as morbidades mais prevalentes é demonstrar os desafios de saúde pública e seu acesso.
-            
-            Em relação ao uso de medicações pelos participantes 41,4% fazem suplementação de vitamina D e 30% tomam algum repositor hormonal da tireoide. Pessoas com SD podem desenvolver hipotireoidismo congênito. Um estudo de Gorini et al (2024) mostra que a concentração baixa ou anormal de T4 ao nascer pode impactar na vida fetal e neonatal, uma vez que os hormônios tireoidianos desempenham papel fundamental no desenvolvimento do cérebro e sua deficiência contribui para a deficiência intelectual em pessoas com SD o que influência no crescimento somático e desenvolvimento psicomotor.
-            
-            A percepção dos cuidadores em relação ao hábitos saudáveis dos participantes, 90,7% relatam que seus filhos possuem uma alimentação saudável, no entanto,
-            este dado contrasta com o gráfico de alta prevalência de sobrepeso e obesidade entre os participantes discutido anteriormente. Além disso a obesidade pode ser influenciada por fatores metabólicos intrínsecos à Síndrome de Down o que reforça a necessidade de acompanhamento nutricional.
-            
-            Os gráficos de atividade física e frequência semanal praticada mostram que 37,9% dos participantes não praticam e entre àqueles que praticam a maioria pratica de 2 a 3 vezes na semana. Embora 62,1% declarem praticar alguma atividade física ou esporte, pode ser que a frequência ainda não seja o ideal para todos. Manter-se ativo é importante não apenas para o controle de peso, visto os dados de IMC dessa amostra, mas também por uma questão de saúde geral  de uma população com predisposição à obesidade e outras comorbidades (Xanthopoulos et al., 2023).
-            
-            O gráfico de atendimento de saúde público adequado mostrou que 70% dos cuidadores acham que seus filhos não o recebem. Esse dado é crítico considerando que a maioria dos participantes possui acesso à rede privada. A percepção negativa ao sistema público de saúde aponta fragilidades no atendimento feito pelo SUS. Por se tratar de um público em vulnerabilidade, desigualdade e dificuldade em acessibilidade, o setor público precisa traçar estratégias políticas que atendam não apenas as demandas dessa população, mas que tenha um olhar de integralidade nos aspectos de saúde, educação e sociodemográficos. O direito à saúde pública de qualidade precisa ser garantido, mais ainda o respeito e a liberdade de ter autonomia e participação numa sociedade que precisar rever esse olhar capacitista.
-            
-            Em relação aos aspectos de autonomia, participação e interação social, no gráfico de autonomia, 54,5% disseram que seus filhos tem autonomia para escolher coisas para sua satisfação pessoal. Em relação a se deslocar independentemente pela cidade 91,3% disseram que não. 51,2% é parcialmente independente na realização de suas atividade em geral. 91% se relaciona com diferentes pessoas e tem amigos. 77,1% interagem socialmente frequentando diferentes lugares da cidade e bairro. 77,1% dos cuidadores tem uma percepção positiva e acreditam que seus filhos são tratados com respeito, dignidade e igualdade pelas outras pessoas. É preciso lembrar que maior parte da faixa etária dessa amostra está entre 5 meses e 10 anos, logo não seria possível se descolar sozinho pela cidade, contudo, ainda que na vida adulta, pessoas com Síndrome de Down durante o curso da vida acabam sendo pouco estimuladas a ter sua autonomia, isso gera uma dependência e superproteção do cuidador o que implica na sua socialização e desenvolvimento. Ter uma rede de apoio é importante e ter sua independência e autonomia estimuladas é essencial para o desenvolvimento de habilidades seja na capacidade de tomar decisões, resolver problemas, desenvolver autoconhecimento, capacidade de comunicação e interação social. Embora a percepção do cuidador achar que seu filho é tratado com respeito e dignidade, foi relato que em alguns casos isso ocorre porque ainda são bebês ou crianças, que ao passar para a adolescência muitos sofrem preconceito e discriminação por parte de colegas nas escolas. Essa reflexão importante, pois como mencionados vivemos em uma sociedade capacitista e desigual. Achar que pelo indivíduo ter o diagnóstico de Síndrome de Down sua vida resume a uma  crença de que ele é incapaz devido às sua deficiências é uma atitude discriminatórias. Educar e ensinar as crianças de que todos são capazes de desenvolver habilidades, seja qual for, independente de suas limitações, é um exercício de cidadania. Oportunizar, incentivar e acolher as limitações é diminuir as barreiras físicas, sociais e institucionais enfrentadas diariamente pelas pessoas com Síndrome de Down.
-            
-            Ao analisar o gráfico de dispersão dos resultados da análise de agrupamento usando K-means após uma redução de dimensões por PCA (PC1 + PC2 explicam 79,5% da variância total dos dados), observamos o agrupamento em 3 clusters considerando as variáveis "idade do participante", "idade do cuidador principal", "IMC", "peso do participante", "altura do participante" e "idade em que a mãe do participante teve a gestação":
-            
-            Cluster 0 - Jovens adultos/adultos com IMC alto:
-            A idade média dos participantes é aproximadamente 27 anos. 
-            A idade do cuidador é aproximadamente 62 anos (pais mais velhos no grupo). 
-            IMC de 28,2kg/m² (sobrepeso). 
-            Altura de 1,54m. 
-            Peso de 68kg
-            Idade materna na gestação entre 38-39 anos
-            - Este cluster representa um grupo de adultos jovens com sobrepeso, sob cuidado de pessoas mais velhas. Pode ser que os indivíduos tenham um grau maior de dependência ou vulnerabilidade física divido os pais terem mais idade.
-            
-            Cluster 1 - Crianças
-            Idade média dos participantes de aproximadamente 3,7 anos
-            Idade do cuidador principal de aproximadamente 42 anos
-            IMC de 19,88kg/m² (eutrofia para faixa etária infantil)
-            Altura de 94cm
-            Peso de 15kg
-            Idade materna na gestação entre 30-31 anos
-            - Este cluster representa um grupo de crianças que tem cuidadores adultos na faixa etária dos 40 anos. É esperado um perfil de dependência da infância e uma demanda de cuidados completos no dia a dia.
-            
-            Cluster 2 - Pré-adolescentes/adolescentes
-            Idade média do participante de aproximadamente 13,6 anos
-            Idade do cuidador principal de 49 anos
-            IMC de 22,9kg/m² (eutrofia)
-            Altura de 1,40m
-            Peso de 43kg
-            Idade materna na gestação entre 35-36 anos
-            - Este cluster representa um grupo de adolescentes ou pré-adolescentes com IMC compatível para a idade. Os cuidadores são pais mais jovens (pais e mãe de meia idade) quando comparado com os pais do cluster 0. É possível que este seja um grupo de pessoa com SD com maior independência funcional e autonomia quando comparado ao cluster 1.
-            
-            O gráfico de distribuição da percepção de atendimento de saúde pública por cluster tem os seguintes achados:
-            
-            Cluster 0 – Jovens adultos/adultos
-            45,6% dos cuidadores avaliam que o atendimento pelo sistema público de saúde é adequado, este é o maior percentual entre os grupos. Ainda assim, mais da metade (54,4%) consideram o atendimento inadequado (Não). É possível que apesar do sobrepeso identificado nesse grupo, este seja o que mais reconhece acesso ou qualidade no SUS. Provavelmente são usuários mais experientes do sistema, com certa autonomia e/ou consciência de seus direitos.
-            
-            Cluster 1 – Crianças 
-            Apenas 18,6% disseram ter acesso a atendimento de qualidade pelo sistema público de saúde, ou seja, mais de 80% dos responsáveis não consideram o atendimento adequado. É possível que haja dificuldade dos cuidadores em conseguir atendimento especializado em demandas, por exemplo, fisioterapia, fonoaudiólogo, terapeuta ocupacional, psicólogo. Além disso, o diagnóstico precoce ou terapias contínuas para crianças com deficiência pode ser uma barreira enfrentada no dia a dia.
-            
-            Cluster 2 – Pré-adolescentes/adolescentes
-            Apenas 24,8% avaliaram positivamente o atendimento. A percepção dos cuidadores parece um pouco melhor comparado ao cluster 1, contudo a maioria ainda é negativa. É possível que haja lacunas em acompanhamento longitudinal e de integralidade seja na reabilitação ou transição para a vida adulta.
-            
-            """, unsafe_allow_html=True)
-
-            st.header("Referências:")
-            st.markdown("""
-
-Marshall, J., Ramakrishnan, R., Slotnick, A. L., Tanner, J. P., Salemi, J. L., & Kirby, R. S. (2019). Family-Centered Perinatal Services for Children With Down Syndrome and Their Families in Florida. Journal of obstetric, gynecologic, and neonatal nursing : JOGNN, 48(1), 78–89. https://doi.org/10.1016/j.jogn.2018.10.006
-
-MONTFERRE, Helio. Estudos revelam impacto da redistribuição de renda no Brasil. Ipea, 4 ago. 2023. Disponível em: https://www.ipea.gov.br/portal/categorias/45-todas-as-noticias/noticias/13909-estudos-revelam-impacto-da-redistribuicao-de-renda-no-brasil. Acesso em: 24 jun. 2025.
-
-Boundy, L., Hargreaves, S., Baxter, R., Holton, S., & Burgoyne, K. (2023). Views of educators working with pupils with Down syndrome on their roles and responsibilities and factors related to successful inclusion. Research in developmental disabilities, 142, 104617. https://doi.org/10.1016/j.ridd.2023.104617
-
-Vičić, A., Hafner, T., Bekavac Vlatković, I., Korać, P., Habek, D., & Stipoljev, F. (2017). Prenatal diagnosis of Down syndrome: A 13-year retrospective study. Taiwanese journal of obstetrics & gynecology, 56(6), 731–735. https://doi.org/10.1016/j.tjog.2017.10.004
-
-Ram, G., & Chinen, J. (2011). Infections and immunodeficiency in Down syndrome. Clinical and experimental immunology, 164(1), 9–16. https://doi.org/10.1111/j.1365-2249.2011.04335.x
-
-Gorini, F., Coi, A., Pierini, A., Assanta, N., Bottoni, A., & Santoro, M. (2024). Hypothyroidism in Patients with Down Syndrome: Prevalence and Association with Congenital Heart Defects. Children (Basel, Switzerland), 11(5), 513. https://doi.org/10.3390/children11050513
-
-Xanthopoulos, M. S., Walega, R., Xiao, R., Pipan, M. E., Cochrane, C. I., Zemel, B. S., Kelly, A., & Magge, S. N. (2023). Physical Activity in Youth with Down Syndrome and Its Relationship with Adiposity. Journal of developmental and behavioral pediatrics : JDBP, 44(6), e436–e443. https://doi.org/10.1097/DBP.0000000000001192
+                                except Exception as e:
+                                    st.error(f"Erro no Random Forest: {str(e)}")
+                            else:
+                                st.warning("Nenhuma variável alvo válida selecionada para classificação.")
 
+                    secao_modelos()
         
-""", unsafe_allow_html=True)  
-
-            
-            st.markdown("""
-            <div class="justified-text">
-            <h3>Principais Achados</h3>
-            <p>Os resultados deste estudo revelaram padrões importantes nas características 
-            sociais, educacionais e de saúde da população com síndrome de Down no Brasil:</p>
-            <ul>
-                <li><strong>Características Sociodemográficas</strong>: A maioria dos participantes se concentra na faixa etária de 5 meses a 10 anos.</li>
-                <li><strong>Saúde</strong>: As morbidades mais prevalentes foram hipotireoidismo, doenças cardiovasculares.</li>
-                <li><strong>Educação</strong>: Grande porcentagem dos participantes não são alfabetizados ou sãos semi alfabetizados.</li>
-                <li><strong>Atividade física</strong>: Necessidade de aumentar a motivação e frequência na prática de ativiade física tendo em vista os altos índices de IMC.</li>
-                </ul
-            </div>
-""", unsafe_allow_html=True)  
-            
-
-            st.markdown("""
-            <div class="justified-text">
-            <h3>Implicações</h3>
-            <p>Estes achados têm importantes implicações para políticas públicas e práticas 
-            clínicas:</p>
-            <ul>
-                <li><strong>Políticas de Saúde</strong>: Necessidade de ampliar o acesso a especialidades como fisioteria, fonoaudiologia, psicoligia e dente outros.</li>
-                <li><strong>Educação Inclusiva</strong>: Importância de fortalecer programas de inclusão escolar, apoio pedagógico, incentivo a autonomia e participação.</li>
-                <li><strong>Assistência Social</strong>: Ampliar o acesso a benefícios como o BPC e outros programas sociais.</li>
-            </ul>
-        </div>
-""", unsafe_allow_html=True)
-
-            st.markdown("""
-            <div class="justified-text">
-            <h3>Limitações</h3>
-            <p>Algumas limitações do estudo devem ser consideradas:</p>
-            <ul>
-                <li><strong>Amostra</strong>: Os participantes foram recrutados principalmente na região Sudeste do Brasil o que pode limitar a generalização.</li>
-                <li><strong>Dados Autorrelatados</strong>: Algumas informações dependem da percepção dos cuidadores, podendo haver viés.</li>   </ul>
- </div>
-""", unsafe_allow_html=True)
-            
-            st.markdown("""
-            <div class="justified-text">
-            <h3>Sugestões para Pesquisas Futuras</h3>
-            <p>Estudos futuros poderiam:</p>
-            <ul>
-                <li>Explorar as diferenças regionais no acesso a serviços e benefícios.</li>
-            </ul>
-        </div>
-""", unsafe_allow_html=True)
-            
-            st.header("Conclusão")
-            st.markdown("""
-            <div class="justified-text">
-            A análise dos dados revela importantes características sociodemográficas, educacionais, saúde e de inclusão de pessoas com Síndrome de Down no Brasil. O predomínio de crianças e adolescentes brancos com maior renda e escolaridade dos responsáveis aponta para um viés amostral, isso pode ser influenciado pelo local de aplicação da pesquisa e pela maior parte da pesquisa ter sido aplicada na região Sudeste do país. Essa limitação reduz a capacidade de generalização dos achados para toda a população com SD no país, especialmente os grupos mais vulneráveis, como aqueles em situação de pobreza extrema, de regiões periféricas ou pertencentes a minorias étnicas. Do ponto de vista socioeconômico, a distribuição de renda e o acesso majoritário à rede privada de saúde e educação reforçam esse perfil mais favorecido da amostra. No entanto, mesmo dentro desse recorte, alguns desafios como a sobrecarga materna no cuidado, o abandono do trabalho por parte dos cuidadores e a dependência de auxílios públicos em camadas economicamente mais frágeis são refletidos na discussão e literatura.
-            
-            A análise de escolaridade e alfabetização expõe um cenário crítico com baixos índices de letramento funcional mesmo entre participantes em idade escolar e com nível educacional regular mais avançado. Isso aponta falhas estruturais nos processos educacionais inclusivos, levantando a urgência por políticas públicas efetivas, formação adequada de profissionais e suporte às famílias.
-            
-            Na área da saúde, a amostra evidencia a baixa cobertura de atendimentos especializados pela rede pública, especialmente entre crianças. A prevalência de sobrepeso e comorbidades como hipotireoidismo, distúrbios cardiovasculares e ansiedade, somada à baixa adesão a acompanhamento nutricional e psicológico, reforça a necessidade de ampliação e qualificação dos serviços de saúde pública voltados para essa população. A resistência ou desinformação quanto à vacinação, sobretudo da Covid-19, também exige estratégias de educação em saúde para os cuidadores.
-            
-            A análise por clusters identificaram três perfis distintos (crianças, adolescentes e adultos jovens) com diferenças significativas quanto à saúde, autonomia e percepção do sistema público. Cuidadores de adultos tendem a relatar maior adequação no atendimento, possivelmente por serem usuários antigos do SUS, enquanto crianças enfrentam mais barreiras ao acesso e à continuidade dos cuidados.
-            
-            Por fim, os dados de autonomia e interação social sugerem avanços em aspectos afetivos e relacionais. Entretanto, apontam para um déficit na independência funcional, especialmente no deslocamento e na tomada de decisões. Isso pode ser reflexo de práticas de superproteção, falta de incentivo à autonomia e barreiras sociais ainda fortemente presentes. Embora os achados ofereçam subsídios importantes sobre a realidade de pessoas com Síndrome de Down em determinados contextos urbanos e institucionais do Brasil, a pesquisa também revela profundas desigualdades sociais e estruturais. As evidências reforçam a necessidade urgente de ações intersetoriais, políticas inclusivas, ampliação do acesso a serviços públicos de qualidade e estratégsias de conscientização que promovam equidade, autonomia e respeito aos direitos das pessoas com Síndrome de Down.
-                        </div>
-            """, unsafe_allow_html=True)
+        # --- Memória do banco (fim da aba 2): gerada depois das demais abas, com as colunas que elas carregaram ---
+        if tab2.open:
+            with tab2:
+                # Lotes de coleta: contagens mantidas por parte do snapshot, somadas sem reler as respostas
+                if banco.origem.lotes:
+                    with st.expander("📥 Lotes de coleta ingeridos"):
+                        lotes = banco.origem.lotes
+                        st.caption(f"{len(lotes)} lote(s), {sum(lote['linhas'] or 0 for lote in lotes)} respostas no total")
+                        st.markdown("**Participantes por instituição e lote**")
+                        st.dataframe(instituicoes_por_lote(lotes), use_container_width=True)
+                        st.markdown("**Respostas preenchidas por coluna**")
+                        st.dataframe(preenchimento_por_coluna(lotes).rename('Preenchidas').rename_axis('Coluna'),
+                                     use_container_width=True)
+
+                # Qualidade dos dados: relatório e linhas sinalizadas (verifica as regras ainda não consultadas)
+                with st.expander("🩺 Qualidade dos dados"):
+                    sinalizadas = validacao.sinalizadas(df_filtrado.index)
+                    col_regras, col_linhas = st.columns(2)
+                    col_regras.metric("Regras verificadas", len(validacao.regras))
+                    col_linhas.metric("Participantes sinalizados", len(sinalizadas))
+                    st.dataframe(validacao.relatorio, hide_index=True, use_container_width=True)
+                    if not sinalizadas.empty:
+                        st.markdown("**Participantes sinalizados**")
+                        st.dataframe(sinalizadas, hide_index=True, use_container_width=True)
+
+                with st.expander("🖼️ Cache de figuras"):
+                    estatisticas = figure_cache().estatisticas()
+                    col_figuras, col_acertos, col_bytes = st.columns(3)
+                    col_figuras.metric("Figuras em cache", estatisticas['figuras'])
+                    col_acertos.metric("Taxa de acerto", f"{estatisticas['taxa_acerto']:.0%}",
+                                       f"{estatisticas['acertos']} acertos / {estatisticas['falhas']} falhas", delta_color='off')
+                    col_bytes.metric("Memória usada", f"{estatisticas['bytes'] / 1024 ** 2:.1f} MB",
+                                     f"orçamento {estatisticas['orcamento'] / 1024 ** 2:.0f} MB", delta_color='off')
+                    if estatisticas['descartes']:
+                        st.caption(f"{estatisticas['descartes']} figura(s) descartada(s) pelo orçamento (LRU)")
+                    if estatisticas['desenho']:
+                        desenho = pd.Series(estatisticas['desenho'], name='Desenho (ms)').mul(1000).round(1)
+                        st.dataframe(desenho.sort_values(ascending=False).rename_axis('Gráfico').head(10),
+                                     use_container_width=True)
+                    # PNG (servidor desenha) x interativo (navegador desenha): tempo no servidor e bytes enviados
+                    if interactive_stats() and estatisticas['tamanho']:
+                        st.caption("Gráficos exibidos nos dois modos: PNG x interativo")
+                        interativos = pd.DataFrame(interactive_stats(), index=['Montagem plotly (ms)', 'JSON (KB)']).T * [1000, 1 / 1024]
+                        comparacao = pd.DataFrame({'Desenho PNG (ms)': pd.Series(estatisticas['desenho']) * 1000,
+                                                   'PNG (KB)': pd.Series(estatisticas['tamanho']) / 1024}).join(interativos, how='inner')
+                        st.dataframe(comparacao.round(1).rename_axis('Gráfico'), use_container_width=True)
+                        st.caption(f"Total enviado: {comparacao['PNG (KB)'].sum():.0f} KB em PNG x "
+                                   f"{comparacao['JSON (KB)'].sum():.0f} KB em JSON")
+
+                # Cache de resultados compartilhado entre as sessões: taxa de acerto geral e por tipo de resultado
+                with st.expander("🗂️ Cache de resultados compartilhado"):
+                    estatisticas = result_cache().estatisticas()
+                    st.caption(f"Estado dos filtros (URL): ?{estado_url}" if estado_url else "Sem filtros ativos (banco inteiro)")
+                    col_resultados, col_acertos, col_bytes = st.columns(3)
+                    col_resultados.metric("Resultados em cache", estatisticas['resultados'])
+                    col_acertos.metric("Taxa de acerto", f"{estatisticas['taxa_acerto']:.0%}",
+                                       f"{estatisticas['acertos']} acertos / {estatisticas['falhas']} falhas", delta_color='off')
+                    col_bytes.metric("Memória usada", f"{estatisticas['bytes'] / 1024:.0f} KB",
+                                     f"orçamento {estatisticas['orcamento'] / 1024 ** 2:.0f} MB", delta_color='off')
+                    if estatisticas['descartes']:
+                        st.caption(f"{estatisticas['descartes']} resultado(s) descartado(s) pelo orçamento (LRU)")
+                    if estatisticas['por_tipo']:
+                        por_tipo = pd.DataFrame(estatisticas['por_tipo']).T
+                        por_tipo['bytes'] = (por_tipo['bytes'] / 1024).round(1)
+                        por_tipo['taxa_acerto'] = (por_tipo['taxa_acerto'] * 100).round(0)
+                        st.dataframe(por_tipo.rename(columns={'resultados': 'Resultados', 'bytes': 'KB', 'acertos': 'Acertos',
+                                                              'falhas': 'Falhas', 'taxa_acerto': 'Acerto (%)'}).rename_axis('Tipo'),
+                                     use_container_width=True)
+
+                relatorio_carga = relatorio_memoria(banco)
+                with st.expander("💾 Memória do banco por coluna"):
+                    bytes_antes = relatorio_carga['Bytes antes'].sum()
+                    bytes_depois = relatorio_carga['Bytes depois'].sum()
+                    st.caption(f"Colunas carregadas sob demanda: {len(relatorio_carga)} de {len(banco.columns)}")
+                    col_antes, col_depois = st.columns(2)
+                    col_antes.metric("Antes da compactação", f"{bytes_antes / 1024:.0f} KB")
+                    col_depois.metric("Depois da compactação", f"{bytes_depois / 1024:.0f} KB",
+                                      f"{bytes_antes / max(bytes_depois, 1):.1f}x menor")
+                    st.dataframe(relatorio_carga.sort_values('Bytes depois', ascending=False),
+                                 hide_index=True, use_container_width=True)
 
 # --- Chamada Principal para Rodar o Dashboard ---
 # Certifique-se de sque a variável caminho_do_arquivo está definida corretamente acima
 # Exemplo: caminho_do_arquivo = 'C:/Users/Emille/Documents/UNIFESP/MATÉRIAS/Tópicos em Ciência de Dados para Neurociência/Projeto5/Banco_SD.xlsx'
 
-# Chamada CORRETA da função load_data:
-df_original = df_original = load_data()
-create_dashboard(df_original)
\ No newline at end of file
+# Chamada CORRETA da função load_data (em segundo plano):
+ondas_selecionadas = st.session_state.get('ondas_coleta')
+ondas_selecionadas = tuple(ondas_selecionadas) if ondas_selecionadas else None
+create_dashboard(start_background_load(ondas_selecionadas), ondas_selecionadas)
\ No newline at end of file
@@ -0,0 +1,448 @@
+import difflib
+import re
+import unicodedata
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# --- Medidas numéricas (ids do registro) ---
+IDS_NUMERICOS = {
+    'idade',
+    'idade_cuidador_principal',
+    'peso',
+    'imc',
+    'peso_cuidador_principal',
+    'altura',
+    'altura_cuidador_principal',
+    'idade_mae_gestacao',
+    'pessoas_renda',
+}
+
+# --- Perguntas com ordem natural: as categorias seguem os códigos do dicionário ---
+IDS_ORDINAIS = {
+    'renda_familiar',
+    'escolaridade_participante',
+    'escolaridade_responsavel',
+}
+
+# --- Faixas derivadas usadas nos gráficos ---
+BINS_FAIXA_ETARIA = [0, 10, 19, 29, 39, 49, 59]
+LABELS_FAIXA_ETARIA = ['5 meses a 10 anos', '11 anos a 19 anos', '20 anos a 29 anos',
+                       '30 anos a 39 anos', '40 anos a 49 anos', '50 anos a 59 anos']
+BINS_IDADE_MAE = [15, 24, 30, 35, 40, 45, 48]
+LABELS_IDADE_MAE = ['16 - 24', '25 - 30', '31 - 35', '36 - 40', '41 - 45', '46 - 48']
+FAIXAS_IMC = [
+    (18.5, 'Abaixo do peso'),
+    (25, 'Normal'),
+    (30, 'Sobrepeso'),
+    (35, 'Obesidade Grau I'),
+    (40, 'Obesidade Grau II'),
+    (np.inf, 'Obesidade Grau III'),
+]
+
+ROTULOS_SIM_NAO = {False: 'Não', True: 'Sim'}
+
+# Grafias equivalentes registradas na coleta (chave: id da coluna)
+SUBSTITUICOES = {
+    'estimulacao_precoce_rede': {'Particular': 'Privada'},
+}
+
+# --- Registro de colunas montado a partir da aba 'Dicionário' ---
+# Palavras descartadas ao gerar o id curto de cada coluna
+PALAVRAS_IGNORADAS = {
+    'a', 'o', 'as', 'os', 'e', 'é', 'de', 'do', 'da', 'dos', 'das', 'em', 'no', 'na', 'nos', 'nas',
+    'se', 'que', 'com', 'por', 'para', 'ou', 'foi', 'teve', 'alguma', 'algum', 'algumas', 'dessas',
+    'esta', 'essa', 'sim', 'você', 'considera', 'participante',
+}
+MAX_PALAVRAS_ID = 4
+MAX_PALAVRAS_APELIDO = 8
+
+# Ids escolhidos à mão quando o gerado a partir do enunciado fica longo ou ambíguo
+# (chave: até 8 palavras significativas do enunciado)
+APELIDOS = {
+    'possui_diagnostico_medico': 'diagnosticos',
+    'apresenta_morbidades_doencas_seguir': 'morbidades',
+    'recebeu_imunizacoes_seguir': 'imunizacoes',
+    'apesar_imunizacoes_doencas': 'doencas_pos_imunizacao',
+    'toma_medicacoes': 'medicacoes',
+    'pergunta_anterior_for_selecionado_outra_di_escreva_qual': 'outra_deficiencia',
+    'mae_realizou_acompanhamento_pre_natal': 'pre_natal',
+    'realizou_acompanhamento_pre_natal_rede': 'pre_natal_rede',
+    'feito_cariotipo': 'cariotipo',
+    'quantos_irmaos_possui': 'quantos_irmaos',
+    'irmaos_possui_deficiencia': 'irmaos_deficiencia',
+    'realiza_realizou_acompanhamento_psicologico': 'acompanhamento_psicologico',
+    'realiza_realizou_acompanhamento_psicologico_rede': 'acompanhamento_psicologico_rede',
+    'realizou_programa_intervencao_estimulacao_precoce_motora_visual_auditiva': 'estimulacao_precoce',
+    'realizou_programa_intervencao_estimulacao_precoce_rede': 'estimulacao_precoce_rede',
+    'faz_acompanhamento_clinico_geral_pediatra_geriatra_depender_idade': 'clinico_geral',
+    'acompanhamento_ocorre_rede1': 'rede_clinico_geral',
+    'faz_acompanhamento_dentista': 'dentista',
+    'acompanhamento_ocorre_rede2': 'rede_dentista',
+    'faz_acompanhamento_nutricionista': 'nutricionista',
+    'acompanhamento_ocorre_rede3': 'rede_nutricionista',
+    'faz_acompanhamento_oftalmologista': 'oftalmologista',
+    'acompanhamento_ocorre_rede4': 'rede_oftalmologista',
+    'covid_19': 'teve_covid',
+    'ficou_hospitalizado_uti_conta_covid': 'hospitalizado_covid',
+    'precisou_suplementacao_o2_conta_covid': 'suplementacao_o2_covid',
+    'nivel_escolaridade': 'escolaridade_participante',
+    'nivel_escolaridade_responsavel': 'escolaridade_responsavel',
+    'quantas_pessoas_vivem_renda_familiar': 'pessoas_renda',
+    'pratica_atividade_fisica_esporte': 'pratica_atividade_fisica',
+    'qual_atividade_fisica_pratica': 'qual_atividade_fisica',
+    'pratica_atividade_fisica_esporte_quantas_vezes_semana': 'frequencia_atividade_fisica',
+    'quanto_tempo_pratica_atividade_fisica_esporte': 'tempo_atividade_fisica',
+    'possui_autonomia_tomar_decisoes_tem_chance_escolher_coisas': 'autonomia',
+    'desloca_independentemente_pela_cidade': 'deslocamento_independente',
+    'realiza_atividade_artistica': 'atividade_artistica',
+    'maioria_vezes_realizacao_suas_necessidades_pessoais_como': 'necessidades_pessoais',
+    'relaciona_diferentes_pessoas_tem_amigos_bem_pessoas': 'relacionamentos',
+    'vontade_propria_interage_socialmente_frequentando_diferentes_lugares_cidade': 'interacao_social',
+    'tratado_respeito_dignidade_igualdade_pelas_outras_pessoas': 'tratado_com_respeito',
+    'possui_habitos_alimentares_saudaveis': 'habitos_alimentares',
+    'possui_atendimento_saude_adequado_pelo_sistema_publico_atender': 'atendimento_saude_sus',
+}
+
+# Erros de digitação do próprio dicionário (só usados quando a planilha não traz a grafia correta)
+ERRATAS_DICIONARIO = {
+    'Pós-gradução': 'Pós-graduação',
+    'Herspes zoster': 'Herpes zoster',
+    'Tátano': 'Tétano',
+    'Distúrbios da tieroide': 'Distúrbios da tireoide',
+}
+
+# Semelhança mínima para casar enunciados e respostas do dicionário com os da planilha
+SEMELHANCA_MINIMA = 0.75
+
+# Colunas calculadas em normalizar_coluna: nome -> (id, id da coluna de origem, faixas)
+COLUNAS_DERIVADAS = {
+    'Faixa Etária': ('faixa_etaria', 'idade', LABELS_FAIXA_ETARIA),
+    'Faixa Etária da Mãe': ('faixa_etaria_mae', 'idade_mae_gestacao', LABELS_IDADE_MAE),
+}
+
+
+@dataclass
+class Coluna:
+    id: str
+    nome: str
+    tipo: str                 # 'sim_nao', 'multipla', 'categorica', 'numerica', 'data' ou 'texto'
+    dtype: str
+    categorias: tuple = ()
+    ordenada: bool = False
+    familia: str = None       # id da pergunta de múltipla escolha a que a opção pertence
+    opcao: str = None
+    codigo: int = None
+    nenhuma: bool = False     # opção "não possui/nenhuma" da família
+    pergunta: str = None      # enunciado no dicionário
+
+
+# --- Limpeza de texto: espaços extras e grafias que diferem só em maiúsculas/minúsculas ---
+def padronizar_texto(serie):
+    texto = serie.astype('string').str.strip().str.replace(r'\s+', ' ', regex=True)
+    texto = texto.mask(texto == '')
+    chave = texto.str.lower()
+    # Cada grafia é trocada pela variante mais frequente entre as equivalentes
+    mais_frequente = texto.groupby(chave).agg(lambda valores: valores.value_counts().index[0])
+    return chave.map(mais_frequente).astype(object).where(texto.notna(), np.nan)
+
+
+def para_sim_nao(serie):
+    chave = serie.astype('string').str.strip().str.lower()
+    return chave.map({'sim': True, 'não': False, 'nao': False}).astype('boolean')
+
+
+def para_marcado(serie):
+    # Em múltipla escolha a célula vazia significa "opção não marcada"
+    chave = serie.astype('string').str.strip().str.lower()
+    return (chave.notna() & (chave != 'não')).astype('boolean')
+
+
+def classificar_imc(imc):
+    limites = [limite for limite, _ in FAIXAS_IMC]
+    rotulos = np.array([rotulo for _, rotulo in FAIXAS_IMC], dtype=object)
+    posicao = np.searchsorted(limites, imc.to_numpy(dtype=float), side='right')
+    classificacao = pd.Series(rotulos[np.minimum(posicao, len(rotulos) - 1)], index=imc.index)
+    return classificacao.where(imc.notna())
+
+
+# --- Comparação aproximada de textos (acentos, caixa e pontuação não contam) ---
+def chave_texto(texto):
+    texto = unicodedata.normalize('NFKD', str(texto)).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', ' ', texto.lower()).strip()
+
+
+def semelhanca(texto_a, texto_b):
+    chave_a, chave_b = chave_texto(texto_a), chave_texto(texto_b)
+    razao = difflib.SequenceMatcher(None, chave_a, chave_b).ratio()
+    # Enunciados abreviados no dicionário (ex.: 'Cor' -> 'Cor/etnia do participante')
+    if chave_a and chave_b and (chave_b.startswith(chave_a + ' ') or chave_a.startswith(chave_b + ' ')):
+        razao = max(razao, 0.9)
+    return razao
+
+
+PALAVRAS_IGNORADAS_CHAVE = {chave_texto(palavra) for palavra in PALAVRAS_IGNORADAS}
+
+
+def gerar_id(texto, max_palavras=MAX_PALAVRAS_ID):
+    palavras = [palavra for palavra in chave_texto(texto).split() if palavra not in PALAVRAS_IGNORADAS_CHAVE]
+    palavras = palavras or chave_texto(texto).split()
+    apelido = APELIDOS.get('_'.join(palavras[:MAX_PALAVRAS_APELIDO]))
+    return apelido or '_'.join(palavras[:max_palavras])
+
+
+# --- Leitura do dicionário: linha com o enunciado seguida das linhas "resposta | código" ---
+def blocos_dicionario(dicionario):
+    blocos = []
+    atual = None
+    rotulos = dicionario.iloc[:, 0]
+    codigos = pd.to_numeric(dicionario.iloc[:, 1], errors='coerce')
+    for rotulo, codigo in zip(rotulos, codigos):
+        if pd.isna(rotulo) or str(rotulo).strip() == '':
+            atual = None
+        elif pd.isna(codigo):
+            atual = {'pergunta': str(rotulo).strip(), 'respostas': []}
+            blocos.append(atual)
+        elif atual is not None:
+            atual['respostas'].append((str(rotulo).strip(), int(codigo)))
+    return blocos
+
+
+# Colunas "Enunciado (Opção)" que compartilham o enunciado formam uma pergunta de múltipla escolha
+def agrupar_familias(colunas):
+    grupos = {}
+    for col in colunas:
+        partes = re.match(r'^(.+?) \((.+?)\)?$', col)
+        if partes:
+            grupos.setdefault(partes.group(1), []).append((col, partes.group(2)))
+    return {enunciado: itens for enunciado, itens in grupos.items() if len(itens) > 1}
+
+
+def casar_blocos(blocos, alvos):
+    # 1ª passada: cada bloco fica com o alvo mais parecido ainda livre. Em empate vale a ordem
+    # da planilha, o que associa os quatro 'Se sim, o acompanhamento ocorre na rede:' a rede1..rede4.
+    casados = {}
+    for bloco in blocos:
+        livres = [(semelhanca(bloco['pergunta'], alvo), -posicao, alvo)
+                  for posicao, alvo in enumerate(alvos) if alvo not in casados]
+        if livres:
+            razao, _, alvo = max(livres)
+            if razao >= SEMELHANCA_MINIMA:
+                casados[alvo] = bloco
+    # 2ª passada: perguntas que na planilha só mudam de número reaproveitam o mesmo bloco
+    # (ex.: 'Nome da vacina da COVID-19' vale para as seis doses)
+    sem_numeros = {re.sub(r'\d+', '', chave_texto(alvo)): bloco for alvo, bloco in casados.items()}
+    for alvo in alvos:
+        chave = re.sub(r'\d+', '', chave_texto(alvo))
+        if alvo not in casados and chave in sem_numeros:
+            casados[alvo] = sem_numeros[chave]
+    return casados
+
+
+def categorias_do_bloco(bloco, observados):
+    # Rótulos na ordem dos códigos; quando a planilha usa outra grafia (ex.: '0 - 45min'), vale a da planilha
+    grafia_observada = {}
+    for valor in observados:
+        grafia_observada.setdefault(chave_texto(valor), valor)
+    categorias = []
+    for rotulo, _ in sorted(bloco['respostas'], key=lambda resposta: resposta[1]):
+        rotulo = ERRATAS_DICIONARIO.get(rotulo, rotulo)
+        categorias.append(grafia_observada.get(chave_texto(rotulo), rotulo))
+    return tuple(categorias)
+
+
+def casar_opcoes(itens, respostas):
+    # Opção da planilha -> (rótulo, código) do dicionário, sem repetir rótulos
+    casadas = {}
+    livres = list(respostas)
+    for col, opcao in itens:
+        candidatas = [(semelhanca(opcao, rotulo), rotulo, codigo) for rotulo, codigo in livres]
+        if candidatas:
+            razao, rotulo, codigo = max(candidatas, key=lambda candidata: candidata[0])
+            if razao >= SEMELHANCA_MINIMA:
+                casadas[col] = (ERRATAS_DICIONARIO.get(rotulo, rotulo), codigo)
+                livres.remove((rotulo, codigo))
+    return casadas
+
+
+def opcao_nenhuma(opcao):
+    return chave_texto(opcao).startswith(('nao ', 'nenhum'))
+
+
+def registrar(colunas, coluna):
+    # Ids repetidos ganham sufixo numérico para continuar únicos
+    id_base, sufixo = coluna.id, 2
+    while coluna.id in colunas:
+        coluna.id = f'{id_base}_{sufixo}'
+        sufixo += 1
+    colunas[coluna.id] = coluna
+
+
+class Esquema:
+    def __init__(self, colunas, enunciados=None):
+        self.colunas = colunas
+        self.enunciados = enunciados or {}
+        self.por_id = {coluna.id: coluna for coluna in colunas}
+        self.por_nome = {coluna.nome: coluna for coluna in colunas}
+        self.familias = {}
+        for coluna in colunas:
+            if coluna.familia:
+                self.familias.setdefault(coluna.familia, []).append(coluna)
+
+    def __contains__(self, id_coluna):
+        return id_coluna in self.por_id
+
+    def __getitem__(self, id_coluna):
+        return self.por_id[id_coluna].nome
+
+    def get(self, id_coluna, padrao=None):
+        coluna = self.por_id.get(id_coluna)
+        return coluna.nome if coluna else padrao
+
+    def nomes(self, *ids):
+        return [self.por_id[id_coluna].nome for id_coluna in ids if id_coluna in self.por_id]
+
+    def coluna(self, id_coluna):
+        return self.por_id.get(id_coluna)
+
+    def familia(self, id_familia, incluir_nenhuma=True):
+        return [coluna.nome for coluna in self.familias.get(id_familia, ())
+                if incluir_nenhuma or not coluna.nenhuma]
+
+    def do_tipo(self, *tipos):
+        return [coluna.nome for coluna in self.colunas if coluna.tipo in tipos]
+
+    def variaveis(self):
+        # Enunciados na ordem da planilha; cada pergunta de múltipla escolha aparece uma vez
+        vistas = []
+        for coluna in self.colunas:
+            if coluna.nome in COLUNAS_DERIVADAS:
+                continue
+            nome = self.enunciados.get(coluna.familia, coluna.nome)
+            if nome not in vistas:
+                vistas.append(nome)
+        return vistas
+
+
+# --- Registro: uma entrada por coluna, com id curto, tipo, categorias e família ---
+def construir_esquema(df, dicionario=None):
+    blocos = [] if dicionario is None else [bloco for bloco in blocos_dicionario(dicionario) if bloco['respostas']]
+    familias = agrupar_familias(df.columns)
+    familia_da_coluna = {col: enunciado for enunciado, itens in familias.items() for col, _ in itens}
+    alvos = list(familias) + [col for col in df.columns if col not in familia_da_coluna]
+    bloco_do_alvo = casar_blocos(blocos, alvos)
+
+    ids_familia = {}
+    enunciados = {}
+    opcoes_casadas = {}
+    for enunciado, itens in familias.items():
+        ids_familia[enunciado] = gerar_id(enunciado)
+        enunciados[ids_familia[enunciado]] = enunciado
+        bloco = bloco_do_alvo.get(enunciado)
+        opcoes_casadas.update(casar_opcoes(itens, bloco['respostas'] if bloco else []))
+    opcao_da_coluna = {col: opcao for itens in familias.values() for col, opcao in itens}
+
+    colunas = {}
+    for col in df.columns:
+        if col in familia_da_coluna:
+            enunciado = familia_da_coluna[col]
+            bloco = bloco_do_alvo.get(enunciado)
+            opcao, codigo = opcoes_casadas.get(col, (opcao_da_coluna[col], None))
+            registrar(colunas, Coluna(
+                id=f'{ids_familia[enunciado]}_{gerar_id(opcao, 3)}', nome=col, tipo='multipla', dtype='boolean',
+                categorias=(False, True), familia=ids_familia[enunciado], opcao=opcao, codigo=codigo,
+                nenhuma=opcao_nenhuma(opcao), pergunta=bloco and bloco['pergunta']))
+            continue
+
+        id_coluna = gerar_id(col)
+        bloco = bloco_do_alvo.get(col)
+        if bloco:
+            observados = df[col].dropna().astype(str).str.strip()
+            categorias = categorias_do_bloco(bloco, observados.value_counts().index)
+            if {chave_texto(categoria) for categoria in categorias} == {'nao', 'sim'}:
+                coluna = Coluna(id_coluna, col, 'sim_nao', 'boolean', categorias=(False, True))
+            else:
+                ordenada = id_coluna in IDS_ORDINAIS
+                coluna = Coluna(id_coluna, col, 'categorica', 'category' if ordenada else 'object',
+                                categorias=categorias, ordenada=ordenada)
+            coluna.pergunta = bloco['pergunta']
+        elif id_coluna in IDS_NUMERICOS or pd.api.types.is_numeric_dtype(df[col]):
+            coluna = Coluna(id_coluna, col, 'numerica', 'float64')
+        elif pd.api.types.is_datetime64_any_dtype(df[col]):
+            coluna = Coluna(id_coluna, col, 'data', str(df[col].dtype))
+        else:
+            coluna = Coluna(id_coluna, col, 'texto', 'object')
+        registrar(colunas, coluna)
+
+    for nome, (id_coluna, origem, faixas) in COLUNAS_DERIVADAS.items():
+        if origem in colunas:
+            registrar(colunas, Coluna(id_coluna, nome, 'categorica', 'category',
+                                      categorias=tuple(faixas), ordenada=True))
+    return Esquema(list(colunas.values()), enunciados)
+
+
+def ajustar_categorias(serie, categorias):
+    # Respostas que só diferem do rótulo em acentos, caixa ou pontuação passam a usar o rótulo
+    por_chave = {chave_texto(categoria): categoria for categoria in categorias}
+    mapa = {valor: por_chave[chave_texto(valor)] for valor in serie.dropna().unique()
+            if chave_texto(valor) in por_chave and por_chave[chave_texto(valor)] != valor}
+    return serie.replace(mapa) if mapa else serie
+
+
+# --- Etapa de normalização: cada coluna tipada uma vez, guiada pelo registro ---
+def normalizar_serie(serie, coluna):
+    if coluna.tipo == 'multipla':
+        return para_marcado(serie)
+    if coluna.tipo == 'sim_nao':
+        return para_sim_nao(serie)
+    if coluna.tipo == 'numerica':
+        return pd.to_numeric(serie, errors='coerce').astype('float64')
+    if coluna.tipo in ('categorica', 'texto') and (serie.dtype == object or pd.api.types.is_string_dtype(serie)):
+        serie = padronizar_texto(serie)
+        if coluna.id in SUBSTITUICOES:
+            serie = serie.replace(SUBSTITUICOES[coluna.id])
+        if coluna.categorias:
+            serie = ajustar_categorias(serie, coluna.categorias)
+        if coluna.ordenada:
+            serie = pd.Series(pd.Categorical(serie, categories=list(coluna.categorias), ordered=True),
+                              index=serie.index, name=serie.name)
+    return serie
+
+
+def normalizar_coluna(coluna, bruta, tipada):
+    # bruta: série da planilha (None nas colunas calculadas); tipada(id): outra coluna já normalizada (ou None)
+    if coluna.id == 'faixa_etaria':
+        return pd.cut(tipada('idade'), bins=BINS_FAIXA_ETARIA, labels=LABELS_FAIXA_ETARIA, right=True)
+    if coluna.id == 'faixa_etaria_mae':
+        return pd.cut(tipada('idade_mae_gestacao'), bins=BINS_IDADE_MAE, labels=LABELS_IDADE_MAE,
+                      right=True, include_lowest=True)
+    if bruta is None:
+        return None
+    serie = normalizar_serie(bruta, coluna)
+    if coluna.id == 'classificacao_imc':
+        # Mantém a classificação da planilha e completa as ausentes a partir do IMC
+        imc = tipada('imc')
+        if imc is not None:
+            serie = serie.fillna(classificar_imc(imc))
+    return serie
+
+
+# DataFrame tipado completo (todas as colunas de uma vez)
+def normalizar_banco(df, esquema):
+    normalizadas = {}
+
+    def tipada(id_coluna):
+        if id_coluna not in esquema:
+            return None
+        nome = esquema[id_coluna]
+        if nome not in normalizadas:
+            normalizadas[nome] = normalizar_coluna(esquema.coluna(id_coluna), df[nome] if nome in df.columns else None, tipada)
+        return normalizadas[nome]
+
+    df = df.copy()
+    for coluna in esquema.colunas:
+        serie = tipada(coluna.id)
+        if serie is not None:
+            df[coluna.nome] = serie
+    return df
@@ -0,0 +1,133 @@
+import atexit
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib.pyplot as plt
+
+# --- Cache de figuras renderizadas: PNG por (id do gráfico, impressão digital dos dados, parâmetros) ---
+# Orçamento de memória: as figuras usadas há mais tempo saem primeiro (LRU)
+ORCAMENTO_BYTES = 64 * 1024 * 1024
+# Mesmas opções de st.pyplot, para que a imagem enviada seja idêntica
+OPCOES_PNG = {'bbox_inches': 'tight', 'dpi': 200, 'format': 'png'}
+
+
+def impressao_digital(*partes):
+    # partes: textos (ex.: hash da planilha) e índices/arrays (ex.: linhas do recorte filtrado)
+    sha = hashlib.sha256()
+    for parte in partes:
+        if hasattr(parte, 'to_numpy'):
+            parte = parte.to_numpy()
+        sha.update(parte.tobytes() if hasattr(parte, 'tobytes') else repr(parte).encode('utf-8'))
+        sha.update(b'\x00')
+    return sha.hexdigest()
+
+
+def para_png(fig):
+    imagem = io.BytesIO()
+    fig.savefig(imagem, **OPCOES_PNG)
+    plt.close(fig)
+    return imagem.getvalue()
+
+
+class CacheFiguras:
+    def __init__(self, orcamento=ORCAMENTO_BYTES):
+        self.orcamento = orcamento
+        self.bytes = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+        # Último tempo de desenho + codificação de cada gráfico (segundos, por id)
+        self.desenho = {}
+        # Tamanho do último PNG de cada gráfico (bytes enviados ao navegador, por id)
+        self.tamanho = {}
+        self._itens = OrderedDict()
+        self._trava = threading.Lock()
+
+    def __len__(self):
+        return len(self._itens)
+
+    def __contains__(self, chave):
+        # Consulta sem contar acerto/falha nem mexer na ordem do LRU
+        with self._trava:
+            return chave in self._itens
+
+    def obter(self, chave):
+        with self._trava:
+            png = self._itens.get(chave)
+            if png is None:
+                self.falhas += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return png
+
+    def guardar(self, chave, png):
+        if len(png) > self.orcamento:
+            return
+        with self._trava:
+            antigo = self._itens.pop(chave, None)
+            if antigo is not None:
+                self.bytes -= len(antigo)
+            self._itens[chave] = png
+            self.bytes += len(png)
+            while self.bytes > self.orcamento:
+                _, descartado = self._itens.popitem(last=False)
+                self.bytes -= len(descartado)
+                self.descartes += 1
+
+    def png(self, chave, gerar):
+        # gerar(): devolve os bytes do PNG (desenho aqui ou resultado de um processo); só é chamada fora do cache
+        png = self.obter(chave)
+        if png is None:
+            inicio = time.perf_counter()
+            png = gerar()
+            self.desenho[chave[0]] = time.perf_counter() - inicio
+            self.tamanho[chave[0]] = len(png)
+            self.guardar(chave, png)
+        return png
+
+    def figura(self, chave, desenhar):
+        # desenhar(): monta e devolve a figura do matplotlib; só é chamada quando a chave não está no cache
+        return self.png(chave, lambda: para_png(desenhar()))
+
+    def estatisticas(self):
+        consultas = self.acertos + self.falhas
+        return {
+            'figuras': len(self._itens),
+            'bytes': self.bytes,
+            'orcamento': self.orcamento,
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'descartes': self.descartes,
+            'taxa_acerto': self.acertos / consultas if consultas else 0.0,
+            'desenho': dict(self.desenho),
+            'tamanho': dict(self.tamanho),
+        }
+
+
+# --- Desenho em processos: gráficos independentes desenhados em paralelo, um PNG por tarefa ---
+# 'spawn': os processos não herdam as travas das threads do servidor (o Streamlit roda o script numa thread)
+def _gerar_png(desenhar, argumentos):
+    return para_png(desenhar(*argumentos))
+
+
+class DesenhoEmProcessos:
+    def __init__(self, processos=None):
+        self.processos = processos or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(max_workers=self.processos,
+                                             mp_context=multiprocessing.get_context('spawn'))
+        atexit.register(self.encerrar)
+
+    def enviar(self, desenhar, *argumentos):
+        # desenhar: função de módulo (vai por pickle para o processo); devolve um Future com os bytes do PNG
+        return self._executor.submit(_gerar_png, desenhar, argumentos)
+
+    def encerrar(self):
+        atexit.unregister(self.encerrar)
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,119 @@
+import time
+from urllib.parse import urlencode
+
+import numpy as np
+
+from compacto_banco import POPCOUNT_BYTE, FamiliaBits
+from cubo_banco import codificar
+from esquema_banco import ROTULOS_SIM_NAO
+
+# --- Filtros da barra lateral: id do filtro -> rótulo (o id é o da coluna no registro, exceto o estado) ---
+FILTROS = {
+    'sexo': 'Sexo',
+    'faixa_etaria': 'Faixa etária',
+    'renda_familiar': 'Renda familiar',
+    'instituicao': 'Instituição',
+    'estado': 'Estado',
+    'cidade': 'Cidade',
+    'recebe_bpc': 'Recebe BPC',
+    'recebe_bolsa_familia': 'Recebe Bolsa família',
+}
+# Opção para as células em branco da coluna filtrada
+ROTULO_EM_BRANCO = 'Não informado'
+
+
+def estado_da_cidade(serie):
+    # 'Santos - São Paulo' -> 'São Paulo' (a planilha guarda cidade e estado na mesma célula)
+    texto = serie.astype('string')
+    estado = texto.str.rsplit('-', n=1).str[-1].str.strip()
+    return estado.where(texto.str.contains('-', regex=False))
+
+
+def coluna_do_filtro(banco, id_filtro):
+    if id_filtro == 'estado':
+        return estado_da_cidade(banco[banco.esquema['cidade']]) if 'cidade' in banco.esquema else None
+    return banco[banco.esquema[id_filtro]] if id_filtro in banco.esquema else None
+
+
+# --- Índice de bitmaps: um bitmap de linhas por valor de cada filtro, montado uma vez na carga ---
+# Cada troca de filtro vira ORs entre os valores marcados e ANDs entre os filtros, sobre os bytes empacotados
+class IndiceFiltros:
+    def __init__(self, banco, filtros=FILTROS):
+        inicio = time.perf_counter()
+        self.index = banco.index
+        self.rotulos = {}
+        self.bitmaps = {}
+        for id_filtro, rotulo in filtros.items():
+            serie = coluna_do_filtro(banco, id_filtro)
+            if serie is None:
+                continue
+            codigos, valores = codificar(serie)
+            nomes = [ROTULOS_SIM_NAO.get(valor, valor) if isinstance(valor, (bool, np.bool_)) else str(valor)
+                     for valor in valores]
+            marcadas = codigos[:, None] == np.arange(len(valores))
+            if (codigos < 0).any():
+                nomes.append(ROTULO_EM_BRANCO)
+                marcadas = np.column_stack([marcadas, codigos < 0])
+            self.rotulos[id_filtro] = rotulo
+            self.bitmaps[id_filtro] = FamiliaBits(nomes, marcadas)
+        self.tempo = time.perf_counter() - inicio
+
+    @property
+    def nbytes(self):
+        return sum(bitmap.nbytes for bitmap in self.bitmaps.values())
+
+    def opcoes(self, id_filtro):
+        return self.bitmaps[id_filtro].nomes
+
+    def mascara(self, escolhas):
+        # escolhas: {id do filtro: valores marcados}; filtro sem valores não restringe. None = banco inteiro
+        mascara = None
+        for id_filtro, valores in escolhas.items():
+            bitmap = self.bitmaps.get(id_filtro)
+            if bitmap is None or not valores:
+                continue
+            posicoes = [bitmap.nomes.index(valor) for valor in valores if valor in bitmap.nomes]
+            bits = (np.bitwise_or.reduce(bitmap.bits[posicoes], axis=0) if posicoes
+                    else np.zeros(bitmap.bits.shape[1], dtype=np.uint8))
+            mascara = bits if mascara is None else mascara & bits
+        return mascara
+
+    def contagem(self, mascara):
+        return len(self.index) if mascara is None else int(POPCOUNT_BYTE[mascara].sum())
+
+    def selecionar(self, escolhas):
+        # Linhas do recorte (index do banco); None quando nenhum filtro está ativo
+        mascara = self.mascara(escolhas)
+        if mascara is None:
+            return None
+        linhas = np.unpackbits(mascara, count=len(self.index), bitorder='little').astype(bool)
+        return self.index[linhas]
+
+
+def indexar_filtros(banco):
+    return IndiceFiltros(banco)
+
+
+def filtros_do_cubo(escolhas, cubo):
+    # Filtros ativos só sobre estratificadores do cubo (e sem a opção em branco): o cubo responde o recorte
+    ativos = {id_filtro: list(valores) for id_filtro, valores in escolhas.items() if valores}
+    if all(id_filtro in cubo.estratificadores and ROTULO_EM_BRANCO not in valores
+           for id_filtro, valores in ativos.items()):
+        return ativos
+    return None
+
+
+# --- Estado dos filtros na URL (?sexo=Feminino&instituicao=...): link compartilhável e chave do cache de resultados ---
+def estado_filtros(escolhas):
+    # Texto canônico (filtros e valores em ordem): a mesma combinação gera sempre a mesma URL e a mesma chave
+    return urlencode(sorted((id_filtro, valor) for id_filtro, valores in escolhas.items() for valor in valores))
+
+
+def escolhas_da_url(parametros, indice):
+    # parametros: st.query_params; filtros e valores que não existem no banco carregado são ignorados
+    escolhas = {}
+    for id_filtro in indice.rotulos:
+        valores = [valor for valor in parametros.get_all(id_filtro) if valor in indice.opcoes(id_filtro)]
+        if valores:
+            escolhas[id_filtro] = valores
+    return escolhas
@@ -0,0 +1,313 @@
+import time
+from dataclasses import dataclass
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from esquema_banco import LABELS_IDADE_MAE, ROTULOS_SIM_NAO
+
+# --- Estilo comum dos gráficos de barras (abas 3 a 6) ---
+FONTE_ROTULOS = 9
+LARGURA_BORDA = 1.2
+ORDEM_SIM_NAO = [False, True]
+ORDEM_SAUDE_GERAL = ['Muito boa', 'Boa', 'Excelente', 'Regular', 'Ruim', 'Muito ruim', 'Não Preenchido']
+
+
+@dataclass
+class GraficoBarras:
+    id: str                       # id do gráfico (chave do cache de figuras)
+    subtitulo: str
+    titulo: str
+    cor: str
+    rotulo_categorias: str        # eixo das categorias
+    coluna: str = None            # id da coluna no registro (pergunta de escolha única)
+    familia: str = None           # ou família de múltipla escolha (contagem de 'Sim' por opção)
+    orientacao: str = 'horizontal'
+    ordem: object = None          # None (mais frequentes primeiro), 'indice', 'crescente' ou lista de categorias
+    rotulos: object = None        # dict ou função: categoria -> texto no eixo
+    base: str = 'respostas'       # % sobre as respostas ('respostas') ou sobre o recorte ('participantes')
+    rotulo_ausentes: str = None   # conta as células em branco com este rótulo
+    rotulo_valores: str = 'Frequência'
+    figsize: tuple = (6, 5)
+    altura_por_barra: float = 0   # cresce a figura com o número de barras
+    fonte_titulo: int = None
+    limite: float = 1.2           # eixo dos valores vai até limite × maior barra
+    rotacao: int = 0
+
+
+def sim_nao(id_grafico, coluna, subtitulo, titulo, cor, **opcoes):
+    # Perguntas Sim/Não: 'Não' antes de 'Sim', % sobre todos os participantes do recorte
+    return GraficoBarras(id_grafico, subtitulo, titulo, cor, 'Resposta', coluna=coluna, orientacao='vertical',
+                         ordem=ORDEM_SIM_NAO, rotulos=ROTULOS_SIM_NAO, base='participantes', **opcoes)
+
+
+def rede(id_grafico, coluna, subtitulo, titulo, cor):
+    return GraficoBarras(id_grafico, subtitulo, titulo, cor, 'Rede', coluna=coluna)
+
+
+def nome_da_opcao(nome):
+    # 'Apresenta algumas das morbidades (Asma)' -> 'Asma'
+    return nome.split('(')[-1].replace(')', '') if '(' in nome and ')' in nome else nome
+
+
+# --- Registro dos gráficos de barras, na ordem das abas ---
+GRAFICOS_POR_ABA = {
+    3: [  # Características sociodemográficas
+        GraficoBarras('cor_etnia', 'Distribuição por Cor/Etnia', 'Distribuição por Cor/Etnia', '#bd928b',
+                      'Cor/Etnia do Participante', coluna='cor_etnia', orientacao='vertical', figsize=(7, 6), rotacao=45),
+        GraficoBarras('quantos_irmaos_possui', 'Quantos irmãos o participante possui', 'Quantos irmãos o participante possui',
+                      '#a1a6aa', 'Nº de irmãos', coluna='quantos_irmaos', figsize=(7, 6)),
+        GraficoBarras('renda_familiar', 'Distribuição da renda familiar', 'Distribuição da renda familiar', '#ffab03',
+                      'Renda', coluna='renda_familiar', figsize=(7, 6)),
+        sim_nao('recebe_bolsa_familia', 'recebe_bolsa_familia', 'Recebe Bolsa família', 'Recebe Bolsa família', '#e2aa87',
+                figsize=(7, 6)),
+        sim_nao('recebe_beneficio_prestacao_continuada', 'recebe_bpc', 'Recebe Benefício de Prestação Continuada',
+                'Recebe Benefício de Prestação Continuada', '#b6d4bb', figsize=(7, 6)),
+        GraficoBarras('tipo_moradia', 'Distribuição do tipo de moradia', 'Distribuição do tipo de moradia', '#a4d9a3',
+                      'Moradia', coluna='residencia', figsize=(7, 6)),
+        GraficoBarras('faixa_etaria', 'Distribuição por Faixa Etária', 'Distribuição por Faixa Etária', '#bd928b',
+                      'Faixa Etária', coluna='faixa_etaria', orientacao='vertical', ordem='indice',
+                      rotulo_valores='Número de Participantes', figsize=(7, 5), fonte_titulo=14, rotacao=45),
+    ],
+    4: [  # Características educacionais
+        GraficoBarras('nivel_escolaridade', 'Nível de Escolaridade do Participante',
+                      'Distribuição do nível de escolaridade do participante', '#7bbda1', 'Escolaridade',
+                      coluna='escolaridade_participante', figsize=(8, 5)),
+        GraficoBarras('nivel_escolaridade_responsavel', 'Nível de Escolaridade do Responsável',
+                      'Distribuição do nível de escolaridade do responsável do participante', '#fcb653', 'Escolaridade',
+                      coluna='escolaridade_responsavel', figsize=(8, 5)),
+        GraficoBarras('nivel_alfabetizacao', 'O Participante é Alfabetizado?',
+                      'Distribuição do nível de alfabetização do participante', '#cee879', 'Alfabetização',
+                      coluna='alfabetizado'),
+        sim_nao('participantes_sabem_ler', 'sabe_ler', 'O Participante Sabe Ler?',
+                'Distribuição dos participantes que sabem ler', '#daa979'),
+        sim_nao('participantes_sabem_escrever', 'sabe_escrever', 'O Participante Sabe Escrever?',
+                'Distribuição dos participantes que sabem escrever', '#f9f36a'),
+        sim_nao('participantes_conseguem_interpretar_texto', 'consegue_interpretar_texto',
+                'O Participante Consegue Interpretar Texto?',
+                'Distribuição dos participantes que conseguem interpretar texto', '#88b4ec'),
+    ],
+    5: [  # Características de saúde e estilo de vida
+        GraficoBarras('idade_gestacional_mae_faixa_etaria', 'Idade em que a mãe do participante teve a gestação',
+                      'Distribuição da Idade Gestacional da Mãe por Faixa Etária', '#92a9a7', 'Faixa Etária da Mãe',
+                      coluna='faixa_etaria_mae', ordem=LABELS_IDADE_MAE, rotulo_valores='Contagem de Mães',
+                      figsize=(9, 7), fonte_titulo=14),
+        rede('rede_mae_realizou_pre_natal', 'pre_natal_rede', 'Rede de Acompanhamento Pré-natal da Mãe',
+             'Distribuição da rede onde a mãe realizou pré natal', '#5fddaa'),
+        GraficoBarras('quando_diagnostico_realizado', 'Quando o Diagnóstico do Participante foi Realizado',
+                      'Distribuição de quando o diagnóstico do participante foi realizado', '#7696dc', 'Diagnóstico',
+                      coluna='diagnostico_realizado'),
+        GraficoBarras('participantes_fizeram_cariotipo', 'Foi feito o cariótipo?',
+                      'Distribuição dos participantes que fizeram o cariótipo', '#c5eea6', 'Resposta',
+                      coluna='cariotipo', orientacao='vertical', ordem=['Não', 'Sim'], base='participantes'),
+        sim_nao('irmaos_deficiencia', 'irmaos_deficiencia', 'Irmãos do participante possuem alguma deficiência?',
+                'Distribuição de irmãos com alguma deficiência', '#ea664d'),
+        GraficoBarras('como_cuidador_saude_geral', 'Saúde Geral do Participante (Percepção do Cuidador)',
+                      'Distribuição de como o cuidador considera a saúde do participante em geral', '#ff9486',
+                      'Saúde em geral', coluna='saude_geral', ordem=ORDEM_SAUDE_GERAL, rotulo_ausentes='Não Preenchido',
+                      figsize=(9, 7), fonte_titulo=14),
+        rede('realiza_realizou_acompanhamento_psicologico', 'acompanhamento_psicologico_rede',
+             'Rede de Acompanhamento Psicológico',
+             'Distribuição onde o participante realiza/realizou acompanhamento psicológico', '#f5da7a'),
+        rede('realizou_estimulacao_precoce', 'estimulacao_precoce_rede', 'Rede de Estimulação Precoce',
+             'Distribuição onde o participante realizou estimulação precoce', '#440154'),
+        rede('faz_acompanhamento_clinico_geral', 'rede_clinico_geral', 'Rede de Acompanhamento com Clínico Geral',
+             'Distribuição onde o participante faz acompanhamento com clínico geral', '#a35572'),
+        rede('faz_acompanhamento_dentista', 'rede_dentista', 'Rede de Acompanhamento com Dentista',
+             'Distribuição onde o participante faz acompanhamento com dentista', '#8ccc81'),
+        rede('faz_acompanhamento_nutricionista', 'rede_nutricionista', 'Rede de Acompanhamento com Nutricionista',
+             'Distribuição onde o participante faz acompanhamento com nutricionista', '#d698b1'),
+        rede('faz_acompanhamento_oftalmologista', 'rede_oftalmologista', 'Rede de Acompanhamento com Oftalmologista',
+             'Distribuição onde o participante faz acompanhamento com oftalmologista', '#5b7c8d'),
+        GraficoBarras('imunizacoes_vacinas_entre_participantes', 'Distribuição de Imunizações (Vacinas)',
+                      'Distribuição de imunizações/vacinas entre os participantes', '#f5da7a', 'Imunizante/vacina',
+                      familia='imunizacoes', ordem='crescente', rotulos=nome_da_opcao, base='participantes',
+                      figsize=(8, 6), altura_por_barra=0.4, fonte_titulo=16, limite=1.25),
+        GraficoBarras('doencas_contraidas_apesar_imunizacoes', 'Doenças Apesar das Imunizações',
+                      'Doenças contraídas apesar das imunizações', '#79aba2', 'Doenças',
+                      familia='doencas_pos_imunizacao', ordem='crescente', rotulos=nome_da_opcao, base='participantes',
+                      figsize=(8, 6), altura_por_barra=0.4, fonte_titulo=14, limite=1.25),
+        GraficoBarras('gravidade_covid_entre_participantes', 'Gravidade da COVID', 'Gravidade da COVID entre participantes',
+                      '#c3c2ff', 'Gravidade', coluna='gravidade_covid', fonte_titulo=14),
+        GraficoBarras('uso_medicacoes_pelos_participantes', 'Medicações Utilizadas pelos Participantes',
+                      'Uso de Medicações pelos Participantes', '#fbc599', 'Tipo de Medicação',
+                      familia='medicacoes', ordem='crescente', rotulos=nome_da_opcao, base='participantes',
+                      figsize=(10, 4), altura_por_barra=0.5, fonte_titulo=16, limite=1.3),
+        sim_nao('pratica_atividade_fisica', 'pratica_atividade_fisica', 'Prática de Atividade Física',
+                'Prática de Atividade Física', '#aef055', rotulo_valores='Número de Participantes', fonte_titulo=14),
+        GraficoBarras('frequencia_semanal_atividade_fisica', 'Frequência Semanal de Atividade Física',
+                      'Frequência Semanal de Atividade Física', '#9b5f7b', 'Vezes por Semana',
+                      coluna='frequencia_atividade_fisica', rotulo_valores='Número de Participantes', fonte_titulo=14),
+        sim_nao('habitos_alimentares_saudaveis', 'habitos_alimentares', 'Hábitos Alimentares Saudáveis',
+                'Hábitos Alimentares Saudáveis', '#b7833a', rotulo_valores='Número de Participantes', fonte_titulo=14),
+        sim_nao('atendimento_saude_publico_adequado', 'atendimento_saude_sus', 'Atendimento de Saúde Público Adequado',
+                'Atendimento de Saúde Público Adequado', '#838689', rotulo_valores='Número de Participantes',
+                fonte_titulo=14),
+    ],
+    6: [  # Participação, autonomia e interação social
+        sim_nao('possui_autonomia_tomar_decisoes', 'autonomia', 'Autonomia para Tomar Decisões',
+                'Possui autonomia para tomar decisões', '#8ccc81'),
+        sim_nao('desloca_independentemente_pela_cidade', 'deslocamento_independente', 'Deslocamento Independente',
+                'Se desloca independentemente pela cidade', '#bcc499'),
+        GraficoBarras('como_cuidador_realizacao_necessidades_pessoais', 'Realização de Necessidades Pessoais',
+                      'Como o cuidador considera o participante na realização de necessidades pessoais', '#f8afb8',
+                      'Forma de Independência', coluna='necessidades_pessoais', ordem='crescente',
+                      rotulos=str.capitalize, base='participantes', rotulo_ausentes='Não Preenchido',
+                      figsize=(10, 6), altura_por_barra=0.7, limite=1.15),
+        sim_nao('relaciona_diferentes_pessoas_tem_amigos', 'relacionamentos', 'Relacionamento Interpessoal',
+                'Se relaciona com diferentes pessoas e tem amigos', '#525574'),
+        sim_nao('interage_socialmente_diferentes_lugares', 'interacao_social', 'Interação Social Voluntária',
+                'Interage socialmente em diferentes lugares', '#ff9934'),
+        sim_nao('tratado_respeito_dignidade_igualdade', 'tratado_com_respeito',
+                'Olhar do Cuidador Quanto a Tratamento com Respeito, Dignidade e Igualdade',
+                'Participante é tratado com respeito, dignidade e igualdade', '#680a1d'),
+    ],
+}
+GRAFICOS_BARRAS = [grafico for graficos in GRAFICOS_POR_ABA.values() for grafico in graficos]
+GRAFICOS = {grafico.id: grafico for grafico in GRAFICOS_BARRAS}
+
+
+# --- Agregação: as contagens de todos os gráficos saem de uma única varredura do recorte ---
+def contar_coluna(serie, linhas):
+    # linhas: posições do recorte no banco (None = todas). Categorias contadas pelos códigos, sem alinhar índices
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        codigos = serie.cat.codes.to_numpy()
+        if linhas is not None:
+            codigos = codigos[linhas]
+        contagem = np.bincount(codigos[codigos >= 0], minlength=len(serie.cat.categories))
+        return pd.Series(contagem, index=serie.cat.categories.astype(object)), int((codigos < 0).sum())
+    valores = serie if linhas is None else serie.iloc[linhas]
+    contagem = valores.value_counts(sort=False)
+    return contagem.set_axis(contagem.index.astype(object)), int(valores.isna().sum())
+
+
+def ordenar(contagem, grafico):
+    # Categorias sem nenhuma resposta no recorte não viram barra
+    if isinstance(grafico.ordem, list):
+        contagem = contagem.reindex(grafico.ordem, fill_value=0)
+    contagem = contagem[contagem > 0]
+    if grafico.ordem == 'indice' or isinstance(grafico.ordem, list):
+        return contagem
+    return contagem.sort_values(ascending=grafico.ordem == 'crescente', kind='stable')
+
+
+def agregar_barras(banco, graficos, index=None, cubo=None, filtros=None, cruzado=None):
+    # Devolve {id: (contagem ordenada, total para as %)} e o tempo gasto; None quando a coluna não existe.
+    # Com o cubo de contagens (cubo_banco), o recorte é dado pelos filtros dos estratificadores e as linhas não são lidas.
+    # Com o filtro cruzado (cruzado_banco), cada pergunta usa as contagens mantidas para ela, sem o próprio filtro
+    inicio = time.perf_counter()
+    linhas = None if index is None else banco.index.get_indexer(index)
+    if cubo is not None:
+        n_participantes = cubo.total(filtros)
+    else:
+        n_participantes = len(banco) if index is None else len(index)
+    agregados = {}
+    for grafico in graficos:
+        pergunta = grafico.familia or grafico.coluna
+        participantes = n_participantes
+        if cruzado is not None and pergunta in cruzado:
+            contagem, ausentes = cruzado.distribuicao(pergunta)
+            participantes = cruzado.total(pergunta)
+        elif cubo is not None and pergunta in cubo:
+            contagem, ausentes = cubo.distribuicao(pergunta, filtros)
+        elif grafico.familia:
+            if not banco.esquema.familia(grafico.familia):
+                agregados[grafico.id] = None
+                continue
+            contagem, ausentes = banco.prevalencia(grafico.familia, index), 0
+        elif grafico.coluna in banco.esquema:
+            contagem, ausentes = contar_coluna(banco[banco.esquema[grafico.coluna]], linhas)
+        else:
+            agregados[grafico.id] = None
+            continue
+        if grafico.rotulo_ausentes and ausentes:
+            contagem[grafico.rotulo_ausentes] = ausentes
+        contagem = ordenar(contagem.astype('int64'), grafico)
+        if grafico.rotulos is not None:
+            contagem.index = contagem.index.map(grafico.rotulos)
+        total = participantes if grafico.base == 'participantes' else int(contagem.sum())
+        agregados[grafico.id] = (contagem, total)
+    return agregados, time.perf_counter() - inicio
+
+
+# --- Desenho: função pura de (gráfico, contagem, total), igual para qualquer forma de executar ---
+def desenhar_barras(grafico, contagem, total):
+    largura, altura = grafico.figsize
+    fig, ax = plt.subplots(figsize=(largura, max(altura, len(contagem) * grafico.altura_por_barra)))
+    rotulos = contagem.index.astype(str)
+    valores = contagem.to_numpy()
+    maximo = valores.max()
+    percentuais = valores / total * 100 if total else np.zeros(len(valores))
+
+    if grafico.orientacao == 'horizontal':
+        ax.barh(rotulos, valores, color=grafico.cor, edgecolor=grafico.cor)
+        for i, (valor, percentual) in enumerate(zip(valores, percentuais)):
+            ax.text(valor + maximo * 0.02, i, f'{percentual:.1f}%', va='center', fontsize=FONTE_ROTULOS)
+        ax.set_xlim(0, maximo * grafico.limite if maximo > 0 else 10)
+        ax.set_xlabel(grafico.rotulo_valores)
+        ax.set_ylabel(grafico.rotulo_categorias)
+        ax.grid(axis='x', linestyle='--', alpha=0.5)
+    else:
+        ax.bar(rotulos, valores, color=grafico.cor, edgecolor=grafico.cor)
+        for i, (valor, percentual) in enumerate(zip(valores, percentuais)):
+            ax.text(i, valor + maximo * 0.01, f'{percentual:.1f}%', ha='center', va='bottom', fontsize=FONTE_ROTULOS)
+        ax.set_ylim(0, maximo * 1.15 if maximo > 0 else 10)
+        ax.set_xticks(range(len(rotulos)))
+        ax.set_xticklabels(rotulos, rotation=grafico.rotacao, ha='right' if grafico.rotacao else 'center')
+        ax.set_xlabel(grafico.rotulo_categorias)
+        ax.set_ylabel(grafico.rotulo_valores)
+        ax.grid(axis='y', linestyle='--', alpha=0.5)
+
+    if grafico.fonte_titulo:
+        ax.set_title(grafico.titulo, fontsize=grafico.fonte_titulo)
+    else:
+        ax.set_title(grafico.titulo)
+    plt.tight_layout()
+    for spine in ax.spines.values():
+        spine.set_visible(True)
+        spine.set_linewidth(LARGURA_BORDA)
+    return fig
+
+
+# --- Versão interativa (plotly): o navegador recebe só as contagens agregadas e desenha as barras ---
+def figura_interativa(grafico, contagem, total, selecionadas=None):
+    # selecionadas: rótulos das barras clicadas (filtro cruzado), que ficam destacadas
+    percentuais = contagem / total * 100 if total else contagem * 0.0
+    tabela = pd.DataFrame({grafico.rotulo_categorias: contagem.index.astype(str), grafico.rotulo_valores: contagem.to_numpy(),
+                           '%': percentuais.round(1).to_numpy()})
+    horizontal = grafico.orientacao == 'horizontal'
+    fig = px.bar(tabela, x=grafico.rotulo_valores if horizontal else grafico.rotulo_categorias,
+                 y=grafico.rotulo_categorias if horizontal else grafico.rotulo_valores,
+                 orientation='h' if horizontal else 'v', text=tabela['%'].map('{:.1f}%'.format),
+                 hover_data={'%': ':.1f'}, title=grafico.titulo, color_discrete_sequence=[grafico.cor])
+    fig.update_traces(textposition='outside', cliponaxis=False)
+    if selecionadas:
+        fig.update_traces(selectedpoints=[posicao for posicao, rotulo in enumerate(tabela[grafico.rotulo_categorias])
+                                          if rotulo in selecionadas])
+    fig.update_layout(margin={'t': 50, 'b': 10})
+    return fig
+
+
+def categorias_dos_rotulos(grafico, categorias):
+    # Texto de cada barra no eixo -> categoria da pergunta (None = barra das células em branco), para o clique
+    categorias = pd.Index(list(categorias), dtype=object)
+    mapa = {}
+    if grafico.rotulo_ausentes:
+        ausentes = pd.Index([grafico.rotulo_ausentes], dtype=object)
+        mapa[str((ausentes if grafico.rotulos is None else ausentes.map(grafico.rotulos))[0])] = None
+    textos = categorias if grafico.rotulos is None else categorias.map(grafico.rotulos)
+    mapa.update({str(texto): categoria for texto, categoria in zip(textos, categorias)})
+    return mapa
+
+
+def mapa_calor_interativo(matriz, titulo, escala='RdBu_r', formato='.2f', limites=(-1, 1), textos=None):
+    # Matrizes de correlação (-1 a 1) e de coocorrência (contagens, limites=None); textos: anotação pronta por célula
+    zmin, zmax = limites if limites else (None, None)
+    fig = px.imshow(matriz, text_auto=formato if textos is None else False, color_continuous_scale=escala,
+                    zmin=zmin, zmax=zmax, aspect='auto', title=titulo)
+    if textos is not None:
+        fig.update_traces(text=np.asarray(textos), texttemplate='%{text}')
+    fig.update_layout(margin={'t': 50, 'b': 10})
+    return fig
@@ -0,0 +1,61 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# --- Codificação ordinal: renda, escolaridade e faixas derivadas pelos níveis na ordem do questionário ---
+# Cada pergunta é codificada na primeira vez que alguma aba a pede (BancoCompacto.ordinais) e guardada em int8
+# (-1 = em branco). Correlações, clusters e modelos leem os mesmos códigos, sem recodificar por aba
+TIPO_CODIGO = np.int8
+
+
+class CodificacaoOrdinal:
+    def __init__(self, banco):
+        self.banco = banco
+        self.index = banco.index
+        # Níveis explícitos do registro (códigos do dicionário), não os observados nem a ordem alfabética
+        self.niveis = {coluna.nome: list(coluna.categorias) for coluna in banco.esquema.colunas
+                       if coluna.ordenada and coluna.nome in banco}
+        self.codigos = {}
+        self.tempo = 0.0
+        self._trava = threading.Lock()
+
+    @property
+    def nomes(self):
+        return list(self.niveis)
+
+    def _codificar(self, nome):
+        codigos = self.codigos.get(nome)
+        if codigos is None:
+            with self._trava:
+                codigos = self.codigos.get(nome)
+                if codigos is None:
+                    inicio = time.perf_counter()
+                    niveis = self.niveis[nome]
+                    tipo = TIPO_CODIGO if len(niveis) <= np.iinfo(TIPO_CODIGO).max else np.int16
+                    codigos = pd.Categorical(self.banco[nome], categories=niveis, ordered=True).codes.astype(tipo)
+                    self.codigos[nome] = codigos
+                    self.tempo += time.perf_counter() - inicio
+        return codigos
+
+    @property
+    def nbytes(self):
+        return sum(codigos.nbytes for codigos in self.codigos.values())
+
+    def codigos_de(self, nome, linhas=None):
+        # linhas: posições das linhas de um recorte (RecorteBanco)
+        codigos = self._codificar(nome)
+        return codigos if linhas is None else codigos[linhas]
+
+    def matriz(self, index=None, nomes=None):
+        # Códigos inteiros (-1 = em branco) das linhas pedidas
+        nomes = [nome for nome in (nomes or self.nomes) if nome in self.niveis]
+        linhas = None if index is None else self.index.get_indexer(index)
+        return pd.DataFrame({nome: self.codigos_de(nome, linhas) for nome in nomes},
+                            index=self.index if index is None else index)
+
+    def valores(self, index=None, nomes=None):
+        # Códigos como número para os modelos (em branco = NaN)
+        matriz = self.matriz(index, nomes)
+        return matriz.astype(float).where(matriz >= 0)
@@ -0,0 +1,238 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from dados_banco import (ARQUIVO_BANCO, COLUNA_INSTITUICAO, PASTA_SNAPSHOT, BancoColunar, abrir_partes, caminhos_snapshot,
+                         ler_banco, ler_meta, preparar_para_arrow)
+
+# --- Coleção de planilhas: uma subpasta por onda de coleta (planilhas/<onda>/*.xlsx) ---
+PASTA_PLANILHAS = 'planilhas'
+ONDA_PADRAO = '1'
+COLUNA_ONDA = 'onda'
+COLUNA_ORDEM = '_ordem'
+# Partições do banco unificado: filtros por onda e instituição leem só as pastas correspondentes
+PARTICOES = pa.schema([(COLUNA_ONDA, pa.string()), (COLUNA_INSTITUICAO, pa.string())])
+
+
+def listar_planilhas(pasta=PASTA_PLANILHAS, arquivo_unico=ARQUIVO_BANCO):
+    # [(onda, caminho)] na ordem de ingestão; sem a pasta, o banco é só a planilha principal
+    if not os.path.isdir(pasta):
+        return [(ONDA_PADRAO, arquivo_unico)] if os.path.exists(arquivo_unico) else []
+    planilhas = []
+    for raiz, subpastas, arquivos in os.walk(pasta):
+        subpastas.sort()
+        relativo = os.path.relpath(raiz, pasta)
+        onda = ONDA_PADRAO if relativo == '.' else relativo.split(os.sep)[0]
+        planilhas += [(onda, os.path.join(raiz, nome)) for nome in sorted(arquivos)
+                      if nome.endswith('.xlsx') and not nome.startswith('~$')]
+    return planilhas
+
+
+def pasta_da_planilha(caminho, pasta=PASTA_SNAPSHOT):
+    # Snapshot (com as partes incrementais) de cada planilha numa pasta própria
+    return os.path.join(pasta, 'planilhas', re.sub(r'[^\w.-]', '_', os.path.normpath(caminho)))
+
+
+def ingerir_planilha(caminho, pasta=PASTA_SNAPSHOT):
+    # Executada em processo separado: devolve só tempos e lotes (as partes ficam gravadas em disco)
+    banco, tempos = ler_banco(caminho, pasta_da_planilha(caminho, pasta))
+    return tempos, banco.lotes
+
+
+def tabela_da_planilha(caminho, sha, pasta=PASTA_SNAPSHOT):
+    # Partes gravadas pelo processo que ingeriu a planilha; sem snapshot em disco, lê de novo aqui
+    pasta_planilha = pasta_da_planilha(caminho, pasta)
+    meta = ler_meta(sha, pasta_planilha)
+    if meta and all(os.path.exists(caminhos_snapshot(parte, pasta_planilha)[0]) for parte in meta['partes']):
+        return abrir_partes(meta['partes'], pasta_planilha)
+    return ler_banco(caminho, pasta_planilha)[0].tabela
+
+
+# --- Esquema único: colunas na ordem em que aparecem e um tipo por coluna ---
+def tipo_unificado(tipos):
+    tipos = [tipo for tipo in tipos if not pa.types.is_null(tipo)]
+    if not tipos:
+        return pa.null()
+    if all(tipo == tipos[0] for tipo in tipos):
+        return tipos[0]
+    if all(pa.types.is_integer(tipo) or pa.types.is_floating(tipo) for tipo in tipos):
+        return pa.float64()
+    # Tipos incompatíveis entre planilhas: texto, como em preparar_para_arrow
+    return pa.string()
+
+
+def unificar_tabelas(tabelas):
+    if len(tabelas) == 1:
+        return tabelas
+    nomes = list(dict.fromkeys(nome for tabela in tabelas for nome in tabela.column_names))
+    tipos = {nome: tipo_unificado([tabela.schema.field(nome).type for tabela in tabelas if nome in tabela.column_names])
+             for nome in nomes}
+    unificadas = []
+    for tabela in tabelas:
+        colunas = []
+        for nome in nomes:
+            if nome not in tabela.column_names:
+                colunas.append(pa.nulls(tabela.num_rows, tipos[nome]))
+            elif tabela.schema.field(nome).type == tipos[nome]:
+                colunas.append(tabela.column(nome))
+            elif pa.types.is_string(tipos[nome]):
+                texto = preparar_para_arrow(tabela.select([nome]).to_pandas().astype(object))[nome]
+                colunas.append(pa.array(texto.map(lambda valor: valor if pd.isna(valor) else str(valor)),
+                                        type=pa.string(), from_pandas=True))
+            else:
+                colunas.append(tabela.column(nome).cast(tipos[nome]))
+        unificadas.append(pa.table(colunas, names=nomes))
+    return unificadas
+
+
+# --- Gravação e leitura do banco particionado por onda e instituição ---
+def chave_colecao(planilhas, tempos):
+    conteudo = json.dumps([[onda, caminho, tempo['sha256']] for (onda, caminho), tempo in zip(planilhas, tempos)])
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+
+def montar_tabela(tabelas, ondas):
+    partes = []
+    inicio_ordem = 0
+    for tabela, onda in zip(unificar_tabelas(tabelas), ondas):
+        # A ordem original das linhas é guardada para ser refeita na leitura (as partições agrupam as linhas)
+        tabela = tabela.append_column(COLUNA_ONDA, pa.array([onda] * tabela.num_rows, type=pa.string()))
+        tabela = tabela.append_column(COLUNA_ORDEM, pa.array(range(inicio_ordem, inicio_ordem + tabela.num_rows),
+                                                             type=pa.int64()))
+        inicio_ordem += tabela.num_rows
+        partes.append(tabela)
+    tabela = pa.concat_tables(partes)
+    if COLUNA_INSTITUICAO not in tabela.column_names:
+        tabela = tabela.append_column(COLUNA_INSTITUICAO, pa.nulls(tabela.num_rows, pa.string()))
+    elif not pa.types.is_string(tabela.schema.field(COLUNA_INSTITUICAO).type):
+        tabela = tabela.set_column(tabela.column_names.index(COLUNA_INSTITUICAO), COLUNA_INSTITUICAO,
+                                   tabela.column(COLUNA_INSTITUICAO).cast(pa.string()))
+    return tabela
+
+
+def info_colunas(tabela):
+    return {'colunas': [nome for nome in tabela.column_names if nome not in (COLUNA_ONDA, COLUNA_ORDEM)],
+            'metadados_pandas': (tabela.schema.metadata or {}).get(b'pandas', b'').decode()}
+
+
+def gravar_particoes(tabela, destino):
+    temporario = destino + '.tmp'
+    shutil.rmtree(temporario, ignore_errors=True)
+    ds.write_dataset(tabela, temporario, format='ipc', partitioning=ds.partitioning(PARTICOES, flavor='hive'))
+    with open(os.path.join(temporario, 'colunas.json'), 'w', encoding='utf-8') as arquivo:
+        json.dump(info_colunas(tabela), arquivo, ensure_ascii=False)
+    shutil.rmtree(destino, ignore_errors=True)
+    os.replace(temporario, destino)
+
+
+def filtro_particoes(ondas=None, instituicoes=None):
+    # None = sem filtro; instituicoes pode incluir None (respostas sem instituição)
+    filtro = None
+    if ondas is not None:
+        filtro = ds.field(COLUNA_ONDA).isin(list(ondas))
+    if instituicoes is not None:
+        nomes = [nome for nome in instituicoes if nome is not None]
+        condicao = ds.field(COLUNA_INSTITUICAO).isin(nomes)
+        if None in instituicoes:
+            condicao = condicao | ds.field(COLUNA_INSTITUICAO).is_null()
+        filtro = condicao if filtro is None else filtro & condicao
+    return filtro
+
+
+def recortar(dataset, info, ondas=None, instituicoes=None):
+    # dataset: pasta particionada (ds.dataset) ou, sem escrita em disco, a tabela montada em memória
+    filtro = filtro_particoes(ondas, instituicoes)
+    if isinstance(dataset, pa.Table):
+        tabela = dataset if filtro is None else dataset.filter(filtro)
+        lidos = arquivos = None
+    else:
+        # Só os arquivos das partições que passam no filtro são abertos
+        arquivos = len(dataset.files)
+        lidos = len(list(dataset.get_fragments(filter=filtro))) if filtro is not None else arquivos
+        tabela = dataset.to_table(filter=filtro)
+    tabela = tabela.sort_by(COLUNA_ORDEM).select(info['colunas'])
+    if info['metadados_pandas']:
+        tabela = tabela.replace_schema_metadata({'pandas': info['metadados_pandas']})
+    return tabela, (lidos, arquivos)
+
+
+def ler_particoes(destino, ondas=None, instituicoes=None):
+    with open(os.path.join(destino, 'colunas.json'), encoding='utf-8') as arquivo:
+        info = json.load(arquivo)
+    dataset = ds.dataset(destino, format='ipc', partitioning=ds.partitioning(PARTICOES, flavor='hive'),
+                         exclude_invalid_files=True)
+    return recortar(dataset, info, ondas, instituicoes)
+
+
+# --- Leitura da coleção: planilhas em paralelo (um processo por planilha), depois o banco particionado ---
+def ler_colecao(pasta_planilhas=PASTA_PLANILHAS, pasta=PASTA_SNAPSHOT, ondas=None, instituicoes=None):
+    planilhas = listar_planilhas(pasta_planilhas)
+    if not planilhas:
+        raise FileNotFoundError(pasta_planilhas)
+
+    inicio = time.perf_counter()
+    caminhos = [caminho for _, caminho in planilhas]
+    if len(caminhos) == 1:
+        resultados = [ingerir_planilha(caminhos[0], pasta)]
+    else:
+        # 'spawn': o load roda numa thread do Streamlit, e um fork copiaria travas seguradas por outras threads
+        with ProcessPoolExecutor(max_workers=min(len(caminhos), os.cpu_count() or 1),
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            resultados = list(executor.map(ingerir_planilha, caminhos, [pasta] * len(caminhos)))
+    tempos_planilhas = [tempos for tempos, _ in resultados]
+
+    tempos = {
+        'planilhas': len(planilhas),
+        'ingestao': time.perf_counter() - inicio,
+        'sha256': chave_colecao(planilhas, tempos_planilhas),
+        'hash': sum(tempo['hash'] for tempo in tempos_planilhas),
+        'linhas_novas': sum(tempo['linhas_novas'] for tempo in tempos_planilhas),
+        # A aba 'Dicionário' da primeira planilha descreve as colunas de toda a coleção
+        'dicionario': (caminhos[0], pasta_da_planilha(caminhos[0], pasta), tempos_planilhas[0]['sha256']),
+    }
+    origens = {tempo['origem'] for tempo in tempos_planilhas}
+    tempos['origem'] = 'snapshot' if origens == {'snapshot'} else 'excel' if 'excel' in origens else 'incremental'
+    if any(tempo.get('excel') is not None for tempo in tempos_planilhas):
+        tempos['excel'] = sum(tempo.get('excel') or 0 for tempo in tempos_planilhas)
+    for etapa in ('conversao', 'contagens', 'gravacao_snapshot'):
+        if any(etapa in tempo for tempo in tempos_planilhas):
+            tempos[etapa] = sum(tempo.get(etapa, 0) for tempo in tempos_planilhas)
+
+    # Banco unificado e particionado, refeito só quando alguma planilha muda
+    destino = os.path.join(pasta, 'particoes', tempos['sha256'])
+    inicio = time.perf_counter()
+    if os.path.exists(os.path.join(destino, 'colunas.json')):
+        tabela, particoes = ler_particoes(destino, ondas, instituicoes)
+    else:
+        tabelas = [tabela_da_planilha(caminho, tempo['sha256'], pasta) for caminho, tempo in zip(caminhos, tempos_planilhas)]
+        completa = montar_tabela(tabelas, [onda for onda, _ in planilhas])
+        try:
+            gravar_particoes(completa, destino)
+            for nome in os.listdir(os.path.dirname(destino)):
+                if nome != tempos['sha256']:
+                    shutil.rmtree(os.path.join(os.path.dirname(destino), nome), ignore_errors=True)
+            tempos['particionamento'] = time.perf_counter() - inicio
+            inicio = time.perf_counter()
+            tabela, particoes = ler_particoes(destino, ondas, instituicoes)
+        except OSError:
+            # Sem permissão de escrita: o mesmo recorte feito sobre a tabela em memória
+            tabela, particoes = recortar(completa, info_colunas(completa), ondas, instituicoes)
+    tempos['snapshot'] = time.perf_counter() - inicio
+    tempos['particoes_lidas'] = particoes
+    tempos['ondas'] = sorted({onda for onda, _ in planilhas})
+
+    # Lotes de todas as planilhas, numerados na ordem de ingestão
+    lotes = []
+    for (onda, caminho), (_, lotes_planilha) in zip(planilhas, resultados):
+        for lote in lotes_planilha:
+            lotes.append({**lote, 'lote': len(lotes) + 1, 'onda': onda, 'planilha': os.path.basename(caminho)})
+    return BancoColunar(tabela, lotes), tempos
@@ -0,0 +1,237 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from associacao_banco import MINIMO_PARES, VariaveisCodificadas, cramer_cruzado, eta_cruzado, pearson_cruzado
+from testes_banco import ALFA, benjamini_hochberg
+
+# --- Significância por permutação e intervalos bootstrap das associações de um mapa de calor ---
+# Cada lote embaralha as linhas de uma cópia das variáveis e mede todos os pares (original × embaralhada) com os
+# mesmos produtos de matrizes da matriz de associações. As cópias do lote ficam lado a lado nas colunas, então o
+# custo cresce linearmente com o número de permutações, sem laço em Python por permutação ou por par
+PERMUTACOES = 5000
+REAMOSTRAS = 1000
+TAMANHO_LOTE = 100
+# Postos refeitos de uma vez no bootstrap do Spearman (cópias × linhas × variáveis): ~32 MB em float64
+LIMITE_POSTOS = 2 ** 22
+SEMENTE = 2024
+# Parada antecipada: o par deixa de ser permutado quando o erro de Monte Carlo do p já não muda a decisão
+MINIMO_PERMUTACOES = 200
+DESVIOS_DECISAO = 3
+# Estatística permutada de cada medida. A policórica exige um ajuste por tabela (caro demais para milhares de
+# permutações): os pares ordinais são testados pelo Spearman dos mesmos códigos, que mede a mesma tendência
+ESTATISTICAS = {
+    'pearson': 'pearson',
+    'phi': 'pearson',
+    'ponto_bisserial': 'pearson',
+    'spearman': 'spearman',
+    'policorica': 'spearman',
+    'cramer': 'cramer',
+    'eta': 'eta',
+}
+
+
+def postos_reamostrados(valores, pesos):
+    # Postos médios de cada coluna em cada reamostragem (pesos: lote × n), refeitos com as repetições da reamostra:
+    # um grupo de empates com c linhas sorteadas depois de k linhas menores recebe o posto k + (c + 1) / 2
+    n, m = valores.shape
+    resultado = np.full((len(pesos), n, m), np.nan)
+    for j in range(m):
+        presentes = np.flatnonzero(~np.isnan(valores[:, j]))
+        if not len(presentes):
+            continue
+        ordem = presentes[np.argsort(valores[presentes, j], kind='stable')]
+        ordenados = valores[ordem, j]
+        inicios = np.flatnonzero(np.r_[True, ordenados[1:] != ordenados[:-1]])
+        grupo = np.repeat(np.arange(len(inicios)), np.diff(np.append(inicios, len(ordem))))
+        contagens = np.add.reduceat(pesos[:, ordem], inicios, axis=1).astype(float)
+        medios = np.cumsum(contagens, axis=1) - contagens + (contagens + 1) / 2
+        resultado[:, ordem, j] = medios[:, grupo]
+    return resultado
+
+
+def medidas_em_lote(variaveis, estatisticas, linhas=None, pesos=None):
+    # Medida de cada par com a variável da coluna numa cópia reordenada das linhas, para um lote de cópias.
+    # linhas (lote × n): permutações; pesos (lote × n): contagens de cada linha numa reamostragem bootstrap.
+    # Devolve lote × m × m
+    n, m = variaveis.valores.shape
+    lote = len(linhas) if linhas is not None else len(pesos)
+
+    def lado_b(matriz):
+        # Coluna k * colunas + j: coluna j na cópia k
+        copias = matriz[linhas] if linhas is not None else np.broadcast_to(matriz, (lote,) + matriz.shape)
+        return copias.transpose(1, 0, 2).reshape(n, lote * matriz.shape[1])
+
+    def pesos_b(colunas):
+        return None if pesos is None else np.repeat(pesos.T.astype(float), colunas, axis=1)
+
+    def por_copia(matriz):
+        return matriz.reshape(matriz.shape[0], lote, -1).transpose(1, 0, 2)
+
+    resultado = np.full((lote, m, m), np.nan)
+    r, _ = pearson_cruzado(variaveis.valores, lado_b(variaveis.valores), pesos_b(m))
+    selecao = estatisticas == 'pearson'
+    resultado[:, selecao] = por_copia(r)[:, selecao]
+    selecao = estatisticas == 'spearman'
+    if selecao.any():
+        if pesos is None:
+            # Permutar as linhas não muda os postos de cada variável: os originais valem para todas as cópias
+            rho = por_copia(pearson_cruzado(variaveis.postos, lado_b(variaveis.postos))[0])
+        else:
+            # Na reamostragem os postos mudam com as repetições: refeitos por cópia, como no Spearman da própria amostra,
+            # só para as variáveis de pares Spearman e em grupos de cópias com até LIMITE_POSTOS postos na memória.
+            # Cada cópia é medida no seu próprio produto de matrizes: empilhar o lote num produto só cria temporários
+            # cópias × linhas × variáveis que não cabem no cache e fica mais lento que o laço
+            envolvidas = np.flatnonzero(selecao.any(axis=0) | selecao.any(axis=1))
+            valores = variaveis.valores[:, envolvidas]
+            por_grupo = max(1, LIMITE_POSTOS // valores.size)
+            rho = np.full((lote, m, m), np.nan)
+            for inicio in range(0, lote, por_grupo):
+                grupo = pesos[inicio:inicio + por_grupo]
+                for copia, postos, pesos_copia in zip(range(inicio, lote), postos_reamostrados(valores, grupo), grupo):
+                    rho[copia][np.ix_(envolvidas, envolvidas)] = pearson_cruzado(
+                        postos, postos, pesos_copia[:, None].astype(float))[0]
+        resultado[:, selecao] = rho[:, selecao]
+
+    categoricas = variaveis.categoricas(range(m))
+    if categoricas:
+        colunas, inicios, _ = variaveis.blocos(categoricas)
+        indicadoras = variaveis.indicadoras[:, colunas]
+        indicadoras_b = lado_b(indicadoras)
+        if pesos is not None:
+            indicadoras_b = indicadoras_b * pesos_b(len(colunas))
+        # Tabelas cruzadas de todas as cópias num único produto; os blocos de cada cópia continuam contíguos
+        inicios_b = (np.arange(lote)[:, None] * len(colunas) + inicios).ravel()
+        v, _ = cramer_cruzado(indicadoras.T @ indicadoras_b, inicios, inicios_b)
+        completo = np.full((lote, m, m), np.nan)
+        completo[:, np.array(categoricas)[:, None], np.array(categoricas)[None, :]] = por_copia(v)
+        selecao = estatisticas == 'cramer'
+        resultado[:, selecao] = completo[:, selecao]
+
+        # Razão de correlação: a nominal fica nas linhas originais e a numérica é reordenada (nos dois sentidos do par)
+        eta, _ = eta_cruzado(indicadoras, inicios, lado_b(variaveis.valores), pesos_b(m))
+        completo = np.full((lote, m, m), np.nan)
+        completo[:, categoricas, :] = por_copia(eta)
+        nominal = np.zeros(m, dtype=bool)
+        nominal[categoricas] = True
+        selecao = estatisticas == 'eta'
+        linha_nominal = selecao & nominal[:, None]
+        coluna_nominal = selecao & ~nominal[:, None]
+        resultado[:, linha_nominal] = completo[:, linha_nominal]
+        resultado[:, coluna_nominal] = completo.transpose(0, 2, 1)[:, coluna_nominal]
+    return resultado
+
+
+class PermutacoesPares:
+    def __init__(self, banco, associacoes, permutacoes=PERMUTACOES, reamostras=REAMOSTRAS,
+                 tamanho_lote=TAMANHO_LOTE, trabalhadores=None, semente=SEMENTE, parada_antecipada=True):
+        inicio = time.perf_counter()
+        nomes = list(associacoes.valores.index)
+        variaveis = VariaveisCodificadas(banco, nomes)
+        m, n = len(variaveis), len(variaveis.valores)
+        medidas = associacoes.medidas.reindex(index=variaveis.nomes, columns=variaveis.nomes).to_numpy()
+        estatisticas = np.vectorize(lambda medida: ESTATISTICAS.get(medida, ''), otypes=[object])(medidas)
+        # Estatística observada: a própria matriz de associações; só os pares policóricos precisam do Spearman substituto
+        observada = np.abs(associacoes.valores.reindex(index=variaveis.nomes, columns=variaveis.nomes).to_numpy())
+        policoricas = medidas == 'policorica'
+        if policoricas.any():
+            ordinais = np.flatnonzero(policoricas.any(axis=1))
+            rho, _ = pearson_cruzado(variaveis.postos[:, ordinais], variaveis.postos[:, ordinais])
+            substituta = np.full((m, m), np.nan)
+            substituta[np.ix_(ordinais, ordinais)] = np.abs(rho)
+            observada = np.where(policoricas, substituta, observada)
+        pares = associacoes.pares.reindex(index=variaveis.nomes, columns=variaveis.nomes).to_numpy()
+        # Cada par é testado uma vez (acima da diagonal) e espelhado no fim
+        validos = np.triu((pares >= MINIMO_PARES) & ~np.isnan(observada), 1)
+        n_pares = max(int(validos.sum()), 1)
+
+        # Lotes independentes (uma semente por lote): o resultado não depende do número de trabalhadores.
+        # Os produtos de matrizes do NumPy liberam o GIL, então os lotes de uma rodada rodam em paralelo em threads
+        trabalhadores = trabalhadores or os.cpu_count() or 1
+        lotes_permutacao, lotes_reamostra = -(-permutacoes // tamanho_lote), -(-reamostras // tamanho_lote)
+        sementes = np.random.SeedSequence(semente).spawn(lotes_permutacao + lotes_reamostra)
+        sementes_permutacao, sementes_reamostra = sementes[:lotes_permutacao], sementes[lotes_permutacao:]
+
+        def permutar(semente_lote):
+            gerador = np.random.default_rng(semente_lote)
+            linhas = gerador.permuted(np.broadcast_to(np.arange(n), (tamanho_lote, n)), axis=1)
+            return medidas_em_lote(variaveis, estatisticas, linhas=linhas)
+
+        def reamostrar(semente_lote):
+            gerador = np.random.default_rng(semente_lote)
+            pesos = gerador.multinomial(n, np.full(n, 1 / n), size=tamanho_lote)
+            return medidas_em_lote(variaveis, estatisticas, pesos=pesos)
+
+        excedentes = np.zeros((m, m))
+        feitas = np.zeros((m, m))
+        ativos = validos.copy()
+        self.lotes = 0
+        with ThreadPoolExecutor(max_workers=trabalhadores, thread_name_prefix='permutacoes') as executor:
+            for rodada in range(0, len(sementes_permutacao), trabalhadores):
+                for nulas in executor.map(permutar, sementes_permutacao[rodada:rodada + trabalhadores]):
+                    nulas = np.abs(nulas)
+                    # Tolerância relativa: a própria estatística observada, recalculada, conta como excedente
+                    excedentes += ativos * (nulas >= observada * (1 - 1e-9)).sum(axis=0)
+                    feitas += ativos * (~np.isnan(nulas)).sum(axis=0)
+                    self.lotes += 1
+                if parada_antecipada:
+                    # Decidido: o p está, com folga de DESVIOS_DECISAO erros de Monte Carlo, acima de ALFA (não
+                    # significativo em nenhuma posição do Benjamini–Hochberg) ou abaixo de ALFA / pares (significativo em todas)
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        p = (excedentes + 1) / (feitas + 1)
+                        erro = DESVIOS_DECISAO * np.sqrt(p * (1 - p) / feitas)
+                    decididos = (feitas >= MINIMO_PERMUTACOES) & ((p - erro > ALFA) | (p + erro < ALFA / n_pares))
+                    ativos &= ~decididos
+                    if not ativos.any():
+                        break
+            amostras = list(executor.map(reamostrar, sementes_reamostra))
+        self.tempo_permutacoes = time.perf_counter() - inicio
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            p = np.where(validos & (feitas > 0), (excedentes + 1) / (feitas + 1), np.nan)
+        p = np.where(np.isnan(p), p.T, p)
+        linhas, colunas = np.triu_indices(m, k=1)
+        q = np.full((m, m), np.nan)
+        q[linhas, colunas] = q[colunas, linhas] = benjamini_hochberg(p[linhas, colunas])
+        feitas = feitas + feitas.T
+
+        # Intervalo bootstrap (percentis 2,5 e 97,5) da própria medida; a policórica fica sem intervalo
+        amostras = np.concatenate(amostras)[:reamostras] if amostras else np.full((0, m, m), np.nan)
+        with np.errstate(invalid='ignore'):
+            inferior, superior = np.nanpercentile(amostras, [2.5, 97.5], axis=0) if len(amostras) else (np.nan, np.nan)
+        sem_intervalo = (medidas == 'policorica') | ~(validos | validos.T)
+        inferior, superior = np.where(sem_intervalo, np.nan, inferior), np.where(sem_intervalo, np.nan, superior)
+
+        self.nomes = variaveis.nomes
+        self.n_testes = int(validos.sum())
+        self.p = pd.DataFrame(p, index=self.nomes, columns=self.nomes)
+        self.q = pd.DataFrame(q, index=self.nomes, columns=self.nomes)
+        self.permutacoes = pd.DataFrame(feitas.astype(np.int64), index=self.nomes, columns=self.nomes)
+        self.inferior = pd.DataFrame(inferior, index=self.nomes, columns=self.nomes)
+        self.superior = pd.DataFrame(superior, index=self.nomes, columns=self.nomes)
+        self.reamostras = len(amostras)
+        self.tempo = time.perf_counter() - inicio
+
+    def significativos(self, alfa=ALFA):
+        return int(np.triu(self.q.to_numpy() < alfa, 1).sum())
+
+    def marcas(self, nomes, alfa=ALFA):
+        # '*' nas células significativas por permutação, após a correção entre os pares do mapa
+        q = self.q.reindex(index=nomes, columns=nomes).to_numpy()
+        return np.where(q < alfa, '*', '')
+
+
+def permutar_pares(banco, associacoes):
+    return PermutacoesPares(banco, associacoes)
+
+
+def medir(banco, associacoes, permutacoes=(500, 1000, 2000, 4000)):
+    # Tempo sem parada antecipada e sem bootstrap para números crescentes de permutações (deve crescer linearmente)
+    tempos = {}
+    for quantidade in permutacoes:
+        resultado = PermutacoesPares(banco, associacoes, permutacoes=quantidade, reamostras=0, parada_antecipada=False)
+        tempos[quantidade] = round(resultado.tempo, 3)
+    return tempos
@@ -0,0 +1,117 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# --- Cache de resultados compartilhado por todas as sessões do processo ---
+# Chave: (tipo do resultado, ...). O recorte é chaveado pelo estado dos filtros da URL; os resultados das abas,
+# pela impressão digital do recorte. Quem abre a mesma combinação de filtros reaproveita o que outra sessão
+# já calculou. Orçamento de memória: os resultados usados há mais tempo saem primeiro (LRU)
+ORCAMENTO_BYTES = 256 * 1024 * 1024
+# Objetos (modelos, matrizes de associação, permutações): estimativa fixa para os que não expõem o estado,
+# e até quantos níveis de atributos são percorridos atrás de quadros e arrays
+TAMANHO_OBJETO = 4 * 1024
+PROFUNDIDADE_MAXIMA = 6
+
+
+def tamanho_estimado(valor, _vistos=None, _profundidade=0, _em_objeto=False):
+    # Bytes aproximados de um resultado: quadros e arrays pelo conteúdo, contêineres somando os itens,
+    # objetos pelos quadros e arrays do seu estado (sem serializar); sem estado, uma estimativa fixa
+    # Quadros dentro de objetos contam sem os textos (rótulos como os das medidas são objetos compartilhados)
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(deep=not _em_objeto).sum())
+    if isinstance(valor, (pd.Series, pd.Index)):
+        return int(valor.memory_usage(deep=not _em_objeto))
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes
+    if valor is None or isinstance(valor, (bool, int, float, str, bytes, np.generic)):
+        return sys.getsizeof(valor)
+    vistos = set() if _vistos is None else _vistos
+    if id(valor) in vistos or _profundidade >= PROFUNDIDADE_MAXIMA:
+        return 0
+    vistos.add(id(valor))
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(tamanho_estimado(chave, vistos, _profundidade + 1, _em_objeto)
+                                          + tamanho_estimado(item, vistos, _profundidade + 1, _em_objeto)
+                                          for chave, item in valor.items())
+    if isinstance(valor, (list, tuple)):
+        return sys.getsizeof(valor) + sum(tamanho_estimado(item, vistos, _profundidade + 1, _em_objeto) for item in valor)
+    # Estado do objeto: o __dict__ na maioria dos casos; as árvores do scikit-learn expõem os arrays dos nós
+    try:
+        estado = valor.__getstate__()
+    except Exception:
+        estado = None
+    if not isinstance(estado, dict):
+        return TAMANHO_OBJETO
+    return sys.getsizeof(valor) + sum(tamanho_estimado(item, vistos, _profundidade + 1, True) for item in estado.values()
+                                      if not callable(item))
+
+
+class CacheResultados:
+    def __init__(self, orcamento=ORCAMENTO_BYTES):
+        self.orcamento = orcamento
+        self.bytes = 0
+        self.descartes = 0
+        # Acertos e falhas por tipo de resultado (primeiro elemento da chave)
+        self.acertos = {}
+        self.falhas = {}
+        self._itens = OrderedDict()
+        self._trava = threading.Lock()
+
+    def __len__(self):
+        return len(self._itens)
+
+    def obter(self, chave, calcular):
+        # calcular(): só é chamada quando a chave não está no cache; o cálculo roda fora da trava
+        tipo = chave[0]
+        with self._trava:
+            item = self._itens.get(chave)
+            if item is not None:
+                self._itens.move_to_end(chave)
+                self.acertos[tipo] = self.acertos.get(tipo, 0) + 1
+                return item[0]
+            self.falhas[tipo] = self.falhas.get(tipo, 0) + 1
+        valor = calcular()
+        self.guardar(chave, valor)
+        return valor
+
+    def guardar(self, chave, valor):
+        tamanho = tamanho_estimado(valor)
+        if tamanho > self.orcamento:
+            return
+        with self._trava:
+            antigo = self._itens.pop(chave, None)
+            if antigo is not None:
+                self.bytes -= antigo[1]
+            self._itens[chave] = (valor, tamanho)
+            self.bytes += tamanho
+            while self.bytes > self.orcamento:
+                _, (_, descartado) = self._itens.popitem(last=False)
+                self.bytes -= descartado
+                self.descartes += 1
+
+    def estatisticas(self):
+        with self._trava:
+            acertos, falhas = sum(self.acertos.values()), sum(self.falhas.values())
+            por_tipo = {}
+            for tipo in sorted(set(self.acertos) | set(self.falhas)):
+                consultas = self.acertos.get(tipo, 0) + self.falhas.get(tipo, 0)
+                por_tipo[tipo] = {
+                    'resultados': sum(1 for chave in self._itens if chave[0] == tipo),
+                    'bytes': sum(tamanho for chave, (_, tamanho) in self._itens.items() if chave[0] == tipo),
+                    'acertos': self.acertos.get(tipo, 0),
+                    'falhas': self.falhas.get(tipo, 0),
+                    'taxa_acerto': self.acertos.get(tipo, 0) / consultas if consultas else 0.0,
+                }
+            return {
+                'resultados': len(self._itens),
+                'bytes': self.bytes,
+                'orcamento': self.orcamento,
+                'acertos': acertos,
+                'falhas': falhas,
+                'descartes': self.descartes,
+                'taxa_acerto': acertos / (acertos + falhas) if acertos + falhas else 0.0,
+                'por_tipo': por_tipo,
+            }
@@ -0,0 +1,167 @@
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.special import gammaln
+from scipy.stats import chi2, f as distribuicao_f, t as distribuicao_t
+
+from associacao_banco import MINIMO_PARES, VariaveisCodificadas, qui_quadrado_cruzado
+
+# --- Testes de significância de todos os pares, com controle da taxa de falsas descobertas (Benjamini–Hochberg) ---
+# Duas categóricas: qui-quadrado da tabela cruzada (exato de Fisher nas 2×2 com frequência esperada abaixo de 5).
+# Com uma numérica: o teste da medida de associação (t da correlação, F da razão de correlação)
+ALFA = 0.05
+ESPERADO_MINIMO = 5
+ROTULOS_TESTES = {
+    'qui2': 'Qui-quadrado',
+    'fisher': 'Exato de Fisher',
+    't': 't da correlação',
+    'f': 'F da razão de correlação',
+}
+
+
+def tabelas_por_bincount(variaveis, categoricas):
+    # Tabelas cruzadas de todos os pares categóricos, lado a lado: para cada variável, um único bincount de
+    # (código da variável, início da outra + código da outra) com todas as outras de uma vez
+    tamanhos = variaveis.tamanhos[categoricas]
+    inicios = np.concatenate([[0], np.cumsum(tamanhos)[:-1]]).astype(np.int64)
+    total = int(tamanhos.sum())
+    codigos = np.column_stack([variaveis.codigos[i] for i in categoricas])
+    deslocados = np.where(codigos >= 0, codigos + inicios, -1)
+    tabelas = np.zeros((total, total))
+    for x in range(len(categoricas)):
+        linhas = codigos[:, x] >= 0
+        chaves = codigos[linhas, x][:, None] * total + deslocados[linhas]
+        contagem = np.bincount(chaves[deslocados[linhas] >= 0], minlength=tamanhos[x] * total)
+        tabelas[inicios[x]:inicios[x] + tamanhos[x]] = contagem.reshape(tamanhos[x], total)
+    return tabelas, inicios, tamanhos
+
+
+def fisher_2x2(a, b, c, d):
+    # Exato de Fisher bilateral de várias tabelas [[a, b], [c, d]] de uma vez: probabilidades hipergeométricas de
+    # todos os resultados possíveis com as mesmas margens; soma as que não são mais prováveis que a observada
+    a, b, c, d = (np.asarray(valor, dtype=np.int64) for valor in (a, b, c, d))
+    linha, coluna, n = a + b, a + c, a + b + c + d
+    minimo, maximo = np.maximum(0, linha + coluna - n), np.minimum(linha, coluna)
+    x = minimo[:, None] + np.arange(int((maximo - minimo).max(initial=0)) + 1)
+    possivel = x <= maximo[:, None]
+    x = np.where(possivel, x, minimo[:, None])
+
+    def log_probabilidade(x):
+        return (gammaln(coluna[:, None] + 1) - gammaln(x + 1) - gammaln(coluna[:, None] - x + 1)
+                + gammaln((n - coluna)[:, None] + 1) - gammaln(linha[:, None] - x + 1)
+                - gammaln((n - coluna - linha)[:, None] + x + 1)
+                - (gammaln(n + 1) - gammaln(linha + 1) - gammaln(n - linha + 1))[:, None])
+
+    probabilidades = np.where(possivel, np.exp(log_probabilidade(x)), 0.0)
+    observada = np.exp(log_probabilidade(a[:, None]))
+    p = (probabilidades * (probabilidades <= observada * (1 + 1e-7))).sum(axis=1)
+    return np.clip(p, 0, 1)
+
+
+def benjamini_hochberg(p):
+    # Valores q (p ajustados pela taxa de falsas descobertas); em branco continua em branco
+    p = np.asarray(p, dtype=float)
+    q = np.full(p.shape, np.nan)
+    validos = ~np.isnan(p)
+    m = int(validos.sum())
+    if not m:
+        return q
+    ordem = np.argsort(p[validos])
+    ajustados = p[validos][ordem] * m / np.arange(1, m + 1)
+    ajustados = np.minimum.accumulate(ajustados[::-1])[::-1]
+    resultado = np.empty(m)
+    resultado[ordem] = np.clip(ajustados, 0, 1)
+    q[validos] = resultado
+    return q
+
+
+# --- Testes de todos os pares da matriz de associações (associacao_banco), corrigidos em conjunto ---
+class TestesPares:
+    def __init__(self, banco, associacoes):
+        inicio = time.perf_counter()
+        nomes = list(associacoes.valores.index)
+        variaveis = VariaveisCodificadas(banco, nomes)
+        m = len(nomes)
+        valores, pares = associacoes.valores.to_numpy(), associacoes.pares.to_numpy()
+        p = np.full((m, m), np.nan)
+        estatistica = np.full((m, m), np.nan)
+        testes = np.full((m, m), '', dtype=object)
+
+        # Duas categóricas: qui-quadrado de todas as tabelas de uma vez
+        categoricas = variaveis.categoricas(range(m))
+        if categoricas:
+            tabelas, inicios, tamanhos = tabelas_por_bincount(variaveis, categoricas)
+            qui2, _, linhas_usadas, colunas_usadas, esperado_minimo = qui_quadrado_cruzado(tabelas, inicios, inicios)
+            graus = (linhas_usadas - 1) * (colunas_usadas - 1)
+            posicoes = np.ix_(categoricas, categoricas)
+            p[posicoes] = np.where(graus > 0, chi2.sf(qui2, np.maximum(graus, 1)), np.nan)
+            estatistica[posicoes] = np.where(graus > 0, qui2, np.nan)
+            testes[posicoes] = 'qui2'
+            # 2×2 com frequência esperada pequena: exato de Fisher, todas as tabelas num só cálculo
+            pequenas = np.triu((linhas_usadas == 2) & (colunas_usadas == 2) & (esperado_minimo < ESPERADO_MINIMO), 1)
+            xs, ys = np.nonzero(pequenas)
+            if len(xs):
+                celulas = []
+                for x, y in zip(xs, ys):
+                    tabela = tabelas[inicios[x]:inicios[x] + tamanhos[x], inicios[y]:inicios[y] + tamanhos[y]]
+                    celulas.append(tabela[tabela.sum(axis=1) > 0][:, tabela.sum(axis=0) > 0].ravel())
+                celulas = np.array(celulas, dtype=np.int64)
+                p_fisher = fisher_2x2(*celulas.T)
+                linhas, colunas = np.array(categoricas)[xs], np.array(categoricas)[ys]
+                p[linhas, colunas] = p[colunas, linhas] = p_fisher
+                estatistica[linhas, colunas] = estatistica[colunas, linhas] = np.nan
+                testes[linhas, colunas] = testes[colunas, linhas] = 'fisher'
+
+        # Uma numérica: t da correlação (Pearson, Spearman, ponto-bisserial) ou F da razão de correlação
+        numericas = np.array([natureza == 'numerica' for natureza in variaveis.naturezas])
+        com_numerica = numericas[:, None] | numericas[None, :]
+        medidas = associacoes.medidas.to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correlacao = com_numerica & np.isin(medidas, ('pearson', 'spearman', 'ponto_bisserial'))
+            t = valores * np.sqrt((pares - 2) / (1 - valores ** 2))
+            p[correlacao] = (2 * distribuicao_t.sf(np.abs(t), np.maximum(pares - 2, 1)))[correlacao]
+            estatistica[correlacao] = t[correlacao]
+            testes[correlacao] = 't'
+            razao = com_numerica & (medidas == 'eta')
+            if razao.any():
+                # Grupos: categorias da nominal com ao menos um participante que respondeu à numérica
+                colunas, inicios, _ = variaveis.blocos(categoricas)
+                presentes = (~np.isnan(variaveis.valores)).astype(float)
+                grupos = np.zeros((m, m))
+                grupos[categoricas] = np.add.reduceat(
+                    (variaveis.indicadoras[:, colunas].T @ presentes > 0).astype(float), inicios, axis=0)
+                grupos = np.where(numericas[:, None], grupos.T, grupos)
+                eta2 = valores ** 2
+                f = (eta2 / (grupos - 1)) / ((1 - eta2) / (pares - grupos))
+                p_f = distribuicao_f.sf(f, np.maximum(grupos - 1, 1), np.maximum(pares - grupos, 1))
+                validos = razao & (grupos > 1) & (pares > grupos)
+                p[validos], estatistica[validos] = p_f[validos], f[validos]
+                testes[razao] = 'f'
+
+        p[(pares < MINIMO_PARES) | np.isnan(valores)] = np.nan
+        np.fill_diagonal(p, np.nan)
+        # Correção conjunta: cada par conta uma vez (triângulo acima da diagonal)
+        linhas, colunas = np.triu_indices(m, k=1)
+        q = np.full((m, m), np.nan)
+        q[linhas, colunas] = q[colunas, linhas] = benjamini_hochberg(p[linhas, colunas])
+
+        self.nomes = nomes
+        self.n_testes = int((~np.isnan(p[linhas, colunas])).sum())
+        self.p = pd.DataFrame(p, index=nomes, columns=nomes)
+        self.q = pd.DataFrame(q, index=nomes, columns=nomes)
+        self.estatistica = pd.DataFrame(estatistica, index=nomes, columns=nomes)
+        self.testes = pd.DataFrame(testes, index=nomes, columns=nomes)
+        self.tempo = time.perf_counter() - inicio
+
+    def significativos(self, alfa=ALFA):
+        return int(np.triu(self.q.to_numpy() < alfa, 1).sum())
+
+    def marcas(self, nomes, alfa=ALFA):
+        # '*' nas células significativas após a correção (para anotar os mapas de calor)
+        q = self.q.reindex(index=nomes, columns=nomes).to_numpy()
+        return np.where(q < alfa, '*', '')
+
+
+def testar_pares(banco, associacoes):
+    return TestesPares(banco, associacoes)
@@ -0,0 +1,214 @@
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from compacto_banco import POPCOUNT_BYTE
+from dados_banco import COLUNA_ID
+from esquema_banco import BINS_FAIXA_ETARIA, BINS_IDADE_MAE, IDS_NUMERICOS, classificar_imc
+
+# --- Faixas válidas das medidas: id -> (mínimo, máximo, mínimo incluído, descrição) ---
+# Idades seguem os mesmos bins de 'Faixa Etária' (right=True: idade 0 fica fora) e de 'Faixa Etária da Mãe'
+INTERVALOS = {
+    'idade': (BINS_FAIXA_ETARIA[0], BINS_FAIXA_ETARIA[-1], False, 'Idade fora das faixas etárias do gráfico'),
+    'idade_mae_gestacao': (BINS_IDADE_MAE[0], BINS_IDADE_MAE[-1], True, 'Idade da mãe na gestação fora de 15 a 48 anos'),
+    'idade_cuidador_principal': (14, 110, True, 'Idade do cuidador fora de 14 a 110 anos'),
+    'peso': (1, 200, True, 'Peso fora de 1 a 200 kg'),
+    'altura': (0.3, 2.2, True, 'Altura fora de 0,30 a 2,20 m'),
+    'peso_cuidador_principal': (30, 250, True, 'Peso do cuidador fora de 30 a 250 kg'),
+    'altura_cuidador_principal': (1.2, 2.2, True, 'Altura do cuidador fora de 1,20 a 2,20 m'),
+    'imc': (10, 60, True, 'IMC fora de 10 a 60 kg/m²'),
+    'pessoas_renda': (1, 30, True, 'Pessoas na renda fora de 1 a 30'),
+}
+
+# IMC informado x peso / altura²: diferença relativa tolerada (arredondamentos da planilha)
+TOLERANCIA_IMC = 0.05
+# Classificação da OMS só vale para adultos (crianças e adolescentes usam o escore Z)
+IDADE_ADULTO = 20
+
+
+@dataclass
+class Regra:
+    id: str
+    tipo: str                 # 'numerico', 'intervalo', 'categorias', 'imc_peso_altura', 'imc_calculavel' ou 'classificacao_imc'
+    colunas: tuple            # ids das colunas verificadas
+    descricao: str
+    parametros: tuple = ()
+
+
+# --- Verificações: cada regra vira uma máscara booleana sobre todas as linhas, sem laços por linha ---
+def medida(banco, id_coluna):
+    return banco[banco.esquema[id_coluna]].to_numpy(dtype='float64', na_value=np.nan)
+
+
+def verificar_numerico(banco, regra):
+    # Célula preenchida na planilha que não virou número na normalização
+    nome = banco.esquema[regra.colunas[0]]
+    bruta = banco.origem[nome].astype('string').str.strip()
+    return (bruta.notna() & (bruta != '')).to_numpy(dtype=bool) & np.isnan(medida(banco, regra.colunas[0]))
+
+
+def verificar_intervalo(banco, regra):
+    minimo, maximo, inclui_minimo = regra.parametros
+    valores = medida(banco, regra.colunas[0])
+    with np.errstate(invalid='ignore'):
+        abaixo = valores < minimo if inclui_minimo else valores <= minimo
+        return abaixo | (valores > maximo)
+
+
+def verificar_categorias(banco, regra):
+    serie = banco[banco.esquema[regra.colunas[0]]]
+    return (serie.notna() & ~serie.isin(regra.parametros)).to_numpy(dtype=bool)
+
+
+def verificar_imc_peso_altura(banco, regra):
+    imc, peso, altura = (medida(banco, id_coluna) for id_coluna in regra.colunas)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.abs(imc - peso / altura ** 2) > regra.parametros[0] * imc
+
+
+def verificar_imc_calculavel(banco, regra):
+    imc, peso, altura = (medida(banco, id_coluna) for id_coluna in regra.colunas)
+    return np.isnan(imc) & ~np.isnan(peso) & ~np.isnan(altura)
+
+
+def verificar_classificacao_imc(banco, regra):
+    id_classificacao, id_imc, id_idade = regra.colunas
+    imc = pd.Series(medida(banco, id_imc), index=banco.index)
+    informada = banco[banco.esquema[id_classificacao]].astype(object)
+    calculada = classificar_imc(imc)
+    with np.errstate(invalid='ignore'):
+        adulto = medida(banco, id_idade) >= regra.parametros[0]
+    return (adulto & informada.notna() & calculada.notna() & (informada != calculada)).to_numpy(dtype=bool)
+
+
+VERIFICACOES = {
+    'numerico': verificar_numerico,
+    'intervalo': verificar_intervalo,
+    'categorias': verificar_categorias,
+    'imc_peso_altura': verificar_imc_peso_altura,
+    'imc_calculavel': verificar_imc_calculavel,
+    'classificacao_imc': verificar_classificacao_imc,
+}
+
+
+# --- Regras declaradas: faixas fixas acima + regras geradas a partir do registro de colunas ---
+def regras_do_esquema(esquema):
+    regras = []
+    for id_coluna in sorted(IDS_NUMERICOS):
+        regras.append(Regra(f'{id_coluna}_numerico', 'numerico', (id_coluna,), 'Valor não numérico'))
+    for id_coluna, (minimo, maximo, inclui_minimo, descricao) in INTERVALOS.items():
+        regras.append(Regra(f'{id_coluna}_intervalo', 'intervalo', (id_coluna,), descricao, (minimo, maximo, inclui_minimo)))
+    regras += [
+        Regra('imc_peso_altura', 'imc_peso_altura', ('imc', 'peso', 'altura'),
+              f'IMC difere de peso/altura² em mais de {TOLERANCIA_IMC:.0%}', (TOLERANCIA_IMC,)),
+        Regra('imc_calculavel', 'imc_calculavel', ('imc', 'peso', 'altura'),
+              'IMC em branco, mas peso e altura preenchidos'),
+        Regra('classificacao_imc_adulto', 'classificacao_imc', ('classificacao_imc', 'imc', 'idade'),
+              'Classificação IMC de adulto diferente da faixa da OMS para o IMC', (IDADE_ADULTO,)),
+    ]
+    # Respostas fora das opções do dicionário (perguntas de escolha única)
+    for coluna in esquema.colunas:
+        if coluna.tipo == 'categorica' and coluna.categorias and not coluna.familia:
+            regras.append(Regra(f'{coluna.id}_categorias', 'categorias', (coluna.id,),
+                                'Resposta fora das opções do dicionário', tuple(coluna.categorias)))
+    return [regra for regra in regras if all(id_coluna in esquema for id_coluna in regra.colunas)]
+
+
+# --- Resultado da validação: uma linha de bits por regra (linhas sinalizadas) ---
+# Cada regra só é verificada na primeira consulta (gráfico que lê a sinalização, relatório da aba 2): a carga
+# não converte as colunas verificadas, e as abas continuam carregando só o que desenham
+class Validacao:
+    def __init__(self, banco, regras):
+        self.banco = banco
+        self.regras = {regra.id: regra for regra in regras}
+        self.nomes = list(self.regras)
+        self.verificadas = {}
+        self.tempo = 0.0
+        self._relatorio = None
+        self._trava = threading.Lock()
+
+    def _linha(self, id_regra):
+        # Linhas sinalizadas pela regra, empacotadas em bits (verificada uma única vez)
+        bits = self.verificadas.get(id_regra)
+        if bits is None:
+            with self._trava:
+                bits = self.verificadas.get(id_regra)
+                if bits is None:
+                    inicio = time.perf_counter()
+                    regra = self.regras[id_regra]
+                    marcadas = np.asarray(VERIFICACOES[regra.tipo](self.banco, regra), dtype=bool)
+                    bits = np.packbits(marcadas, bitorder='little')
+                    self.verificadas[id_regra] = bits
+                    self.tempo += time.perf_counter() - inicio
+        return bits
+
+    def _matriz_bits(self, ids=None):
+        # Regras × bytes (mesmo formato das famílias de bits do banco)
+        ids = self.nomes if ids is None else ids
+        if not ids:
+            return np.zeros((0, (len(self.banco) + 7) // 8), dtype=np.uint8)
+        return np.vstack([self._linha(id_regra) for id_regra in ids])
+
+    @property
+    def relatorio(self):
+        if self._relatorio is None:
+            self._relatorio = self._montar_relatorio()
+        return self._relatorio
+
+    def _montar_relatorio(self):
+        contagens = POPCOUNT_BYTE[self._matriz_bits()].sum(axis=1)
+        linhas = []
+        for regra, total in zip(self.regras.values(), contagens):
+            linhas.append({
+                'Regra': regra.id,
+                'Colunas': ', '.join(self.banco.esquema[id_coluna] for id_coluna in regra.colunas),
+                'Descrição': regra.descricao,
+                'Linhas sinalizadas': int(total),
+                '% das linhas': round(100 * total / max(len(self.banco), 1), 1),
+            })
+        relatorio = pd.DataFrame(linhas, columns=['Regra', 'Colunas', 'Descrição', 'Linhas sinalizadas', '% das linhas'])
+        return relatorio.sort_values('Linhas sinalizadas', ascending=False, kind='stable').reset_index(drop=True)
+
+    def _bits(self, ids):
+        # União das regras pedidas (linhas com qualquer uma delas), ainda empacotada
+        ids = [id_regra for id_regra in ids if id_regra in self.regras]
+        if not ids:
+            return np.zeros((len(self.banco) + 7) // 8, dtype=np.uint8)
+        return np.bitwise_or.reduce(self._matriz_bits(ids), axis=0)
+
+    def contagens(self, index=None):
+        # Linhas sinalizadas por regra dentro de um recorte (index) do banco
+        bits, mascara = self._matriz_bits(), self.banco.mascara(index)
+        return pd.Series(POPCOUNT_BYTE[bits if mascara is None else bits & mascara].sum(axis=1).astype(np.int64),
+                         index=self.nomes)
+
+    def contagem(self, ids, index=None):
+        bits = self._bits(ids)
+        mascara = self.banco.mascara(index)
+        return int(POPCOUNT_BYTE[bits if mascara is None else bits & mascara].sum())
+
+    def linhas(self, ids, index=None):
+        # Sinalização por linha reutilizada pelos gráficos (True = alguma das regras falhou)
+        marcadas = np.unpackbits(self._bits(ids), count=len(self.banco), bitorder='little').astype(bool)
+        sinal = pd.Series(marcadas, index=self.banco.index)
+        return sinal if index is None else sinal.loc[index]
+
+    def sinalizadas(self, index=None):
+        # Uma linha por participante sinalizado, com as regras que falharam
+        index = self.banco.index if index is None else index
+        matriz = np.unpackbits(self._matriz_bits(), axis=1, count=len(self.banco), bitorder='little').T.astype(bool)
+        matriz = matriz[self.banco.index.get_indexer(index)]
+        linhas = matriz.any(axis=1)
+        nomes = np.array(self.nomes, dtype=object)
+        tabela = pd.DataFrame({'Regras violadas': [', '.join(nomes[marcadas]) for marcadas in matriz[linhas]]},
+                              index=index[linhas])
+        if COLUNA_ID in self.banco.origem:
+            tabela.insert(0, COLUNA_ID, self.banco.origem[COLUNA_ID].loc[tabela.index].astype(str))
+        return tabela
+
+
+def validar_banco(banco):
+    return Validacao(banco, regras_do_esquema(banco.esquema))